@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Hermano, AreaInteres, Acto, PapeletaSitio, CuerpoPertenencia, HermanoCuerpo, TipoActo, Puesto
+from .models import Hermano, AreaInteres, Acto, PapeletaSitio, CuerpoPertenencia, HermanoCuerpo, TipoActo, Puesto, EnvioTelegram
 
 # Register your models here.
 
@@ -11,3 +11,4 @@ admin.site.register(CuerpoPertenencia)
 admin.site.register(HermanoCuerpo)
 admin.site.register(TipoActo)
 admin.site.register(Puesto)
+admin.site.register(EnvioTelegram)
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        # Registra los receptores que mantienen las máscaras de áreas de interés
+        from api import signals  # noqa: F401
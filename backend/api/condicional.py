@@ -0,0 +1,54 @@
+import hashlib
+from functools import wraps
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+def calcular_etag(*partes) -> str:
+    """ETag fuerte a partir de los valores que identifican una versión del recurso."""
+    return quote_etag(hashlib.sha1(repr(partes).encode()).hexdigest())
+
+
+def peticion_condicional(obtener_version):
+    """
+    Decorador para los `get` de las vistas de DRF que responde `304 Not Modified` sin
+    ejecutar la vista cuando el cliente ya tiene la versión actual del recurso.
+
+    `obtener_version(request, *args, **kwargs)` debe ser barata (un agregado, nunca
+    serializar) y devolver una tupla `(version, ultima_modificacion)`:
+        - `version`: valores que cambian siempre que cambia la respuesta
+          (p. ej. número de filas y max(updated_at)).
+        - `ultima_modificacion`: datetime para `Last-Modified`, o None. Solo tiene sentido
+          en recursos individuales; en listados un borrado no mueve el máximo.
+
+    El ETag incluye además el usuario y la URL completa (página, cursor, filtros), así
+    que dos hermanos o dos páginas nunca comparten validador.
+    """
+    def decorador(metodo):
+        @wraps(metodo)
+        def envoltura(self, request, *args, **kwargs):
+            version, ultima_modificacion = obtener_version(request, *args, **kwargs)
+
+            etag = calcular_etag(request.user.pk, request.get_full_path(), *version)
+            timestamp = int(ultima_modificacion.timestamp()) if ultima_modificacion else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+            if response is None:
+                response = metodo(self, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+
+            response.headers['ETag'] = etag
+            if timestamp is not None:
+                response.headers['Last-Modified'] = http_date(timestamp)
+
+            # El cliente puede guardar la respuesta, pero debe revalidarla siempre
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ('Authorization',))
+            return response
+
+        return envoltura
+
+    return decorador
@@ -0,0 +1,271 @@
+import math
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+
+from api.models import AreaInteres, Comunicado, Hermano
+from api.servicios.comunicado.cliente_gemini import MODELO_EMBEDDING, MODELO_GENERACION, obtener_cliente_gemini, reiniciar_cliente_gemini
+from api.servicios.comunicado.comunicado_rag_service import ComunicadoRAGService, calcular_similitud_coseno
+from api.servicios.comunicado.indice_lexico_service import reiniciar_indice_comunicados
+from api.servicios.comunicado.indice_vectorial_service import IndiceVectorialCuantizado
+
+
+TEMAS = [
+    ("Reparto de papeletas de sitio", "El reparto de papeletas de sitio se realizará en la casa hermandad en horario de tarde."),
+    ("Cuota anual de hermanos", "Se recuerda a los hermanos que el plazo de pago de la cuota anual finaliza a final de mes."),
+    ("Solemne Quinario", "La hermandad celebrará el solemne quinario en honor a sus titulares con predicación."),
+    ("Besamanos extraordinario", "Con motivo del aniversario se celebrará un besamanos extraordinario abierto a los fieles."),
+    ("Igualá de costaleros", "Se convoca a todos los costaleros a la igualá de las cuadrillas en el almacén."),
+    ("Convivencia de la juventud", "El grupo joven organiza una convivencia con actividades formativas y deportivas."),
+    ("Campaña de recogida de alimentos", "La diputación de caridad organiza una campaña de recogida de alimentos no perecederos."),
+    ("Cabildo general ordinario", "Se cita a los hermanos mayores de edad al cabildo general ordinario de cuentas."),
+    ("Montaje de los pasos", "Priostía solicita voluntarios para el montaje de los pasos durante la semana."),
+    ("Ensayo de acólitos", "El cuerpo de acólitos realizará su ensayo general antes de la estación de penitencia."),
+]
+
+SILABAS = ["ca", "ro", "me", "lin", "sa", "tor", "vi", "nu", "pe", "dal", "gue", "mon", "ris", "ta", "bel", "fo"]
+
+
+def percentil(valores: list[float], p: float) -> float:
+    """Percentil por rango más cercano (los valores deben venir ordenados)."""
+    if not valores:
+        return 0.0
+
+    posicion = max(0, math.ceil(p / 100 * len(valores)) - 1)
+    return valores[posicion]
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide la recuperación del chat RAG sobre un corpus sintético de comunicados: '
+        'latencias (p50/p90/p99), tamaño del prompt y recall@k. Por defecto usa el '
+        'sustituto local de Gemini, por lo que no necesita red. El corpus se crea '
+        'dentro de una transacción que se revierte al terminar.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--comunicados', type=int, default=200, help='Tamaño del corpus sintético.')
+        parser.add_argument('--preguntas', type=int, default=50, help='Número de preguntas a lanzar.')
+        parser.add_argument('--k', type=int, default=3, help='Comunicados recuperados por pregunta.')
+        parser.add_argument('--latencia-ms', type=float, default=0, help='Latencia artificial del Gemini simulado.')
+        parser.add_argument('--semilla', type=int, default=42)
+        parser.add_argument('--backend-real', action='store_true', help='Usa el backend de Gemini configurado en settings.')
+        parser.add_argument('--recall-minimo', type=float, default=None, help='Falla si el recall@k queda por debajo (para CI).')
+        parser.add_argument('--cuantizacion', action='store_true', help='Compara memoria y recall de los vectores float16/int8 frente a los completos.')
+        parser.add_argument('--dimension', type=int, default=None, help='Recorte Matryoshka a comparar además de la dimensión completa.')
+        parser.add_argument('--repuntuar', type=int, default=50, help='Candidatos de la primera pasada que se repuntúan a precisión completa.')
+
+    def handle(self, *args, **options):
+        if options['comunicados'] < 1 or options['preguntas'] < 1 or options['k'] < 1:
+            raise CommandError("--comunicados, --preguntas y --k deben ser mayores que 0.")
+
+        if options['backend_real']:
+            resultados = self._ejecutar(options)
+        else:
+            with override_settings(GEMINI_BACKEND='falso', GEMINI_FALSO_LATENCIA_MS=options['latencia_ms']):
+                reiniciar_cliente_gemini()
+                try:
+                    resultados = self._ejecutar(options)
+                finally:
+                    reiniciar_cliente_gemini()
+
+        self._informar(resultados, options['k'])
+
+        if resultados.get('cuantizacion'):
+            self._informar_cuantizacion(resultados['cuantizacion'], options['k'])
+
+        if options['recall_minimo'] is not None and resultados['recall'] < options['recall_minimo']:
+            raise CommandError(
+                f"recall@{options['k']} = {resultados['recall']:.3f} por debajo del mínimo {options['recall_minimo']:.3f}"
+            )
+
+    def _ejecutar(self, options):
+        aleatorio = random.Random(options['semilla'])
+
+        try:
+            with transaction.atomic():
+                objetivos = self._crear_corpus(options['comunicados'], aleatorio)
+                reiniciar_indice_comunicados()
+
+                resultados = self._medir(objetivos, options, aleatorio)
+
+                if options['cuantizacion']:
+                    resultados['cuantizacion'] = self._comparar_cuantizacion(objetivos, options)
+
+                transaction.set_rollback(True)
+        finally:
+            reiniciar_indice_comunicados()
+
+        return resultados
+
+    def _crear_corpus(self, total, aleatorio):
+        """Crea los comunicados sintéticos y devuelve [(pregunta, id esperado)]."""
+        self.stdout.write(self.style.WARNING(f"⏳ Generando corpus sintético de {total} comunicados..."))
+
+        client = obtener_cliente_gemini()
+
+        autor = Hermano.objects.create_user(
+            username="BENCH0000", dni="BENCH0000", password=None, nombre="Benchmark", primer_apellido="RAG",
+            segundo_apellido="Sintético", telefono="600000000", estado_civil=Hermano.EstadoCivil.SOLTERO
+        )
+        areas = [AreaInteres.objects.get_or_create(nombre_area=nombre)[0] for nombre in AreaInteres.NombreArea.values]
+
+        objetivos = []
+        claves_usadas = set()
+
+        for i in range(total):
+            titulo_tema, contenido_tema = TEMAS[i % len(TEMAS)]
+
+            clave = ''.join(aleatorio.choice(SILABAS) for _ in range(3))
+            while clave in claves_usadas:
+                clave = ''.join(aleatorio.choice(SILABAS) for _ in range(4))
+            claves_usadas.add(clave)
+
+            titulo = f"{titulo_tema} en {clave.capitalize()}"
+            contenido = f"{contenido_tema} Este año tendrá lugar en {clave.capitalize()}, el día {aleatorio.randint(1, 28)}."
+
+            resultado = client.models.embed_content(model=MODELO_EMBEDDING, contents=f"Título: {titulo}\nContenido: {contenido}")
+
+            comunicado = Comunicado.objects.create(
+                titulo=titulo,
+                contenido=contenido,
+                tipo_comunicacion=Comunicado.TipoComunicacion.GENERAL,
+                autor=autor,
+                embedding=list(resultado.embeddings[0].values),
+            )
+            comunicado.areas_interes.set([aleatorio.choice(areas)])
+
+            objetivos.append((f"¿Cuándo es el {titulo_tema.lower()} de {clave.capitalize()}?", comunicado.id))
+
+        return objetivos
+
+    def _medir(self, objetivos, options, aleatorio):
+        servicio = ComunicadoRAGService()
+        servicio.NUM_COMUNICADOS_CONTEXTO = options['k']
+
+        preguntas = [aleatorio.choice(objetivos) for _ in range(options['preguntas'])]
+
+        # Primera consulta fuera de la medición: construye el índice léxico
+        servicio._recuperar_comunicados(preguntas[0][0])
+
+        latencias_recuperacion, latencias_generacion, tamanos_prompt = [], [], []
+        aciertos = 0
+
+        for pregunta, esperado in preguntas:
+            inicio = time.perf_counter()
+            recuperados = servicio._recuperar_comunicados(pregunta)
+            latencias_recuperacion.append((time.perf_counter() - inicio) * 1000)
+
+            prompt = servicio._construir_prompt(servicio._construir_contexto(recuperados), pregunta)
+            tamanos_prompt.append(len(prompt))
+
+            inicio = time.perf_counter()
+            servicio.client.models.generate_content(model=MODELO_GENERACION, contents=prompt)
+            latencias_generacion.append((time.perf_counter() - inicio) * 1000)
+
+            if esperado in {com.id for com in recuperados}:
+                aciertos += 1
+
+        return {
+            'preguntas': len(preguntas),
+            'recuperacion_ms': sorted(latencias_recuperacion),
+            'generacion_ms': sorted(latencias_generacion),
+            'prompt_caracteres': sorted(tamanos_prompt),
+            'recall': aciertos / len(preguntas),
+        }
+
+    def _comparar_cuantizacion(self, objetivos, options):
+        """
+        Para cada formato compacto mide la memoria de los vectores y el recall@k de la
+        búsqueda vectorial frente al ranking exacto en float completo, con y sin repuntuar
+        los mejores candidatos con el embedding original.
+        """
+        client = obtener_cliente_gemini()
+        k = options['k']
+
+        embeddings = dict(Comunicado.objects.filter(embedding__isnull=False).values_list('id', 'embedding'))
+        dimension_completa = len(next(iter(embeddings.values())))
+
+        preguntas = [pregunta for pregunta, _ in objetivos[:options['preguntas']]]
+        vectores_pregunta = [
+            client.models.embed_content(model=MODELO_EMBEDDING, contents=pregunta).embeddings[0].values
+            for pregunta in preguntas
+        ]
+
+        def ranking_exacto(vector, ids):
+            puntuaciones = {com_id: calcular_similitud_coseno(vector, embeddings[com_id]) for com_id in ids}
+            return sorted(puntuaciones, key=puntuaciones.get, reverse=True)[:k]
+
+        exactos = [ranking_exacto(vector, embeddings) for vector in vectores_pregunta]
+
+        configuraciones = [('float16', None), ('int8', None)]
+        if options['dimension'] and options['dimension'] < dimension_completa:
+            configuraciones += [('float16', options['dimension']), ('int8', options['dimension'])]
+
+        filas = []
+        for modo, dimension in configuraciones:
+            indice = IndiceVectorialCuantizado(modo, dimension)
+            for com_id, embedding in embeddings.items():
+                indice.indexar(com_id, embedding)
+
+            aciertos_directos, aciertos_repuntuados, latencias = 0, 0, []
+
+            for vector, exacto in zip(vectores_pregunta, exactos):
+                inicio = time.perf_counter()
+                candidatos = indice.mejores(vector, options['repuntuar'])
+                repuntuado = ranking_exacto(vector, candidatos)
+                latencias.append((time.perf_counter() - inicio) * 1000)
+
+                aciertos_directos += len(set(candidatos[:k]) & set(exacto))
+                aciertos_repuntuados += len(set(repuntuado) & set(exacto))
+
+            total = len(exactos) * k
+            filas.append({
+                'modo': modo,
+                'dimension': dimension or dimension_completa,
+                'memoria': indice.memoria_bytes(),
+                'recall_directo': aciertos_directos / total,
+                'recall_repuntuado': aciertos_repuntuados / total,
+                'latencia_ms': sorted(latencias),
+            })
+
+        return {
+            'comunicados': len(embeddings),
+            'memoria_float32': 4 * dimension_completa * len(embeddings),
+            'filas': filas,
+        }
+
+    def _informar_cuantizacion(self, comparacion, k):
+        base = comparacion['memoria_float32']
+
+        self.stdout.write(self.style.SUCCESS(f"\n🗜️  Vectores compactos ({comparacion['comunicados']} comunicados)"))
+        self.stdout.write(f"  float32 (referencia): {base / 1024:.1f} KiB")
+
+        for fila in comparacion['filas']:
+            self.stdout.write(
+                f"  {fila['modo']:<8} dim={fila['dimension']:<5} {fila['memoria'] / 1024:8.1f} KiB (x{base / fila['memoria']:.1f})  "
+                f"recall@{k} directo={fila['recall_directo']:.3f}  repuntuado={fila['recall_repuntuado']:.3f}  "
+                f"p50={percentil(fila['latencia_ms'], 50):.2f} ms"
+            )
+
+    def _informar(self, resultados, k):
+        def linea_latencias(nombre, valores):
+            return (
+                f"  {nombre:<16} p50={percentil(valores, 50):8.2f}  p90={percentil(valores, 90):8.2f}  "
+                f"p99={percentil(valores, 99):8.2f}  máx={valores[-1]:8.2f}"
+            )
+
+        prompts = resultados['prompt_caracteres']
+
+        self.stdout.write(self.style.SUCCESS(f"\n📊 Resultados ({resultados['preguntas']} preguntas)"))
+        self.stdout.write("Latencias (ms):")
+        self.stdout.write(linea_latencias("recuperación", resultados['recuperacion_ms']))
+        self.stdout.write(linea_latencias("generación", resultados['generacion_ms']))
+        self.stdout.write(
+            f"Prompt (caracteres): media={sum(prompts) / len(prompts):.0f}  "
+            f"p90={percentil(prompts, 90)}  máx={prompts[-1]}"
+        )
+        self.stdout.write(self.style.SUCCESS(f"recall@{k}: {resultados['recall']:.3f}"))
@@ -0,0 +1,122 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from api.models import Acto, AreaInteres, Comunicado, Hermano, PapeletaSitio, Puesto, TipoActo, TipoPuesto, Tramo
+from api.serializadores.comunicado.comunicado_list_serializer import ComunicadoListSerializer
+from api.serializadores.comunicado.comunicado_list_values import proyectar_comunicados_listado, serializar_comunicados_listado
+from api.serializadores.papeleta_sitio.historial_papeleta_values import proyectar_historial_papeletas, serializar_historial_papeletas
+from api.serializers import HistorialPapeletaSerializer
+from api.services import get_historial_papeletas_hermano_service
+from api.servicios.comunicado.feed_comunicado_service import obtener_feed_comunicados
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara la serialización de los listados más usados (tablón de comunicados e historial '
+        'de papeletas) con los serializadores de DRF frente a la ruta rápida basada en values(). '
+        'Los datos se crean dentro de una transacción que se revierte al terminar.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--elementos', type=int, default=100, help='Filas por respuesta (tamaño de página).')
+        parser.add_argument('--repeticiones', type=int, default=50)
+        parser.add_argument('--semilla', type=int, default=42)
+
+    def handle(self, *args, **options):
+        if options['elementos'] < 1 or options['repeticiones'] < 1:
+            raise CommandError("--elementos y --repeticiones deben ser mayores que 0.")
+
+        aleatorio = random.Random(options['semilla'])
+
+        with transaction.atomic():
+            hermano = self._crear_datos(options['elementos'], aleatorio)
+            request = APIRequestFactory().get('/api/comunicados/')
+
+            feed = obtener_feed_comunicados(hermano)[:options['elementos']]
+            historial = get_historial_papeletas_hermano_service(hermano)[:options['elementos']]
+
+            casos = [
+                (
+                    "Tablón de comunicados",
+                    lambda: ComunicadoListSerializer(feed.all(), many=True, context={'request': request}).data,
+                    lambda: serializar_comunicados_listado(proyectar_comunicados_listado(feed.all()), request),
+                ),
+                (
+                    "Historial de papeletas",
+                    lambda: HistorialPapeletaSerializer(historial.all(), many=True).data,
+                    lambda: serializar_historial_papeletas(proyectar_historial_papeletas(historial.all())),
+                ),
+            ]
+
+            for nombre, drf, rapido in casos:
+                if JSONRenderer().render(drf()) != JSONRenderer().render(rapido()):
+                    raise CommandError(f"{nombre}: la ruta rápida no produce el mismo JSON que el serializador.")
+
+                tiempo_drf = self._medir(drf, options['repeticiones'])
+                tiempo_rapido = self._medir(rapido, options['repeticiones'])
+
+                self.stdout.write(self.style.SUCCESS(
+                    f"✅ {nombre} ({options['elementos']} filas): DRF {tiempo_drf:.2f} ms · "
+                    f"values() {tiempo_rapido:.2f} ms · x{tiempo_drf / tiempo_rapido:.1f}"
+                ))
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS("\n🎉 Proceso terminado"))
+
+    def _medir(self, funcion, repeticiones):
+        """Mediana en milisegundos (incluye las consultas a la BD)."""
+        funcion()
+
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            funcion()
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+
+        return sorted(tiempos)[len(tiempos) // 2]
+
+    def _crear_datos(self, total, aleatorio):
+        self.stdout.write(self.style.WARNING(f"⏳ Generando {total} comunicados y papeletas sintéticos..."))
+
+        hermano = Hermano.objects.create_user(
+            username="BENCH0001", dni="BENCH0001", password=None, nombre="Benchmark", primer_apellido="Serializadores",
+            segundo_apellido="Sintético", telefono="600000000", estado_civil=Hermano.EstadoCivil.SOLTERO
+        )
+        areas = [AreaInteres.objects.get_or_create(nombre_area=nombre)[0] for nombre in AreaInteres.NombreArea.values]
+        hermano.areas_interes.set(areas)
+
+        for i in range(total):
+            comunicado = Comunicado.objects.create(
+                titulo=f"Comunicado sintético {i}",
+                contenido="<p>Texto del comunicado sintético para medir la serialización.</p>" * 20,
+                tipo_comunicacion=aleatorio.choice(Comunicado.TipoComunicacion.values),
+                autor=hermano,
+            )
+            comunicado.areas_interes.set(aleatorio.sample(areas, 2))
+
+        tipo_acto, _ = TipoActo.objects.get_or_create(tipo=TipoActo.OpcionesTipo.CONVIVENCIA, defaults={'requiere_papeleta': False})
+        tipo_puesto = TipoPuesto.objects.create(nombre_tipo="Benchmark serializadores", es_insignia=True)
+        ahora = timezone.now()
+
+        for i in range(total):
+            acto = Acto.objects.create(
+                nombre=f"Acto sintético {i}", lugar="Casa Hermandad", fecha=ahora - timedelta(days=i), tipo_acto=tipo_acto
+            )
+            puesto = Puesto.objects.create(nombre="Vara", acto=acto, tipo_puesto=tipo_puesto, hora_citacion=ahora.time())
+            tramo = Tramo.objects.create(nombre="Tramo 1", numero_orden=1, acto=acto)
+
+            PapeletaSitio.objects.create(
+                hermano=hermano, acto=acto, anio=ahora.year - i, puesto=puesto, tramo=tramo, orden_en_tramo=i,
+                lado=PapeletaSitio.LadoTramo.DERECHA, estado_papeleta=PapeletaSitio.EstadoPapeleta.EMITIDA,
+                fecha_solicitud=ahora, fecha_emision=ahora.date(),
+            )
+
+        return hermano
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from api.models import Acto, Comunicado
+from api.servicios.imagen.derivados_imagen_service import generar_derivados_imagen
+
+class Command(BaseCommand):
+    help = 'Genera las versiones WebP/JPEG reducidas de las portadas de comunicados y actos que aún no las tienen.'
+
+    def handle(self, *args, **options):
+        for modelo in (Comunicado, Acto):
+            pendientes = [
+                pk for pk, origen, derivados in modelo.objects.exclude(imagen_portada='')
+                                                        .exclude(imagen_portada__isnull=True)
+                                                        .values_list('pk', 'imagen_portada', 'imagen_derivados')
+                if (derivados or {}).get('origen') != origen
+            ]
+
+            if not pendientes:
+                self.stdout.write(self.style.SUCCESS(f"✅ Todas las portadas de {modelo.__name__} tienen sus derivados."))
+                continue
+
+            self.stdout.write(self.style.WARNING(f"⏳ Generando derivados para {len(pendientes)} portadas de {modelo.__name__}..."))
+
+            for pk in pendientes:
+                generar_derivados_imagen(modelo, pk)
+
+        self.stdout.write(self.style.SUCCESS("\n🎉 Proceso terminado."))
@@ -1,15 +1,16 @@
 import time
-from google import genai
 from google.genai import types
 from django.core.management.base import BaseCommand
-from django.conf import settings
+from django.utils import timezone
 from api.models import Comunicado
+from api.servicios.comunicado.cliente_gemini import MODELO_EMBEDDING, obtener_cliente_gemini
+from api.servicios.comunicado.relacionados_comunicado_service import actualizar_relacionados
 
 class Command(BaseCommand):
     help = 'Genera vectores semánticos (Embeddings) para los comunicados.'
 
     def handle(self, *args, **options):
-        client = genai.Client(api_key=settings.GEMINI_API_KEY)
+        client = obtener_cliente_gemini()
         
         comunicados_sin_vector = Comunicado.objects.filter(embedding__isnull=True)
         total = comunicados_sin_vector.count()
@@ -25,12 +26,14 @@ class Command(BaseCommand):
             texto = f"Título: {comunicado.titulo}\nContenido: {comunicado.contenido}"
             try:
                 resultado = client.models.embed_content(
-                    model='gemini-embedding-001',
+                    model=MODELO_EMBEDDING,
                     contents=texto,
                     config=types.EmbedContentConfig(task_type="RETRIEVAL_DOCUMENT")
                 )
                 comunicado.embedding = resultado.embeddings[0].values
-                comunicado.save(update_fields=['embedding'])
+                comunicado.embedding_modificado = timezone.now()
+                comunicado.save(update_fields=['embedding', 'embedding_modificado'])
+                actualizar_relacionados(comunicado.id, comunicado.embedding)
                 exitos += 1
                 self.stdout.write(self.style.SUCCESS(f"  ✓ Vectorizado: {comunicado.titulo}"))
                 time.sleep(1) 
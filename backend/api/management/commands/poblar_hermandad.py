@@ -12,6 +12,7 @@ from django.conf import settings
 from django.core.files import File
 import random
 from django.contrib.auth.hashers import make_password
+from api.servicios.acto.estadisticas_acto_service import recalcular_estadisticas_acto
 
 class Command(BaseCommand):
     help = 'Puebla la base de datos con hermanos de prueba y áreas de interés'
@@ -921,6 +922,15 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(f'¡Éxito! Se han creado {len(tramos_a_crear_ep27)} tramos para el Acto 2 en total.'))
 
 
+        # =========================================================================
+        # ESTADÍSTICAS DE LOS ACTOS (las papeletas se han creado con bulk_create)
+        # =========================================================================
+        for acto_id in Acto.objects.values_list('id', flat=True):
+            recalcular_estadisticas_acto(acto_id)
+
+        self.stdout.write(self.style.SUCCESS('¡Éxito! Se han recalculado las estadísticas de los actos.'))
+
+
         # =========================================================================
         # POBLADO DE COMUNICADO 1
         # =========================================================================
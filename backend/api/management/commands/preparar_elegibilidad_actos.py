@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
+
+from api.models import Acto
+from api.servicios.papeleta_sitio.elegibilidad_solicitud_service import preparar_elegibilidad_acto
+
+
+class Command(BaseCommand):
+    help = (
+        'Construye la foto de elegibilidad (cuotas y cuerpos) de todos los hermanos para los '
+        'actos con plazo de solicitud pendiente. Conviene lanzarlo antes de abrir el plazo.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--acto', type=int, help='Prepara solo el acto indicado.')
+
+    def handle(self, *args, **options):
+        if options['acto'] is not None:
+            actos = Acto.objects.filter(pk=options['acto'])
+            if not actos.exists():
+                raise CommandError(f"No existe el acto {options['acto']}.")
+        else:
+            ahora = timezone.now()
+            actos = Acto.objects.filter(
+                Q(fin_solicitud__gte=ahora) | Q(fin_solicitud_cirios__gte=ahora),
+                tipo_acto__requiere_papeleta=True,
+            )
+
+        self.stdout.write(self.style.WARNING("⏳ Preparando la elegibilidad de los hermanos..."))
+
+        actos = list(actos.order_by('id'))
+        for acto in actos:
+            total = preparar_elegibilidad_acto(acto)
+            self.stdout.write(self.style.SUCCESS(f"✅ {acto.nombre}: {total} hermanos."))
+
+        self.stdout.write(self.style.SUCCESS(f"\n🎉 Proceso terminado: {len(actos)} actos preparados."))
@@ -0,0 +1,60 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from api.models import SolicitudEnCola
+from api.servicios.papeleta_sitio.cola_solicitudes_service import liberar_atascadas, reclamar_lote, tramitar
+
+
+class Command(BaseCommand):
+    help = (
+        'Tramita las solicitudes de papeleta recibidas en modo admisión (SOLICITUDES_EN_COLA) '
+        'con un número fijo de workers, para que la BD vea una concurrencia acotada.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=getattr(settings, 'SOLICITUDES_COLA_WORKERS', 4), help='Workers concurrentes.')
+        parser.add_argument('--lote', type=int, default=10, help='Solicitudes que reclama cada worker de una vez.')
+        parser.add_argument('--continuo', action='store_true', help='No termina al vaciar la cola: sigue esperando solicitudes.')
+        parser.add_argument('--espera', type=float, default=1.0, help='Segundos entre consultas con la cola vacía (modo continuo).')
+
+    def handle(self, *args, **options):
+        liberadas = liberar_atascadas()
+        if liberadas:
+            self.stdout.write(self.style.WARNING(f"⚠️ {liberadas} solicitudes atascadas devueltas a la cola."))
+
+        self.stdout.write(self.style.WARNING(f"⏳ Procesando la cola con {options['workers']} workers..."))
+
+        tramitadas = []
+        cerrojo = threading.Lock()
+
+        def worker():
+            try:
+                while True:
+                    lote = reclamar_lote(options['lote'])
+                    if not lote:
+                        if not options['continuo']:
+                            return
+                        time.sleep(options['espera'])
+                        continue
+
+                    for solicitud in lote:
+                        tramitar(solicitud)
+
+                    with cerrojo:
+                        tramitadas.extend(solicitud.estado for solicitud in lote)
+            finally:
+                connection.close()
+
+        hilos = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, options['workers']))]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        aceptadas = tramitadas.count(SolicitudEnCola.EstadoCola.ACEPTADA)
+        rechazadas = tramitadas.count(SolicitudEnCola.EstadoCola.RECHAZADA)
+        self.stdout.write(self.style.SUCCESS(f"\n🎉 Proceso terminado: {aceptadas} aceptadas, {rechazadas} rechazadas."))
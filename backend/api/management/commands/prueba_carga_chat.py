@@ -0,0 +1,106 @@
+import asyncio
+import time
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+
+from api.management.commands.benchmark_rag import percentil
+
+
+class Command(BaseCommand):
+    help = (
+        'Prueba de carga del chat de comunicados: lanza N peticiones con una concurrencia '
+        'dada contra uno o dos despliegues (WSGI/gunicorn y ASGI/uvicorn) y compara '
+        'rendimiento (peticiones/s), latencias (p50/p90/p99) y errores. Para aislar el '
+        'efecto del servidor, arranca ambos con GEMINI_BACKEND=falso y la misma '
+        'GEMINI_FALSO_LATENCIA_MS, p. ej.:\n'
+        '  gunicorn backend.wsgi -w 2 -b :8001\n'
+        '  uvicorn backend.asgi:application --workers 2 --port 8002'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url-sincrono', help='URL base del despliegue WSGI, p. ej. http://localhost:8001')
+        parser.add_argument('--url-asincrono', help='URL base del despliegue ASGI, p. ej. http://localhost:8002')
+        parser.add_argument('--endpoint', default='/api/comunicados/chat/')
+        parser.add_argument('--token', required=True, help='Token JWT de acceso de un hermano.')
+        parser.add_argument('--peticiones', type=int, default=200)
+        parser.add_argument('--concurrencia', type=int, default=50)
+        parser.add_argument('--pregunta', default='¿Cuándo es el reparto de papeletas de sitio?')
+        parser.add_argument('--timeout', type=float, default=60, help='Timeout por petición en segundos.')
+
+    def handle(self, *args, **options):
+        despliegues = [
+            (nombre, options[clave]) for nombre, clave in (("WSGI", 'url_sincrono'), ("ASGI", 'url_asincrono'))
+            if options[clave]
+        ]
+
+        if not despliegues:
+            raise CommandError("Indica al menos --url-sincrono o --url-asincrono.")
+
+        if options['peticiones'] < 1 or options['concurrencia'] < 1:
+            raise CommandError("--peticiones y --concurrencia deben ser mayores que 0.")
+
+        resultados = {}
+        for nombre, url_base in despliegues:
+            self.stdout.write(self.style.WARNING(
+                f"⏳ {nombre}: {options['peticiones']} peticiones, concurrencia {options['concurrencia']} ({url_base})"
+            ))
+            resultados[nombre] = asyncio.run(self._lanzar(url_base.rstrip('/') + options['endpoint'], options))
+            self._informar(nombre, resultados[nombre])
+
+        if len(resultados) == 2 and resultados["WSGI"]['rendimiento']:
+            mejora = resultados["ASGI"]['rendimiento'] / resultados["WSGI"]['rendimiento']
+            self.stdout.write(self.style.SUCCESS(f"\n⚖️  ASGI / WSGI (peticiones/s): x{mejora:.2f}"))
+
+    async def _lanzar(self, url, options):
+        semaforo = asyncio.Semaphore(options['concurrencia'])
+        cabeceras = {"Authorization": f"Bearer {options['token']}"}
+        cuerpo = {"pregunta": options['pregunta']}
+
+        latencias, errores = [], []
+
+        limites = httpx.Limits(max_connections=options['concurrencia'], max_keepalive_connections=options['concurrencia'])
+
+        async with httpx.AsyncClient(timeout=options['timeout'], limits=limites) as cliente:
+
+            async def peticion():
+                async with semaforo:
+                    inicio = time.perf_counter()
+                    try:
+                        respuesta = await cliente.post(url, json=cuerpo, headers=cabeceras)
+                    except httpx.HTTPError as e:
+                        errores.append(type(e).__name__)
+                        return
+
+                    if respuesta.status_code == 200:
+                        latencias.append((time.perf_counter() - inicio) * 1000)
+                    else:
+                        errores.append(f"HTTP {respuesta.status_code}")
+
+            inicio_total = time.perf_counter()
+            await asyncio.gather(*(peticion() for _ in range(options['peticiones'])))
+            duracion = time.perf_counter() - inicio_total
+
+        return {
+            'latencias_ms': sorted(latencias),
+            'errores': errores,
+            'duracion_s': duracion,
+            'rendimiento': len(latencias) / duracion if duracion else 0.0,
+        }
+
+    def _informar(self, nombre, resultado):
+        latencias = resultado['latencias_ms']
+
+        self.stdout.write(self.style.SUCCESS(f"📊 {nombre}"))
+        self.stdout.write(f"  Correctas: {len(latencias)}  Errores: {len(resultado['errores'])}  Duración: {resultado['duracion_s']:.2f}s")
+        self.stdout.write(f"  Rendimiento: {resultado['rendimiento']:.1f} peticiones/s")
+
+        if latencias:
+            self.stdout.write(
+                f"  Latencia (ms): p50={percentil(latencias, 50):.1f}  p90={percentil(latencias, 90):.1f}  "
+                f"p99={percentil(latencias, 99):.1f}  máx={latencias[-1]:.1f}"
+            )
+
+        if resultado['errores']:
+            tipos = sorted(set(resultado['errores']))
+            self.stdout.write(self.style.ERROR(f"  Tipos de error: {', '.join(tipos)}"))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.forms.models import model_to_dict
+
+from api.models import Acto, EstadisticasActo
+from api.servicios.acto.estadisticas_acto_service import recalcular_estadisticas_acto
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula desde las papeletas las estadísticas materializadas de los actos '
+        'y corrige cualquier desviación de los contadores incrementales.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--acto', type=int, help='Recalcula solo el acto indicado.')
+
+    def handle(self, *args, **options):
+        actos = Acto.objects.order_by('id').values_list('id', flat=True)
+        if options['acto'] is not None:
+            actos = actos.filter(pk=options['acto'])
+            if not actos.exists():
+                raise CommandError(f"No existe el acto {options['acto']}.")
+
+        self.stdout.write(self.style.WARNING("⏳ Recalculando las estadísticas de los actos..."))
+
+        corregidos = 0
+        for acto_id in actos:
+            with transaction.atomic():
+                anterior = EstadisticasActo.objects.select_for_update().filter(acto_id=acto_id).first()
+                actual = recalcular_estadisticas_acto(acto_id)
+
+            if anterior is None or self._contadores(anterior) != self._contadores(actual):
+                corregidos += 1
+                self.stdout.write(self.style.WARNING(f"⚠️ Acto {acto_id}: estadísticas corregidas."))
+
+        self.stdout.write(self.style.SUCCESS(f"\n🎉 Proceso terminado: {len(actos)} actos revisados, {corregidos} corregidos."))
+
+    def _contadores(self, estadisticas):
+        return model_to_dict(estadisticas, exclude=['acto', 'updated_at'])
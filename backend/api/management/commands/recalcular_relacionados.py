@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from api.servicios.comunicado.relacionados_comunicado_service import reconstruir_relacionados
+
+class Command(BaseCommand):
+    help = 'Recalcula la tabla de comunicados relacionados a partir de los embeddings guardados.'
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.WARNING("⏳ Calculando los vecinos de cada comunicado vectorizado..."))
+
+        procesados = reconstruir_relacionados()
+
+        self.stdout.write(self.style.SUCCESS(f"\n🎉 Proceso terminado: {procesados} comunicados procesados."))
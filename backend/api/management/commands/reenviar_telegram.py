@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from api.models import EnvioTelegram
+from api.servicios.comunicado.difusion_telegram_service import difundir_comunicado
+
+class Command(BaseCommand):
+    help = 'Reintenta la difusión a Telegram de los comunicados con envíos pendientes o fallidos.'
+
+    def handle(self, *args, **options):
+        comunicados = list(
+            EnvioTelegram.objects.exclude(estado=EnvioTelegram.EstadoEnvio.ENVIADO)
+                                 .values_list('comunicado_id', flat=True)
+                                 .distinct()
+                                 .order_by('comunicado_id')
+        )
+
+        if not comunicados:
+            self.stdout.write(self.style.SUCCESS("✅ No hay envíos a Telegram pendientes."))
+            return
+
+        self.stdout.write(self.style.WARNING(f"⏳ Reenviando {len(comunicados)} comunicados a Telegram..."))
+
+        for comunicado_id in comunicados:
+            difundir_comunicado(comunicado_id)
+
+        fallidos = EnvioTelegram.objects.filter(estado=EnvioTelegram.EstadoEnvio.FALLIDO).count()
+        self.stdout.write(self.style.SUCCESS(f"\n🎉 Proceso terminado. Envíos aún fallidos: {fallidos}"))
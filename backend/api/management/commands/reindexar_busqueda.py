@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from api.servicios.comunicado.busqueda_comunicado_service import reconstruir_busqueda
+
+class Command(BaseCommand):
+    help = 'Regenera el índice de texto completo de los comunicados.'
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.WARNING("⏳ Indexando el texto de los comunicados..."))
+
+        procesados = reconstruir_busqueda()
+
+        self.stdout.write(self.style.SUCCESS(f"\n🎉 Proceso terminado: {procesados} comunicados indexados."))
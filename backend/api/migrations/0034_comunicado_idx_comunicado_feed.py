@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-19 04:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0033_acto_fecha_ejecucion_cirios'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comunicado',
+            index=models.Index(fields=['-fecha_emision', '-id'], name='idx_comunicado_feed'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 6.0 on 2026-10-19 04:46
+
+from django.db import migrations, models
+
+
+# Copia del orden de AreaInteres.NombreArea en el momento de la migración
+NOMBRES_AREA = [
+    'TODOS_HERMANOS', 'CARIDAD', 'CULTOS_FORMACION', 'JUVENTUD', 'PATRIMONIO',
+    'PRIOSTIA', 'DIPUTACION_MAYOR_GOBIERNO', 'COSTALEROS', 'ACOLITOS',
+]
+
+
+def calcular_mascaras(apps, schema_editor):
+    for nombre_modelo, campo_mascara, columna in (
+        ('Comunicado', 'mascara_audiencia', 'comunicado_id'),
+        ('Hermano', 'mascara_suscripcion', 'hermano_id'),
+    ):
+        modelo = apps.get_model('api', nombre_modelo)
+        through = modelo._meta.get_field('areas_interes').remote_field.through
+
+        mascaras = {}
+        for pk, nombre_area in through.objects.values_list(columna, 'areainteres__nombre_area'):
+            if nombre_area not in NOMBRES_AREA:
+                continue
+            mascaras[pk] = mascaras.get(pk, 0) | (1 << NOMBRES_AREA.index(nombre_area))
+
+        for pk, mascara in mascaras.items():
+            modelo.objects.filter(pk=pk).update(**{campo_mascara: mascara})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0034_comunicado_idx_comunicado_feed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comunicado',
+            name='mascara_audiencia',
+            field=models.PositiveBigIntegerField(default=0, editable=False, help_text='Bits de las áreas destinatarias (ver AreaInteres.mascara_de). Se mantiene automáticamente.', verbose_name='Máscara de audiencia'),
+        ),
+        migrations.AddField(
+            model_name='hermano',
+            name='mascara_suscripcion',
+            field=models.PositiveBigIntegerField(default=0, editable=False, help_text='Bits de las áreas de interés del hermano (ver AreaInteres.mascara_de). Se mantiene automáticamente.', verbose_name='Máscara de suscripción'),
+        ),
+        migrations.RunPython(calcular_mascaras, migrations.RunPython.noop),
+    ]
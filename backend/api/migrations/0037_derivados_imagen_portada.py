@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-19 05:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0036_updated_at_recursos'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='acto',
+            name='imagen_derivados',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Versiones WebP/JPEG reducidas de la portada (ver api/servicios/imagen). Se generan automáticamente tras la subida.', verbose_name='Derivados de la portada'),
+        ),
+        migrations.AddField(
+            model_name='comunicado',
+            name='imagen_derivados',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Versiones WebP/JPEG reducidas de la portada (ver api/servicios/imagen). Se generan automáticamente tras la subida.', verbose_name='Derivados de la portada'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 6.0 on 2026-10-19 05:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0037_derivados_imagen_portada'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EnvioTelegram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('canal', models.CharField(max_length=50, verbose_name='ID Canal Telegram')),
+                ('estado', models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('ENVIADO', 'Enviado'), ('FALLIDO', 'Fallido')], default='PENDIENTE', max_length=10, verbose_name='Estado del envío')),
+                ('intentos', models.PositiveIntegerField(default=0, verbose_name='Intentos realizados')),
+                ('ultimo_error', models.TextField(blank=True, default='', verbose_name='Último error')),
+                ('fecha_envio', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de entrega')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Última modificación')),
+                ('comunicado', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='envios_telegram', to='api.comunicado', verbose_name='Comunicado')),
+            ],
+            options={
+                'verbose_name': 'Envío a Telegram',
+                'verbose_name_plural': 'Envíos a Telegram',
+                'constraints': [models.UniqueConstraint(fields=('comunicado', 'canal'), name='unique_envio_telegram_por_canal')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 06:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0038_envio_telegram'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comunicado',
+            name='telegram_file_id',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Identificador devuelto por Telegram al subir la portada. Los demás canales y reenvíos lo reutilizan en lugar de volver a subir la imagen.', max_length=255, verbose_name='file_id de la portada en Telegram'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-19 06:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0039_telegram_file_id_comunicado'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComunicadoRelacionado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('similitud', models.FloatField(help_text='Similitud coseno entre los embeddings de ambos comunicados.', verbose_name='Similitud')),
+                ('comunicado', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vecinos', to='api.comunicado', verbose_name='Comunicado')),
+                ('relacionado', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vecino_de', to='api.comunicado', verbose_name='Comunicado relacionado')),
+            ],
+            options={
+                'verbose_name': 'Comunicado relacionado',
+                'verbose_name_plural': 'Comunicados relacionados',
+                'indexes': [models.Index(fields=['comunicado', '-similitud'], name='idx_comunicado_vecinos')],
+                'constraints': [models.UniqueConstraint(fields=('comunicado', 'relacionado'), name='unique_comunicado_relacionado')],
+            },
+        ),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 6.0 on 2026-10-19 06:27
+
+import html
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils.html import strip_tags
+
+
+# Copia de resumen_comunicado_service.texto_plano: las migraciones no importan código de la app
+PATRON_FIN_BLOQUE = re.compile(r'<(?:br|/p|/li|/ul|/ol|/h[1-6]|/div)\b[^>]*>', re.IGNORECASE)
+
+
+def texto_plano(contenido):
+    contenido = PATRON_FIN_BLOQUE.sub(' ', contenido or '')
+    return ' '.join(html.unescape(strip_tags(contenido)).split())
+
+
+SQL_INDICE = {
+    'mysql': [
+        "CREATE FULLTEXT INDEX idx_busqueda_comunicado_ft ON api_busquedacomunicado (titulo, texto)",
+    ],
+    # Tabla FTS5 de contenido externo: guarda solo el índice y lee el texto de api_busquedacomunicado
+    'sqlite': [
+        """CREATE VIRTUAL TABLE api_busquedacomunicado_fts USING fts5(
+            titulo, texto,
+            content='api_busquedacomunicado', content_rowid='comunicado_id',
+            tokenize='unicode61 remove_diacritics 2'
+        )""",
+        """CREATE TRIGGER api_busquedacomunicado_ai AFTER INSERT ON api_busquedacomunicado BEGIN
+            INSERT INTO api_busquedacomunicado_fts(rowid, titulo, texto) VALUES (new.comunicado_id, new.titulo, new.texto);
+        END""",
+        """CREATE TRIGGER api_busquedacomunicado_ad AFTER DELETE ON api_busquedacomunicado BEGIN
+            INSERT INTO api_busquedacomunicado_fts(api_busquedacomunicado_fts, rowid, titulo, texto)
+            VALUES ('delete', old.comunicado_id, old.titulo, old.texto);
+        END""",
+        """CREATE TRIGGER api_busquedacomunicado_au AFTER UPDATE ON api_busquedacomunicado BEGIN
+            INSERT INTO api_busquedacomunicado_fts(api_busquedacomunicado_fts, rowid, titulo, texto)
+            VALUES ('delete', old.comunicado_id, old.titulo, old.texto);
+            INSERT INTO api_busquedacomunicado_fts(rowid, titulo, texto) VALUES (new.comunicado_id, new.titulo, new.texto);
+        END""",
+    ],
+}
+
+SQL_BORRADO = {
+    'mysql': ["DROP INDEX idx_busqueda_comunicado_ft ON api_busquedacomunicado"],
+    'sqlite': [
+        "DROP TRIGGER IF EXISTS api_busquedacomunicado_ai",
+        "DROP TRIGGER IF EXISTS api_busquedacomunicado_ad",
+        "DROP TRIGGER IF EXISTS api_busquedacomunicado_au",
+        "DROP TABLE IF EXISTS api_busquedacomunicado_fts",
+    ],
+}
+
+
+def _ejecutar(sentencias, schema_editor):
+    for sentencia in sentencias.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sentencia)
+
+
+def crear_indice(apps, schema_editor):
+    _ejecutar(SQL_INDICE, schema_editor)
+
+
+def borrar_indice(apps, schema_editor):
+    _ejecutar(SQL_BORRADO, schema_editor)
+
+
+def indexar_existentes(apps, schema_editor):
+    Comunicado = apps.get_model('api', 'Comunicado')
+    BusquedaComunicado = apps.get_model('api', 'BusquedaComunicado')
+
+    BusquedaComunicado.objects.bulk_create([
+        BusquedaComunicado(comunicado_id=pk, titulo=titulo, texto=texto_plano(contenido))
+        for pk, titulo, contenido in Comunicado.objects.values_list('pk', 'titulo', 'contenido').iterator()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0040_comunicados_relacionados'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusquedaComunicado',
+            fields=[
+                ('comunicado', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='documento_busqueda', serialize=False, to='api.comunicado', verbose_name='Comunicado')),
+                ('titulo', models.CharField(max_length=200, verbose_name='Título')),
+                ('texto', models.TextField(help_text='Contenido sin etiquetas HTML.', verbose_name='Texto plano')),
+            ],
+            options={
+                'verbose_name': 'Documento de búsqueda',
+                'verbose_name_plural': 'Documentos de búsqueda',
+            },
+        ),
+        migrations.RunPython(crear_indice, borrar_indice),
+        migrations.RunPython(indexar_existentes, migrations.RunPython.noop),
+    ]
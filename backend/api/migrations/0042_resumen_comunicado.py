@@ -0,0 +1,77 @@
+# Generated by Django 6.0 on 2026-10-19 06:42
+
+import html
+import math
+import re
+
+from django.db import migrations, models
+from django.utils.html import strip_tags
+
+
+# Copia de resumen_comunicado_service.calcular_resumen: las migraciones no importan código de la app
+LONGITUD_EXTRACTO = 280
+PALABRAS_POR_MINUTO = 200
+PATRON_FIN_BLOQUE = re.compile(r'<(?:br|/p|/li|/ul|/ol|/h[1-6]|/div)\b[^>]*>', re.IGNORECASE)
+
+
+def texto_plano(contenido):
+    contenido = PATRON_FIN_BLOQUE.sub(' ', contenido or '')
+    return ' '.join(html.unescape(strip_tags(contenido)).split())
+
+
+def recortar(texto, longitud=LONGITUD_EXTRACTO):
+    if len(texto) <= longitud:
+        return texto
+
+    recorte = texto[:longitud + 1]
+    recorte = recorte.rsplit(' ', 1)[0] if ' ' in recorte else texto[:longitud]
+
+    return recorte.rstrip(' ,;:.') + '…'
+
+
+def calcular_resumen(contenido):
+    texto = texto_plano(contenido)
+    palabras = len(texto.split())
+
+    return {
+        'extracto': recortar(texto),
+        'numero_palabras': palabras,
+        'minutos_lectura': max(1, math.ceil(palabras / PALABRAS_POR_MINUTO)),
+    }
+
+
+def rellenar_resumenes(apps, schema_editor):
+    Comunicado = apps.get_model('api', 'Comunicado')
+
+    comunicados = list(Comunicado.objects.only('id', 'contenido'))
+    for comunicado in comunicados:
+        for campo, valor in calcular_resumen(comunicado.contenido).items():
+            setattr(comunicado, campo, valor)
+
+    Comunicado.objects.bulk_update(comunicados, ['extracto', 'numero_palabras', 'minutos_lectura'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0041_busqueda_texto_completo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comunicado',
+            name='extracto',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Inicio del contenido en texto plano para las tarjetas de los listados. Se calcula al guardar.', max_length=300, verbose_name='Extracto'),
+        ),
+        migrations.AddField(
+            model_name='comunicado',
+            name='minutos_lectura',
+            field=models.PositiveSmallIntegerField(default=1, editable=False, verbose_name='Minutos de lectura'),
+        ),
+        migrations.AddField(
+            model_name='comunicado',
+            name='numero_palabras',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Número de palabras'),
+        ),
+        migrations.RunPython(rellenar_resumenes, migrations.RunPython.noop),
+    ]
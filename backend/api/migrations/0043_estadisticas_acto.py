@@ -0,0 +1,52 @@
+# Generated by Django 6.0 on 2026-10-19 07:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from api.servicios.acto.estadisticas_acto_service import agregados_estadisticas
+
+
+def rellenar_estadisticas(apps, schema_editor):
+    Acto = apps.get_model('api', 'Acto')
+    PapeletaSitio = apps.get_model('api', 'PapeletaSitio')
+    EstadisticasActo = apps.get_model('api', 'EstadisticasActo')
+
+    EstadisticasActo.objects.bulk_create([
+        EstadisticasActo(acto_id=acto_id, **PapeletaSitio.objects.filter(acto_id=acto_id).order_by().aggregate(**agregados_estadisticas()))
+        for acto_id in Acto.objects.values_list('id', flat=True)
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0042_resumen_comunicado'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstadisticasActo',
+            fields=[
+                ('acto', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='estadisticas', serialize=False, to='api.acto', verbose_name='Acto')),
+                ('papeletas_no_solicitadas', models.IntegerField(default=0, verbose_name='Papeletas no solicitadas')),
+                ('papeletas_solicitadas', models.IntegerField(default=0, verbose_name='Papeletas solicitadas')),
+                ('papeletas_emitidas', models.IntegerField(default=0, verbose_name='Papeletas emitidas')),
+                ('papeletas_recogidas', models.IntegerField(default=0, verbose_name='Papeletas recogidas')),
+                ('papeletas_leidas', models.IntegerField(default=0, verbose_name='Papeletas leídas')),
+                ('papeletas_anuladas', models.IntegerField(default=0, verbose_name='Papeletas anuladas')),
+                ('papeletas_no_asignadas', models.IntegerField(default=0, verbose_name='Papeletas no asignadas')),
+                ('solicitantes_insignia', models.IntegerField(default=0, help_text='Solicitudes de insignia no anuladas.', verbose_name='Solicitantes de insignia')),
+                ('solicitudes_insignias', models.IntegerField(default=0, help_text='Preferencias de las solicitudes de insignia en curso o resueltas.', verbose_name='Preferencias de insignia')),
+                ('insignias_asignadas', models.IntegerField(default=0, verbose_name='Insignias asignadas')),
+                ('solicitantes_cirio', models.IntegerField(default=0, help_text='Solicitudes que no son de insignia y no están anuladas.', verbose_name='Solicitantes de cirio')),
+                ('cirios_cristo', models.IntegerField(default=0, verbose_name='Cirios en el cortejo de Cristo')),
+                ('cirios_virgen', models.IntegerField(default=0, verbose_name='Cirios en el cortejo de Virgen')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Última modificación')),
+            ],
+            options={
+                'verbose_name': 'Estadísticas del acto',
+                'verbose_name_plural': 'Estadísticas de los actos',
+            },
+        ),
+        migrations.RunPython(rellenar_estadisticas, migrations.RunPython.noop),
+    ]
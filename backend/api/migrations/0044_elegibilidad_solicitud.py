@@ -0,0 +1,33 @@
+# Generated by Django 6.0 on 2026-10-19 07:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0043_estadisticas_acto'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ElegibilidadSolicitud',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('anio_limite', models.PositiveIntegerField(help_text='Último año que el hermano debe tener al corriente.', verbose_name='Ejercicio límite')),
+                ('anio_primera_deuda', models.PositiveIntegerField(blank=True, help_text='Primer año hasta el límite con una cuota pendiente o devuelta.', null=True, verbose_name='Primer año con deuda')),
+                ('tiene_historial_cuotas', models.BooleanField(default=False, verbose_name='Tiene cuotas hasta el límite')),
+                ('cuerpos', models.JSONField(blank=True, default=list, verbose_name='Cuerpos de pertenencia')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Última modificación')),
+                ('acto', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='elegibilidades', to='api.acto', verbose_name='Acto')),
+                ('hermano', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='elegibilidades', to=settings.AUTH_USER_MODEL, verbose_name='Hermano')),
+            ],
+            options={
+                'verbose_name': 'Elegibilidad para solicitar',
+                'verbose_name_plural': 'Elegibilidades para solicitar',
+                'constraints': [models.UniqueConstraint(fields=('acto', 'hermano'), name='unique_elegibilidad_acto_hermano')],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 6.0 on 2026-10-19 08:13
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0044_elegibilidad_solicitud'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SolicitudEnCola',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticket', models.UUIDField(default=uuid.uuid4, editable=False, unique=True, verbose_name='Ticket')),
+                ('tipo', models.CharField(choices=[('INSIGNIA', 'Insignia (tradicional)'), ('CIRIO', 'Cirio (tradicional)'), ('UNIFICADA', 'Unificada')], max_length=20, verbose_name='Tipo de solicitud')),
+                ('datos', models.JSONField(blank=True, default=dict, help_text='Puestos y preferencias por id, tal como se validaron en el endpoint.', verbose_name='Datos de la solicitud')),
+                ('clave_idempotencia', models.CharField(max_length=64, verbose_name='Clave de idempotencia')),
+                ('estado', models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('EN_PROCESO', 'En proceso'), ('ACEPTADA', 'Aceptada'), ('RECHAZADA', 'Rechazada')], default='PENDIENTE', max_length=20, verbose_name='Estado')),
+                ('intentos', models.PositiveSmallIntegerField(default=0, verbose_name='Intentos')),
+                ('mensaje', models.TextField(blank=True, verbose_name='Motivo del rechazo')),
+                ('recibida_en', models.DateTimeField(default=django.utils.timezone.now, help_text='Los plazos del acto se evalúan en este instante.', verbose_name='Recibida en')),
+                ('procesada_en', models.DateTimeField(blank=True, null=True, verbose_name='Procesada en')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Última modificación')),
+                ('acto', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='solicitudes_en_cola', to='api.acto', verbose_name='Acto')),
+                ('hermano', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='solicitudes_en_cola', to=settings.AUTH_USER_MODEL, verbose_name='Hermano')),
+                ('papeleta', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.papeletasitio', verbose_name='Papeleta creada')),
+            ],
+            options={
+                'verbose_name': 'Solicitud en cola',
+                'verbose_name_plural': 'Solicitudes en cola',
+                'indexes': [models.Index(fields=['estado', 'id'], name='idx_solicitud_cola_estado')],
+                'constraints': [models.UniqueConstraint(fields=('hermano', 'clave_idempotencia'), name='unique_solicitud_cola_idempotencia')],
+            },
+        ),
+    ]
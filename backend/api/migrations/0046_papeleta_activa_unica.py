@@ -0,0 +1,43 @@
+# Generated by Django 6.0 on 2026-10-19 08:28
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def comprobar_papeletas_activas_duplicadas(apps, schema_editor):
+    PapeletaSitio = apps.get_model('api', 'PapeletaSitio')
+
+    duplicadas = list(
+        PapeletaSitio.objects.filter(activa=True)
+        .values('hermano_id', 'acto_id')
+        .annotate(total=Count('id'))
+        .filter(total__gt=1)
+        .order_by('acto_id', 'hermano_id')[:20]
+    )
+
+    if duplicadas:
+        detalle = ', '.join(f"hermano {d['hermano_id']} / acto {d['acto_id']}" for d in duplicadas)
+        raise RuntimeError(
+            "Hay hermanos con más de una papeleta activa en el mismo acto; anula las sobrantes "
+            f"antes de aplicar esta migración: {detalle}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0045_solicitud_en_cola'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='papeletasitio',
+            name='activa',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(models.Q(('estado_papeleta__in', ['ANULADA', 'NO_ASIGNADA']), _negated=True), then=models.Value(True))), help_text='TRUE si la papeleta no está anulada ni sin asignar, NULL en caso contrario (columna calculada por la BD)', output_field=models.BooleanField(null=True), verbose_name='¿Activa?'),
+        ),
+        migrations.RunPython(comprobar_papeletas_activas_duplicadas, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='papeletasitio',
+            constraint=models.UniqueConstraint(fields=('hermano', 'acto', 'activa'), name='unique_papeleta_activa_hermano_acto'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-19 11:41
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def rellenar_indice_modificado(apps, schema_editor):
+    Comunicado = apps.get_model('api', 'Comunicado')
+    Comunicado.objects.update(indice_modificado=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0046_papeleta_activa_unica'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comunicado',
+            name='indice_modificado',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Cambia solo con el título, el contenido o las áreas: lo que guarda el índice léxico del chat (ver indice_lexico_service). Los derivados de imagen, el file_id de Telegram o el embedding no la tocan.', null=True, verbose_name='Última modificación indexada'),
+        ),
+        migrations.RunPython(rellenar_indice_modificado, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-19 11:49
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def rellenar_embedding_modificado(apps, schema_editor):
+    Comunicado = apps.get_model('api', 'Comunicado')
+    Comunicado.objects.filter(embedding__isnull=False).update(embedding_modificado=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0047_comunicado_indice_modificado'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comunicado',
+            name='embedding_modificado',
+            field=models.DateTimeField(blank=True, editable=False, help_text='La escribe solo quien guarda un embedding nuevo. El índice vectorial del chat la usa para detectar vectores regenerados en otro proceso (ver indice_vectorial_service).', null=True, verbose_name='Última generación del embedding'),
+        ),
+        migrations.RunPython(rellenar_embedding_modificado, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+import uuid
+
+from django.db import IntegrityError, connections, models, router, transaction
 from django.utils import timezone
 from django.contrib.auth.models import User
 from django.conf import settings
@@ -6,7 +8,7 @@ from django.contrib.auth.models import AbstractUser
 from django.core.validators import RegexValidator
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
-from django.db.models import UniqueConstraint, Q
+from django.db.models import Case, Q, UniqueConstraint, Value, When
 from google import genai
 from google.genai import types
 
@@ -32,6 +34,16 @@ class AreaInteres(models.Model):
 
     def __str__(self):
         return self.get_nombre_area_display()
+
+    @staticmethod
+    def mascara_de(nombres_area) -> int:
+        """
+        Máscara de bits de un conjunto de áreas: un bit por área según su posición en
+        NombreArea (las áreas nuevas deben añadirse siempre al final de la enumeración).
+        Los nombres que no están en la enumeración no aportan ningún bit.
+        """
+        valores = AreaInteres.NombreArea.values
+        return sum(1 << valores.index(nombre) for nombre in set(nombres_area) if nombre in valores)
     
 # -----------------------------------------------------------------------------
 # ENTIDAD: CUERPO DE PERTENENCIA
@@ -134,6 +146,8 @@ class Cuota(models.Model):
 
     observaciones = models.TextField(blank=True, null=True)
 
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Última modificación")
+
     def __str__(self):
         return f"{self.anio} - {self.tipo} - {self.hermano}"
     
@@ -206,6 +220,8 @@ class Hermano(AbstractUser):
         related_name="hermanos"
     )
 
+    mascara_suscripcion = models.PositiveBigIntegerField(default=0, editable=False, verbose_name="Máscara de suscripción", help_text="Bits de las áreas de interés del hermano (ver AreaInteres.mascara_de). Se mantiene automáticamente.")
+
     cuerpos = models.ManyToManyField(CuerpoPertenencia,
         through='HermanoCuerpo',
         verbose_name="Cuerpos de pertenencia",
@@ -287,22 +303,111 @@ class Comunicado(models.Model):
 
     titulo = models.CharField(max_length=200, verbose_name="Título")
     contenido = models.TextField(verbose_name="Contenido", help_text="Contenido del comunicado. Soporta texto enriquecido si el frontend lo implementa.")
+    extracto = models.CharField(max_length=300, blank=True, default='', editable=False, verbose_name="Extracto", help_text="Inicio del contenido en texto plano para las tarjetas de los listados. Se calcula al guardar.")
+    numero_palabras = models.PositiveIntegerField(default=0, editable=False, verbose_name="Número de palabras")
+    minutos_lectura = models.PositiveSmallIntegerField(default=1, editable=False, verbose_name="Minutos de lectura")
     imagen_portada = models.ImageField(upload_to='comunicados/portadas/', null=True, blank=True, verbose_name="Imagen de Portada", help_text="Imagen principal de la noticia o comunicado")
+    imagen_derivados = models.JSONField(default=dict, blank=True, editable=False, verbose_name="Derivados de la portada", help_text="Versiones WebP/JPEG reducidas de la portada (ver api/servicios/imagen). Se generan automáticamente tras la subida.")
+    telegram_file_id = models.CharField(max_length=255, blank=True, default='', editable=False, verbose_name="file_id de la portada en Telegram", help_text="Identificador devuelto por Telegram al subir la portada. Los demás canales y reenvíos lo reutilizan en lugar de volver a subir la imagen.")
     fecha_emision = models.DateTimeField(default=timezone.now, verbose_name="Fecha de emisión")
     tipo_comunicacion = models.CharField(max_length=20, choices=TipoComunicacion.choices, verbose_name="Tipo de comunicación")
 
     autor = models.ForeignKey(Hermano, on_delete=models.PROTECT, related_name='comunicados_emitidos', verbose_name="Autor (Emisor)")
     areas_interes = models.ManyToManyField(AreaInteres, related_name='comunicados', verbose_name="Áreas destinatarias", blank=True, help_text="Seleccione las áreas a las que va dirigido este comunicado.")
+    mascara_audiencia = models.PositiveBigIntegerField(default=0, editable=False, verbose_name="Máscara de audiencia", help_text="Bits de las áreas destinatarias (ver AreaInteres.mascara_de). Se mantiene automáticamente.")
 
     embedding = models.JSONField(null=True, blank=True, help_text="Vector semántico generado por Gemini para búsquedas RAG")
+    embedding_modificado = models.DateTimeField(null=True, blank=True, editable=False, verbose_name="Última generación del embedding", help_text="La escribe solo quien guarda un embedding nuevo. El índice vectorial del chat la usa para detectar vectores regenerados en otro proceso (ver indice_vectorial_service).")
+
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Última modificación")
+    indice_modificado = models.DateTimeField(null=True, blank=True, editable=False, verbose_name="Última modificación indexada", help_text="Cambia solo con el título, el contenido o las áreas: lo que guarda el índice léxico del chat (ver indice_lexico_service). Los derivados de imagen, el file_id de Telegram o el embedding no la tocan.")
+
+    CAMPOS_INDEXADOS = ('titulo', 'contenido')
+
+    class Meta:
+        indexes = [models.Index(fields=['-fecha_emision', '-id'], name='idx_comunicado_feed'),]
 
     def save(self, *args, **kwargs):
         self.full_clean()
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or set(self.CAMPOS_INDEXADOS) & set(update_fields):
+            self.indice_modificado = timezone.now()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'indice_modificado'}
+
         super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.fecha_emision.strftime('%d/%m/%Y')} - {self.titulo} ({self.get_tipo_comunicacion_display()})"
 
+# -----------------------------------------------------------------------------
+# ENTIDAD: DOCUMENTO DE BÚSQUEDA DE COMUNICADO
+# -----------------------------------------------------------------------------
+class BusquedaComunicado(models.Model):
+    """
+    Texto plano del comunicado para la búsqueda de texto completo. El índice no lo crea
+    Django: FULLTEXT en MySQL y una tabla FTS5 sincronizada por triggers en SQLite
+    (ver migración 0041 y api/servicios/comunicado/busqueda_comunicado_service.py).
+    """
+    comunicado = models.OneToOneField(Comunicado, on_delete=models.CASCADE, primary_key=True, related_name='documento_busqueda', verbose_name="Comunicado")
+    titulo = models.CharField(max_length=200, verbose_name="Título")
+    texto = models.TextField(verbose_name="Texto plano", help_text="Contenido sin etiquetas HTML.")
+
+    class Meta:
+        verbose_name = "Documento de búsqueda"
+        verbose_name_plural = "Documentos de búsqueda"
+
+    def __str__(self):
+        return self.titulo
+
+# -----------------------------------------------------------------------------
+# ENTIDAD: COMUNICADO RELACIONADO (vecinos semánticos precalculados)
+# -----------------------------------------------------------------------------
+class ComunicadoRelacionado(models.Model):
+    comunicado = models.ForeignKey(Comunicado, on_delete=models.CASCADE, related_name='vecinos', verbose_name="Comunicado")
+    relacionado = models.ForeignKey(Comunicado, on_delete=models.CASCADE, related_name='vecino_de', verbose_name="Comunicado relacionado")
+    similitud = models.FloatField(verbose_name="Similitud", help_text="Similitud coseno entre los embeddings de ambos comunicados.")
+
+    class Meta:
+        verbose_name = "Comunicado relacionado"
+        verbose_name_plural = "Comunicados relacionados"
+        constraints = [
+            UniqueConstraint(fields=['comunicado', 'relacionado'], name='unique_comunicado_relacionado'),
+        ]
+        indexes = [models.Index(fields=['comunicado', '-similitud'], name='idx_comunicado_vecinos')]
+
+    def __str__(self):
+        return f"{self.comunicado_id} ~ {self.relacionado_id} ({self.similitud:.3f})"
+
+# -----------------------------------------------------------------------------
+# ENTIDAD: ENVÍO DE COMUNICADO A TELEGRAM
+# -----------------------------------------------------------------------------
+class EnvioTelegram(models.Model):
+    class EstadoEnvio(models.TextChoices):
+        PENDIENTE = 'PENDIENTE', 'Pendiente'
+        ENVIADO = 'ENVIADO', 'Enviado'
+        FALLIDO = 'FALLIDO', 'Fallido'
+
+    comunicado = models.ForeignKey(Comunicado, on_delete=models.CASCADE, related_name='envios_telegram', verbose_name="Comunicado")
+    canal = models.CharField(max_length=50, verbose_name="ID Canal Telegram")
+    estado = models.CharField(max_length=10, choices=EstadoEnvio.choices, default=EstadoEnvio.PENDIENTE, verbose_name="Estado del envío")
+    intentos = models.PositiveIntegerField(default=0, verbose_name="Intentos realizados")
+    ultimo_error = models.TextField(blank=True, default='', verbose_name="Último error")
+    fecha_envio = models.DateTimeField(null=True, blank=True, verbose_name="Fecha de entrega")
+
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Última modificación")
+
+    class Meta:
+        verbose_name = "Envío a Telegram"
+        verbose_name_plural = "Envíos a Telegram"
+        constraints = [
+            UniqueConstraint(fields=['comunicado', 'canal'], name='unique_envio_telegram_por_canal'),
+        ]
+
+    def __str__(self):
+        return f"{self.comunicado_id} -> {self.canal} ({self.get_estado_display()})"
+
 # -----------------------------------------------------------------------------
 # ENTIDAD: TIPO DE ACTO
 # -----------------------------------------------------------------------------
@@ -350,6 +455,9 @@ class Acto(models.Model):
     fecha_ejecucion_cirios = models.DateTimeField(null=True, blank=True, verbose_name="Fecha ejecución cirios/general", help_text="Indica cuándo se ejecutó el reparto de cirios.")
 
     imagen_portada = models.ImageField(upload_to='actos/portadas/', null=True, blank=True, verbose_name="Imagen de Portada", help_text="Imagen principal del acto")
+    imagen_derivados = models.JSONField(default=dict, blank=True, editable=False, verbose_name="Derivados de la portada", help_text="Versiones WebP/JPEG reducidas de la portada (ver api/servicios/imagen). Se generan automáticamente tras la subida.")
+
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Última modificación")
 
     def clean(self):
         super().clean()
@@ -480,6 +588,8 @@ class Puesto(models.Model):
 
     tipo_puesto = models.ForeignKey(TipoPuesto, on_delete=models.PROTECT, verbose_name="Tipo de puesto")
 
+    ESTADOS_OCUPADOS = ['EMITIDA', 'RECOGIDA', 'LEIDA']
+
     def __str__(self):
         return f"{self.nombre} ({self.tipo_puesto.nombre_tipo}) - {self.acto.nombre}"
     
@@ -488,11 +598,15 @@ class Puesto(models.Model):
         """
         Calcula dinámicamente cuántas papeletas tienen asignado este puesto.
         Filtramos para contar solo las que están realmente asignadas (EMITIDA, RECOGIDA, LEIDA).
+        Si el serializador ya ha fijado `ocupacion_precalculada` (mapa de ocupación del acto),
+        se usa ese valor y no se consulta la BD.
         """
-        estados_ocupados = ['EMITIDA', 'RECOGIDA', 'LEIDA']
-        
+        ocupacion = getattr(self, 'ocupacion_precalculada', None)
+        if ocupacion is not None:
+            return ocupacion
+
         return self.papeletas_asignadas.filter(
-            estado_papeleta__in=estados_ocupados
+            estado_papeleta__in=self.ESTADOS_OCUPADOS
         ).count()
 
     @property
@@ -578,44 +692,111 @@ class PapeletaSitio(models.Model):
         blank=True, 
         verbose_name="Lado en el tramo"
     )
+
+    activa = models.GeneratedField(
+        expression=Case(When(~Q(estado_papeleta__in=[EstadoPapeleta.ANULADA, EstadoPapeleta.NO_ASIGNADA]), then=Value(True))),
+        output_field=models.BooleanField(null=True),
+        db_persist=True,
+        verbose_name="¿Activa?",
+        help_text="TRUE si la papeleta no está anulada ni sin asignar, NULL en caso contrario (columna calculada por la BD)"
+    )
+
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Última modificación")
     
     def __str__(self):
         return f"Papeleta {self.numero_papeleta} - {self.anio})"
 
-    def clean(self):
+    MENSAJE_PAPELETA_ACTIVA_DUPLICADA = 'Este hermano ya tiene una papeleta activa para este acto. Debe anular la anterior antes de crear una nueva.'
+
+    ESTADOS_INACTIVOS = (EstadoPapeleta.ANULADA, EstadoPapeleta.NO_ASIGNADA)
+    CAMPOS_UNICIDAD = ('estado_papeleta', 'hermano_id', 'acto_id')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        instancia._guardada = {campo: instancia.__dict__.get(campo) for campo in cls.CAMPOS_UNICIDAD}
+        return instancia
+
+    def save(self, *args, **kwargs):
+        # La unicidad de la papeleta activa la garantiza el índice único de la BD,
+        # así que no se valida con una consulta previa en cada guardado.
+        self.full_clean(validate_constraints=False)
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        try:
+            if self._puede_duplicar_activa(kwargs.get('update_fields')) and connections[using].in_atomic_block:
+                # Punto de guardado propio: tras el error la transacción del llamador sigue siendo usable
+                with transaction.atomic(using=using):
+                    super().save(*args, **kwargs)
+            else:
+                super().save(*args, **kwargs)
+        except IntegrityError as e:
+            if not self._es_duplicado_activo(e):
+                raise
+            raise ValidationError({'hermano': self.MENSAJE_PAPELETA_ACTIVA_DUPLICADA}) from e
+
+        self._guardada = {campo: getattr(self, campo) for campo in self.CAMPOS_UNICIDAD}
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._guardada = {campo: self.__dict__.get(campo) for campo in self.CAMPOS_UNICIDAD}
+
+    def _puede_duplicar_activa(self, update_fields):
         """
-        Validación personalizada para evitar duplicados activos en MariaDB.
+        Solo las altas y los guardados que reactivan la papeleta o cambian su hermano o acto
+        pueden chocar con el índice único; el resto (p. ej. cada guardado del reparto) se
+        ahorra el SAVEPOINT y el RELEASE.
         """
-        super().clean()
+        if self.estado_papeleta in self.ESTADOS_INACTIVOS:
+            return False
+        if self._state.adding:
+            return True
+        if update_fields is not None and not {'estado_papeleta', 'hermano', 'hermano_id', 'acto', 'acto_id'} & set(update_fields):
+            return False
+
+        guardada = getattr(self, '_guardada', None)
+        if guardada is None:
+            return True
+
+        return (
+            guardada['estado_papeleta'] in self.ESTADOS_INACTIVOS + (None,)
+            or guardada['hermano_id'] != self.hermano_id
+            or guardada['acto_id'] != self.acto_id
+        )
 
-        estados_inactivos = [
-            self.EstadoPapeleta.ANULADA,
-            self.EstadoPapeleta.NO_ASIGNADA
-        ]
+    def validate_constraints(self, exclude=None):
+        """
+        Los formularios (admin) validan las restricciones antes de guardar, pero `activa` no
+        tiene valor hasta que la BD la calcula: la papeleta activa duplicada se busca aquí.
+        """
+        super().validate_constraints(exclude=exclude)
 
-        if self.estado_papeleta not in estados_inactivos:
-            papeletas_existentes = PapeletaSitio.objects.filter(
-                hermano=self.hermano,
-                acto=self.acto
-            ).exclude(
-                estado_papeleta__in=estados_inactivos
-            )
+        if exclude and {'hermano', 'acto'} & set(exclude):
+            return
 
-            if self.pk:
-                papeletas_existentes = papeletas_existentes.exclude(pk=self.pk)
+        if self.estado_papeleta in self.ESTADOS_INACTIVOS:
+            return
 
-            if papeletas_existentes.exists():
-                raise ValidationError({
-                    'hermano': 'Este hermano ya tiene una papeleta activa para este acto. Debe anular la anterior antes de crear una nueva.'
-                })
+        duplicada = PapeletaSitio.objects.filter(hermano_id=self.hermano_id, acto_id=self.acto_id).exclude(
+            estado_papeleta__in=self.ESTADOS_INACTIVOS
+        ).exclude(pk=self.pk).exists()
 
-    def save(self, *args, **kwargs):
-        self.full_clean()
-        super().save(*args, **kwargs)
+        if duplicada:
+            raise ValidationError({'hermano': self.MENSAJE_PAPELETA_ACTIVA_DUPLICADA})
+
+    def _es_duplicado_activo(self, error):
+        """MySQL y PostgreSQL nombran el índice en el error; SQLite lista sus columnas."""
+        mensaje = str(error)
+        return 'unique_papeleta_activa_hermano_acto' in mensaje or f'{self._meta.db_table}.activa' in mensaje
 
     class Meta:
         verbose_name = "Papeleta de Sitio"
         verbose_name_plural = "Papeletas de Sitio"
+        constraints = [
+            # `activa` vale NULL en las papeletas anuladas o no asignadas y los NULL no
+            # colisionan en un índice único: solo puede haber una papeleta viva por
+            # hermano y acto, y las anuladas se acumulan sin límite.
+            UniqueConstraint(fields=['hermano', 'acto', 'activa'], name='unique_papeleta_activa_hermano_acto'),
+        ]
     
 # -----------------------------------------------------------------------------
 # ENTIDAD: PREFERENCIA SOLICITUD
@@ -627,4 +808,121 @@ class PreferenciaSolicitud(models.Model):
 
     def __str__(self):
         return f"{self.papeleta} - Puesto: {self.puesto_solicitado.nombre} (Prioridad: {self.orden_prioridad})"
-    
\ No newline at end of file
+    
+# -----------------------------------------------------------------------------
+# ENTIDAD: ESTADÍSTICAS DEL ACTO (contadores materializados)
+# -----------------------------------------------------------------------------
+class EstadisticasActo(models.Model):
+    """
+    Contadores de papeletas del acto que consultan los paneles de administración.
+    Los servicios que cambian el estado de las papeletas los actualizan por incrementos
+    en la misma transacción (api/servicios/acto/estadisticas_acto_service.py); los cambios
+    hechos fuera de ellos (admin, puestos) recalculan el acto al confirmar (api/signals.py).
+    El comando `recalcular_estadisticas_actos` corrige cualquier desviación.
+    """
+    acto = models.OneToOneField(Acto, on_delete=models.CASCADE, primary_key=True, related_name='estadisticas', verbose_name="Acto")
+
+    papeletas_no_solicitadas = models.IntegerField(default=0, verbose_name="Papeletas no solicitadas")
+    papeletas_solicitadas = models.IntegerField(default=0, verbose_name="Papeletas solicitadas")
+    papeletas_emitidas = models.IntegerField(default=0, verbose_name="Papeletas emitidas")
+    papeletas_recogidas = models.IntegerField(default=0, verbose_name="Papeletas recogidas")
+    papeletas_leidas = models.IntegerField(default=0, verbose_name="Papeletas leídas")
+    papeletas_anuladas = models.IntegerField(default=0, verbose_name="Papeletas anuladas")
+    papeletas_no_asignadas = models.IntegerField(default=0, verbose_name="Papeletas no asignadas")
+
+    solicitantes_insignia = models.IntegerField(default=0, verbose_name="Solicitantes de insignia", help_text="Solicitudes de insignia no anuladas.")
+    solicitudes_insignias = models.IntegerField(default=0, verbose_name="Preferencias de insignia", help_text="Preferencias de las solicitudes de insignia en curso o resueltas.")
+    insignias_asignadas = models.IntegerField(default=0, verbose_name="Insignias asignadas")
+
+    solicitantes_cirio = models.IntegerField(default=0, verbose_name="Solicitantes de cirio", help_text="Solicitudes que no son de insignia y no están anuladas.")
+    cirios_cristo = models.IntegerField(default=0, verbose_name="Cirios en el cortejo de Cristo")
+    cirios_virgen = models.IntegerField(default=0, verbose_name="Cirios en el cortejo de Virgen")
+
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Última modificación")
+
+    class Meta:
+        verbose_name = "Estadísticas del acto"
+        verbose_name_plural = "Estadísticas de los actos"
+
+    def __str__(self):
+        return f"Estadísticas de {self.acto_id}"
+
+
+# -----------------------------------------------------------------------------
+# ENTIDAD: ELEGIBILIDAD PARA SOLICITAR (foto por acto)
+# -----------------------------------------------------------------------------
+class ElegibilidadSolicitud(models.Model):
+    """
+    Requisitos de cuotas y cuerpos de un hermano, calculados de una vez para todos los
+    hermanos antes de abrir el plazo de un acto (comando `preparar_elegibilidad_actos`).
+    Las señales de Cuota y HermanoCuerpo mantienen las filas al día; los servicios de
+    solicitud la leen con una sola consulta y, si no hay fila, calculan lo mismo al vuelo.
+    """
+    acto = models.ForeignKey(Acto, on_delete=models.CASCADE, related_name='elegibilidades', verbose_name="Acto")
+    hermano = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='elegibilidades', verbose_name="Hermano")
+
+    anio_limite = models.PositiveIntegerField(verbose_name="Ejercicio límite", help_text="Último año que el hermano debe tener al corriente.")
+    anio_primera_deuda = models.PositiveIntegerField(null=True, blank=True, verbose_name="Primer año con deuda", help_text="Primer año hasta el límite con una cuota pendiente o devuelta.")
+    tiene_historial_cuotas = models.BooleanField(default=False, verbose_name="Tiene cuotas hasta el límite")
+    cuerpos = models.JSONField(default=list, blank=True, verbose_name="Cuerpos de pertenencia")
+
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Última modificación")
+
+    class Meta:
+        verbose_name = "Elegibilidad para solicitar"
+        verbose_name_plural = "Elegibilidades para solicitar"
+        constraints = [
+            UniqueConstraint(fields=['acto', 'hermano'], name='unique_elegibilidad_acto_hermano'),
+        ]
+
+    def __str__(self):
+        return f"Elegibilidad de {self.hermano_id} en {self.acto_id}"
+
+
+# -----------------------------------------------------------------------------
+# ENTIDAD: SOLICITUD EN COLA (modo admisión)
+# -----------------------------------------------------------------------------
+class SolicitudEnCola(models.Model):
+    """
+    Solicitud de papeleta recibida con `SOLICITUDES_EN_COLA` activo: el endpoint solo
+    valida la forma de la petición y la guarda aquí con su ticket; los workers del comando
+    `procesar_cola_solicitudes` la tramitan con los servicios de cada modalidad.
+    """
+    class TipoSolicitud(models.TextChoices):
+        INSIGNIA = 'INSIGNIA', 'Insignia (tradicional)'
+        CIRIO = 'CIRIO', 'Cirio (tradicional)'
+        UNIFICADA = 'UNIFICADA', 'Unificada'
+
+    class EstadoCola(models.TextChoices):
+        PENDIENTE = 'PENDIENTE', 'Pendiente'
+        EN_PROCESO = 'EN_PROCESO', 'En proceso'
+        ACEPTADA = 'ACEPTADA', 'Aceptada'
+        RECHAZADA = 'RECHAZADA', 'Rechazada'
+
+    ticket = models.UUIDField(default=uuid.uuid4, unique=True, editable=False, verbose_name="Ticket")
+    hermano = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='solicitudes_en_cola', verbose_name="Hermano")
+    acto = models.ForeignKey(Acto, on_delete=models.CASCADE, related_name='solicitudes_en_cola', verbose_name="Acto")
+
+    tipo = models.CharField(max_length=20, choices=TipoSolicitud.choices, verbose_name="Tipo de solicitud")
+    datos = models.JSONField(default=dict, blank=True, verbose_name="Datos de la solicitud", help_text="Puestos y preferencias por id, tal como se validaron en el endpoint.")
+    clave_idempotencia = models.CharField(max_length=64, verbose_name="Clave de idempotencia")
+
+    estado = models.CharField(max_length=20, choices=EstadoCola.choices, default=EstadoCola.PENDIENTE, verbose_name="Estado")
+    intentos = models.PositiveSmallIntegerField(default=0, verbose_name="Intentos")
+    papeleta = models.ForeignKey(PapeletaSitio, on_delete=models.SET_NULL, null=True, blank=True, related_name='+', verbose_name="Papeleta creada")
+    mensaje = models.TextField(blank=True, verbose_name="Motivo del rechazo")
+
+    recibida_en = models.DateTimeField(default=timezone.now, verbose_name="Recibida en", help_text="Los plazos del acto se evalúan en este instante.")
+    procesada_en = models.DateTimeField(null=True, blank=True, verbose_name="Procesada en")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Última modificación")
+
+    class Meta:
+        verbose_name = "Solicitud en cola"
+        verbose_name_plural = "Solicitudes en cola"
+        constraints = [
+            UniqueConstraint(fields=['hermano', 'clave_idempotencia'], name='unique_solicitud_cola_idempotencia'),
+        ]
+        indexes = [models.Index(fields=['estado', 'id'], name='idx_solicitud_cola_estado')]
+
+    def __str__(self):
+        return f"{self.ticket} ({self.estado})"
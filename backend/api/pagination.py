@@ -1,4 +1,11 @@
-from rest_framework.pagination import PageNumberPagination
+from datetime import datetime
+
+from django.core import signing
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 20
@@ -8,4 +15,90 @@ class StandardResultsSetPagination(PageNumberPagination):
 class PaginacionDiezElementos(PageNumberPagination):
     page_size = 10
     page_size_query_param = 'page_size'
-    max_page_size = 50
\ No newline at end of file
+    max_page_size = 50
+
+class PaginacionCursorComunicados(BasePagination):
+    """
+    Paginación por cursor (keyset) de los tablones de comunicados, sobre (fecha_emision, id).
+
+    Cada página se obtiene con `WHERE (fecha_emision, id) < cursor ORDER BY fecha_emision DESC, id DESC
+    LIMIT n`, apoyado en el índice idx_comunicado_feed, por lo que cuesta lo mismo en la primera
+    página que en la más antigua. El cursor es opaco y va firmado: el cliente solo debe
+    reenviar el enlace `next` de la respuesta.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    salt_cursor = 'api.pagination.comunicados'
+    mensaje_cursor_invalido = 'Cursor no válido.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        posicion = self.decodificar_cursor(request)
+        if posicion is not None:
+            fecha, ultimo_id = posicion
+            queryset = queryset.filter(Q(fecha_emision__lt=fecha) | Q(fecha_emision=fecha, id__lt=ultimo_id))
+
+        # Se pide un elemento de más para saber si existe página siguiente sin hacer un COUNT
+        pagina = list(queryset.order_by('-fecha_emision', '-id')[:self.page_size + 1])
+
+        self.siguiente = None
+        if len(pagina) > self.page_size:
+            pagina = pagina[:self.page_size]
+            ultimo = pagina[-1]
+            # Admite instancias o filas de values() (ruta rápida de serialización)
+            self.siguiente = (ultimo['fecha_emision'], ultimo['id']) if isinstance(ultimo, dict) else (ultimo.fecha_emision, ultimo.id)
+
+        return pagina
+
+    def get_page_size(self, request):
+        try:
+            tamano = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if tamano <= 0:
+            return self.page_size
+
+        return min(tamano, self.max_page_size)
+
+    def decodificar_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+
+        try:
+            datos = signing.loads(cursor, salt=self.salt_cursor)
+            return datetime.fromisoformat(datos['f']), int(datos['i'])
+        except (signing.BadSignature, KeyError, TypeError, ValueError):
+            raise NotFound(self.mensaje_cursor_invalido)
+
+    def codificar_cursor(self, posicion):
+        fecha, ultimo_id = posicion
+        return signing.dumps({'f': fecha.isoformat(), 'i': ultimo_id}, salt=self.salt_cursor)
+
+    def get_next_link(self):
+        if self.siguiente is None:
+            return None
+
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.codificar_cursor(self.siguiente))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
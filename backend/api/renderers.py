@@ -0,0 +1,24 @@
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+
+def formatear_evento_sse(evento, datos):
+    """Serializa un evento con el formato de Server-Sent Events (event + data + línea en blanco)."""
+    return f"event: {evento}\ndata: {json.dumps(datos, ensure_ascii=False)}\n\n"
+
+
+class ServerSentEventRenderer(BaseRenderer):
+    """
+    Permite que DRF acepte peticiones con `Accept: text/event-stream`.
+    Las respuestas normales (errores de validación, 401...) se envían como un único evento 'error'.
+    """
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        return formatear_evento_sse('error', data).encode(self.charset)
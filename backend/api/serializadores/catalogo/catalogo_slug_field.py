@@ -0,0 +1,27 @@
+from rest_framework import serializers
+
+from api.servicios.catalogo_service import obtener_catalogo, obtener_instancia
+
+
+class CatalogoSlugRelatedField(serializers.SlugRelatedField):
+    """
+    `SlugRelatedField` para los modelos de catálogo que resuelve en memoria
+    (api.servicios.catalogo_service) en lugar de consultar la BD:
+
+    - Al leer solo necesita la clave ajena (`tipo_acto_id`), no la fila relacionada.
+    - Al escribir busca el slug en el índice del catálogo; si no aparece vuelve a la
+      consulta de DRF, que es la que produce el error de validación.
+    """
+
+    def use_pk_only_optimization(self):
+        return True
+
+    def to_representation(self, obj):
+        return super().to_representation(obtener_instancia(self.get_queryset().model, obj.pk))
+
+    def to_internal_value(self, data):
+        if isinstance(data, (str, int)):
+            instancia = obtener_catalogo(self.get_queryset().model).por(self.slug_field).get(str(data))
+            if instancia is not None:
+                return instancia
+        return super().to_internal_value(data)
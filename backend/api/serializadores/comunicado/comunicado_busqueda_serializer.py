@@ -0,0 +1,30 @@
+from rest_framework import serializers
+from api.models import Comunicado
+from api.serializadores.imagen.imagen_srcset_field import ImagenSrcsetField
+
+class ComunicadoBusquedaSerializer(serializers.ModelSerializer):
+    """
+    Resultado de la búsqueda. `titulo_resaltado` y `fragmento` son HTML ya escapado
+    con las coincidencias entre <mark></mark>.
+    """
+    tipo_comunicacion_display = serializers.CharField(source='get_tipo_comunicacion_display', read_only=True)
+    imagen_srcset = ImagenSrcsetField()
+
+    titulo_resaltado = serializers.CharField(read_only=True)
+    fragmento = serializers.CharField(read_only=True)
+    puntuacion = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Comunicado
+        fields = [
+            'id',
+            'titulo',
+            'titulo_resaltado',
+            'fragmento',
+            'puntuacion',
+            'imagen_portada',
+            'imagen_srcset',
+            'fecha_emision',
+            'tipo_comunicacion',
+            'tipo_comunicacion_display',
+        ]
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.core.exceptions import ObjectDoesNotExist
 from api.models import Comunicado
+from api.serializadores.imagen.imagen_srcset_field import ImagenSrcsetField
 
 
 class ComunicadoListSerializer(serializers.ModelSerializer):
@@ -15,17 +16,22 @@ class ComunicadoListSerializer(serializers.ModelSerializer):
     Transformaciones principales aplicadas:
         - Tipos de datos (tipo_display): Resuelve el valor interno del campo de opciones (choices) a su etiqueta legible.
         - Relaciones (areas_interes): Serializa la relación Many-To-Many (M2M) devolviendo un listado de nombres en lugar de IDs.
+        - Imagen (imagen_srcset): URLs de las versiones WebP/JPEG reducidas de la portada, para `srcset`.
+        - Texto (extracto, minutos_lectura): Resumen precalculado al guardar; el `contenido` completo
+          solo se envía en el detalle (`ComunicadoDetalleSerializer`).
         - Campos dinámicos (autor_nombre): Construye y formatea el nombre completo del emisor en tiempo de ejecución, con "Secretaría" como valor de respaldo (fallback).
     """
     tipo_display = serializers.CharField(source='get_tipo_comunicacion_display', read_only=True)
     areas_interes = serializers.SerializerMethodField()
     autor_nombre = serializers.SerializerMethodField()
+    imagen_srcset = ImagenSrcsetField()
 
 
     class Meta:
         model = Comunicado
         fields = [
-            'id', 'titulo', 'contenido', 'fecha_emision', 'imagen_portada',
+            'id', 'titulo', 'extracto', 'numero_palabras', 'minutos_lectura',
+            'fecha_emision', 'imagen_portada', 'imagen_srcset',
             'tipo_comunicacion', 'tipo_display', 'autor_nombre', 
             'areas_interes'
         ]
@@ -81,4 +87,13 @@ class ComunicadoListSerializer(serializers.ModelSerializer):
             except Exception:
                 nombres_areas.append(f"Área (ID: {area.id})")
                 
-        return nombres_areas
\ No newline at end of file
+        return nombres_areas
+
+
+class ComunicadoDetalleSerializer(ComunicadoListSerializer):
+    """
+    Representación completa de un comunicado: la de los listados más el `contenido` HTML.
+    """
+
+    class Meta(ComunicadoListSerializer.Meta):
+        fields = ComunicadoListSerializer.Meta.fields + ['contenido']
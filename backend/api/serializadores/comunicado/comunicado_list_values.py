@@ -0,0 +1,91 @@
+from collections import defaultdict
+
+from rest_framework import serializers
+
+from api.models import AreaInteres, Comunicado
+from api.serializadores.imagen.imagen_srcset_field import representar_srcset
+
+
+# -----------------------------------------------------------------------------
+# RUTA RÁPIDA DE `ComunicadoListSerializer` (listados paginados)
+# -----------------------------------------------------------------------------
+# Construye cada elemento directamente desde una proyección `values()`: sin instanciar
+# modelos, sin resolver fuentes con getattr por campo y con las etiquetas de los choices
+# precalculadas. La salida es idéntica (mismas claves, orden y formato) a la del
+# serializador, lo que comprueba el test de contrato.
+
+CAMPOS_VALUES = (
+    'id', 'titulo', 'extracto', 'numero_palabras', 'minutos_lectura', 'fecha_emision',
+    'imagen_portada', 'imagen_derivados', 'tipo_comunicacion',
+    'autor__nombre', 'autor__username', 'autor__primer_apellido',
+)
+
+ETIQUETAS_TIPO = dict(Comunicado.TipoComunicacion.choices)
+ETIQUETAS_AREA = dict(AreaInteres.NombreArea.choices)
+
+_fecha_hora = serializers.DateTimeField()
+_almacen_portada = Comunicado._meta.get_field('imagen_portada').storage
+
+
+def proyectar_comunicados_listado(queryset):
+    """Convierte el queryset del listado en la proyección que consume `serializar_comunicados_listado`."""
+    return queryset.select_related(None).prefetch_related(None).values(*CAMPOS_VALUES)
+
+
+def nombre_autor(nombre, username, primer_apellido) -> str:
+    """Mismo resultado que `ComunicadoListSerializer.get_autor_nombre`."""
+    nombre = str(nombre or username or "").strip()
+    apellido = str(primer_apellido or "").strip()
+
+    if not nombre and not apellido:
+        return "Secretaría"
+
+    return f"{nombre} {apellido}".strip()
+
+
+def _areas_por_comunicado(ids) -> dict[int, list[str]]:
+    """Nombres visibles de las áreas de cada comunicado, en una sola consulta a la tabla intermedia."""
+    areas = defaultdict(list)
+    if not ids:
+        return areas
+
+    filas = Comunicado.areas_interes.through.objects.filter(comunicado_id__in=ids) \
+                                                    .order_by('areainteres_id') \
+                                                    .values_list('comunicado_id', 'areainteres__nombre_area')
+    for com_id, nombre_area in filas:
+        areas[com_id].append(ETIQUETAS_AREA.get(nombre_area, nombre_area))
+
+    return areas
+
+
+def serializar_comunicados_listado(filas, request=None) -> list[dict]:
+    """
+    Equivalente a `ComunicadoListSerializer(filas, many=True, context={'request': request}).data`
+    para filas de `proyectar_comunicados_listado`.
+    """
+    filas = list(filas)
+    areas = _areas_por_comunicado([fila['id'] for fila in filas])
+
+    absoluta = request.build_absolute_uri if request is not None else None
+
+    def url(nombre):
+        ruta = _almacen_portada.url(nombre)
+        return absoluta(ruta) if absoluta else ruta
+
+    return [
+        {
+            'id': fila['id'],
+            'titulo': fila['titulo'],
+            'extracto': fila['extracto'],
+            'numero_palabras': fila['numero_palabras'],
+            'minutos_lectura': fila['minutos_lectura'],
+            'fecha_emision': _fecha_hora.to_representation(fila['fecha_emision']),
+            'imagen_portada': url(fila['imagen_portada']) if fila['imagen_portada'] else None,
+            'imagen_srcset': representar_srcset(fila['imagen_portada'], fila['imagen_derivados'], url),
+            'tipo_comunicacion': fila['tipo_comunicacion'],
+            'tipo_display': ETIQUETAS_TIPO.get(fila['tipo_comunicacion'], fila['tipo_comunicacion']),
+            'autor_nombre': nombre_autor(fila['autor__nombre'], fila['autor__username'], fila['autor__primer_apellido']),
+            'areas_interes': areas.get(fila['id'], []),
+        }
+        for fila in filas
+    ]
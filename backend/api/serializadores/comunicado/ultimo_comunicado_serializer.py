@@ -1,18 +1,22 @@
 from rest_framework import serializers
 from api.models import Comunicado
+from api.serializadores.imagen.imagen_srcset_field import ImagenSrcsetField
 
 class ComunicadoSerializer(serializers.ModelSerializer):
     tipo_comunicacion_display = serializers.CharField(source='get_tipo_comunicacion_display', read_only=True)
 
     areas_interes = serializers.SerializerMethodField()
+    imagen_srcset = ImagenSrcsetField()
 
     class Meta:
         model = Comunicado
         fields = [
             'id', 
             'titulo', 
-            'contenido', 
+            'extracto', 
+            'minutos_lectura', 
             'imagen_portada', 
+            'imagen_srcset',
             'fecha_emision', 
             'tipo_comunicacion', 
             'tipo_comunicacion_display',
@@ -0,0 +1,51 @@
+from rest_framework import serializers
+
+
+def representar_srcset(nombre_imagen, derivados, url):
+    """
+    Representación de `ImagenSrcsetField` a partir de los valores en bruto (nombre de la
+    portada y JSON de derivados); `url(nombre)` construye la URL pública de cada fichero.
+    """
+    derivados = derivados or {}
+
+    if not nombre_imagen or derivados.get('origen') != nombre_imagen:
+        return None
+
+    anchos = [str(ancho) for ancho in derivados['anchos']]
+
+    representacion = {
+        formato: ", ".join(f"{url(derivados[formato][ancho])} {ancho}w" for ancho in anchos)
+        for formato in ('webp', 'jpeg')
+    }
+    representacion['miniatura'] = url(derivados['jpeg'][anchos[0]])
+    return representacion
+
+
+class ImagenSrcsetField(serializers.Field):
+    """
+    Campo de solo lectura con las versiones reducidas de `imagen_portada`, listas para
+    `<picture>` / `<img srcset>`:
+
+        {"webp": "url 400w, url 1000w", "jpeg": "url 400w, url 1000w", "miniatura": "url"}
+
+    Devuelve None mientras los derivados no se han generado (o si corresponden a una
+    portada anterior); el cliente debe recurrir entonces a `imagen_portada`.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def _url(self, storage, nombre):
+        url = storage.url(nombre)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
+
+    def to_representation(self, instancia):
+        imagen = instancia.imagen_portada
+        storage = imagen.storage
+
+        return representar_srcset(
+            imagen.name if imagen else None, instancia.imagen_derivados, lambda nombre: self._url(storage, nombre)
+        )
@@ -0,0 +1,21 @@
+from rest_framework import serializers
+
+from api.models import SolicitudEnCola
+from api.servicios.papeleta_sitio.cola_solicitudes_service import posicion_en_cola
+
+
+class TicketSolicitudSerializer(serializers.ModelSerializer):
+    """
+    Estado de una solicitud recibida en modo admisión. El cliente lo consulta con el
+    ticket hasta que pasa a ACEPTADA (con el id de la papeleta) o RECHAZADA (con el motivo).
+    """
+    papeleta_id = serializers.IntegerField(read_only=True, allow_null=True)
+    posicion = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SolicitudEnCola
+        fields = ['ticket', 'tipo', 'acto', 'estado', 'posicion', 'mensaje', 'papeleta_id', 'recibida_en', 'procesada_en']
+        read_only_fields = fields
+
+    def get_posicion(self, obj):
+        return posicion_en_cola(obj)
@@ -0,0 +1,60 @@
+from rest_framework import serializers
+
+from api.models import PapeletaSitio
+
+
+# -----------------------------------------------------------------------------
+# RUTA RÁPIDA DE `HistorialPapeletaSerializer` (historial de papeletas del hermano)
+# -----------------------------------------------------------------------------
+# Una sola consulta con los JOIN a acto, tipo de acto, puesto, tipo de puesto y tramo
+# resueltos en la proyección `values()`, en lugar de recorrer las relaciones campo a
+# campo. La salida es idéntica a la del serializador (ver test de contrato).
+
+CAMPOS_VALUES = (
+    'id', 'acto_id', 'estado_papeleta', 'fecha_solicitud', 'fecha_emision', 'anio',
+    'acto__tipo_acto__tipo', 'acto__nombre', 'acto__fecha',
+    'puesto__nombre', 'tramo__nombre', 'tramo__numero_orden', 'puesto__tipo_puesto__es_insignia',
+    'puesto__lugar_citacion', 'puesto__hora_citacion', 'orden_en_tramo', 'lado',
+)
+
+ETIQUETAS_LADO = dict(PapeletaSitio.LadoTramo.choices)
+
+_fecha_hora = serializers.DateTimeField()
+_fecha = serializers.DateField()
+_hora = serializers.TimeField()
+
+
+def proyectar_historial_papeletas(queryset):
+    """Convierte el queryset del historial en la proyección que consume `serializar_historial_papeletas`."""
+    return queryset.select_related(None).values(*CAMPOS_VALUES)
+
+
+def _o_none(formato, valor):
+    return None if valor is None else formato(valor)
+
+
+def serializar_historial_papeletas(filas) -> list[dict]:
+    """Equivalente a `HistorialPapeletaSerializer(filas, many=True).data` para filas de `proyectar_historial_papeletas`."""
+    return [
+        {
+            'id': fila['id'],
+            'acto': fila['acto_id'],
+            'estado_papeleta': fila['estado_papeleta'],
+            'fecha_solicitud': _o_none(_fecha_hora.to_representation, fila['fecha_solicitud']),
+            'fecha_emision': _o_none(_fecha.to_representation, fila['fecha_emision']),
+            'anio': fila['anio'],
+            'tipo_acto': fila['acto__tipo_acto__tipo'],
+            'nombre_acto': fila['acto__nombre'],
+            'fecha_acto': _o_none(_fecha_hora.to_representation, fila['acto__fecha']),
+            'nombre_puesto': fila['puesto__nombre'],
+            'nombre_tramo': fila['tramo__nombre'],
+            'numero_tramo': fila['tramo__numero_orden'],
+            'es_insignia': bool(fila['puesto__tipo_puesto__es_insignia']),
+            'lugar_citacion': fila['puesto__lugar_citacion'],
+            'hora_citacion': _o_none(_hora.to_representation, fila['puesto__hora_citacion']),
+            'orden_en_tramo': fila['orden_en_tramo'],
+            'lado': fila['lado'],
+            'lado_display': _o_none(lambda lado: ETIQUETAS_LADO.get(lado, lado), fila['lado']),
+        }
+        for fila in filas
+    ]
@@ -11,6 +11,10 @@ from django.db import transaction
 from django.core.signing import Signer
 import base64
 from django.db.models import Q, Count
+from api.serializadores.catalogo.catalogo_slug_field import CatalogoSlugRelatedField
+from api.serializadores.imagen.imagen_srcset_field import ImagenSrcsetField
+from api.servicios.acto.contadores_acto_service import contadores_acto, mapa_ocupacion_puestos
+from api.servicios.catalogo_service import obtener_instancia
 
 User = get_user_model()
 
@@ -60,7 +64,7 @@ class CuotaSerializer(serializers.ModelSerializer):
 # -----------------------------------------------------------------------------
 
 class UserSerializer(serializers.ModelSerializer):
-    areas_interes = serializers.SlugRelatedField(
+    areas_interes = CatalogoSlugRelatedField(
         many=True,
         slug_field='nombre_area',
         queryset=AreaInteres.objects.all(),
@@ -158,7 +162,7 @@ class UserSerializer(serializers.ModelSerializer):
     
     
 class UserUpdateSerializer(serializers.ModelSerializer):
-    areas_interes = serializers.SlugRelatedField(
+    areas_interes = CatalogoSlugRelatedField(
         many=True,
         slug_field='nombre_area',
         queryset=AreaInteres.objects.all(),
@@ -234,7 +238,7 @@ class HermanoCuerpoSerializer(serializers.ModelSerializer):
     Gestiona la pertenencia de un hermano a un cuerpo (ej. Costaleros, Nazarenos).
     """
     nombre_cuerpo = serializers.CharField(source='cuerpo.get_nombre_cuerpo_display', read_only=True)
-    cuerpo_slug = serializers.SlugRelatedField(
+    cuerpo_slug = CatalogoSlugRelatedField(
         slug_field='nombre_cuerpo',
         queryset=CuerpoPertenencia.objects.all(),
         source='cuerpo',
@@ -267,12 +271,12 @@ class TipoPuestoSerializer(serializers.ModelSerializer):
         fields = ['id', 'nombre_tipo', 'solo_junta_gobierno', 'es_insignia']
 
 class PuestoSerializer(serializers.ModelSerializer):
-    tipo_puesto = serializers.SlugRelatedField(
+    tipo_puesto = CatalogoSlugRelatedField(
         slug_field='nombre_tipo',
         queryset=TipoPuesto.objects.all()
     )
 
-    es_insignia = serializers.BooleanField(source='tipo_puesto.es_insignia', read_only=True)
+    es_insignia = serializers.SerializerMethodField()
 
     class Meta:
         model = Puesto
@@ -292,6 +296,15 @@ class PuestoSerializer(serializers.ModelSerializer):
             }
         }
 
+    def to_representation(self, instance):
+        ocupacion = self.context.get('ocupacion_puestos')
+        if ocupacion and instance.pk in ocupacion:
+            instance.ocupacion_precalculada = ocupacion[instance.pk]
+        return super().to_representation(instance)
+
+    def get_es_insignia(self, obj) -> bool:
+        return obtener_instancia(TipoPuesto, obj.tipo_puesto_id).es_insignia
+
     def validate_numero_maximo_asignaciones(self, value):
         """
         Validación de campo: El número de asignaciones debe ser positivo.
@@ -322,6 +335,17 @@ class TramoSerializer(serializers.ModelSerializer):
         fields = ['id', 'nombre', 'numero_orden', 'paso', 'paso_display', 'acto', 'numero_maximo_cirios']
 
 
+class ActoListSerializer(serializers.ListSerializer):
+    """
+    Calcula el mapa de ocupación de los puestos de todos los actos de la lista
+    con una sola consulta antes de serializarlos.
+    """
+    def to_representation(self, data):
+        actos = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        self.context.setdefault('ocupacion_puestos', {}).update(mapa_ocupacion_puestos([acto.pk for acto in actos]))
+        return super().to_representation(actos)
+
+
 class ActoSerializer(serializers.ModelSerializer):
     total_insignias = serializers.SerializerMethodField()
     total_asignados = serializers.SerializerMethodField()
@@ -331,7 +355,7 @@ class ActoSerializer(serializers.ModelSerializer):
     total_cirios_cristo = serializers.SerializerMethodField()
     total_cirios_virgen = serializers.SerializerMethodField()
 
-    tipo_acto = serializers.SlugRelatedField(
+    tipo_acto = CatalogoSlugRelatedField(
         slug_field='tipo',
         queryset=TipoActo.objects.all()
     )
@@ -339,7 +363,9 @@ class ActoSerializer(serializers.ModelSerializer):
 
     tramos = TramoSerializer(many=True, read_only=True)
 
-    requiere_papeleta = serializers.BooleanField(source='tipo_acto.requiere_papeleta', read_only=True)
+    requiere_papeleta = serializers.SerializerMethodField()
+
+    imagen_srcset = ImagenSrcsetField()
 
     en_plazo_insignias = serializers.SerializerMethodField()
     en_plazo_cirios = serializers.SerializerMethodField()
@@ -351,10 +377,19 @@ class ActoSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Acto
-        fields = ['id', 'nombre', 'lugar', 'descripcion', 'fecha', 'tipo_acto', 'modalidad', 'inicio_solicitud', 'fin_solicitud', 'en_plazo_insignias', 'puestos_disponibles', 'tramos', 'inicio_solicitud_cirios', 'fin_solicitud_cirios', 'en_plazo_cirios', 'requiere_papeleta', 'fecha_ejecucion_reparto', 'reparto_ejecutado', 'imagen_portada', 'total_solicitantes_insignia', 'total_solicitudes_insignias', 'total_insignias', 'total_asignados', 'total_no_asignados', 'fecha_ejecucion_cirios', 'total_solicitantes_cirio', 'total_cirios_cristo', 'total_cirios_virgen']
+        fields = ['id', 'nombre', 'lugar', 'descripcion', 'fecha', 'tipo_acto', 'modalidad', 'inicio_solicitud', 'fin_solicitud', 'en_plazo_insignias', 'puestos_disponibles', 'tramos', 'inicio_solicitud_cirios', 'fin_solicitud_cirios', 'en_plazo_cirios', 'requiere_papeleta', 'fecha_ejecucion_reparto', 'reparto_ejecutado', 'imagen_portada', 'imagen_srcset', 'total_solicitantes_insignia', 'total_solicitudes_insignias', 'total_insignias', 'total_asignados', 'total_no_asignados', 'fecha_ejecucion_cirios', 'total_solicitantes_cirio', 'total_cirios_cristo', 'total_cirios_virgen']
+        list_serializer_class = ActoListSerializer
 
     read_only_fields = ['fecha_ejecucion_reparto', 'reparto_ejecutado']
 
+    def to_representation(self, instance):
+        if self.parent is None:
+            self.context.setdefault('ocupacion_puestos', {}).update(mapa_ocupacion_puestos([instance.pk]))
+        return super().to_representation(instance)
+
+    def get_requiere_papeleta(self, obj) -> bool:
+        return obtener_instancia(TipoActo, obj.tipo_acto_id).requiere_papeleta
+
     def get_en_plazo_insignias(self, obj):
         ahora = timezone.now()
         if obj.inicio_solicitud and obj.fin_solicitud:
@@ -371,80 +406,36 @@ class ActoSerializer(serializers.ModelSerializer):
         return obj.fecha_ejecucion_reparto is not None
     
     def get_total_solicitantes_insignia(self, obj):
-        estados_inactivos = ['ANULADA']
-
-        return obj.papeletas.filter(
-            es_solicitud_insignia=True
-        ).exclude(
-            estado_papeleta__in=estados_inactivos
-        ).count()
+        return contadores_acto(obj)['n_solicitantes_insignia']
     
     def get_total_solicitudes_insignias(self, obj):
-        estados_validos = ['SOLICITADA', 'EMITIDA', 'RECOGIDA', 'LEIDA', 'NO_ASIGNADA']
-
-        total = PreferenciaSolicitud.objects.filter(
-            papeleta__acto_id=obj.id,
-            papeleta__estado_papeleta__in=estados_validos,
-            papeleta__es_solicitud_insignia=True
-        ).count()
-
-        return total
+        return contadores_acto(obj)['n_solicitudes_insignias']
 
     def get_total_insignias(self, obj):
         """Calcula el cupo máximo de insignias para este acto"""
-        puestos = obj.puestos_disponibles.filter(tipo_puesto__es_insignia=True)
-        return sum(p.numero_maximo_asignaciones for p in puestos)
+        return contadores_acto(obj)['n_insignias']
 
     def get_total_asignados(self, obj):
         if not obj.fecha_ejecucion_reparto:
             return None
-            
-        estados_inactivos = ['ANULADA', 'NO_ASIGNADA']
-        
-        return obj.papeletas.filter(
-            es_solicitud_insignia=True, 
-            puesto__isnull=False
-        ).exclude(
-            estado_papeleta__in=estados_inactivos
-        ).count()
+
+        return contadores_acto(obj)['n_asignados']
 
     def get_total_no_asignados(self, obj):
         if not obj.fecha_ejecucion_reparto:
             return None
-            
-        total = self.get_total_insignias(obj)
-        asignados = self.get_total_asignados(obj)
-        return max(0, total - asignados)
+
+        contadores = contadores_acto(obj)
+        return max(0, contadores['n_insignias'] - contadores['n_asignados'])
     
     def get_total_solicitantes_cirio(self, obj):
-        estados_inactivos = ['ANULADA']
-        return obj.papeletas.filter(
-            Q(es_solicitud_insignia=False) | Q(es_solicitud_insignia__isnull=True)
-        ).exclude(
-            estado_papeleta__in=estados_inactivos
-        ).count()
+        return contadores_acto(obj)['n_solicitantes_cirio']
 
     def get_total_cirios_cristo(self, obj):
-        estados_inactivos = ['ANULADA']
-        return obj.papeletas.filter(
-            Q(es_solicitud_insignia=False) | Q(es_solicitud_insignia__isnull=True),
-            puesto__isnull=False,
-            puesto__cortejo_cristo=True,
-            puesto__tipo_puesto__es_insignia=False
-        ).exclude(
-            estado_papeleta__in=estados_inactivos
-        ).count()
+        return contadores_acto(obj)['n_cirios_cristo']
 
     def get_total_cirios_virgen(self, obj):
-        estados_inactivos = ['ANULADA']
-        return obj.papeletas.filter(
-            Q(es_solicitud_insignia=False) | Q(es_solicitud_insignia__isnull=True),
-            puesto__isnull=False,
-            puesto__cortejo_cristo=False,
-            puesto__tipo_puesto__es_insignia=False
-        ).exclude(
-            estado_papeleta__in=estados_inactivos
-        ).count()
+        return contadores_acto(obj)['n_cirios_virgen']
 
 # -----------------------------------------------------------------------------
 # SERIALIZER TRANSACCIONAL: PAPELETA DE SITIO
@@ -728,7 +719,7 @@ class HistorialPapeletaSerializer(serializers.ModelSerializer):
 # SERIALIZERS PARA LA CREACIÓN DE ACTOS
 # -----------------------------------------------------------------------------
 class ActoCreateSerializer(serializers.ModelSerializer):
-    tipo_acto = serializers.SlugRelatedField(
+    tipo_acto = CatalogoSlugRelatedField(
         slug_field='tipo',
         queryset=TipoActo.objects.all()
     )
@@ -810,7 +801,7 @@ class ActoCreateSerializer(serializers.ModelSerializer):
 class ActoUpdateSerializer(serializers.ModelSerializer):
     requiere_papeleta = serializers.BooleanField(source='tipo_acto.requiere_papeleta', read_only=True)
 
-    tipo_acto = serializers.SlugRelatedField(
+    tipo_acto = CatalogoSlugRelatedField(
         slug_field='tipo',
         queryset=TipoActo.objects.all()
     )
@@ -6,9 +6,11 @@ from reportlab.pdfgen import canvas
 from reportlab.lib.units import cm
 from django.utils.timezone import now
 from django.core.exceptions import PermissionDenied, ValidationError
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 
 from api.models import PapeletaSitio
+from api.servicios.acto.estadisticas_acto_service import contar_papeletas, registrar_transicion
 
 def generar_pdf_papeleta(papeleta):
     """
@@ -119,9 +121,15 @@ def validar_acceso_papeleta(papeleta_id, codigo_verificacion, usuario_escaneador
     if papeleta.estado_papeleta not in [PapeletaSitio.EstadoPapeleta.EMITIDA, PapeletaSitio.EstadoPapeleta.RECOGIDA]:
         raise ValidationError(f"La papeleta no está activa (Estado: {papeleta.estado_papeleta}).")
 
-    # 5. ACTUALIZAR ESTADO
-    papeleta.estado_papeleta = PapeletaSitio.EstadoPapeleta.LEIDA
-    papeleta.save()
+    # 5. ACTUALIZAR ESTADO (y las estadísticas del acto en la misma transacción)
+    with transaction.atomic():
+        papeleta_actual = PapeletaSitio.objects.filter(pk=papeleta.pk)
+        estadisticas_antes = contar_papeletas(papeleta_actual)
+
+        papeleta.estado_papeleta = PapeletaSitio.EstadoPapeleta.LEIDA
+        papeleta.save()
+
+        registrar_transicion(papeleta.acto_id, estadisticas_antes, papeleta_actual)
 
     return {
         "status": "success",
@@ -5,6 +5,8 @@ from django.shortcuts import get_object_or_404
 from .models import Acto, PapeletaSitio, Puesto, TipoActo, TipoPuesto
 from django.db import transaction
 from django.contrib.auth import get_user_model
+from api.servicios.imagen.derivados_imagen_service import programar_derivados_imagen
+from api.servicios.catalogo_service import obtener_catalogo
 # from django.core.exceptions import ValidationError as DjangoValidationError
 
 User = get_user_model()
@@ -85,6 +87,7 @@ def create_acto_service(usuario, data_validada):
     data_validada['fin_solicitud'] = fin_final
 
     acto = Acto.objects.create(**data_validada)
+    programar_derivados_imagen(acto)
     return acto
 
 
@@ -131,7 +134,13 @@ def update_acto_service(usuario, acto_id, data_validada):
     for attr, value in data_validada.items():
         setattr(acto, attr, value)
 
+    if 'imagen_portada' in data_validada:
+        acto.imagen_derivados = {}
+
     acto.save()
+
+    if 'imagen_portada' in data_validada:
+        programar_derivados_imagen(acto)
     return acto
 
 # -----------------------------------------------------------------------------
@@ -185,16 +194,17 @@ def get_tipos_puesto_service():
     """
     Servicio para recuperar el catálogo completo de tipos de puestos.
     Puede incluir lógica de filtrado si fuera necesaria en el futuro.
+    Se sirve desde la caché en memoria de catálogos.
     """
-    return TipoPuesto.objects.all()
+    return list(obtener_catalogo(TipoPuesto).instancias)
 
 
 # -----------------------------------------------------------------------------
 # SERVICES: TIPO DE ACTO
 # -----------------------------------------------------------------------------
 def get_tipos_acto_service():
-    """Retorna todos los tipos de actos disponibles"""
-    return TipoActo.objects.all()
+    """Retorna todos los tipos de actos disponibles (desde la caché en memoria de catálogos)"""
+    return list(obtener_catalogo(TipoActo).instancias)
 
 # -----------------------------------------------------------------------------
 # SERVICES: PANEL DE ADMINISTRADOR
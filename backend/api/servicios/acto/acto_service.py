@@ -4,6 +4,7 @@ from django.http import QueryDict
 from django.utils import timezone
 
 from api.models import Acto, TipoActo
+from api.servicios.imagen.derivados_imagen_service import programar_derivados_imagen
 
 # -----------------------------------------------------------------------------
 # SERVICES: CREAR ACTO
@@ -27,6 +28,7 @@ def crear_acto_service(usuario_solicitante, data_validada):
             })
 
     nuevo_acto = Acto.objects.create(**data_validada)
+    programar_derivados_imagen(nuevo_acto)
 
     return nuevo_acto
 
@@ -206,11 +208,17 @@ def actualizar_acto_service(usuario_solicitante, acto_id, data_validada):
         if campo in data_dict:
             setattr(acto, campo, data_dict[campo])
 
+    if "imagen_portada" in data_dict:
+        acto.imagen_derivados = {}
+
     _normalizar_campos_papeleta(acto)
 
     acto.full_clean()
     acto.save()
 
+    if "imagen_portada" in data_dict:
+        programar_derivados_imagen(acto)
+
     return acto
 
 
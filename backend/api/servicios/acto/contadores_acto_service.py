@@ -0,0 +1,84 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from api.models import Acto, Puesto
+
+
+# -----------------------------------------------------------------------------
+# CONTADORES DE `ActoSerializer`
+# -----------------------------------------------------------------------------
+# Los totales de papeletas salen de `EstadisticasActo` (contadores materializados,
+# ver estadisticas_acto_service.py) con un JOIN por clave primaria; el cupo de
+# insignias depende de los puestos y va en una subconsulta correlacionada.
+
+CONTADORES = (
+    'n_solicitantes_insignia', 'n_solicitudes_insignias', 'n_insignias',
+    'n_asignados', 'n_solicitantes_cirio', 'n_cirios_cristo', 'n_cirios_virgen',
+)
+
+_CAMPOS_ESTADISTICAS = {
+    'n_solicitantes_insignia': 'solicitantes_insignia',
+    'n_solicitudes_insignias': 'solicitudes_insignias',
+    'n_asignados': 'insignias_asignadas',
+    'n_solicitantes_cirio': 'solicitantes_cirio',
+    'n_cirios_cristo': 'cirios_cristo',
+    'n_cirios_virgen': 'cirios_virgen',
+}
+
+
+def anotar_contadores_acto(queryset):
+    """
+    Añade a cada acto del queryset los atributos de `CONTADORES`, que `ActoSerializer`
+    lee en lugar de lanzar un COUNT por campo.
+    """
+    cupo_insignias = Puesto.objects.filter(acto=OuterRef('pk'), tipo_puesto__es_insignia=True) \
+                                   .order_by() \
+                                   .values('acto') \
+                                   .annotate(total=Sum('numero_maximo_asignaciones')) \
+                                   .values('total')
+
+    return queryset.annotate(
+        n_insignias=Coalesce(Subquery(cupo_insignias, output_field=IntegerField()), Value(0)),
+        **{
+            contador: Coalesce(F(f'estadisticas__{campo}'), Value(0))
+            for contador, campo in _CAMPOS_ESTADISTICAS.items()
+        },
+    )
+
+
+def contadores_acto(acto) -> dict:
+    """
+    Contadores de un acto suelto. Usa los valores anotados si el acto viene de
+    `anotar_contadores_acto`; si no, los calcula en una consulta y los deja en la instancia.
+    """
+    if not all(hasattr(acto, campo) for campo in CONTADORES):
+        valores = anotar_contadores_acto(Acto.objects.filter(pk=acto.pk)).values(*CONTADORES).first() or {}
+        for campo in CONTADORES:
+            setattr(acto, campo, valores.get(campo, 0))
+
+    return {campo: getattr(acto, campo) for campo in CONTADORES}
+
+
+def preparar_actos_serializacion(queryset):
+    """
+    Queryset listo para `ActoSerializer`: contadores anotados y relaciones anidadas precargadas.
+    Tipos de acto y de puesto no hacen falta: se resuelven con la caché de catálogos.
+    """
+    return anotar_contadores_acto(queryset.prefetch_related('puestos_disponibles', 'tramos'))
+
+
+def mapa_ocupacion_puestos(actos_ids) -> dict[int, int]:
+    """
+    Plazas ocupadas de cada puesto de los actos indicados (también los que están a 0),
+    en una sola consulta agrupada. `PuestoSerializer` lo recibe en el contexto como
+    `ocupacion_puestos` y evita las tres consultas por puesto de las propiedades del modelo.
+    """
+    if not actos_ids:
+        return {}
+
+    return dict(
+        Puesto.objects.filter(acto_id__in=actos_ids)
+                      .order_by()
+                      .annotate(ocupadas=Count('papeletas_asignadas', filter=Q(papeletas_asignadas__estado_papeleta__in=Puesto.ESTADOS_OCUPADOS)))
+                      .values_list('id', 'ocupadas')
+    )
@@ -0,0 +1,149 @@
+import threading
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from api.models import Acto, EstadisticasActo, PapeletaSitio
+
+
+# -----------------------------------------------------------------------------
+# ESTADÍSTICAS MATERIALIZADAS DEL ACTO
+# -----------------------------------------------------------------------------
+# Cada servicio que cambia papeletas toma una instantánea de los contadores de las
+# papeletas afectadas antes del cambio y, al terminar, suma la diferencia a la fila
+# de `EstadisticasActo` con F() dentro de la misma transacción:
+#
+#     antes = contar_papeletas(afectadas)
+#     ...cambios...
+#     registrar_transicion(acto.pk, antes, afectadas)
+#
+# `afectadas` es un queryset que se vuelve a evaluar al final, así que debe seguir
+# seleccionando las mismas papeletas (y las nuevas, si se crean) tras el cambio.
+# Si el servicio ya conoce cada transición (el reparto), suma los incrementos
+# directamente con `sumar_incrementos` sin volver a contar.
+#
+# Lo que no pasa por un servicio (admin, comandos, scripts) lo cubren las señales
+# de api/signals.py: marcan el acto y, al confirmar la transacción, se recalcula
+# desde cero salvo que un servicio haya registrado entretanto su transición.
+
+Estado = PapeletaSitio.EstadoPapeleta
+
+CAMPOS_POR_ESTADO = {
+    Estado.NO_SOLICITADA: 'papeletas_no_solicitadas',
+    Estado.SOLICITADA: 'papeletas_solicitadas',
+    Estado.EMITIDA: 'papeletas_emitidas',
+    Estado.RECOGIDA: 'papeletas_recogidas',
+    Estado.LEIDA: 'papeletas_leidas',
+    Estado.ANULADA: 'papeletas_anuladas',
+    Estado.NO_ASIGNADA: 'papeletas_no_asignadas',
+}
+
+ESTADOS_SOLICITUD_INSIGNIA_VALIDOS = [Estado.SOLICITADA, Estado.EMITIDA, Estado.RECOGIDA, Estado.LEIDA, Estado.NO_ASIGNADA]
+
+
+def agregados_estadisticas() -> dict:
+    """
+    Expresiones de agregación de cada contador sobre un queryset de papeletas.
+    Solo usan nombres de campo, por lo que también sirven con los modelos históricos
+    de las migraciones. `distinct` evita contar varias veces la papeleta por el JOIN con sus preferencias.
+    """
+    no_anulada = ~Q(estado_papeleta=Estado.ANULADA)
+    insignia = Q(es_solicitud_insignia=True)
+    cirio = Q(es_solicitud_insignia=False) | Q(es_solicitud_insignia__isnull=True)
+    cirio_con_puesto = cirio & no_anulada & Q(puesto__isnull=False, puesto__tipo_puesto__es_insignia=False)
+
+    def contar(condicion):
+        return Count('pk', filter=condicion, distinct=True)
+
+    agregados = {campo: contar(Q(estado_papeleta=estado)) for estado, campo in CAMPOS_POR_ESTADO.items()}
+    agregados.update(
+        solicitantes_insignia=contar(insignia & no_anulada),
+        solicitudes_insignias=Count('preferencias', filter=insignia & Q(estado_papeleta__in=ESTADOS_SOLICITUD_INSIGNIA_VALIDOS)),
+        insignias_asignadas=contar(insignia & Q(puesto__isnull=False) & ~Q(estado_papeleta__in=[Estado.ANULADA, Estado.NO_ASIGNADA])),
+        solicitantes_cirio=contar(cirio & no_anulada),
+        cirios_cristo=contar(cirio_con_puesto & Q(puesto__cortejo_cristo=True)),
+        cirios_virgen=contar(cirio_con_puesto & Q(puesto__cortejo_cristo=False)),
+    )
+    return agregados
+
+
+def contar_papeletas(queryset) -> dict:
+    """Contadores de las papeletas del queryset, en una sola consulta."""
+    return queryset.order_by().aggregate(**agregados_estadisticas())
+
+
+def recalcular_estadisticas_acto(acto_id) -> EstadisticasActo:
+    """Recalcula desde cero la fila del acto a partir de sus papeletas."""
+    contadores = contar_papeletas(PapeletaSitio.objects.filter(acto_id=acto_id))
+    estadisticas, _ = EstadisticasActo.objects.update_or_create(acto_id=acto_id, defaults=contadores)
+    return estadisticas
+
+
+def registrar_transicion(acto_id, antes, queryset):
+    """
+    Suma a las estadísticas del acto la diferencia entre los contadores actuales de
+    `queryset` y la instantánea `antes` (None si las papeletas no existían). Debe
+    llamarse dentro de la transacción del servicio para que ambos cambios vayan juntos.
+    """
+    despues = contar_papeletas(queryset)
+    antes = antes or {}
+
+    sumar_incrementos(acto_id, {campo: valor - antes.get(campo, 0) for campo, valor in despues.items()})
+
+
+def sumar_incrementos(acto_id, incrementos: dict) -> None:
+    """Suma `{contador: delta}` a la fila del acto; el servicio ya ha contabilizado sus cambios."""
+    _actos_pendientes().discard(acto_id)
+
+    incrementos = {campo: delta for campo, delta in incrementos.items() if delta}
+    if not incrementos:
+        return
+
+    actualizadas = EstadisticasActo.objects.filter(acto_id=acto_id).update(
+        **{campo: F(campo) + delta for campo, delta in incrementos.items()},
+        updated_at=timezone.now(),
+    )
+
+    if not actualizadas:
+        # Acto sin fila (creado antes de existir la tabla o con bulk_create): el recálculo ya incluye el cambio.
+        recalcular_estadisticas_acto(acto_id)
+
+
+# -----------------------------------------------------------------------------
+# CAMBIOS FUERA DE LOS SERVICIOS
+# -----------------------------------------------------------------------------
+_pendientes = threading.local()
+
+
+def _actos_pendientes() -> set:
+    if not hasattr(_pendientes, 'actos'):
+        _pendientes.actos = set()
+    return _pendientes.actos
+
+
+def _recalcular_si_existe(acto_id) -> None:
+    # Al borrar un acto en cascada también se borran sus papeletas y puestos
+    if Acto.objects.filter(pk=acto_id).exists():
+        recalcular_estadisticas_acto(acto_id)
+
+
+def marcar_para_recalculo(acto_id) -> None:
+    """
+    Una papeleta del acto ha cambiado: al confirmar la transacción se recalculan sus
+    estadísticas, salvo que antes un servicio haya sumado su transición.
+    """
+    _actos_pendientes().add(acto_id)
+
+    def recalcular_si_pendiente():
+        pendientes = _actos_pendientes()
+        if acto_id in pendientes:
+            pendientes.discard(acto_id)
+            _recalcular_si_existe(acto_id)
+
+    transaction.on_commit(recalcular_si_pendiente)
+
+
+def programar_recalculo(acto_id) -> None:
+    """Recalcula las estadísticas del acto al confirmar la transacción (cambios en sus puestos)."""
+    transaction.on_commit(lambda: _recalcular_si_existe(acto_id))
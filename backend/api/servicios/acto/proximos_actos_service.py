@@ -0,0 +1,101 @@
+import math
+import uuid
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.utils import timezone
+
+from api.models import Acto, TipoActo
+from api.serializadores.acto.proximos_actos_serializer import ActoCultoCardSerializer
+
+
+# -----------------------------------------------------------------------------
+# CACHÉ DE LOS WIDGETS DE PRÓXIMOS ACTOS (dashboard)
+#
+# El resultado solo cambia cuando se crea, edita o borra un acto (las señales llaman a
+# `invalidar_proximos_actos`) o cuando pasa la fecha del primer acto devuelto, que deja
+# de ser futuro. Por eso cada entrada caduca justo después de esa fecha. Las claves
+# llevan una versión para que una lectura lenta anterior a la invalidación no pueda
+# dejar datos viejos bajo la clave nueva.
+#
+# La invalidación solo llega a los demás procesos si la caché es compartida (Redis,
+# Memcached, BD). settings.py no configura `CACHES`, así que por defecto es LocMemCache,
+# una por proceso: con varios workers, un acto modificado en uno no invalida a los
+# demás. En ese caso ninguna entrada dura más de `TTL_CACHE_LOCAL` segundos, igual que
+# hace `CATALOGOS_TTL` con los catálogos. `PROXIMOS_ACTOS_TTL` fija el tope a mano.
+# -----------------------------------------------------------------------------
+CLAVE_VERSION = 'actos:proximos:version'
+NUMERO_PROXIMOS_ACTOS = 3
+TTL_MAXIMO = 60 * 60 * 24
+TTL_CACHE_LOCAL = 300
+
+
+def _clave(nombre) -> str:
+    version = cache.get(CLAVE_VERSION)
+    if version is None:
+        cache.add(CLAVE_VERSION, uuid.uuid4().hex, None)
+        version = cache.get(CLAVE_VERSION)
+    return f'actos:{nombre}:{version}'
+
+
+def ttl_maximo() -> int:
+    """Tope de vida de una entrada: un día con caché compartida, `TTL_CACHE_LOCAL` si es por proceso."""
+    ttl = getattr(settings, 'PROXIMOS_ACTOS_TTL', None)
+    if ttl is not None:
+        return ttl
+    return TTL_CACHE_LOCAL if isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache) else TTL_MAXIMO
+
+
+def ttl_hasta(fecha, ahora) -> int:
+    """Segundos hasta que `fecha` deja de cumplir `fecha >= ahora` (con el tope de `ttl_maximo`)."""
+    tope = ttl_maximo()
+    if fecha is None:
+        return tope
+    return max(1, min(tope, math.ceil((fecha - ahora).total_seconds()) + 1))
+
+
+def invalidar_proximos_actos():
+    """Cambia la versión de las claves; se repite al confirmar la transacción que modificó el acto."""
+    def invalidar():
+        cache.set(CLAVE_VERSION, uuid.uuid4().hex, None)
+
+    invalidar()
+    transaction.on_commit(invalidar)
+
+
+def obtener_proximos_actos() -> list:
+    """Los `NUMERO_PROXIMOS_ACTOS` actos futuros más cercanos, ya serializados para las tarjetas."""
+    clave = _clave('proximos')
+    datos = cache.get(clave)
+    if datos is not None:
+        return datos
+
+    ahora = timezone.now()
+    actos = list(
+        Acto.objects.filter(fecha__gte=ahora).only('id', 'nombre', 'fecha', 'lugar').order_by('fecha')[:NUMERO_PROXIMOS_ACTOS]
+    )
+    datos = list(ActoCultoCardSerializer(actos, many=True).data)
+
+    cache.set(clave, datos, ttl_hasta(actos[0].fecha if actos else None, ahora))
+    return datos
+
+
+def obtener_proxima_estacion_penitencia():
+    """La próxima Estación de Penitencia serializada, o None si no hay ninguna programada."""
+    clave = _clave('proxima-estacion')
+    entrada = cache.get(clave)
+    if entrada is not None:
+        return entrada['acto']
+
+    ahora = timezone.now()
+    acto = Acto.objects.filter(
+        tipo_acto__tipo=TipoActo.OpcionesTipo.ESTACION_PENITENCIA,
+        fecha__gte=ahora
+    ).only('id', 'nombre', 'fecha', 'lugar').order_by('fecha').first()
+    datos = dict(ActoCultoCardSerializer(acto).data) if acto else None
+
+    # Se envuelve en un dict para distinguir "no hay estación" de "no está en caché".
+    cache.set(clave, {'acto': datos}, ttl_hasta(acto.fecha if acto else None, ahora))
+    return datos
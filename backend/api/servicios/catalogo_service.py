@@ -0,0 +1,116 @@
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from api.models import AreaInteres, CuerpoPertenencia, TipoActo, TipoPuesto
+
+
+# -----------------------------------------------------------------------------
+# CACHÉ EN PROCESO DE LOS CATÁLOGOS
+#
+# Tipos de acto, tipos de puesto, áreas de interés y cuerpos casi nunca cambian, pero
+# se consultan en cada petición (listados para los selectores y resolución de los
+# SlugRelatedField). Cada proceso guarda una copia en memoria asociada a una versión
+# global que vive en la caché de Django (`CLAVE_VERSION`); cualquier escritura en un
+# catálogo cambia la versión (ver api.signals) y todos los procesos recargan en la
+# siguiente lectura. `CATALOGOS_TTL` acota lo que puede durar una copia si la caché
+# configurada no es compartida entre procesos (LocMemCache).
+#
+# Con una caché compartida leer la versión es un viaje de red, así que cada proceso
+# la comprueba como mucho cada `CATALOGOS_INTERVALO_VERSION` segundos: los cambios
+# de otro proceso se ven con ese retraso; los del propio proceso, al momento.
+# -----------------------------------------------------------------------------
+MODELOS_CATALOGO = (TipoActo, TipoPuesto, AreaInteres, CuerpoPertenencia)
+
+CLAVE_VERSION = 'catalogos:version'
+TTL_POR_DEFECTO = 300
+INTERVALO_VERSION_POR_DEFECTO = 2
+
+_catalogos = {}
+_cerrojo = threading.Lock()
+_version_leida = (None, 0.0)
+
+
+class Catalogo:
+    """Copia inmutable de una tabla de catálogo: instancias en orden de pk e índices por campo."""
+
+    def __init__(self, instancias, version):
+        self.instancias = tuple(instancias)
+        self.version = version
+        self.cargado = time.monotonic()
+        self.por_pk = {instancia.pk: instancia for instancia in self.instancias}
+        self._indices = {}
+
+    def por(self, campo) -> dict:
+        """Índice `valor del campo (str) -> instancia`, construido la primera vez que se pide."""
+        indice = self._indices.get(campo)
+        if indice is None:
+            indice = {str(getattr(instancia, campo)): instancia for instancia in self.instancias}
+            self._indices[campo] = indice
+        return indice
+
+
+def version_catalogos() -> str:
+    """Versión global de los catálogos, leída de la caché como mucho una vez por intervalo."""
+    global _version_leida
+
+    version, leida = _version_leida
+    ahora = time.monotonic()
+    if version is not None and ahora - leida < getattr(settings, 'CATALOGOS_INTERVALO_VERSION', INTERVALO_VERSION_POR_DEFECTO):
+        return version
+
+    version = cache.get(CLAVE_VERSION)
+    if version is None:
+        cache.add(CLAVE_VERSION, uuid.uuid4().hex, None)
+        version = cache.get(CLAVE_VERSION)
+
+    _version_leida = (version, ahora)
+    return version
+
+
+def invalidar_catalogos():
+    """
+    Cambia la versión global y descarta la copia de este proceso. Se repite al confirmar
+    la transacción para que ningún proceso se quede con datos leídos antes del commit.
+    """
+    def invalidar():
+        global _version_leida
+
+        version = uuid.uuid4().hex
+        cache.set(CLAVE_VERSION, version, None)
+        with _cerrojo:
+            _version_leida = (version, time.monotonic())
+            _catalogos.clear()
+
+    invalidar()
+    transaction.on_commit(invalidar)
+
+
+def obtener_catalogo(modelo) -> Catalogo:
+    if modelo not in MODELOS_CATALOGO:
+        raise ValueError(f"{modelo.__name__} no es un catálogo.")
+
+    version = version_catalogos()
+    ttl = getattr(settings, 'CATALOGOS_TTL', TTL_POR_DEFECTO)
+
+    catalogo = _catalogos.get(modelo)
+    if catalogo is not None and catalogo.version == version and time.monotonic() - catalogo.cargado < ttl:
+        return catalogo
+
+    catalogo = Catalogo(modelo.objects.order_by('pk'), version)
+    with _cerrojo:
+        _catalogos[modelo] = catalogo
+
+    return catalogo
+
+
+def obtener_instancia(modelo, pk):
+    """Instancia del catálogo por pk; si la copia en memoria no la tiene, la busca en la BD."""
+    instancia = obtener_catalogo(modelo).por_pk.get(pk)
+    if instancia is None and pk is not None:
+        instancia = modelo.objects.get(pk=pk)
+    return instancia
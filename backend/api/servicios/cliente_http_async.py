@@ -0,0 +1,25 @@
+import asyncio
+import weakref
+
+import httpx
+
+
+_clientes = weakref.WeakKeyDictionary()
+
+
+def obtener_cliente_http_async() -> httpx.AsyncClient:
+    """
+    Cliente HTTP asíncrono compartido (Telegram y demás llamadas externas de las vistas ASGI).
+
+    Un `httpx.AsyncClient` queda ligado al bucle de eventos en el que abre sus conexiones,
+    así que se mantiene uno por bucle: en producción (un bucle por worker ASGI) es
+    siempre el mismo y reutiliza las conexiones keep-alive entre peticiones.
+    """
+    bucle = asyncio.get_running_loop()
+    cliente = _clientes.get(bucle)
+
+    if cliente is None or cliente.is_closed:
+        cliente = httpx.AsyncClient(timeout=10)
+        _clientes[bucle] = cliente
+
+    return cliente
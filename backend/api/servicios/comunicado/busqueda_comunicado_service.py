@@ -0,0 +1,212 @@
+import re
+from abc import ABC, abstractmethod
+
+from django.db import connection
+from django.db.models import Q
+from django.utils.html import escape
+
+from api.models import BusquedaComunicado, Comunicado
+from api.servicios.comunicado.feed_comunicado_service import CAMPOS_DIFERIDOS_LISTADO, filtrar_por_audiencia, mascara_feed_usuario
+from api.servicios.comunicado.indice_lexico_service import PATRON_TOKEN, STOPWORDS_ES, normalizar_texto
+from api.servicios.comunicado.resumen_comunicado_service import texto_plano
+
+
+MAX_TERMINOS_CONSULTA = 8
+LONGITUD_FRAGMENTO = 180
+
+
+# -----------------------------------------------------------------------------
+# MANTENIMIENTO DEL ÍNDICE (llamado desde api/signals.py)
+# -----------------------------------------------------------------------------
+def indexar_busqueda(comunicado) -> None:
+    """Escribe la fila de búsqueda del comunicado en la misma transacción que el propio comunicado."""
+    BusquedaComunicado.objects.update_or_create(
+        comunicado_id=comunicado.pk,
+        defaults={'titulo': comunicado.titulo, 'texto': texto_plano(comunicado.contenido)},
+    )
+
+
+def reconstruir_busqueda() -> int:
+    """Vuelve a generar todas las filas de búsqueda (los triggers/FULLTEXT actualizan el índice)."""
+    BusquedaComunicado.objects.all().delete()
+
+    documentos = [
+        BusquedaComunicado(comunicado_id=com_id, titulo=titulo, texto=texto_plano(contenido))
+        for com_id, titulo, contenido in Comunicado.objects.values_list('id', 'titulo', 'contenido').iterator()
+    ]
+    BusquedaComunicado.objects.bulk_create(documentos, batch_size=500)
+
+    return len(documentos)
+
+
+# -----------------------------------------------------------------------------
+# MOTORES DE BÚSQUEDA (uno por base de datos)
+# -----------------------------------------------------------------------------
+class MotorBusqueda(ABC):
+    """
+    Devuelve `[(comunicado_id, puntuacion)]` de los comunicados que contienen todos los
+    términos (como prefijo) y comparten audiencia con `mascara`, del más al menos relevante.
+    Las subclases traducen la consulta a la sintaxis de texto completo de su base de datos.
+    """
+
+    @abstractmethod
+    def buscar(self, terminos: list[str], mascara: int, limite: int) -> list[tuple[int, float]]:
+        ...
+
+
+class MotorBusquedaMySQL(MotorBusqueda):
+    """Índice FULLTEXT de InnoDB sobre (titulo, texto) en modo booleano: `+termino*` obliga a que aparezca."""
+
+    SQL = """
+        SELECT b.comunicado_id, MATCH(b.titulo, b.texto) AGAINST (%s IN BOOLEAN MODE) AS puntuacion
+        FROM api_busquedacomunicado b
+        JOIN api_comunicado c ON c.id = b.comunicado_id
+        WHERE MATCH(b.titulo, b.texto) AGAINST (%s IN BOOLEAN MODE)
+          AND (c.mascara_audiencia & %s) <> 0
+        ORDER BY puntuacion DESC, c.fecha_emision DESC
+        LIMIT %s
+    """
+
+    def buscar(self, terminos, mascara, limite):
+        expresion = ' '.join(f'+{termino}*' for termino in terminos)
+
+        with connection.cursor() as cursor:
+            cursor.execute(self.SQL, [expresion, expresion, mascara, limite])
+            return [(com_id, float(puntuacion)) for com_id, puntuacion in cursor.fetchall()]
+
+
+class MotorBusquedaSQLite(MotorBusqueda):
+    """Tabla FTS5 con BM25; el título pesa más que el cuerpo."""
+
+    SQL = """
+        SELECT f.rowid, bm25(api_busquedacomunicado_fts, 5.0, 1.0) AS rango
+        FROM api_busquedacomunicado_fts f
+        JOIN api_comunicado c ON c.id = f.rowid
+        WHERE api_busquedacomunicado_fts MATCH %s
+          AND (c.mascara_audiencia & %s) <> 0
+        ORDER BY rango, c.fecha_emision DESC
+        LIMIT %s
+    """
+
+    def buscar(self, terminos, mascara, limite):
+        expresion = ' '.join(f'"{termino}"*' for termino in terminos)
+
+        with connection.cursor() as cursor:
+            cursor.execute(self.SQL, [expresion, mascara, limite])
+            # bm25() es menor cuanto más relevante: se invierte el signo
+            return [(com_id, -rango) for com_id, rango in cursor.fetchall()]
+
+
+class MotorBusquedaBasico(MotorBusqueda):
+    """Respaldo para otras bases de datos: LIKE por término, sin ranking (los más recientes primero)."""
+
+    def buscar(self, terminos, mascara, limite):
+        documentos = BusquedaComunicado.objects.all()
+        for termino in terminos:
+            documentos = documentos.filter(Q(titulo__icontains=termino) | Q(texto__icontains=termino))
+
+        comunicados = filtrar_por_audiencia(Comunicado.objects.filter(documento_busqueda__in=documentos), mascara)
+
+        return [(com_id, 0.0) for com_id in comunicados.order_by('-fecha_emision').values_list('id', flat=True)[:limite]]
+
+
+MOTORES = {
+    'mysql': MotorBusquedaMySQL,
+    'sqlite': MotorBusquedaSQLite,
+}
+
+
+def obtener_motor_busqueda() -> MotorBusqueda:
+    return MOTORES.get(connection.vendor, MotorBusquedaBasico)()
+
+
+# -----------------------------------------------------------------------------
+# RESALTADO DE FRAGMENTOS
+# -----------------------------------------------------------------------------
+def _plegar(texto: str) -> str:
+    """Como `normalizar_texto` pero carácter a carácter, para que las posiciones coincidan con el original."""
+    return ''.join((normalizar_texto(c)[:1] or c) if ord(c) > 127 else c.lower() for c in texto)
+
+
+def _resaltar(texto: str, patron) -> str:
+    plegado = _plegar(texto)
+    partes, cursor = [], 0
+
+    for coincidencia in patron.finditer(plegado):
+        inicio, fin = coincidencia.span()
+        partes.append(escape(texto[cursor:inicio]))
+        partes.append(f"<mark>{escape(texto[inicio:fin])}</mark>")
+        cursor = fin
+
+    partes.append(escape(texto[cursor:]))
+    return ''.join(partes)
+
+
+def _patron_terminos(terminos):
+    return re.compile(r'\b(?:' + '|'.join(map(re.escape, terminos)) + r')\w*')
+
+
+def resaltar_fragmento(texto: str, terminos: list[str], longitud: int = LONGITUD_FRAGMENTO) -> str:
+    """
+    Fragmento de `texto` de unos `longitud` caracteres centrado en la primera coincidencia,
+    escapado para HTML y con los términos encontrados entre <mark></mark>.
+    """
+    patron = _patron_terminos(terminos)
+    primera = patron.search(_plegar(texto))
+
+    inicio = 0
+    if primera and len(texto) > longitud:
+        inicio = max(0, min(primera.start() - longitud // 3, len(texto) - longitud))
+        # No cortar palabras por la mitad
+        espacio = texto.rfind(' ', 0, inicio + 1)
+        inicio = espacio + 1 if inicio and espacio != -1 else inicio
+
+    fragmento = texto[inicio:inicio + longitud]
+    if inicio + longitud < len(texto):
+        fragmento = fragmento.rsplit(' ', 1)[0]
+
+    prefijo = '… ' if inicio else ''
+    sufijo = ' …' if inicio + len(fragmento) < len(texto) else ''
+
+    return prefijo + _resaltar(fragmento, patron) + sufijo
+
+
+# -----------------------------------------------------------------------------
+# BÚSQUEDA
+# -----------------------------------------------------------------------------
+def terminos_consulta(consulta: str) -> list[str]:
+    """Términos de la consulta sin tildes ni palabras vacías, sin repetir y en su orden."""
+    terminos = [t for t in PATRON_TOKEN.findall(normalizar_texto(consulta or '')) if t not in STOPWORDS_ES]
+    return list(dict.fromkeys(terminos))[:MAX_TERMINOS_CONSULTA]
+
+
+def buscar_comunicados(usuario, consulta: str, limite: int = 20) -> list[Comunicado]:
+    """
+    Busca en los comunicados dirigidos al hermano (sus áreas más TODOS_HERMANOS).
+    Devuelve los comunicados por relevancia con tres atributos añadidos: `puntuacion`,
+    `titulo_resaltado` y `fragmento` (HTML escapado con las coincidencias en <mark>).
+    """
+    terminos = terminos_consulta(consulta)
+    if not terminos:
+        return []
+
+    resultados = obtener_motor_busqueda().buscar(terminos, mascara_feed_usuario(usuario), limite)
+    if not resultados:
+        return []
+
+    ids = [com_id for com_id, _ in resultados]
+    comunicados = Comunicado.objects.select_related('documento_busqueda').defer(*CAMPOS_DIFERIDOS_LISTADO).in_bulk(ids)
+
+    patron = _patron_terminos(terminos)
+    encontrados = []
+    for com_id, puntuacion in resultados:
+        comunicado = comunicados.get(com_id)
+        if comunicado is None:
+            continue
+
+        comunicado.puntuacion = puntuacion
+        comunicado.titulo_resaltado = _resaltar(comunicado.titulo, patron)
+        comunicado.fragmento = resaltar_fragmento(comunicado.documento_busqueda.texto, terminos)
+        encontrados.append(comunicado)
+
+    return encontrados
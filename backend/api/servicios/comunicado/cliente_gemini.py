@@ -0,0 +1,61 @@
+import threading
+
+import httpx
+from django.conf import settings
+from google import genai
+from google.genai import types
+
+from api.servicios.comunicado.cliente_gemini_falso import ClienteGeminiFalso
+
+
+MODELO_EMBEDDING = 'gemini-embedding-001'
+MODELO_GENERACION = 'gemini-2.5-flash'
+
+_cliente = None
+_lock = threading.Lock()
+
+
+def _construir_cliente():
+    if getattr(settings, 'GEMINI_BACKEND', 'google') == 'falso':
+        return ClienteGeminiFalso(latencia_ms=getattr(settings, 'GEMINI_FALSO_LATENCIA_MS', 0))
+
+    timeout = getattr(settings, 'GEMINI_TIMEOUT_SEGUNDOS', 30)
+    max_conexiones = getattr(settings, 'GEMINI_MAX_CONEXIONES', 10)
+
+    limites = httpx.Limits(max_connections=max_conexiones, max_keepalive_connections=max_conexiones)
+
+    # `client.aio` (vistas ASGI) usa su propio pool asíncrono con los mismos límites
+    return genai.Client(
+        api_key=settings.GEMINI_API_KEY,
+        http_options=types.HttpOptions(
+            timeout=int(timeout * 1000),
+            client_args={'limits': limites},
+            async_client_args={'limits': limites},
+        ),
+    )
+
+
+def obtener_cliente_gemini():
+    """
+    Devuelve el cliente de Gemini compartido por todo el proceso.
+
+    Se crea de forma perezosa en la primera llamada (después del fork de los workers
+    de gunicorn), de modo que las peticiones posteriores reutilizan las conexiones
+    HTTP abiertas en lugar de repetir la construcción del cliente y el handshake TLS.
+    """
+    global _cliente
+
+    if _cliente is None:
+        with _lock:
+            if _cliente is None:
+                _cliente = _construir_cliente()
+
+    return _cliente
+
+
+def reiniciar_cliente_gemini():
+    """Descarta el cliente compartido; el siguiente uso construirá uno nuevo (útil en tests)."""
+    global _cliente
+
+    with _lock:
+        _cliente = None
@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+import math
+import re
+import time
+from types import SimpleNamespace
+
+from api.servicios.comunicado.indice_lexico_service import tokenizar
+
+
+DIMENSION_EMBEDDING_FALSO = 256
+
+PATRON_TITULO_PROMPT = re.compile(r"--- COMUNICADO: (.+?) \(Fecha:")
+
+
+def embedding_por_hash(texto: str, dimension: int = DIMENSION_EMBEDDING_FALSO) -> list[float]:
+    """
+    Vector determinista a partir de los términos del texto (feature hashing).
+    Textos que comparten vocabulario quedan cerca en coseno, lo que basta para
+    medir la recuperación sin depender de la red.
+    """
+    vector = [0.0] * dimension
+
+    for termino in tokenizar(texto):
+        huella = hashlib.blake2b(termino.encode('utf-8'), digest_size=8).digest()
+        posicion = int.from_bytes(huella[:4], 'little') % dimension
+        signo = 1.0 if huella[4] & 1 else -1.0
+        vector[posicion] += signo
+
+    norma = math.sqrt(sum(v * v for v in vector))
+    if not norma:
+        return vector
+
+    return [v / norma for v in vector]
+
+
+class _ModelosFalsos:
+
+    def __init__(self, latencia_ms: float = 0):
+        self.latencia_ms = latencia_ms
+
+    def _esperar(self):
+        if self.latencia_ms:
+            time.sleep(self.latencia_ms / 1000)
+
+    def embed_content(self, model, contents, config=None):
+        self._esperar()
+
+        textos = [contents] if isinstance(contents, str) else list(contents)
+
+        return SimpleNamespace(
+            embeddings=[SimpleNamespace(values=embedding_por_hash(texto)) for texto in textos]
+        )
+
+    def _responder(self, prompt: str) -> str:
+        titulos = PATRON_TITULO_PROMPT.findall(prompt)
+
+        if not titulos:
+            return "Lo siento, no encuentro información sobre esa consulta en los comunicados recientes."
+
+        return f"Según el comunicado \"{titulos[0]}\", esta es una respuesta simulada ({len(prompt)} caracteres de contexto)."
+
+    def generate_content(self, model, contents, config=None):
+        self._esperar()
+        return SimpleNamespace(text=self._responder(contents))
+
+    def generate_content_stream(self, model, contents, config=None):
+        self._esperar()
+
+        for palabra in re.findall(r"\S+\s*", self._responder(contents)):
+            yield SimpleNamespace(text=palabra)
+
+
+class _ModelosFalsosAsincronos:
+    """Equivalente a `client.aio.models`: misma respuesta, esperando con asyncio en lugar de bloquear."""
+
+    def __init__(self, modelos: _ModelosFalsos):
+        self._modelos = modelos
+
+    async def _esperar(self):
+        if self._modelos.latencia_ms:
+            await asyncio.sleep(self._modelos.latencia_ms / 1000)
+
+    async def embed_content(self, model, contents, config=None):
+        await self._esperar()
+        textos = [contents] if isinstance(contents, str) else list(contents)
+
+        return SimpleNamespace(
+            embeddings=[SimpleNamespace(values=embedding_por_hash(texto)) for texto in textos]
+        )
+
+    async def generate_content(self, model, contents, config=None):
+        await self._esperar()
+        return SimpleNamespace(text=self._modelos._responder(contents))
+
+    async def generate_content_stream(self, model, contents, config=None):
+        # Como en el SDK: se espera la llamada y se recorre el iterador asíncrono que devuelve
+        await self._esperar()
+
+        async def trozos():
+            for palabra in re.findall(r"\S+\s*", self._modelos._responder(contents)):
+                yield SimpleNamespace(text=palabra)
+
+        return trozos()
+
+
+class ClienteGeminiFalso:
+    """
+    Sustituto local y determinista del cliente de Gemini, con la misma forma que
+    `genai.Client` en lo que usa la aplicación (`client.models.embed_content`,
+    `generate_content` y `generate_content_stream`, y sus variantes en `client.aio`).
+
+    Se activa con GEMINI_BACKEND = 'falso'. GEMINI_FALSO_LATENCIA_MS añade una
+    espera artificial a cada llamada para simular la red.
+    """
+
+    def __init__(self, latencia_ms: float = 0):
+        self.models = _ModelosFalsos(latencia_ms)
+        self.aio = SimpleNamespace(models=_ModelosFalsosAsincronos(self.models))
@@ -1,8 +1,14 @@
 import math
-from google import genai
-from google.genai import types
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from google.genai import types
 from api.models import Comunicado
+from api.servicios.comunicado.cliente_gemini import MODELO_EMBEDDING, MODELO_GENERACION, obtener_cliente_gemini
+from api.servicios.comunicado.feed_comunicado_service import MASCARA_TODOS_HERMANOS, filtrar_por_audiencia, mascara_feed_usuario
+from api.servicios.comunicado.indice_lexico_service import (
+    leer_firma_comunicados, obtener_indice_comunicados, particiones_usuario, tokenizar,
+)
+from api.servicios.comunicado.indice_vectorial_service import cuantizacion_activa, obtener_indice_vectorial
 
 def calcular_similitud_coseno(vec1: list[float], vec2: list[float]) -> float:
     if not vec1 or not vec2: return 0.0
@@ -12,52 +18,163 @@ def calcular_similitud_coseno(vec1: list[float], vec2: list[float]) -> float:
     if not magnitude1 or not magnitude2: return 0.0
     return dot_product / (magnitude1 * magnitude2)
 
+
+def fusionar_rankings(*rankings: dict, k: int = 60) -> list[int]:
+    """
+    Reciprocal Rank Fusion: combina varias listas de puntuaciones {id: score}
+    usando solo la posición de cada documento en cada ranking, lo que evita
+    tener que normalizar escalas tan distintas como el coseno y BM25.
+    """
+    fusion = {}
+    for ranking in rankings:
+        ordenados = sorted(ranking.items(), key=lambda x: x[1], reverse=True)
+        for posicion, (doc_id, _) in enumerate(ordenados, start=1):
+            fusion[doc_id] = fusion.get(doc_id, 0.0) + 1.0 / (k + posicion)
+
+    return [doc_id for doc_id, _ in sorted(fusion.items(), key=lambda x: x[1], reverse=True)]
+
+
 class ComunicadoRAGService:
+    NUM_COMUNICADOS_CONTEXTO = 3
+    MENSAJE_SIN_COMUNICADOS = "Lo siento, actualmente no hay comunicados vectorizados en la base de datos."
+    MENSAJE_SIN_INFORMACION = "Lo siento, no encuentro información sobre esa consulta en los comunicados recientes."
+
     def __init__(self):
-        # Usamos el nuevo cliente
-        self.client = genai.Client(api_key=settings.GEMINI_API_KEY)
-        
-    def _recuperar_contexto_semantico(self, pregunta: str) -> str:
+        # Cliente compartido por el proceso: reutiliza las conexiones entre peticiones
+        self.client = obtener_cliente_gemini()
+
+    def _vectorizar_pregunta(self, pregunta: str):
         try:
             # Nueva sintaxis para embeddings
             resultado = self.client.models.embed_content(
-                model='gemini-embedding-001',
+                model=MODELO_EMBEDDING,
                 contents=pregunta,
                 config=types.EmbedContentConfig(task_type="RETRIEVAL_QUERY")
             )
             # Accedemos a los valores del vector
-            vector_pregunta = resultado.embeddings[0].values
+            return resultado.embeddings[0].values
         except Exception as e:
             print(f"Error vectorizando la pregunta: {e}")
-            return ""
+            return None
 
-        comunicados = Comunicado.objects.filter(embedding__isnull=False).only('titulo', 'contenido', 'fecha_emision', 'embedding')
-        
-        resultados_puntuados = []
-        for com in comunicados:
-            similitud = calcular_similitud_coseno(vector_pregunta, com.embedding)
-            resultados_puntuados.append((similitud, com))
-            
-        resultados_puntuados.sort(key=lambda x: x[0], reverse=True)
-        top_comunicados = [item[1] for item in resultados_puntuados[:3]]
+    async def _avectorizar_pregunta(self, pregunta: str):
+        try:
+            resultado = await self.client.aio.models.embed_content(
+                model=MODELO_EMBEDDING,
+                contents=pregunta,
+                config=types.EmbedContentConfig(task_type="RETRIEVAL_QUERY")
+            )
+            return resultado.embeddings[0].values
+        except Exception as e:
+            print(f"Error vectorizando la pregunta: {e}")
+            return None
+
+    def _obtener_indices(self):
+        """
+        Índices léxico y vectorial (None sin cuantización) de la petición. Sus firmas se
+        comprueban con una única lectura de la BD y se reutilizan en toda la recuperación.
+        """
+        datos_firma = leer_firma_comunicados()
+        indice_vectorial = obtener_indice_vectorial(datos_firma) if cuantizacion_activa() else None
+
+        return obtener_indice_comunicados(datos_firma), indice_vectorial
+
+    def _puntuar_por_vector(self, vector_pregunta, particiones=None, mascara=None, indices=None) -> dict[int, float]:
+        if vector_pregunta is None:
+            return {}
+
+        vectores = Comunicado.objects.filter(embedding__isnull=False)
+        indice_lexico, indice_vectorial = indices or self._obtener_indices()
+
+        if indice_vectorial is not None:
+            # Primera pasada sobre los vectores compactos en memoria, limitada a las particiones
+            # del hermano; solo los mejores se leen de la BD y se repuntúan con el embedding completo
+            candidatos = None if particiones is None else indice_lexico.documentos(particiones)
+            vectores = vectores.filter(id__in=indice_vectorial.mejores(
+                vector_pregunta, settings.RAG_CANDIDATOS_REPUNTUACION, candidatos
+            ))
+        elif mascara is not None:
+            # El mismo predicado bit a bit que el tablón, sin pasar una lista de ids a la consulta
+            vectores = filtrar_por_audiencia(vectores, mascara)
+
+        vectores = vectores.values_list('id', 'embedding')
+
+        return {
+            com_id: calcular_similitud_coseno(vector_pregunta, embedding)
+            for com_id, embedding in vectores
+        }
+
+    def _seleccionar_audiencia(self, usuario, indice_lexico):
+        """
+        Devuelve (particiones, máscara) de los comunicados que puede ver el hermano: las áreas
+        que sigue más TODOS_HERMANOS. Sin usuario ambos son None y se busca en todo el índice.
+        Si el hermano no tiene ningún comunicado visible devuelve None.
+        """
+        particiones = particiones_usuario(usuario)
+
+        if particiones is None:
+            return None, None
+
+        if not indice_lexico.hay_documentos(particiones):
+            return None
+
+        mascara = mascara_feed_usuario(usuario) if usuario.is_authenticated else MASCARA_TODOS_HERMANOS
+
+        return particiones, mascara
+
+    def _preparar_recuperacion(self, usuario):
+        """Índices de la petición y audiencia del hermano (None si no tiene comunicados visibles)."""
+        indices = self._obtener_indices()
+
+        return indices, self._seleccionar_audiencia(usuario, indices[0])
+
+    def _clasificar(self, pregunta: str, particiones, mascara, vector_pregunta, indices) -> list[Comunicado]:
+        ranking_ids = fusionar_rankings(
+            self._puntuar_por_vector(vector_pregunta, particiones, mascara, indices),
+            # BM25 sobre título y contenido (coincidencias exactas de nombres, fechas y números)
+            indices[0].buscar(tokenizar(pregunta), particiones),
+        )[:self.NUM_COMUNICADOS_CONTEXTO]
+
+        comunicados = Comunicado.objects.only('titulo', 'contenido', 'fecha_emision').in_bulk(ranking_ids)
+
+        return [comunicados[com_id] for com_id in ranking_ids if com_id in comunicados]
+
+    def _recuperar_comunicados(self, pregunta: str, usuario=None) -> list[Comunicado]:
+        """Recupera los comunicados más relevantes entre los dirigidos al hermano."""
+        indices, audiencia = self._preparar_recuperacion(usuario)
+
+        if audiencia is None:
+            return []
+
+        return self._clasificar(pregunta, *audiencia, self._vectorizar_pregunta(pregunta), indices)
+
+    async def _arecuperar_comunicados(self, pregunta: str, usuario=None) -> list[Comunicado]:
+        """Versión asíncrona: la llamada a Gemini no bloquea el hilo; el acceso a BD va por sync_to_async."""
+        indices, audiencia = await sync_to_async(self._preparar_recuperacion)(usuario)
+
+        if audiencia is None:
+            return []
+
+        vector_pregunta = await self._avectorizar_pregunta(pregunta)
 
+        return await sync_to_async(self._clasificar)(pregunta, *audiencia, vector_pregunta, indices)
+
+    def _construir_contexto(self, comunicados: list[Comunicado]) -> str:
         contexto = ""
-        for com in top_comunicados:
+        for com in comunicados:
             contexto += f"--- COMUNICADO: {com.titulo} (Fecha: {com.fecha_emision.strftime('%d/%m/%Y')}) ---\n"
             contexto += f"{com.contenido}\n\n"
-            
+
         return contexto
 
-    def preguntar_a_comunicados(self, pregunta_usuario: str) -> str:
-        contexto_textual = self._recuperar_contexto_semantico(pregunta_usuario)
-        
-        if not contexto_textual.strip():
-            return "Lo siento, actualmente no hay comunicados vectorizados en la base de datos."
+    def _recuperar_contexto_semantico(self, pregunta: str, usuario=None) -> str:
+        return self._construir_contexto(self._recuperar_comunicados(pregunta, usuario))
 
-        prompt_estricto = f"""
-        Eres el asistente virtual oficial de la Hermandad. 
+    def _construir_prompt(self, contexto_textual: str, pregunta_usuario: str) -> str:
+        return f"""
+        Eres el asistente virtual oficial de la Hermandad.
         Tu tarea es responder a la pregunta del hermano utilizando ÚNICAMENTE la información proporcionada en el bloque "COMUNICADOS OFICIALES".
-        Si la respuesta no se encuentra en el texto proporcionado, responde EXACTAMENTE: "Lo siento, no encuentro información sobre esa consulta en los comunicados recientes."
+        Si la respuesta no se encuentra en el texto proporcionado, responde EXACTAMENTE: "{self.MENSAJE_SIN_INFORMACION}"
 
         COMUNICADOS OFICIALES:
         {contexto_textual}
@@ -66,12 +183,110 @@ class ComunicadoRAGService:
         {pregunta_usuario}
         """
 
+    def preguntar_a_comunicados(self, pregunta_usuario: str, usuario=None) -> str:
+        contexto_textual = self._recuperar_contexto_semantico(pregunta_usuario, usuario)
+
+        if not contexto_textual.strip():
+            return self.MENSAJE_SIN_COMUNICADOS
+
+        prompt_estricto = self._construir_prompt(contexto_textual, pregunta_usuario)
+
         try:
             # Nueva sintaxis para generar texto (usamos gemini-2.5-flash que es el más rápido y moderno)
             respuesta = self.client.models.generate_content(
-                model='gemini-2.5-flash',
+                model=MODELO_GENERACION,
                 contents=prompt_estricto
             )
             return respuesta.text
         except Exception as e:
-            raise Exception(f"Error al generar la respuesta con la IA: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Error al generar la respuesta con la IA: {str(e)}")
+
+    async def apreguntar_a_comunicados(self, pregunta_usuario: str, usuario=None) -> str:
+        """Versión asíncrona de `preguntar_a_comunicados` para las vistas ASGI."""
+        contexto_textual = self._construir_contexto(await self._arecuperar_comunicados(pregunta_usuario, usuario))
+
+        if not contexto_textual.strip():
+            return self.MENSAJE_SIN_COMUNICADOS
+
+        prompt_estricto = self._construir_prompt(contexto_textual, pregunta_usuario)
+
+        try:
+            respuesta = await self.client.aio.models.generate_content(
+                model=MODELO_GENERACION,
+                contents=prompt_estricto
+            )
+            return respuesta.text
+        except Exception as e:
+            raise Exception(f"Error al generar la respuesta con la IA: {str(e)}")
+
+    def preguntar_a_comunicados_stream(self, pregunta_usuario: str, usuario=None):
+        """
+        Variante en streaming de `preguntar_a_comunicados`. Es un generador de
+        tuplas (evento, datos):
+
+        - ("contexto", {"comunicados": [...]}) con los comunicados recuperados, siempre primero.
+        - ("fragmento", {"texto": ...}) por cada trozo de respuesta que entrega el modelo.
+        - ("fin", {}) al terminar, o ("error", {"detail": ...}) si la generación falla.
+        """
+        comunicados = self._recuperar_comunicados(pregunta_usuario, usuario)
+
+        yield self._evento_contexto(comunicados)
+
+        if not comunicados:
+            yield "fragmento", {"texto": self.MENSAJE_SIN_COMUNICADOS}
+            yield "fin", {}
+            return
+
+        prompt_estricto = self._construir_prompt(self._construir_contexto(comunicados), pregunta_usuario)
+
+        try:
+            for trozo in self.client.models.generate_content_stream(
+                model=MODELO_GENERACION,
+                contents=prompt_estricto
+            ):
+                if trozo.text:
+                    yield "fragmento", {"texto": trozo.text}
+        except Exception as e:
+            yield "error", {"detail": f"Error al generar la respuesta con la IA: {str(e)}"}
+            return
+
+        yield "fin", {}
+
+    async def apreguntar_a_comunicados_stream(self, pregunta_usuario: str, usuario=None):
+        """
+        Versión asíncrona de `preguntar_a_comunicados_stream` para las vistas ASGI, con los
+        mismos eventos. Cada fragmento se entrega en cuanto llega de `client.aio`, sin que
+        Django tenga que consumir antes un generador síncrono entero.
+        """
+        comunicados = await self._arecuperar_comunicados(pregunta_usuario, usuario)
+
+        yield self._evento_contexto(comunicados)
+
+        if not comunicados:
+            yield "fragmento", {"texto": self.MENSAJE_SIN_COMUNICADOS}
+            yield "fin", {}
+            return
+
+        prompt_estricto = self._construir_prompt(self._construir_contexto(comunicados), pregunta_usuario)
+
+        try:
+            async for trozo in await self.client.aio.models.generate_content_stream(
+                model=MODELO_GENERACION,
+                contents=prompt_estricto
+            ):
+                if trozo.text:
+                    yield "fragmento", {"texto": trozo.text}
+        except Exception as e:
+            yield "error", {"detail": f"Error al generar la respuesta con la IA: {str(e)}"}
+            return
+
+        yield "fin", {}
+
+    @staticmethod
+    def _evento_contexto(comunicados: list[Comunicado]):
+        return "contexto", {
+            "comunicados": [
+                {"id": com.id, "titulo": com.titulo, "fecha_emision": com.fecha_emision.isoformat()}
+                for com in comunicados
+            ]
+        }
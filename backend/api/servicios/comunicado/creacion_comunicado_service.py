@@ -1,10 +1,14 @@
 from django.db import transaction
 from django.core.exceptions import PermissionDenied
-import requests
 from api.models import AreaInteres, Comunicado, CuerpoPertenencia
-from django.conf import settings
 
 from api.servicios.comunicado.gemini_service import generar_y_guardar_embedding_async
+from api.servicios.comunicado.indice_lexico_service import desindexar_comunicado, indexar_comunicado
+from api.servicios.comunicado.indice_vectorial_service import desindexar_vector_comunicado
+from api.servicios.comunicado.difusion_telegram_service import programar_difusion
+from api.servicios.imagen.derivados_imagen_service import (
+    eliminar_derivados, generar_derivados_imagen_async, programar_derivados_imagen
+)
 
 
 class ComunicadoService:
@@ -26,6 +30,14 @@ class ComunicadoService:
 
     @transaction.atomic
     def create_comunicado(self, usuario, data_validada):
+        comunicado, areas = self._registrar_comunicado(usuario, data_validada)
+
+        programar_difusion(comunicado, self._canales_telegram(areas))
+        self._indexar(comunicado)
+
+        return comunicado
+
+    def _registrar_comunicado(self, usuario, data_validada):
         self._verificar_permisos(usuario)
         
         areas = data_validada.pop('areas_interes', [])
@@ -34,65 +46,25 @@ class ComunicadoService:
         if areas:
             comunicado.areas_interes.set(areas)
 
-        self._notificar_telegram(comunicado, areas)
-        generar_y_guardar_embedding_async(comunicado.id)
+        programar_derivados_imagen(comunicado)
 
-        return comunicado
-    
-    def _notificar_telegram(self, comunicado, areas_ids):
-        """
-        Método auxiliar para enviar notificaciones con o sin imagen.
-        """
+        return comunicado, areas
+
+    def _indexar(self, comunicado):
+        # El hilo del embedding lee el comunicado de la BD: no puede arrancar antes del commit
+        def refrescar_indices():
+            generar_y_guardar_embedding_async(comunicado.id)
+            indexar_comunicado(comunicado)
+
+        transaction.on_commit(refrescar_indices)
+
+    def _canales_telegram(self, areas_ids):
         areas_con_telegram = AreaInteres.objects.filter(
             id__in=[a.id for a in areas_ids], 
             telegram_channel_id__isnull=False
         ).exclude(telegram_channel_id__exact='')
 
-        canales_a_enviar = set(area.telegram_channel_id for area in areas_con_telegram)
-
-        token = getattr(settings, 'TELEGRAM_BOT_TOKEN', None)
-        if not token:
-            print("TELEGRAM_BOT_TOKEN no configurado.")
-            return
-
-        texto_mensaje = f"<b>🔔 Nuevo Comunicado: {comunicado.titulo}</b>\n\n{comunicado.contenido}"
-
-        for channel_id in canales_a_enviar:
-            try:
-                if comunicado.imagen_portada:
-                    url = f"https://api.telegram.org/bot{token}/sendPhoto"
-
-                    caption = texto_mensaje
-                    if len(caption) > 1000:
-                        caption = caption[:1000] + "... (ver web)"
-
-                    payload = {
-                        "chat_id": channel_id,
-                        "caption": caption,
-                        "parse_mode": "HTML"
-                    }
-
-                    with comunicado.imagen_portada.open('rb') as imagen_file:
-                        files = {'photo': imagen_file}
-                        requests.post(url, data=payload, files=files, timeout=10)
-
-                else:
-                    url = f"https://api.telegram.org/bot{token}/sendMessage"
-
-                    mensaje = texto_mensaje
-                    if len(mensaje) > 3000:
-                        mensaje = mensaje[:3000] + "..."
-
-                    payload = {
-                        "chat_id": channel_id,
-                        "text": mensaje,
-                        "parse_mode": "HTML"
-                    }
-                    requests.post(url, data=payload, timeout=5)
-                
-            except Exception as e:
-                print(f"Error enviando telegram al canal {channel_id}: {e}")
-
+        return set(area.telegram_channel_id for area in areas_con_telegram)
 
     @transaction.atomic
     def update_comunicado(self, usuario, comunicado_instance, data_validada):
@@ -101,7 +73,10 @@ class ComunicadoService:
         """
         self._verificar_permisos(usuario)
 
-        if 'areas_interes' in data_validada:
+        imagen_modificada = 'imagen_portada' in data_validada
+
+        areas_modificadas = 'areas_interes' in data_validada
+        if areas_modificadas:
             areas = data_validada.pop('areas_interes')
             comunicado_instance.areas_interes.set(areas)
 
@@ -119,12 +94,22 @@ class ComunicadoService:
             
             setattr(comunicado_instance, attr, value)
 
+        if imagen_modificada:
+            comunicado_instance.imagen_derivados = {}
+            comunicado_instance.telegram_file_id = ''
+
         comunicado_instance.save()
 
-        if generar_nuevo_vector:
-            transaction.on_commit(
-                lambda: generar_y_guardar_embedding_async(comunicado_instance.id)
-            )
+        if generar_nuevo_vector or areas_modificadas or imagen_modificada:
+            def refrescar_indices():
+                if generar_nuevo_vector:
+                    generar_y_guardar_embedding_async(comunicado_instance.id)
+                if generar_nuevo_vector or areas_modificadas:
+                    indexar_comunicado(comunicado_instance)
+                if imagen_modificada and comunicado_instance.imagen_portada:
+                    generar_derivados_imagen_async(Comunicado, comunicado_instance.id)
+
+            transaction.on_commit(refrescar_indices)
             
         return comunicado_instance
 
@@ -137,13 +122,21 @@ class ComunicadoService:
         self._verificar_permisos(usuario)
 
         imagen_adjunta = comunicado_instance.imagen_portada
+        derivados = comunicado_instance.imagen_derivados
+        comunicado_id = comunicado_instance.id
 
+        # La fila de búsqueda se borra en cascada (y con ella su entrada en el índice)
         comunicado_instance.delete()
 
+        # Si la transacción se revierte, la firma de los índices deja de coincidir y se reconstruyen
+        desindexar_comunicado(comunicado_id)
+        desindexar_vector_comunicado(comunicado_id)
+
         if imagen_adjunta:
             def eliminar_archivo_seguro():
                 try:
                     imagen_adjunta.delete(save=False)
+                    eliminar_derivados(Comunicado, derivados, imagen_adjunta.storage)
                 except Exception:
                     pass
             
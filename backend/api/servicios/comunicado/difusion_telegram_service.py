@@ -0,0 +1,269 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from api.models import Comunicado, EnvioTelegram
+
+
+URL_API_TELEGRAM = "https://api.telegram.org/bot{token}/{metodo}"
+
+
+# -----------------------------------------------------------------------------
+# LIMITADOR DE TASA (uno por bot)
+# -----------------------------------------------------------------------------
+class LimitadorTasa:
+    """
+    Reparte los envíos de un bot a intervalos regulares (`por_segundo` mensajes por segundo).
+    Es seguro entre hilos: cada llamada a `esperar()` reserva el siguiente hueco libre y
+    duerme fuera del cerrojo hasta que llega su turno.
+    """
+
+    def __init__(self, por_segundo):
+        self.intervalo = 1 / por_segundo if por_segundo > 0 else 0
+        self._siguiente = 0.0
+        self._cerrojo = threading.Lock()
+
+    def esperar(self):
+        with self._cerrojo:
+            ahora = time.monotonic()
+            turno = max(ahora, self._siguiente)
+            self._siguiente = turno + self.intervalo
+
+        if turno > ahora:
+            time.sleep(turno - ahora)
+
+
+_limitadores = {}
+_cerrojo_limitadores = threading.Lock()
+
+
+def obtener_limitador(token) -> LimitadorTasa:
+    """Todos los hilos y difusiones del proceso que usan el mismo bot comparten limitador."""
+    with _cerrojo_limitadores:
+        limitador = _limitadores.get(token)
+        if limitador is None:
+            limitador = LimitadorTasa(settings.TELEGRAM_MENSAJES_POR_SEGUNDO)
+            _limitadores[token] = limitador
+        return limitador
+
+
+# -----------------------------------------------------------------------------
+# ENVÍO A UN CANAL (con reintentos)
+# -----------------------------------------------------------------------------
+def _pausa_solicitada(respuesta):
+    """Segundos indicados por Telegram en `parameters.retry_after` cuando responde 429."""
+    try:
+        return float(respuesta.json()['parameters']['retry_after'])
+    except Exception:
+        return None
+
+
+def publicar_en_telegram(token, metodo, datos, archivos=None, timeout=5):
+    """
+    Llama a `metodo` de la API de Telegram respetando el limitador del bot.
+
+    Reintenta con espera exponencial los errores transitorios (conexión, timeout, 429 y 5xx);
+    el resto de errores se devuelven al primer intento.
+
+    Devuelve `(respuesta | None, intentos, error | None)`.
+    """
+    limitador = obtener_limitador(token)
+    url = URL_API_TELEGRAM.format(token=token, metodo=metodo)
+    max_intentos = max(1, settings.TELEGRAM_REINTENTOS)
+
+    error = None
+    for intento in range(1, max_intentos + 1):
+        limitador.esperar()
+        pausa = settings.TELEGRAM_ESPERA_REINTENTO * 2 ** (intento - 1)
+
+        try:
+            if archivos is not None:
+                respuesta = requests.post(url, data=datos, files=archivos, timeout=timeout)
+            else:
+                respuesta = requests.post(url, data=datos, timeout=timeout)
+
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = str(e)
+
+        except Exception as e:
+            return None, intento, str(e)
+
+        else:
+            if respuesta.ok:
+                return respuesta, intento, None
+
+            error = f"HTTP {respuesta.status_code}: {respuesta.text[:200]}"
+
+            if respuesta.status_code == 429:
+                pausa = _pausa_solicitada(respuesta) or pausa
+            elif respuesta.status_code < 500:
+                return None, intento, error
+
+        if intento < max_intentos:
+            time.sleep(pausa)
+
+    return None, max_intentos, error
+
+
+def _texto_comunicado(comunicado):
+    return f"<b>🔔 Nuevo Comunicado: {comunicado.titulo}</b>\n\n{comunicado.contenido}"
+
+
+def _enviar_a_canal(token, comunicado, foto, canal):
+    """`foto` es None (solo texto), los bytes de la portada o el `file_id` que Telegram ya tiene."""
+    texto_mensaje = _texto_comunicado(comunicado)
+
+    if foto is not None:
+        caption = texto_mensaje
+        if len(caption) > 1000:
+            caption = caption[:1000] + "... (ver web)"
+
+        datos = {"chat_id": canal, "caption": caption, "parse_mode": "HTML"}
+
+        if isinstance(foto, str):
+            return publicar_en_telegram(token, "sendPhoto", {**datos, "photo": foto}, timeout=10)
+
+        return publicar_en_telegram(
+            token, "sendPhoto", datos,
+            archivos={'photo': (comunicado.imagen_portada.name, foto)},
+            timeout=10
+        )
+
+    mensaje = texto_mensaje
+    if len(mensaje) > 3000:
+        mensaje = mensaje[:3000] + "..."
+
+    return publicar_en_telegram(
+        token, "sendMessage",
+        {"chat_id": canal, "text": mensaje, "parse_mode": "HTML"},
+        timeout=5
+    )
+
+
+def file_id_de(respuesta):
+    """`file_id` de la foto enviada (Telegram devuelve varias resoluciones; la última es la mayor)."""
+    try:
+        file_id = respuesta.json()['result']['photo'][-1]['file_id']
+    except Exception:
+        return None
+
+    return file_id if isinstance(file_id, str) and file_id else None
+
+
+# -----------------------------------------------------------------------------
+# DIFUSIÓN DE UN COMUNICADO
+# -----------------------------------------------------------------------------
+def _registrar_resultados(envios, resultados):
+    ahora = timezone.now()
+
+    for envio, (_, intentos, error) in zip(envios, resultados):
+        envio.intentos += intentos
+        envio.updated_at = ahora
+
+        if error is None:
+            envio.estado = EnvioTelegram.EstadoEnvio.ENVIADO
+            envio.fecha_envio = ahora
+            envio.ultimo_error = ''
+        else:
+            envio.estado = EnvioTelegram.EstadoEnvio.FALLIDO
+            envio.ultimo_error = error
+            print(f"Error enviando telegram al canal {envio.canal}: {error}")
+
+    EnvioTelegram.objects.bulk_update(envios, ['estado', 'intentos', 'ultimo_error', 'fecha_envio', 'updated_at'])
+
+
+def difundir_comunicado(comunicado_id):
+    """
+    Envía el comunicado a los canales que aún no lo han recibido (envíos PENDIENTE o FALLIDO).
+
+    Los envíos se hacen en paralelo (TELEGRAM_ENVIOS_CONCURRENTES hilos) y los hilos no tocan
+    la BD: la lectura del comunicado, de la imagen y el registro de resultados se hacen aquí.
+    Si hay portada, se sube una sola vez y el resto de canales (y los reenvíos) usan el
+    `file_id` que devuelve Telegram, guardado en `Comunicado.telegram_file_id`.
+    Volver a llamarla reintenta solo los canales que fallaron.
+    """
+    token = getattr(settings, 'TELEGRAM_BOT_TOKEN', None)
+    if not token:
+        print("TELEGRAM_BOT_TOKEN no configurado.")
+        return
+
+    try:
+        comunicado = Comunicado.objects.get(pk=comunicado_id)
+    except Comunicado.DoesNotExist:
+        print(f"⚠️ Comunicado {comunicado_id} no encontrado para difundir en Telegram.")
+        return
+
+    envios = list(comunicado.envios_telegram.exclude(estado=EnvioTelegram.EstadoEnvio.ENVIADO))
+    if not envios:
+        return
+
+    foto = None
+    if comunicado.imagen_portada:
+        foto = comunicado.telegram_file_id or None
+
+        if foto is None:
+            try:
+                with comunicado.imagen_portada.open('rb') as imagen_file:
+                    foto = imagen_file.read()
+            except Exception as e:
+                print(f"Error leyendo la imagen del comunicado {comunicado.id}: {e}")
+                _registrar_resultados(envios, [(None, 0, str(e))] * len(envios))
+                return
+
+    enviados, resultados = [], []
+
+    # La portada se sube a un solo canal; el resto la reenvía por su file_id
+    pendientes = list(envios)
+    while pendientes and isinstance(foto, bytes):
+        envio = pendientes.pop(0)
+        resultado = _enviar_a_canal(token, comunicado, foto, envio.canal)
+        enviados.append(envio)
+        resultados.append(resultado)
+
+        file_id = file_id_de(resultado[0]) if resultado[0] is not None else None
+        if file_id:
+            foto = file_id
+            Comunicado.objects.filter(pk=comunicado.pk, imagen_portada=comunicado.imagen_portada.name).update(
+                telegram_file_id=file_id
+            )
+
+    if pendientes:
+        hilos = max(1, min(len(pendientes), settings.TELEGRAM_ENVIOS_CONCURRENTES))
+        with ThreadPoolExecutor(max_workers=hilos) as pool:
+            resultados += pool.map(lambda envio: _enviar_a_canal(token, comunicado, foto, envio.canal), pendientes)
+        enviados += pendientes
+
+    _registrar_resultados(enviados, resultados)
+
+
+def lanzar_en_segundo_plano(funcion, *args):
+    """Ejecuta `funcion` en un hilo propio y cierra su conexión a la BD al terminar."""
+    def ejecutar():
+        try:
+            funcion(*args)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=ejecutar)
+    thread.start()
+
+
+def programar_difusion(comunicado, canales):
+    """
+    Registra un envío PENDIENTE por canal dentro de la transacción del alta y lanza la
+    difusión en segundo plano cuando se confirme. El alta no espera a Telegram.
+    """
+    if not canales:
+        return
+
+    EnvioTelegram.objects.bulk_create([
+        EnvioTelegram(comunicado=comunicado, canal=canal) for canal in sorted(canales)
+    ])
+
+    comunicado_id = comunicado.id
+    transaction.on_commit(lambda: lanzar_en_segundo_plano(difundir_comunicado, comunicado_id))
@@ -0,0 +1,38 @@
+from django.db.models import F
+
+from api.models import AreaInteres, Comunicado
+
+
+MASCARA_TODOS_HERMANOS = AreaInteres.mascara_de([AreaInteres.NombreArea.TODOS_HERMANOS])
+
+# Columnas pesadas que los listados no envían (usan `extracto`): no se leen de la BD
+CAMPOS_DIFERIDOS_LISTADO = ('contenido', 'embedding')
+
+
+def filtrar_por_audiencia(queryset, mascara: int):
+    """
+    Comunicados cuya audiencia comparte al menos un área con `mascara`: un único
+    predicado bit a bit sobre la propia fila (`mascara_audiencia & mascara <> 0`),
+    sin JOIN con la tabla intermedia ni DISTINCT.
+    """
+    return queryset.alias(audiencia_comun=F('mascara_audiencia').bitand(mascara)) \
+                   .filter(audiencia_comun__gt=0)
+
+
+def mascara_feed_usuario(usuario) -> int:
+    """Áreas que sigue el hermano más TODOS_HERMANOS."""
+    return usuario.mascara_suscripcion | MASCARA_TODOS_HERMANOS
+
+
+def obtener_feed_comunicados(usuario):
+    """
+    Comunicados del tablón del hermano: los de sus áreas de interés más los dirigidos
+    a 'Todos los Hermanos', ordenados del más reciente al más antiguo.
+
+    El filtro de audiencia no necesita JOIN, así que la base de datos puede recorrer el
+    índice (fecha_emision, id) y detenerse en cuanto completa la página.
+    """
+    comunicados = Comunicado.objects.select_related('autor').prefetch_related('areas_interes') \
+                                    .defer(*CAMPOS_DIFERIDOS_LISTADO)
+
+    return filtrar_por_audiencia(comunicados, mascara_feed_usuario(usuario)).order_by('-fecha_emision', '-id')
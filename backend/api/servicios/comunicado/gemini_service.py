@@ -1,8 +1,10 @@
 import threading
-from django.conf import settings
-from google import genai
+from django.utils import timezone
 from google.genai import types
 from api.models import Comunicado
+from api.servicios.comunicado.cliente_gemini import MODELO_EMBEDDING, obtener_cliente_gemini
+from api.servicios.comunicado.indice_vectorial_service import indexar_vector_comunicado
+from api.servicios.comunicado.relacionados_comunicado_service import actualizar_relacionados
 
 def generar_y_guardar_embedding_async(comunicado_id):
     """
@@ -14,16 +16,21 @@ def generar_y_guardar_embedding_async(comunicado_id):
             comunicado = Comunicado.objects.get(pk=comunicado_id)
             texto = f"Título: {comunicado.titulo}\nContenido: {comunicado.contenido}"
 
-            client = genai.Client(api_key=settings.GEMINI_API_KEY)
-            resultado = client.models.embed_content(
-                model='gemini-embedding-001',
+            resultado = obtener_cliente_gemini().models.embed_content(
+                model=MODELO_EMBEDDING,
                 contents=texto,
                 config=types.EmbedContentConfig(task_type="RETRIEVAL_DOCUMENT")
             )
 
+            embedding = resultado.embeddings[0].values
+
+            # `embedding_modificado` marca el cambio para que los índices vectoriales de otros procesos lo detecten
+            modificado = timezone.now()
             Comunicado.objects.filter(pk=comunicado_id).update(
-                embedding=resultado.embeddings[0].values
+                embedding=embedding, embedding_modificado=modificado
             )
+            indexar_vector_comunicado(comunicado_id, embedding, modificado)
+            actualizar_relacionados(comunicado_id, embedding)
             print(f"✅ Embedding generado para el comunicado {comunicado_id}")
             
         except Comunicado.DoesNotExist:
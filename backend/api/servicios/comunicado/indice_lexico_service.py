@@ -0,0 +1,368 @@
+import math
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+
+from django.db.models import Count, Max, Q
+from django.utils.html import strip_tags
+
+from api.models import AreaInteres, Comunicado
+
+
+STOPWORDS_ES = frozenset("""
+a al algo algun alguna algunas alguno algunos ante antes como con contra cual cuales cuando de del desde donde
+durante e el ella ellas ellos en entre era eran es esa esas ese eso esos esta estan estas este esto estos fue
+fueron ha han hasta hay la las le les lo los mas me mi mis mucho muy nada ni no nos nuestra nuestro o os otra
+otro para pero poco por porque que quien se sea ser si sin sobre su sus tambien tan te tiene tu tus un una
+unas uno unos y ya yo
+""".split())
+
+PATRON_TOKEN = re.compile(r"[a-z0-9ñ]+")
+
+SUFIJOS_PLURAL = ('ces', 'es', 's')
+SUFIJOS_GENERO = ('a', 'o', 'e')
+
+
+def normalizar_texto(texto: str) -> str:
+    """
+    Pasa el texto a minúsculas y elimina tildes y diéresis, conservando la 'ñ'.
+    """
+    texto = texto.lower().replace('ñ', '\x00')
+    texto = unicodedata.normalize('NFKD', texto)
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return texto.replace('\x00', 'ñ')
+
+
+def reducir_termino(termino: str) -> str:
+    """
+    Stemmer ligero para castellano: elimina el plural y la vocal final de género.
+    Los números se conservan intactos para poder buscar "tramo 7" o "cuota 2025".
+    """
+    if termino.isdigit() or len(termino) <= 3:
+        return termino
+
+    for sufijo in SUFIJOS_PLURAL:
+        if termino.endswith(sufijo) and len(termino) - len(sufijo) >= 3:
+            termino = termino[:-len(sufijo)] + ('z' if sufijo == 'ces' else '')
+            break
+
+    if termino.endswith(SUFIJOS_GENERO) and len(termino) > 4:
+        termino = termino[:-1]
+
+    return termino
+
+
+def tokenizar(texto: str) -> list[str]:
+    """
+    Convierte un texto (admite HTML) en la lista de términos indexables.
+    """
+    if not texto:
+        return []
+
+    texto = normalizar_texto(strip_tags(texto))
+
+    return [
+        reducir_termino(token)
+        for token in PATRON_TOKEN.findall(texto)
+        if token not in STOPWORDS_ES
+    ]
+
+
+class IndiceBM25:
+    """
+    Índice invertido en memoria con puntuación Okapi BM25, particionado.
+
+    Cada documento pertenece a una o varias particiones (en los comunicados, sus
+    áreas de interés) y sus postings se guardan en un subíndice por partición.
+    Las estadísticas (nº de documentos, longitud media y frecuencia documental)
+    son globales, de modo que las puntuaciones son comparables entre particiones.
+
+    Admite altas, modificaciones y bajas de documentos de forma incremental,
+    sin reconstruir el índice completo. Es seguro entre hilos.
+    """
+    K1 = 1.5
+    B = 0.75
+
+    def __init__(self):
+        self._postings = defaultdict(lambda: defaultdict(dict))
+        self._docs_particion = defaultdict(set)
+        self._df = defaultdict(int)
+        self._terminos_doc = {}
+        self._particiones_doc = {}
+        self._longitudes = {}
+        self._longitud_total = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._longitudes)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._longitudes
+
+    def indexar(self, doc_id: int, terminos: list[str], particiones=(None,)):
+        """Inserta o reemplaza el documento indicado en las particiones dadas."""
+        frecuencias = defaultdict(int)
+        for termino in terminos:
+            frecuencias[termino] += 1
+
+        particiones = frozenset(particiones) or frozenset((None,))
+
+        with self._lock:
+            self._eliminar_sin_lock(doc_id)
+
+            for particion in particiones:
+                subindice = self._postings[particion]
+                for termino, tf in frecuencias.items():
+                    subindice[termino][doc_id] = tf
+                self._docs_particion[particion].add(doc_id)
+
+            for termino in frecuencias:
+                self._df[termino] += 1
+
+            self._terminos_doc[doc_id] = frozenset(frecuencias)
+            self._particiones_doc[doc_id] = particiones
+            self._longitudes[doc_id] = len(terminos)
+            self._longitud_total += len(terminos)
+
+    def eliminar(self, doc_id: int):
+        with self._lock:
+            self._eliminar_sin_lock(doc_id)
+
+    def _eliminar_sin_lock(self, doc_id: int):
+        longitud = self._longitudes.pop(doc_id, None)
+        if longitud is None:
+            return
+
+        self._longitud_total -= longitud
+        terminos = self._terminos_doc.pop(doc_id, ())
+
+        for particion in self._particiones_doc.pop(doc_id, ()):
+            self._docs_particion[particion].discard(doc_id)
+            if not self._docs_particion[particion]:
+                del self._docs_particion[particion]
+
+            subindice = self._postings[particion]
+            for termino in terminos:
+                del subindice[termino][doc_id]
+                if not subindice[termino]:
+                    del subindice[termino]
+            if not subindice:
+                del self._postings[particion]
+
+        for termino in terminos:
+            self._df[termino] -= 1
+            if not self._df[termino]:
+                del self._df[termino]
+
+    def documentos(self, particiones=None) -> set[int]:
+        """Ids de los documentos que pertenecen a alguna de las particiones (todos si es None)."""
+        with self._lock:
+            if particiones is None:
+                return set(self._longitudes)
+
+            return set().union(*(self._docs_particion[p] for p in particiones if p in self._docs_particion))
+
+    def hay_documentos(self, particiones=None) -> bool:
+        """Si alguna de las particiones (o el índice, si es None) tiene documentos, sin construir el conjunto."""
+        with self._lock:
+            if particiones is None:
+                return bool(self._longitudes)
+
+            return any(p in self._docs_particion for p in particiones)
+
+    def buscar(self, terminos: list[str], particiones=None) -> dict[int, float]:
+        """
+        Devuelve un diccionario {doc_id: puntuación BM25} con los documentos que
+        contienen al menos uno de los términos. Si se indican `particiones`, solo
+        se recorren los subíndices de esas particiones; si es None, todos.
+        """
+        puntuaciones = defaultdict(float)
+
+        with self._lock:
+            total_docs = len(self._longitudes)
+            if not total_docs:
+                return {}
+
+            longitud_media = self._longitud_total / total_docs or 1
+
+            if particiones is None:
+                subindices = list(self._postings.values())
+            else:
+                subindices = [self._postings[p] for p in particiones if p in self._postings]
+
+            for termino in set(terminos):
+                df = self._df.get(termino)
+                if not df:
+                    continue
+
+                # Un documento puede estar en varias particiones: se puntúa una sola vez
+                docs = {}
+                for subindice in subindices:
+                    docs.update(subindice.get(termino, {}))
+
+                idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+
+                for doc_id, tf in docs.items():
+                    norma = 1 - self.B + self.B * self._longitudes[doc_id] / longitud_media
+                    puntuaciones[doc_id] += idf * tf * (self.K1 + 1) / (tf + self.K1 * norma)
+
+        return dict(puntuaciones)
+
+
+# -----------------------------------------------------------------------------
+# ÍNDICE DE COMUNICADOS (INSTANCIA COMPARTIDA POR PROCESO)
+# -----------------------------------------------------------------------------
+PESO_TITULO = 2
+
+_indice_comunicados = None
+_firma_indice = None
+_lock_construccion = threading.Lock()
+
+
+def terminos_comunicado(titulo: str, contenido: str) -> list[str]:
+    """El título se repite PESO_TITULO veces para primar las coincidencias en él."""
+    return tokenizar(titulo) * PESO_TITULO + tokenizar(contenido)
+
+
+def leer_firma_comunicados() -> dict:
+    """
+    Agregados de los que salen las firmas de los índices léxico y vectorial, en una sola
+    consulta: una petición del chat comprueba ambos índices con un único viaje a la BD.
+    """
+    return Comunicado.objects.aggregate(
+        total=Count('id'),
+        ultimo=Max('id'),
+        indice_modificado=Max('indice_modificado'),
+        embedding_modificado=Max('embedding_modificado'),
+        con_embedding=Count('id', filter=Q(embedding__isnull=False)),
+    )
+
+
+def _calcular_firma(datos=None):
+    """
+    Total, último id y última modificación indexable: cambia con cualquier alta, baja o
+    edición de título, contenido o áreas, sea del proceso que sea. Se usa
+    `indice_modificado` y no `updated_at` porque los hilos de embedding y de derivados de
+    imagen también escriben `updated_at` y forzarían reconstrucciones inútiles.
+    """
+    datos = datos or leer_firma_comunicados()
+    return (datos['total'], datos['ultimo'], datos['indice_modificado'])
+
+
+def _firma_tras_indexar(firma, comunicado, es_nuevo: bool):
+    """
+    Firma que tendría la BD si el único cambio desde `firma` fuese este alta o edición.
+    No se lee la firma real: si otro proceso ha escrito entretanto, no coincidirá y el
+    índice se reconstruirá en el siguiente uso en lugar de quedarse sin sus cambios.
+    """
+    total, ultimo, modificado = firma
+    modificaciones = [m for m in (modificado, comunicado.indice_modificado) if m is not None]
+
+    return (
+        total + es_nuevo,
+        max(ultimo or 0, comunicado.id),
+        max(modificaciones) if modificaciones else None,
+    )
+
+
+def obtener_indice_comunicados(datos_firma=None) -> IndiceBM25:
+    """
+    Devuelve el índice léxico de comunicados, construyéndolo desde la base de datos
+    en el primer uso. Si otro proceso ha creado, editado o borrado comunicados (la firma
+    total/último id/última modificación indexable no coincide), se reconstruye.
+
+    `datos_firma` permite reutilizar una lectura de `leer_firma_comunicados`.
+    """
+    global _indice_comunicados, _firma_indice
+
+    firma_actual = _calcular_firma(datos_firma)
+
+    if _indice_comunicados is not None and _firma_indice == firma_actual:
+        return _indice_comunicados
+
+    with _lock_construccion:
+        if _indice_comunicados is not None and _firma_indice == firma_actual:
+            return _indice_comunicados
+
+        areas_por_comunicado = defaultdict(set)
+        for com_id, nombre_area in Comunicado.areas_interes.through.objects.values_list('comunicado_id', 'areainteres__nombre_area'):
+            areas_por_comunicado[com_id].add(nombre_area)
+
+        indice = IndiceBM25()
+        for com_id, titulo, contenido in Comunicado.objects.values_list('id', 'titulo', 'contenido').iterator():
+            indice.indexar(com_id, terminos_comunicado(titulo, contenido), areas_por_comunicado.get(com_id, ()))
+
+        _indice_comunicados = indice
+        _firma_indice = firma_actual
+
+    return _indice_comunicados
+
+
+def indexar_comunicado(comunicado):
+    """
+    Actualiza incrementalmente el índice tras crear o editar un comunicado (texto o áreas).
+    Si el índice aún no se ha construido no hace nada: se cargará completo en el primer uso.
+    """
+    global _firma_indice
+
+    if _indice_comunicados is None:
+        return
+
+    es_nuevo = comunicado.id not in _indice_comunicados
+    areas = comunicado.areas_interes.values_list('nombre_area', flat=True)
+    _indice_comunicados.indexar(comunicado.id, terminos_comunicado(comunicado.titulo, comunicado.contenido), areas)
+
+    if _firma_indice is not None:
+        _firma_indice = _firma_tras_indexar(_firma_indice, comunicado, es_nuevo)
+
+
+def desindexar_comunicado(comunicado_id):
+    """
+    Quita el comunicado del índice. La firma real solo se adopta si encaja con la baja de
+    este único documento; si además ha habido altas o ediciones en otro proceso, se
+    conserva la anterior para que el siguiente uso reconstruya el índice.
+    """
+    global _firma_indice
+
+    if _indice_comunicados is None:
+        return
+
+    existia = comunicado_id in _indice_comunicados
+    _indice_comunicados.eliminar(comunicado_id)
+
+    if _firma_indice is None or not existia:
+        return
+
+    total, ultimo, modificado = _firma_indice
+    firma_actual = _calcular_firma()
+    total_actual, ultimo_actual, modificado_actual = firma_actual
+
+    if total_actual == total - 1 and (ultimo_actual or 0) <= (ultimo or 0) and \
+            (modificado_actual is None or (modificado is not None and modificado_actual <= modificado)):
+        _firma_indice = firma_actual
+
+
+def particiones_usuario(usuario):
+    """
+    Particiones (áreas) cuyos comunicados puede ver el hermano: las áreas que sigue
+    más TODOS_HERMANOS, igual que en su tablón de noticias. Devuelve None (sin filtro)
+    cuando no hay usuario, p. ej. en los comandos de gestión.
+    """
+    if usuario is None:
+        return None
+
+    areas = {AreaInteres.NombreArea.TODOS_HERMANOS.value}
+    if usuario.is_authenticated:
+        areas.update(usuario.areas_interes.values_list('nombre_area', flat=True))
+
+    return areas
+
+
+def reiniciar_indice_comunicados():
+    """Descarta el índice en memoria (útil en tests y tras cargas masivas)."""
+    global _indice_comunicados, _firma_indice
+
+    with _lock_construccion:
+        _indice_comunicados = None
+        _firma_indice = None
@@ -0,0 +1,221 @@
+import heapq
+import math
+import operator
+import struct
+import threading
+from array import array
+
+from django.conf import settings
+from api.models import Comunicado
+from api.servicios.comunicado.indice_lexico_service import leer_firma_comunicados
+
+
+MODOS_CUANTIZACION = ('ninguna', 'float16', 'int8')
+
+
+def truncar_y_normalizar(vector, dimension: int | None = None) -> list[float]:
+    """
+    Recorta el vector a sus primeras `dimension` componentes (los embeddings de Gemini
+    están entrenados tipo Matryoshka, así que el prefijo conserva la semántica) y lo
+    vuelve a normalizar, para que el producto escalar equivalga al coseno.
+    """
+    if dimension:
+        vector = vector[:dimension]
+
+    norma = math.sqrt(sum(v * v for v in vector))
+    if not norma:
+        return [0.0] * len(vector)
+
+    return [v / norma for v in vector]
+
+
+def cuantizar_int8(vector: list[float]) -> tuple[array, float]:
+    """Cuantización escalar simétrica: enteros en [-127, 127] y la escala para deshacerla."""
+    maximo = max((abs(v) for v in vector), default=0.0)
+    if not maximo:
+        return array('b', bytes(len(vector))), 0.0
+
+    escala = maximo / 127
+    return array('b', (round(v / escala) for v in vector)), escala
+
+
+def cuantizar_float16(vector: list[float]) -> memoryview:
+    return memoryview(struct.pack(f'{len(vector)}e', *vector)).cast('e')
+
+
+def producto_escalar(a, b) -> float:
+    return sum(map(operator.mul, a, b))
+
+
+class IndiceVectorialCuantizado:
+    """
+    Vectores de los comunicados en formato compacto para la primera pasada de la
+    búsqueda semántica: float16 (2 bytes por dimensión) o int8 (1 byte más una escala
+    por vector), frente a los 4 de float32 o los ~30 de una lista de floats de Python.
+
+    Las puntuaciones son aproximadas; quien lo usa debe repuntuar los mejores candidatos
+    con el embedding completo de la base de datos.
+    """
+
+    def __init__(self, modo: str = 'int8', dimension: int | None = None):
+        if modo not in MODOS_CUANTIZACION or modo == 'ninguna':
+            raise ValueError(f"Modo de cuantización no válido: {modo}")
+
+        self.modo = modo
+        self.dimension = dimension
+        self._vectores = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._vectores)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._vectores
+
+    def indexar(self, doc_id: int, vector) -> None:
+        normalizado = truncar_y_normalizar(list(vector), self.dimension)
+
+        if self.modo == 'int8':
+            compacto = cuantizar_int8(normalizado)
+        else:
+            compacto = (cuantizar_float16(normalizado), 1.0)
+
+        with self._lock:
+            self._vectores[doc_id] = compacto
+
+    def eliminar(self, doc_id: int) -> None:
+        with self._lock:
+            self._vectores.pop(doc_id, None)
+
+    def puntuar(self, vector_pregunta, candidatos=None) -> dict[int, float]:
+        """Similitud coseno aproximada entre la pregunta y cada comunicado (o solo los candidatos)."""
+        consulta = truncar_y_normalizar(list(vector_pregunta), self.dimension)
+
+        with self._lock:
+            if candidatos is None:
+                vectores = list(self._vectores.items())
+            else:
+                vectores = [(doc_id, self._vectores[doc_id]) for doc_id in candidatos if doc_id in self._vectores]
+
+        return {
+            doc_id: escala * producto_escalar(consulta, compacto)
+            for doc_id, (compacto, escala) in vectores
+        }
+
+    def mejores(self, vector_pregunta, n: int, candidatos=None) -> list[int]:
+        puntuaciones = self.puntuar(vector_pregunta, candidatos)
+        return heapq.nlargest(n, puntuaciones, key=puntuaciones.get)
+
+    def memoria_bytes(self) -> int:
+        """Bytes ocupados por los vectores compactos (sin contar la estructura del diccionario)."""
+        bytes_escala = 8 if self.modo == 'int8' else 0
+
+        with self._lock:
+            return sum(memoryview(compacto).nbytes + bytes_escala for compacto, _ in self._vectores.values())
+
+
+_indice_vectorial = None
+_firma_indice = None
+_lock_construccion = threading.Lock()
+
+
+def cuantizacion_activa() -> bool:
+    return getattr(settings, 'RAG_CUANTIZACION', 'ninguna') != 'ninguna'
+
+
+def _calcular_firma(datos=None):
+    """
+    Configuración, nº de embeddings y última generación de un embedding. Se usa
+    `embedding_modificado` y no `updated_at`: editar el título, cambiar las áreas o generar
+    los derivados de la portada no toca los vectores y no debe reconstruir el índice.
+    """
+    datos = datos or leer_firma_comunicados()
+    return (settings.RAG_CUANTIZACION, settings.RAG_DIMENSION_TRUNCADA, datos['con_embedding'], datos['embedding_modificado'])
+
+
+def obtener_indice_vectorial(datos_firma=None) -> IndiceVectorialCuantizado:
+    """
+    Devuelve el índice vectorial compacto, construyéndolo desde la base de datos en el
+    primer uso. Se reconstruye si cambia la configuración o si otro proceso ha añadido,
+    regenerado o borrado embeddings (la firma no coincide).
+
+    `datos_firma` permite reutilizar una lectura de `leer_firma_comunicados`.
+    """
+    global _indice_vectorial, _firma_indice
+
+    firma_actual = _calcular_firma(datos_firma)
+
+    if _indice_vectorial is not None and _firma_indice == firma_actual:
+        return _indice_vectorial
+
+    with _lock_construccion:
+        if _indice_vectorial is not None and _firma_indice == firma_actual:
+            return _indice_vectorial
+
+        indice = IndiceVectorialCuantizado(settings.RAG_CUANTIZACION, settings.RAG_DIMENSION_TRUNCADA)
+
+        vectores = Comunicado.objects.filter(embedding__isnull=False).values_list('id', 'embedding')
+        for com_id, embedding in vectores.iterator():
+            indice.indexar(com_id, embedding)
+
+        _indice_vectorial = indice
+        _firma_indice = firma_actual
+
+    return _indice_vectorial
+
+
+def indexar_vector_comunicado(comunicado_id: int, embedding, modificado=None) -> None:
+    """
+    Actualiza el vector tras generar (o regenerar) el embedding de un comunicado, guardado
+    con `embedding_modificado = modificado`. Si el índice aún no se ha construido no hace nada: se
+    cargará completo en el primer uso.
+
+    La firma avanza solo con este cambio, sin leer la de la BD: si otro proceso ha escrito
+    entretanto no coincidirá y el índice se reconstruirá en el siguiente uso.
+    """
+    global _firma_indice
+
+    if _indice_vectorial is None:
+        return
+
+    es_nuevo = comunicado_id not in _indice_vectorial
+    _indice_vectorial.indexar(comunicado_id, embedding)
+
+    if _firma_indice is not None:
+        cuantizacion, dimension, con_embedding, ultima = _firma_indice
+        modificaciones = [m for m in (ultima, modificado) if m is not None]
+        _firma_indice = (cuantizacion, dimension, con_embedding + es_nuevo, max(modificaciones) if modificaciones else None)
+
+
+def desindexar_vector_comunicado(comunicado_id: int) -> None:
+    """
+    Quita el vector del índice. La firma real solo se adopta si encaja con la baja de este
+    único embedding; si no, se conserva la anterior y el siguiente uso reconstruye el índice.
+    """
+    global _firma_indice
+
+    if _indice_vectorial is None:
+        return
+
+    existia = comunicado_id in _indice_vectorial
+    _indice_vectorial.eliminar(comunicado_id)
+
+    if _firma_indice is None or not existia:
+        return
+
+    cuantizacion, dimension, con_embedding, modificado = _firma_indice
+    firma_actual = _calcular_firma()
+    modificado_actual = firma_actual[3]
+
+    if firma_actual[:3] == (cuantizacion, dimension, con_embedding - 1) and \
+            (modificado_actual is None or (modificado is not None and modificado_actual <= modificado)):
+        _firma_indice = firma_actual
+
+
+def reiniciar_indice_vectorial():
+    """Descarta el índice en memoria (útil en tests y tras cargas masivas)."""
+    global _indice_vectorial, _firma_indice
+
+    with _lock_construccion:
+        _indice_vectorial = None
+        _firma_indice = None
@@ -0,0 +1,95 @@
+import heapq
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min, Q
+
+from api.models import Comunicado, ComunicadoRelacionado
+from api.servicios.comunicado.comunicado_rag_service import calcular_similitud_coseno
+from api.servicios.comunicado.indice_vectorial_service import cuantizacion_activa, obtener_indice_vectorial
+
+
+# Vecinos guardados por comunicado. Son más de los que se muestran (3) porque en la
+# lectura se descartan los que no van dirigidos al hermano.
+VECINOS_POR_COMUNICADO = 20
+
+
+def _similitudes(comunicado_id, embedding) -> dict[int, float]:
+    """Similitud coseno del comunicado con el resto de comunicados vectorizados."""
+    vectores = Comunicado.objects.filter(embedding__isnull=False).exclude(pk=comunicado_id)
+
+    if cuantizacion_activa():
+        # Igual que en el chat: preselección sobre los vectores compactos en memoria y
+        # puntuación exacta solo de los mejores candidatos
+        candidatos = obtener_indice_vectorial().mejores(
+            embedding, max(settings.RAG_CANDIDATOS_REPUNTUACION, VECINOS_POR_COMUNICADO) + 1
+        )
+        vectores = vectores.filter(id__in=candidatos)
+
+    return {
+        com_id: calcular_similitud_coseno(embedding, otro)
+        for com_id, otro in vectores.values_list('id', 'embedding').iterator()
+    }
+
+
+def _mejores(similitudes: dict[int, float]) -> list[tuple[int, float]]:
+    return heapq.nlargest(VECINOS_POR_COMUNICADO, similitudes.items(), key=itemgetter(1))
+
+
+@transaction.atomic
+def actualizar_relacionados(comunicado_id, embedding):
+    """
+    Recalcula los vecinos de un comunicado tras escribir su embedding y lo añade a la
+    lista de los comunicados para los que ahora es uno de sus VECINOS_POR_COMUNICADO
+    más cercanos (sustituyendo al peor si la lista estaba completa).
+    """
+    similitudes = _similitudes(comunicado_id, embedding)
+
+    ComunicadoRelacionado.objects.filter(Q(comunicado_id=comunicado_id) | Q(relacionado_id=comunicado_id)).delete()
+
+    listas = {
+        fila['comunicado']: (fila['total'], fila['minima'])
+        for fila in ComunicadoRelacionado.objects.values('comunicado').annotate(total=Count('id'), minima=Min('similitud'))
+    }
+
+    entrantes, completas = [], []
+    for com_id, similitud in similitudes.items():
+        total, minima = listas.get(com_id, (0, None))
+
+        if total < VECINOS_POR_COMUNICADO:
+            entrantes.append(com_id)
+        elif similitud > minima:
+            entrantes.append(com_id)
+            completas.append(com_id)
+
+    ComunicadoRelacionado.objects.bulk_create(
+        [ComunicadoRelacionado(comunicado_id=comunicado_id, relacionado_id=com_id, similitud=similitud)
+         for com_id, similitud in _mejores(similitudes)] +
+        [ComunicadoRelacionado(comunicado_id=com_id, relacionado_id=comunicado_id, similitud=similitudes[com_id])
+         for com_id in entrantes]
+    )
+
+    for com_id in completas:
+        sobrantes = ComunicadoRelacionado.objects.filter(comunicado_id=com_id) \
+                                                 .order_by('-similitud', 'id') \
+                                                 .values_list('id', flat=True)[VECINOS_POR_COMUNICADO:]
+        ComunicadoRelacionado.objects.filter(id__in=list(sobrantes)).delete()
+
+
+def reconstruir_relacionados() -> int:
+    """
+    Vuelve a calcular la tabla completa (coste cuadrático en el número de comunicados).
+    Pensado para la carga inicial o tras regenerar los embeddings; devuelve los comunicados procesados.
+    """
+    ComunicadoRelacionado.objects.all().delete()
+
+    vectorizados = list(Comunicado.objects.filter(embedding__isnull=False).values_list('id', 'embedding'))
+
+    for com_id, embedding in vectorizados:
+        ComunicadoRelacionado.objects.bulk_create([
+            ComunicadoRelacionado(comunicado_id=com_id, relacionado_id=vecino_id, similitud=similitud)
+            for vecino_id, similitud in _mejores(_similitudes(com_id, embedding))
+        ])
+
+    return len(vectorizados)
@@ -0,0 +1,45 @@
+import html
+import math
+import re
+
+from django.utils.html import strip_tags
+
+
+LONGITUD_EXTRACTO = 280
+PALABRAS_POR_MINUTO = 200
+
+# Fin de bloque (párrafos, listas, títulos, saltos): separa palabras aunque no haya espacio en el HTML
+PATRON_FIN_BLOQUE = re.compile(r'<(?:br|/p|/li|/ul|/ol|/h[1-6]|/div)\b[^>]*>', re.IGNORECASE)
+
+
+def texto_plano(contenido: str) -> str:
+    """Contenido sin etiquetas ni entidades HTML y con los espacios colapsados."""
+    contenido = PATRON_FIN_BLOQUE.sub(' ', contenido or '')
+    return ' '.join(html.unescape(strip_tags(contenido)).split())
+
+
+def recortar(texto: str, longitud: int = LONGITUD_EXTRACTO) -> str:
+    """Primeros `longitud` caracteres del texto sin partir la última palabra."""
+    if len(texto) <= longitud:
+        return texto
+
+    recorte = texto[:longitud + 1]
+    recorte = recorte.rsplit(' ', 1)[0] if ' ' in recorte else texto[:longitud]
+
+    return recorte.rstrip(' ,;:.') + '…'
+
+
+def calcular_resumen(contenido: str) -> dict:
+    """
+    Extracto en texto plano, número de palabras y minutos de lectura del contenido HTML.
+    Se guardan en el propio comunicado al escribirlo para que los listados no tengan que
+    enviar (ni procesar) el contenido completo.
+    """
+    texto = texto_plano(contenido)
+    palabras = len(texto.split())
+
+    return {
+        'extracto': recortar(texto),
+        'numero_palabras': palabras,
+        'minutos_lectura': max(1, math.ceil(palabras / PALABRAS_POR_MINUTO)),
+    }
@@ -1,4 +1,5 @@
-from api.models import Comunicado, AreaInteres
+from api.models import Comunicado
+from api.servicios.comunicado.feed_comunicado_service import CAMPOS_DIFERIDOS_LISTADO, MASCARA_TODOS_HERMANOS, filtrar_por_audiencia
 
 
 def obtener_ultimos_comunicados_areas_usuario(usuario):
@@ -7,33 +8,32 @@ def obtener_ultimos_comunicados_areas_usuario(usuario):
     de las áreas de interés a las que está suscrito el usuario.
     Si no tiene áreas asignadas, devuelve los 2 últimos de TODOS_HERMANOS.
     """
-    areas_usuario = usuario.areas_interes.all()
+    mascara = usuario.mascara_suscripcion or MASCARA_TODOS_HERMANOS
 
-    if not areas_usuario.exists():
-        return Comunicado.objects.filter(
-            areas_interes__nombre_area=AreaInteres.NombreArea.TODOS_HERMANOS
-        ).distinct().order_by('-fecha_emision')[:2]
+    comunicados = Comunicado.objects.defer(*CAMPOS_DIFERIDOS_LISTADO)
 
-    return Comunicado.objects.filter(
-        areas_interes__in=areas_usuario
-    ).distinct().order_by('-fecha_emision')[:2]
+    return filtrar_por_audiencia(comunicados, mascara).order_by('-fecha_emision')[:2]
 
 
 def obtener_comunicados_relacionados_usuario(usuario, comunicado_actual_id):
     """
-    Obtiene los 3 últimos comunicados publicados de las áreas de interés del usuario,
-    excluyendo explícitamente el comunicado que se está leyendo.
-    Si no tiene áreas asignadas, devuelve los 3 últimos de TODOS_HERMANOS.
+    Obtiene los 3 comunicados más parecidos al que se está leyendo entre los dirigidos a las
+    áreas de interés del usuario (o a TODOS_HERMANOS si no tiene áreas).
+
+    Los vecinos vienen precalculados a partir de los embeddings (ver
+    relacionados_comunicado_service), así que es una sola consulta por índice. Si el
+    comunicado aún no tiene vecinos visibles para el usuario, devuelve los 3 últimos
+    de sus áreas, excluyendo el que se está leyendo.
     """
-    areas_usuario = usuario.areas_interes.all()
+    mascara = usuario.mascara_suscripcion or MASCARA_TODOS_HERMANOS
+
+    vecinos = filtrar_por_audiencia(
+        Comunicado.objects.filter(vecino_de__comunicado_id=comunicado_actual_id).defer(*CAMPOS_DIFERIDOS_LISTADO), mascara
+    ).order_by('-vecino_de__similitud')[:3]
 
-    queryset_base = Comunicado.objects.exclude(id=comunicado_actual_id)
+    if vecinos:
+        return vecinos
 
-    if not areas_usuario.exists():
-        return queryset_base.filter(
-            areas_interes__nombre_area=AreaInteres.NombreArea.TODOS_HERMANOS
-        ).distinct().order_by('-fecha_emision')[:3]
+    queryset_base = Comunicado.objects.exclude(id=comunicado_actual_id).defer(*CAMPOS_DIFERIDOS_LISTADO)
 
-    return queryset_base.filter(
-        areas_interes__in=areas_usuario
-    ).distinct().order_by('-fecha_emision')[:3]
\ No newline at end of file
+    return filtrar_por_audiencia(queryset_base, mascara).order_by('-fecha_emision')[:3]
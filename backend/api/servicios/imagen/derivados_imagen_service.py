@@ -0,0 +1,143 @@
+import hashlib
+import posixpath
+import threading
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+
+# Anchos (px) de las versiones reducidas: miniatura para las tarjetas y media para el detalle
+ANCHOS_DERIVADOS = (400, 1000)
+
+FORMATOS_DERIVADOS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'jpeg': {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True},
+}
+
+EXTENSIONES = {'webp': 'webp', 'jpeg': 'jpg'}
+
+
+def _redimensionar(imagen, ancho):
+    if imagen.width <= ancho:
+        return imagen
+    alto = max(1, round(imagen.height * ancho / imagen.width))
+    return imagen.resize((ancho, alto), Image.Resampling.LANCZOS)
+
+
+def _codificar(imagen, formato):
+    if formato == 'jpeg' and imagen.mode != 'RGB':
+        imagen = imagen.convert('RGB')
+    elif formato == 'webp' and imagen.mode not in ('RGB', 'RGBA'):
+        imagen = imagen.convert('RGBA' if 'A' in imagen.getbands() else 'RGB')
+
+    buffer = BytesIO()
+    imagen.save(buffer, **FORMATOS_DERIVADOS[formato])
+    return buffer.getvalue()
+
+
+def crear_derivados(campo_imagen) -> dict:
+    """
+    Genera las versiones WebP y JPEG de `campo_imagen` (un FieldFile) y las guarda en
+    `<carpeta del original>/derivados/<huella>_<ancho>.<ext>`.
+
+    La huella es el SHA-256 del contenido original, así que los nombres son estables:
+    volver a procesar la misma imagen (o subirla dos veces) no genera ficheros nuevos.
+    Nunca se amplía: si el original es más estrecho que un ancho, se usa su anchura.
+
+    Devuelve el diccionario que se guarda en `imagen_derivados`:
+        {'origen': nombre, 'huella': ..., 'anchos': [...], 'webp': {ancho: nombre}, 'jpeg': {...}}
+    """
+    storage = campo_imagen.storage
+
+    with campo_imagen.open('rb') as fichero:
+        contenido = fichero.read()
+
+    huella = hashlib.sha256(contenido).hexdigest()[:20]
+    carpeta = posixpath.join(posixpath.dirname(campo_imagen.name), 'derivados')
+
+    with Image.open(BytesIO(contenido)) as original:
+        original = ImageOps.exif_transpose(original)
+        original.load()
+
+    anchos = sorted({min(ancho, original.width) for ancho in ANCHOS_DERIVADOS})
+    derivados = {'origen': campo_imagen.name, 'huella': huella, 'anchos': anchos}
+
+    for ancho in anchos:
+        reducida = _redimensionar(original, ancho)
+
+        for formato, extension in EXTENSIONES.items():
+            nombre = posixpath.join(carpeta, f"{huella}_{ancho}.{extension}")
+            if not storage.exists(nombre):
+                nombre = storage.save(nombre, ContentFile(_codificar(reducida, formato)))
+
+            derivados.setdefault(formato, {})[str(ancho)] = nombre
+
+    return derivados
+
+
+def generar_derivados_imagen(modelo, pk):
+    """
+    Genera y registra los derivados de la portada de una fila de `modelo` (Comunicado o Acto).
+    Solo guarda el resultado si la portada no ha cambiado mientras se procesaba.
+    """
+    try:
+        instancia = modelo.objects.only('imagen_portada', 'imagen_derivados').get(pk=pk)
+        if not instancia.imagen_portada:
+            return
+
+        if instancia.imagen_derivados.get('origen') == instancia.imagen_portada.name:
+            return
+
+        derivados = crear_derivados(instancia.imagen_portada)
+
+        modelo.objects.filter(pk=pk, imagen_portada=instancia.imagen_portada.name).update(
+            imagen_derivados=derivados, updated_at=timezone.now()
+        )
+        print(f"✅ Derivados de imagen generados para {modelo.__name__} {pk}")
+
+    except modelo.DoesNotExist:
+        print(f"⚠️ {modelo.__name__} {pk} no encontrado para generar derivados de imagen.")
+    except Exception as e:
+        print(f"⚠️ Error generando derivados de imagen para {modelo.__name__} {pk}: {e}")
+
+
+def generar_derivados_imagen_async(modelo, pk):
+    """
+    Se ejecuta en segundo plano para no alargar la petición de subida (imágenes de hasta 4000x4000).
+    El hilo cierra su conexión a la BD al terminar para no dejarla abierta tras cada subida.
+    """
+    def ejecutar():
+        try:
+            generar_derivados_imagen(modelo, pk)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=ejecutar)
+    thread.start()
+
+
+def programar_derivados_imagen(instancia):
+    """Encola la generación de derivados cuando se confirme la transacción, si la instancia tiene portada."""
+    if instancia.imagen_portada:
+        modelo, pk = type(instancia), instancia.pk
+        transaction.on_commit(lambda: generar_derivados_imagen_async(modelo, pk))
+
+
+def eliminar_derivados(modelo, derivados: dict, storage):
+    """
+    Borra los ficheros derivados salvo que otra fila use la misma imagen (misma huella),
+    ya que los nombres por contenido se comparten.
+    """
+    huella = derivados.get('huella')
+    if not huella or modelo.objects.filter(imagen_derivados__huella=huella).exists():
+        return
+
+    for formato in EXTENSIONES:
+        for nombre in derivados.get(formato, {}).values():
+            try:
+                storage.delete(nombre)
+            except Exception:
+                pass
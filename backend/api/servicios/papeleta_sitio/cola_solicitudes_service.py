@@ -0,0 +1,231 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from api.models import Acto, PapeletaSitio, Puesto, SolicitudEnCola
+from api.servicios.papeleta_sitio_service import PapeletaSitioService
+from api.servicios.solicitud_cirio_tradicional import SolicitudCirioTradicionalService
+from api.servicios.solicitud_insignia.solicitud_insignia_service import SolicitudInsigniaService
+
+
+# -----------------------------------------------------------------------------
+# COLA DE ADMISIÓN DE SOLICITUDES
+#
+# Al abrir el plazo todos los hermanos envían su solicitud a la vez y cada una bloquea
+# la fila del hermano, lanza sus validaciones y escribe papeleta y preferencias. Con
+# `SOLICITUDES_EN_COLA` los endpoints solo validan la forma de la petición, la guardan
+# en SolicitudEnCola y devuelven un ticket; los workers del comando
+# `procesar_cola_solicitudes` la tramitan con los servicios de siempre, de modo que la
+# BD ve como mucho tantas escrituras concurrentes como workers.
+# -----------------------------------------------------------------------------
+MAX_INTENTOS = 3
+MINUTOS_ATASCADA = 10
+
+Tipo = SolicitudEnCola.TipoSolicitud
+Estado = SolicitudEnCola.EstadoCola
+
+
+def modo_admision_activo() -> bool:
+    return getattr(settings, 'SOLICITUDES_EN_COLA', False)
+
+
+def _preferencias_para_cola(preferencias) -> list:
+    return [
+        {'puesto_solicitado': item['puesto_solicitado'].pk, 'orden_prioridad': item['orden_prioridad']}
+        for item in preferencias
+    ]
+
+
+def datos_para_cola(tipo, validated_data) -> dict:
+    """Convierte los datos validados por el serializer del endpoint en JSON (ids en lugar de instancias)."""
+    if tipo == Tipo.INSIGNIA:
+        return {'preferencias': _preferencias_para_cola(validated_data['preferencias'])}
+
+    if tipo == Tipo.CIRIO:
+        return {
+            'puesto': validated_data['puesto'].pk,
+            'numero_registro_vinculado': validated_data.get('numero_registro_vinculado'),
+        }
+
+    return {
+        'puesto_general_id': validated_data.get('puesto_general_id'),
+        'preferencias': _preferencias_para_cola(validated_data.get('preferencias_solicitadas', [])),
+    }
+
+
+def calcular_clave_idempotencia(tipo, acto_id, datos) -> str:
+    """Clave por defecto si el cliente no envía `Idempotency-Key`: el mismo envío repetido es la misma solicitud."""
+    contenido = json.dumps([tipo, acto_id, datos], sort_keys=True)
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+
+def _admite_reenvio(solicitud: SolicitudEnCola) -> bool:
+    """Rechazada, o aceptada pero su papeleta ya no está activa (anulada, no asignada o borrada)."""
+    if solicitud.estado == Estado.RECHAZADA:
+        return True
+
+    return solicitud.estado == Estado.ACEPTADA and not PapeletaSitio.objects.filter(
+        pk=solicitud.papeleta_id, activa=True
+    ).exists()
+
+
+def encolar_solicitud(hermano, tipo, validated_data, clave_idempotencia=None) -> SolicitudEnCola:
+    """
+    Guarda la solicitud y devuelve su ticket. Si ya existe una con la misma clave se
+    devuelve esa (doble clic, reintentos del cliente), salvo que hubiera sido rechazada
+    o que su papeleta se haya anulado después: entonces el envío es un nuevo intento y
+    vuelve a la cola.
+    """
+    acto = validated_data['acto']
+    datos = datos_para_cola(tipo, validated_data)
+    clave = (clave_idempotencia or calcular_clave_idempotencia(tipo, acto.pk, datos))[:64]
+
+    existente = SolicitudEnCola.objects.filter(hermano=hermano, clave_idempotencia=clave).first()
+    if existente is None:
+        try:
+            with transaction.atomic():
+                return SolicitudEnCola.objects.create(
+                    hermano=hermano, acto=acto, tipo=tipo, datos=datos, clave_idempotencia=clave
+                )
+        except IntegrityError:
+            existente = SolicitudEnCola.objects.get(hermano=hermano, clave_idempotencia=clave)
+
+    if _admite_reenvio(existente):
+        ahora = timezone.now()
+        SolicitudEnCola.objects.filter(pk=existente.pk, estado=existente.estado).update(
+            acto=acto, tipo=tipo, datos=datos, estado=Estado.PENDIENTE, intentos=0,
+            mensaje='', papeleta=None, recibida_en=ahora, procesada_en=None, updated_at=ahora,
+        )
+        existente.refresh_from_db()
+
+    return existente
+
+
+def posicion_en_cola(solicitud: SolicitudEnCola):
+    """Solicitudes pendientes por delante (1 = la siguiente), o None si ya no está pendiente."""
+    if solicitud.estado != Estado.PENDIENTE:
+        return None
+    return SolicitudEnCola.objects.filter(estado=Estado.PENDIENTE, pk__lt=solicitud.pk).count() + 1
+
+
+def reclamar_lote(tamano: int) -> list:
+    """
+    Pasa a EN_PROCESO hasta `tamano` solicitudes pendientes en orden de llegada. Donde la
+    BD lo admite se saltan las filas que otro worker tiene bloqueadas; el UPDATE
+    condicionado garantiza además que cada solicitud la reclame un solo worker.
+    """
+    with transaction.atomic():
+        pendientes = SolicitudEnCola.objects.filter(estado=Estado.PENDIENTE).order_by('pk')
+        if connection.features.has_select_for_update_skip_locked:
+            pendientes = pendientes.select_for_update(skip_locked=True)
+
+        reclamadas = []
+        for solicitud in pendientes[:tamano]:
+            actualizadas = SolicitudEnCola.objects.filter(pk=solicitud.pk, estado=Estado.PENDIENTE).update(
+                estado=Estado.EN_PROCESO, intentos=F('intentos') + 1, updated_at=timezone.now()
+            )
+            if actualizadas:
+                solicitud.estado = Estado.EN_PROCESO
+                solicitud.intentos += 1
+                reclamadas.append(solicitud)
+
+    return reclamadas
+
+
+def _ejecutar(solicitud: SolicitudEnCola):
+    hermano = solicitud.hermano
+    acto = Acto.objects.select_related('tipo_acto').get(pk=solicitud.acto_id)
+    datos = solicitud.datos
+    ahora = solicitud.recibida_en
+
+    if solicitud.tipo == Tipo.INSIGNIA:
+        return SolicitudInsigniaService().procesar_solicitud_insignia_tradicional(
+            hermano=hermano, acto=acto, preferencias_data=[dict(item) for item in datos['preferencias']], ahora=ahora
+        )
+
+    if solicitud.tipo == Tipo.CIRIO:
+        puesto = Puesto.objects.select_related('tipo_puesto').get(pk=datos['puesto'])
+        return SolicitudCirioTradicionalService().procesar_solicitud_cirio_tradicional(
+            hermano=hermano, acto=acto, puesto=puesto,
+            numero_registro_vinculado=datos.get('numero_registro_vinculado'), ahora=ahora
+        )
+
+    return PapeletaSitioService().procesar_solicitud_unificada(
+        hermano=hermano, acto=acto, ahora=ahora,
+        datos_solicitud={
+            'puesto_general_id': datos.get('puesto_general_id'),
+            'preferencias': [dict(item) for item in datos.get('preferencias', [])],
+        },
+    )
+
+
+def _papeleta_de_intento_anterior(solicitud: SolicitudEnCola):
+    """
+    Papeleta que un intento anterior llegó a confirmar aunque el worker cayera antes de
+    marcar la solicitud. Los servicios la fechan con `recibida_en`, lo que la identifica.
+    """
+    if solicitud.intentos <= 1:
+        return None
+
+    return PapeletaSitio.objects.filter(
+        hermano_id=solicitud.hermano_id, acto_id=solicitud.acto_id, activa=True, fecha_solicitud=solicitud.recibida_en
+    ).first()
+
+
+def tramitar(solicitud: SolicitudEnCola) -> SolicitudEnCola:
+    """
+    Tramita una solicitud reclamada con el servicio de su modalidad. Los plazos se evalúan
+    en el momento en que se recibió, no en el que la procesa el worker. Los errores que
+    no son de validación (bloqueos, caídas de la BD) se reintentan hasta MAX_INTENTOS;
+    si un intento anterior ya creó la papeleta, se enlaza en lugar de repetirlo.
+    """
+    try:
+        papeleta = _papeleta_de_intento_anterior(solicitud) or _ejecutar(solicitud)
+        solicitud.estado = Estado.ACEPTADA
+        solicitud.papeleta = papeleta
+        solicitud.mensaje = ''
+
+    except ValidationError as e:
+        solicitud.estado = Estado.RECHAZADA
+        solicitud.mensaje = e.message if hasattr(e, 'message') else ' '.join(e.messages)
+
+    except Exception as e:
+        print(f"Error tramitando la solicitud en cola {solicitud.ticket}: {e}")
+        if solicitud.intentos < MAX_INTENTOS:
+            solicitud.estado = Estado.PENDIENTE
+        else:
+            solicitud.estado = Estado.RECHAZADA
+            solicitud.mensaje = "Error interno al procesar la solicitud."
+
+    if solicitud.estado != Estado.PENDIENTE:
+        solicitud.procesada_en = timezone.now()
+
+    solicitud.save(update_fields=['estado', 'papeleta', 'mensaje', 'procesada_en', 'updated_at'])
+    return solicitud
+
+
+def procesar_cola(tamano_lote: int = 10) -> int:
+    """Vacía la cola en lotes hasta que no quedan pendientes. Devuelve las solicitudes tramitadas."""
+    total = 0
+    while True:
+        lote = reclamar_lote(tamano_lote)
+        if not lote:
+            return total
+
+        for solicitud in lote:
+            tramitar(solicitud)
+        total += len(lote)
+
+
+def liberar_atascadas(minutos: int = MINUTOS_ATASCADA) -> int:
+    """Devuelve a la cola las solicitudes que un worker caído dejó EN_PROCESO."""
+    limite = timezone.now() - timedelta(minutes=minutos)
+    return SolicitudEnCola.objects.filter(estado=Estado.EN_PROCESO, updated_at__lt=limite).update(
+        estado=Estado.PENDIENTE, updated_at=timezone.now()
+    )
@@ -0,0 +1,125 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Min, Q
+
+from api.models import Acto, Cuota, ElegibilidadSolicitud, Hermano, HermanoCuerpo
+
+
+# -----------------------------------------------------------------------------
+# FOTO DE ELEGIBILIDAD POR ACTO
+#
+# Al abrir el plazo todos los hermanos solicitan a la vez y cada solicitud consultaba
+# sus cuotas (deuda e historial) y sus cuerpos. La foto se construye antes del plazo en
+# dos consultas para toda la hermandad, las señales de Cuota y HermanoCuerpo la mantienen
+# al día y la validación se reduce a leer una fila por (acto, hermano). El estado ALTA y
+# la fecha de nacimiento están en la propia fila del hermano y se siguen leyendo de ahí.
+# -----------------------------------------------------------------------------
+ESTADOS_DEUDA = (Cuota.EstadoCuota.PENDIENTE, Cuota.EstadoCuota.DEVUELTA)
+
+
+def anio_limite_para(ahora) -> int:
+    """Los hermanos deben estar al corriente hasta el ejercicio anterior al de la solicitud."""
+    return ahora.date().year - 1
+
+
+def _agregados_cuotas(anio_limite, prefijo=''):
+    return {
+        'anio_primera_deuda': Min(
+            f'{prefijo}anio',
+            filter=Q(**{f'{prefijo}anio__lte': anio_limite, f'{prefijo}estado__in': ESTADOS_DEUDA}),
+        ),
+        'cuotas_hasta_limite': Count(f'{prefijo}id', filter=Q(**{f'{prefijo}anio__lte': anio_limite})),
+    }
+
+
+def _cuerpos_por_hermano(hermanos_ids=None) -> dict:
+    pertenencias = HermanoCuerpo.objects.all()
+    if hermanos_ids is not None:
+        pertenencias = pertenencias.filter(hermano_id__in=hermanos_ids)
+
+    cuerpos = defaultdict(list)
+    for hermano_id, nombre_cuerpo in pertenencias.order_by('cuerpo__nombre_cuerpo').values_list('hermano_id', 'cuerpo__nombre_cuerpo'):
+        cuerpos[hermano_id].append(nombre_cuerpo)
+    return cuerpos
+
+
+def _filas_elegibilidad(anio_limite, hermanos_ids=None) -> dict:
+    """`hermano_id -> campos de la foto` para los hermanos indicados (todos si es None), en dos consultas."""
+    hermanos = Hermano.objects.all()
+    if hermanos_ids is not None:
+        hermanos = hermanos.filter(pk__in=hermanos_ids)
+
+    agregados = hermanos.order_by().annotate(**_agregados_cuotas(anio_limite, prefijo='cuotas__')).values_list(
+        'pk', 'anio_primera_deuda', 'cuotas_hasta_limite'
+    )
+    cuerpos = _cuerpos_por_hermano(hermanos_ids)
+
+    return {
+        hermano_id: {
+            'anio_limite': anio_limite,
+            'anio_primera_deuda': anio_primera_deuda,
+            'tiene_historial_cuotas': cuotas_hasta_limite > 0,
+            'cuerpos': cuerpos.get(hermano_id, []),
+        }
+        for hermano_id, anio_primera_deuda, cuotas_hasta_limite in agregados
+    }
+
+
+@transaction.atomic
+def preparar_elegibilidad_acto(acto: Acto) -> int:
+    """
+    (Re)construye la foto de todos los hermanos para el acto. Se lanza antes de abrir el
+    plazo; el ejercicio límite se toma del inicio de solicitud del acto.
+    """
+    referencia = acto.inicio_solicitud or acto.inicio_solicitud_cirios or acto.fecha
+    filas = _filas_elegibilidad(anio_limite_para(referencia))
+
+    ElegibilidadSolicitud.objects.filter(acto=acto).delete()
+    ElegibilidadSolicitud.objects.bulk_create(
+        [ElegibilidadSolicitud(acto=acto, hermano_id=hermano_id, **campos) for hermano_id, campos in filas.items()],
+        batch_size=1000,
+    )
+    return len(filas)
+
+
+def actualizar_elegibilidad_hermanos(hermanos_ids):
+    """Recalcula las fotos existentes de los hermanos indicados tras un cambio en sus cuotas o cuerpos."""
+    hermanos_ids = {pk for pk in hermanos_ids if pk is not None}
+    if not hermanos_ids:
+        return
+
+    fotos = ElegibilidadSolicitud.objects.filter(hermano_id__in=hermanos_ids).only('pk', 'hermano_id', 'anio_limite')
+
+    fotos_por_limite = defaultdict(list)
+    for foto in fotos:
+        fotos_por_limite[foto.anio_limite].append(foto)
+
+    for anio_limite, fotos_limite in fotos_por_limite.items():
+        filas = _filas_elegibilidad(anio_limite, {foto.hermano_id for foto in fotos_limite})
+        for foto in fotos_limite:
+            if foto.hermano_id in filas:
+                ElegibilidadSolicitud.objects.filter(pk=foto.pk).update(**filas[foto.hermano_id])
+
+
+def obtener_elegibilidad(hermano: Hermano, acto: Acto, ahora) -> ElegibilidadSolicitud:
+    """
+    Foto del hermano para el acto. Si no se preparó (o es de otro ejercicio) se calcula
+    al vuelo sin guardarla, con el mismo resultado.
+    """
+    anio_limite = anio_limite_para(ahora)
+
+    foto = ElegibilidadSolicitud.objects.filter(acto=acto, hermano=hermano, anio_limite=anio_limite).first()
+    if foto is not None:
+        return foto
+
+    cuotas = hermano.cuotas.aggregate(**_agregados_cuotas(anio_limite))
+
+    return ElegibilidadSolicitud(
+        acto=acto,
+        hermano=hermano,
+        anio_limite=anio_limite,
+        anio_primera_deuda=cuotas['anio_primera_deuda'],
+        tiene_historial_cuotas=cuotas['cuotas_hasta_limite'] > 0,
+        cuerpos=list(hermano.cuerpos.values_list('nombre_cuerpo', flat=True)),
+    )
@@ -1,11 +1,13 @@
 from datetime import datetime, time
 import uuid
 from django.utils import timezone
-from django.db import transaction, IntegrityError
+from django.db import transaction
 from django.core.exceptions import ValidationError
 from django.db.models import Q
 
-from ..models import Acto, CuerpoPertenencia, Cuota, Hermano, PapeletaSitio, Puesto, PreferenciaSolicitud
+from ..models import Acto, CuerpoPertenencia, ElegibilidadSolicitud, Hermano, PapeletaSitio, Puesto, PreferenciaSolicitud
+from .acto.estadisticas_acto_service import registrar_transicion
+from .papeleta_sitio.elegibilidad_solicitud_service import obtener_elegibilidad
 
 class PapeletaSitioService:
     """
@@ -23,17 +25,18 @@ class PapeletaSitioService:
     )
 
     @transaction.atomic
-    def procesar_solicitud_unificada(self, hermano: Hermano, acto: Acto, datos_solicitud: dict):
+    def procesar_solicitud_unificada(self, hermano: Hermano, acto: Acto, datos_solicitud: dict, ahora=None):
         # ----------------------------------------------------------------------------------
         Hermano.objects.select_for_update().only("id").get(pk=hermano.pk)
 
-        ahora = timezone.now()
+        ahora = ahora or timezone.now()
 
         self._validar_configuracion_acto_unificado(acto)
         self._validar_plazo_vigente(ahora, acto.inicio_solicitud, acto.fin_solicitud, nombre_plazo="solicitud de papeletas")
 
-        cuerpos_hermano_set = set(hermano.cuerpos.values_list('nombre_cuerpo', flat=True))
-        self._validar_hermano_apto_para_solicitar(hermano, cuerpos_hermano_set, ahora)
+        elegibilidad = obtener_elegibilidad(hermano, acto, ahora)
+        cuerpos_hermano_set = set(elegibilidad.cuerpos)
+        self._validar_hermano_apto_para_solicitar(hermano, elegibilidad)
         # ----------------------------------------------------------------------------------
 
         self._validar_unicidad(hermano, acto)
@@ -58,22 +61,21 @@ class PapeletaSitioService:
             
             self._validar_item_puesto_general(cuerpos_hermano_set, acto, puesto_general_obj)
 
-        try:
-            papeleta = self._crear_papeleta(
-                hermano, 
-                acto, 
-                ahora, 
-                puesto_general=puesto_general_obj, 
-                tiene_insignias=bool(preferencias_data)
-            )
+        # Una papeleta activa duplicada (doble envío simultáneo) la rechaza el propio modelo con ValidationError
+        papeleta = self._crear_papeleta(
+            hermano, 
+            acto, 
+            ahora, 
+            puesto_general=puesto_general_obj, 
+            tiene_insignias=bool(preferencias_data)
+        )
 
-            if preferencias_data:
-                self._guardar_preferencias(papeleta, preferencias_data)
+        if preferencias_data:
+            self._guardar_preferencias(papeleta, preferencias_data)
 
-            return papeleta
+        registrar_transicion(acto.pk, None, PapeletaSitio.objects.filter(pk=papeleta.pk))
 
-        except IntegrityError:
-            raise ValidationError("Error de integridad. Es posible que ya exista una solicitud procesándose.")
+        return papeleta
         
     # =========================================================================
     # VALIDACIONES DE ACTO Y HERMANO
@@ -129,11 +131,11 @@ class PapeletaSitioService:
         
 
 
-    def _validar_hermano_apto_para_solicitar(self, hermano: Hermano, cuerpos_hermano_set: set, ahora):
+    def _validar_hermano_apto_para_solicitar(self, hermano: Hermano, elegibilidad: ElegibilidadSolicitud):
         """Agrupa las validaciones de estado del hermano."""
         self._validar_hermano_en_alta(hermano)
-        self._validar_hermano_al_corriente_hasta_anio_anterior(hermano, ahora)
-        self._validar_pertenencia_cuerpos(cuerpos_hermano_set)
+        self._validar_hermano_al_corriente_hasta_anio_anterior(elegibilidad)
+        self._validar_pertenencia_cuerpos(set(elegibilidad.cuerpos))
 
 
 
@@ -143,29 +145,16 @@ class PapeletaSitioService:
         
 
 
-    def _validar_hermano_al_corriente_hasta_anio_anterior(self, hermano: Hermano, ahora):
-        anio_actual = ahora.date().year
-        anio_limite = anio_actual - 1
+    def _validar_hermano_al_corriente_hasta_anio_anterior(self, elegibilidad: ElegibilidadSolicitud):
+        anio_limite = elegibilidad.anio_limite
 
-        estados_deuda = [
-            Cuota.EstadoCuota.PENDIENTE, 
-            Cuota.EstadoCuota.DEVUELTA
-        ]
-
-        deuda = hermano.cuotas.filter(
-            anio__lte=anio_limite,
-            estado__in=estados_deuda
-        ).values('anio').order_by('anio').first()
-
-        if deuda:
+        if elegibilidad.anio_primera_deuda is not None:
             raise ValidationError(
-                f"Consta una cuota pendiente o devuelta del año {deuda['anio']}. "
+                f"Consta una cuota pendiente o devuelta del año {elegibilidad.anio_primera_deuda}. "
                 f"Por favor, contacte con mayordomía para regularizar su situación."
             )
 
-        existe_historial = hermano.cuotas.filter(anio__lte=anio_limite).exists()
-        
-        if not existe_historial:
+        if not elegibilidad.tiene_historial_cuotas:
             raise ValidationError(
                 f"No constan cuotas registradas hasta el año {anio_limite}. "
                 "Contacte con secretaría para verificar su ficha."
@@ -3,6 +3,9 @@ from django.contrib.auth import get_user_model
 import requests
 from django.conf import settings
 import base64
+from asgiref.sync import sync_to_async
+
+from api.servicios.cliente_http_async import obtener_cliente_http_async
 
 User = get_user_model()
 
@@ -13,34 +16,72 @@ class TelegramWebhookService:
         Recibe el JSON del webhook de Telegram y busca el comando /start
         """
         try:
-            message = data.get('message', {})
-            chat_id = message.get('chat', {}).get('id')
-            text = message.get('text', '')
-
-            if text.startswith('/start '):
-                token_limpio = text.split(' ')[1] 
-                
-                padding = 4 - (len(token_limpio) % 4)
-                token_base64 = token_limpio + ("=" * padding)
-                
-                signer = Signer()
-                try:
-                    token_decodificado = base64.urlsafe_b64decode(token_base64.encode()).decode()
-
-                    user_id = signer.unsign(token_decodificado)
-                    hermano = User.objects.get(id=user_id)
-
-                    hermano.telegram_chat_id = str(chat_id)
-                    hermano.save()
-
-                    TelegramWebhookService._enviar_bienvenida(chat_id, hermano.nombre)
-                    
-                except (BadSignature, User.DoesNotExist, ValueError) as e:
-                    print(f"Intento de vinculación fallido. Error: {e}")
-                    
+            vinculado = TelegramWebhookService._vincular_hermano(data)
+
+            if vinculado:
+                chat_id, hermano = vinculado
+                TelegramWebhookService._enviar_bienvenida(chat_id, hermano.nombre)
+
         except Exception as e:
             print(f"Error procesando webhook de Telegram: {e}")
 
+    @staticmethod
+    async def aprocesar_actualizacion(data):
+        """
+        Versión asíncrona para la vista ASGI: la vinculación (BD) se ejecuta en un hilo
+        y el mensaje de bienvenida se envía con el cliente HTTP asíncrono.
+        """
+        try:
+            vinculado = await sync_to_async(TelegramWebhookService._vincular_hermano)(data)
+
+            if vinculado:
+                chat_id, hermano = vinculado
+                await TelegramWebhookService._aenviar_bienvenida(chat_id, hermano.nombre)
+
+        except Exception as e:
+            print(f"Error procesando webhook de Telegram: {e}")
+
+    @staticmethod
+    def _vincular_hermano(data):
+        """
+        Si el mensaje es '/start <token>' con un token firmado válido, guarda el chat_id
+        en el hermano correspondiente y devuelve (chat_id, hermano). En otro caso, None.
+        """
+        message = data.get('message', {})
+        chat_id = message.get('chat', {}).get('id')
+        text = message.get('text', '')
+
+        if not text.startswith('/start '):
+            return None
+
+        token_limpio = text.split(' ')[1] 
+        
+        padding = 4 - (len(token_limpio) % 4)
+        token_base64 = token_limpio + ("=" * padding)
+        
+        signer = Signer()
+        try:
+            token_decodificado = base64.urlsafe_b64decode(token_base64.encode()).decode()
+
+            user_id = signer.unsign(token_decodificado)
+            hermano = User.objects.get(id=user_id)
+
+            hermano.telegram_chat_id = str(chat_id)
+            hermano.save()
+
+            return chat_id, hermano
+            
+        except (BadSignature, User.DoesNotExist, ValueError) as e:
+            print(f"Intento de vinculación fallido. Error: {e}")
+            return None
+
+    @staticmethod
+    def _payload_bienvenida(chat_id, nombre_hermano):
+        return {
+            "chat_id": chat_id,
+            "text": f"✅ ¡Hola {nombre_hermano}! Tu cuenta de la Hermandad ha sido vinculada correctamente a Telegram. A partir de ahora recibirás aquí los comunicados."
+        }
+
     @staticmethod
     def _enviar_bienvenida(chat_id, nombre_hermano):
         token = getattr(settings, 'TELEGRAM_BOT_TOKEN', None)
@@ -48,11 +89,16 @@ class TelegramWebhookService:
             return
             
         url = f"https://api.telegram.org/bot{token}/sendMessage"
-        payload = {
-            "chat_id": chat_id,
-            "text": f"✅ ¡Hola {nombre_hermano}! Tu cuenta de la Hermandad ha sido vinculada correctamente a Telegram. A partir de ahora recibirás aquí los comunicados."
-        }
-        requests.post(url, json=payload, timeout=5)
+        requests.post(url, json=TelegramWebhookService._payload_bienvenida(chat_id, nombre_hermano), timeout=5)
+
+    @staticmethod
+    async def _aenviar_bienvenida(chat_id, nombre_hermano):
+        token = getattr(settings, 'TELEGRAM_BOT_TOKEN', None)
+        if not token:
+            return
+
+        url = f"https://api.telegram.org/bot{token}/sendMessage"
+        await obtener_cliente_http_async().post(url, json=TelegramWebhookService._payload_bienvenida(chat_id, nombre_hermano), timeout=5)
 
 
 
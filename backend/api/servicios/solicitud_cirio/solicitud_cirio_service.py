@@ -12,6 +12,7 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib.styles import getSampleStyleSheet
 
 from api.models import Acto, PapeletaSitio, Tramo, Puesto
+from api.servicios.acto.estadisticas_acto_service import contar_papeletas, registrar_transicion
 
 class ReportesCiriosService:
     def ejecutar_asignacion_automatica_cirios(acto_id: int):
@@ -37,6 +38,12 @@ class ReportesCiriosService:
             ahora = timezone.now()
             fecha_hoy = ahora.date()
 
+            papeletas_cirio = PapeletaSitio.objects.filter(
+                Q(es_solicitud_insignia=False) | Q(es_solicitud_insignia__isnull=True),
+                acto=acto
+            )
+            estadisticas_antes = contar_papeletas(papeletas_cirio)
+
             PapeletaSitio.objects.filter(
                 Q(es_solicitud_insignia=False) | Q(es_solicitud_insignia__isnull=True),
                 acto=acto
@@ -47,7 +54,8 @@ class ReportesCiriosService:
                 codigo_verificacion=None,
                 orden_en_tramo=None,
                 lado=None,
-                estado_papeleta=PapeletaSitio.EstadoPapeleta.SOLICITADA
+                estado_papeleta=PapeletaSitio.EstadoPapeleta.SOLICITADA,
+                updated_at=ahora
             )
 
             max_papeleta_existente = PapeletaSitio.objects.filter(
@@ -211,18 +219,23 @@ class ReportesCiriosService:
                 )
 
             if papeletas_para_actualizar:
+                for papeleta in papeletas_para_actualizar:
+                    papeleta.updated_at = ahora
+
                 PapeletaSitio.objects.bulk_update(
                     papeletas_para_actualizar, 
                     fields=[
                         'tramo', 'numero_papeleta', 'estado_papeleta', 
                         'fecha_emision', 'codigo_verificacion', 
-                        'orden_en_tramo', 'lado'
+                        'orden_en_tramo', 'lado', 'updated_at'
                     ],
                     batch_size=1000
                 )
 
+            registrar_transicion(acto.pk, estadisticas_antes, papeletas_cirio)
+
             acto.fecha_ejecucion_cirios = ahora
-            acto.save(update_fields=['fecha_ejecucion_cirios'])
+            acto.save(update_fields=['fecha_ejecucion_cirios', 'updated_at'])
 
         return len(papeletas_para_actualizar)
 
@@ -1,9 +1,11 @@
 import uuid
 from django.utils import timezone
-from django.db import transaction, IntegrityError
+from django.db import transaction
 from django.core.exceptions import ValidationError
 
-from api.models import Acto, CuerpoPertenencia, Cuota, Hermano, PapeletaSitio, Puesto
+from api.models import Acto, CuerpoPertenencia, ElegibilidadSolicitud, Hermano, PapeletaSitio, Puesto
+from api.servicios.acto.estadisticas_acto_service import contar_papeletas, registrar_transicion
+from api.servicios.papeleta_sitio.elegibilidad_solicitud_service import obtener_elegibilidad
 
 
 class SolicitudCirioTradicionalService:
@@ -16,22 +18,26 @@ class SolicitudCirioTradicionalService:
         return PapeletaSitio.objects.exclude(estado_papeleta__in=self.ESTADOS_NO_ACTIVOS)
 
     @transaction.atomic
-    def procesar_solicitud_cirio_tradicional(self, hermano: Hermano, acto: Acto, puesto: Puesto, numero_registro_vinculado: int = None):
+    def procesar_solicitud_cirio_tradicional(self, hermano: Hermano, acto: Acto, puesto: Puesto, numero_registro_vinculado: int = None, ahora=None):
 
         Hermano.objects.select_for_update().only("id").get(pk=hermano.pk)
 
-        ahora = timezone.now()
+        ahora = ahora or timezone.now()
 
         self._validar_configuracion_acto_tradicional(acto)
         self._validar_plazo_vigente(ahora, acto.inicio_solicitud_cirios, acto.fin_solicitud_cirios, "cirios")
 
-        cuerpos_hermano_set = set(hermano.cuerpos.values_list('nombre_cuerpo', flat=True))
-        self._validar_hermano_apto_para_solicitar(hermano, cuerpos_hermano_set, ahora)
+        elegibilidad = obtener_elegibilidad(hermano, acto, ahora)
+        cuerpos_hermano_set = set(elegibilidad.cuerpos)
+        self._validar_hermano_apto_para_solicitar(hermano, elegibilidad)
 
         self._validar_item_puesto_cirio(cuerpos_hermano_set, acto, puesto)
 
         solicitud_insignia_a_anular = self._gestionar_conflicto_insignia_y_unicidad(hermano, acto, puesto)
 
+        papeletas_hermano = PapeletaSitio.objects.filter(hermano=hermano, acto=acto)
+        estadisticas_antes = contar_papeletas(papeletas_hermano)
+
         if solicitud_insignia_a_anular:
             anulado = (
                 PapeletaSitio.objects
@@ -43,7 +49,7 @@ class SolicitudCirioTradicionalService:
                     hermano=hermano,
                     acto=acto,
                 )
-                .update(estado_papeleta=PapeletaSitio.EstadoPapeleta.ANULADA)
+                .update(estado_papeleta=PapeletaSitio.EstadoPapeleta.ANULADA, updated_at=timezone.now())
             )
 
             if anulado == 0:
@@ -52,20 +58,16 @@ class SolicitudCirioTradicionalService:
                     "Vuelve a intentarlo o contacta con secretaría."
                 )
 
-        try:
-            papeleta = self._crear_papeleta_base(hermano, acto, ahora)
-            papeleta.puesto = puesto
-            papeleta.save(update_fields=['puesto'])
-
-        except IntegrityError:
-            raise ValidationError(
-                "Ya existe una papeleta activa para este acto. "
-                "Si has pulsado dos veces, espera unos segundos y recarga."
-            )
+        # Una papeleta activa duplicada (doble envío simultáneo) la rechaza el propio modelo con ValidationError
+        papeleta = self._crear_papeleta_base(hermano, acto, ahora)
+        papeleta.puesto = puesto
+        papeleta.save(update_fields=['puesto', 'updated_at'])
 
         if numero_registro_vinculado:
             self._procesar_vinculacion(hermano, acto, papeleta, puesto, numero_registro_vinculado)
 
+        registrar_transicion(acto.pk, estadisticas_antes, papeletas_hermano)
+
         return papeleta
     
 
@@ -100,11 +102,11 @@ class SolicitudCirioTradicionalService:
         
 
 
-    def _validar_hermano_apto_para_solicitar(self, hermano: Hermano, cuerpos_hermano_set: set, ahora):
+    def _validar_hermano_apto_para_solicitar(self, hermano: Hermano, elegibilidad: ElegibilidadSolicitud):
         """Agrupa las validaciones de estado del hermano."""
         self._validar_hermano_en_alta(hermano)
-        self._validar_hermano_al_corriente_hasta_anio_anterior(hermano, ahora)
-        self._validar_pertenencia_cuerpos(cuerpos_hermano_set)
+        self._validar_hermano_al_corriente_hasta_anio_anterior(elegibilidad)
+        self._validar_pertenencia_cuerpos(set(elegibilidad.cuerpos))
 
 
 
@@ -114,29 +116,16 @@ class SolicitudCirioTradicionalService:
         
 
 
-    def _validar_hermano_al_corriente_hasta_anio_anterior(self, hermano: Hermano, ahora):
-        anio_actual = ahora.date().year
-        anio_limite = anio_actual - 1
-
-        estados_deuda = [
-            Cuota.EstadoCuota.PENDIENTE, 
-            Cuota.EstadoCuota.DEVUELTA
-        ]
+    def _validar_hermano_al_corriente_hasta_anio_anterior(self, elegibilidad: ElegibilidadSolicitud):
+        anio_limite = elegibilidad.anio_limite
 
-        deuda = hermano.cuotas.filter(
-            anio__lte=anio_limite,
-            estado__in=estados_deuda
-        ).values('anio').order_by('anio').first()
-
-        if deuda:
+        if elegibilidad.anio_primera_deuda is not None:
             raise ValidationError(
-                f"Consta una cuota pendiente o devuelta del año {deuda['anio']}. "
+                f"Consta una cuota pendiente o devuelta del año {elegibilidad.anio_primera_deuda}. "
                 f"Por favor, contacte con mayordomía para regularizar su situación."
             )
 
-        existe_historial = hermano.cuotas.filter(anio__lte=anio_limite).exists()
-        
-        if not existe_historial:
+        if not elegibilidad.tiene_historial_cuotas:
             raise ValidationError(
                 f"No constan cuotas registradas hasta el año {anio_limite}. "
                 "Contacte con secretaría para verificar su ficha."
@@ -307,4 +296,4 @@ class SolicitudCirioTradicionalService:
             raise ValidationError("Conflicto de sección: Uno va en Cristo y otro en Virgen.")
 
         mi_papeleta.vinculado_a = hermano_objetivo
-        mi_papeleta.save(update_fields=['vinculado_a'])
\ No newline at end of file
+        mi_papeleta.save(update_fields=['vinculado_a', 'updated_at'])
\ No newline at end of file
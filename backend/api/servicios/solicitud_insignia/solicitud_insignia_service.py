@@ -1,10 +1,12 @@
 from django.utils import timezone
-from api.models import Acto, CuerpoPertenencia, Cuota, Hermano, PapeletaSitio, PreferenciaSolicitud, Puesto
+from api.models import Acto, CuerpoPertenencia, ElegibilidadSolicitud, Hermano, PapeletaSitio, PreferenciaSolicitud, Puesto
+from api.servicios.acto.estadisticas_acto_service import registrar_transicion, sumar_incrementos
+from api.servicios.papeleta_sitio.elegibilidad_solicitud_service import obtener_elegibilidad
 from api.servicios.papeleta_telegram import TelegramWebhookService
 from datetime import datetime, time
 import uuid
 from django.utils import timezone
-from django.db import transaction, IntegrityError
+from django.db import transaction
 from django.core.exceptions import ValidationError
 from django.db.models import Q, Count, Max
 from io import BytesIO
@@ -48,21 +50,22 @@ class SolicitudInsigniaService:
     MAX_PREFERENCIAS_PERMITIDAS = 20
 
     @transaction.atomic
-    def procesar_solicitud_insignia_tradicional(self, hermano: Hermano, acto: Acto, preferencias_data: list, vinculado_a = None):
+    def procesar_solicitud_insignia_tradicional(self, hermano: Hermano, acto: Acto, preferencias_data: list, vinculado_a = None, ahora=None):
         """
         [MODALIDAD TRADICIONAL - FASE 1]
         """
         if vinculado_a is not None:
             raise ValidationError("Las solicitudes de insignia no permiten vincularse con otro hermano.")
 
-        ahora = timezone.now()
-
-        cuerpos_hermano_set = set(hermano.cuerpos.values_list('nombre_cuerpo', flat=True))
+        ahora = ahora or timezone.now()
 
         self._validar_configuracion_acto_tradicional(acto)
         self._validar_plazo_vigente(ahora, acto.inicio_solicitud, acto.fin_solicitud, "insignias")
 
-        self._validar_hermano_apto_para_solicitar(hermano, cuerpos_hermano_set)
+        elegibilidad = obtener_elegibilidad(hermano, acto, ahora)
+        cuerpos_hermano_set = set(elegibilidad.cuerpos)
+
+        self._validar_hermano_apto_para_solicitar(hermano, elegibilidad)
         self._validar_edad_minima_insignia(hermano, acto)
 
         self._validar_unicidad(hermano, acto)
@@ -70,18 +73,13 @@ class SolicitudInsigniaService:
         self._validar_limites_preferencias(preferencias_data)
         self._validar_preferencias_insignia_tradicional(hermano, acto, preferencias_data, cuerpos_hermano_set)
 
-        try:
-            papeleta = self._crear_papeleta_base(hermano, acto, ahora)
-            papeleta.es_solicitud_insignia = True
-            papeleta.save(update_fields=['es_solicitud_insignia'])
-
-        except IntegrityError:
-            raise ValidationError(
-                "Ya existe una solicitud activa tramitada para este hermano. "
-                "Por favor, no haga doble clic en el botón de enviar."
-            )
+        # Una papeleta activa duplicada (doble envío simultáneo) la rechaza el propio modelo con ValidationError
+        papeleta = self._crear_papeleta_base(hermano, acto, ahora)
+        papeleta.es_solicitud_insignia = True
+        papeleta.save(update_fields=['es_solicitud_insignia', 'updated_at'])
 
         self._guardar_preferencias(papeleta, preferencias_data)
+        registrar_transicion(acto.pk, None, PapeletaSitio.objects.filter(pk=papeleta.pk))
 
         return papeleta
 
@@ -111,11 +109,11 @@ class SolicitudInsigniaService:
 
 
 
-    def _validar_hermano_apto_para_solicitar(self, hermano: Hermano, cuerpos_hermano_set: set):
+    def _validar_hermano_apto_para_solicitar(self, hermano: Hermano, elegibilidad: ElegibilidadSolicitud):
         """Agrupa las validaciones de estado del hermano."""
         self._validar_hermano_en_alta(hermano)
-        self._validar_hermano_al_corriente_hasta_anio_anterior(hermano)
-        self._validar_pertenencia_cuerpos(cuerpos_hermano_set)
+        self._validar_hermano_al_corriente_hasta_anio_anterior(elegibilidad)
+        self._validar_pertenencia_cuerpos(set(elegibilidad.cuerpos))
 
 
 
@@ -254,29 +252,16 @@ class SolicitudInsigniaService:
 
 
 
-    def _validar_hermano_al_corriente_hasta_anio_anterior(self, hermano: Hermano):
-        anio_actual = timezone.now().date().year
-        anio_limite = anio_actual - 1
+    def _validar_hermano_al_corriente_hasta_anio_anterior(self, elegibilidad: ElegibilidadSolicitud):
+        anio_limite = elegibilidad.anio_limite
 
-        estados_deuda = [
-            Cuota.EstadoCuota.PENDIENTE, 
-            Cuota.EstadoCuota.DEVUELTA
-        ]
-
-        deuda = hermano.cuotas.filter(
-            anio__lte=anio_limite,
-            estado__in=estados_deuda
-        ).values('anio').order_by('anio').first()
-
-        if deuda:
+        if elegibilidad.anio_primera_deuda is not None:
             raise ValidationError(
-                f"Consta una cuota pendiente o devuelta del año {deuda['anio']}. "
+                f"Consta una cuota pendiente o devuelta del año {elegibilidad.anio_primera_deuda}. "
                 f"Por favor, contacte con tesorería para regularizar su situación."
             )
 
-        existe_historial = hermano.cuotas.filter(anio__lte=anio_limite).exists()
-        
-        if not existe_historial:
+        if not elegibilidad.tiene_historial_cuotas:
             raise ValidationError(
                 f"No constan cuotas registradas hasta el año {anio_limite}. "
                 "Contacte con secretaría para verificar su ficha."
@@ -642,6 +627,15 @@ class RepartoService:
                             estado="NO_ASIGNADA"
                         )
 
+            # Todas las solicitudes salen de SOLICITADA sin puesto: los incrementos se conocen sin volver a contar
+            sin_asignar = len(hermanos_sin_puesto)
+            sumar_incrementos(acto.pk, {
+                'papeletas_solicitadas': -(asignaciones_realizadas + sin_asignar),
+                'papeletas_emitidas': asignaciones_realizadas,
+                'papeletas_no_asignadas': sin_asignar,
+                'insignias_asignadas': asignaciones_realizadas,
+            })
+
             acto.fecha_ejecucion_reparto = now
             acto.save()
 
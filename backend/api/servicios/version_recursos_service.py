@@ -0,0 +1,71 @@
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from api.models import Acto, Comunicado, Cuota, PapeletaSitio, PreferenciaSolicitud
+from api.servicios.comunicado.feed_comunicado_service import filtrar_por_audiencia, mascara_feed_usuario
+
+
+# -----------------------------------------------------------------------------
+# VERSIONES DE RECURSOS (validadores para peticiones condicionales, ver api.condicional)
+#
+# Cada función devuelve `(version, ultima_modificacion)` con uno o dos agregados sobre
+# índices, sin cargar ni serializar filas. El número de filas entra en la versión para
+# detectar borrados, que no mueven max(updated_at).
+# -----------------------------------------------------------------------------
+def _total_y_ultima(queryset):
+    agregado = queryset.aggregate(total=Count('id'), ultima=Max('updated_at'))
+    return agregado['total'], agregado['ultima']
+
+
+def version_feed_comunicados(usuario):
+    mascara = mascara_feed_usuario(usuario)
+    comunicados = filtrar_por_audiencia(Comunicado.objects.all(), mascara)
+
+    return (mascara, *_total_y_ultima(comunicados)), None
+
+
+def version_comunicado(pk):
+    ultima = Comunicado.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+    return (ultima,), ultima
+
+
+def version_cuotas_hermano(usuario):
+    return _total_y_ultima(Cuota.objects.filter(hermano=usuario)), None
+
+
+def version_papeletas_hermano(usuario):
+    """Incluye el acto de cada papeleta: el historial muestra su nombre, fecha, puesto y tramo."""
+    agregado = PapeletaSitio.objects.filter(hermano=usuario).aggregate(
+        total=Count('id'), ultima=Max('updated_at'), ultima_acto=Max('acto__updated_at')
+    )
+    return tuple(agregado.values()), None
+
+
+def _plazos_abiertos(ahora):
+    """Los campos `en_plazo_*` del acto dependen de la hora, no solo de los datos."""
+    return {
+        'insignias_abiertos': Count('id', filter=Q(inicio_solicitud__lte=ahora, fin_solicitud__gte=ahora)),
+        'cirios_abiertos': Count('id', filter=Q(inicio_solicitud_cirios__lte=ahora, fin_solicitud_cirios__gte=ahora)),
+    }
+
+
+def version_acto(pk):
+    """
+    El acto se devuelve con sus puestos, tramos y contadores de papeletas y preferencias.
+    Los cambios en puestos y tramos ya actualizan `Acto.updated_at` (ver api.signals).
+    """
+    acto = Acto.objects.filter(pk=pk).aggregate(ultima=Max('updated_at'), **_plazos_abiertos(timezone.now()))
+    papeletas = PapeletaSitio.objects.filter(acto_id=pk).aggregate(
+        total=Count('id', distinct=True), ultima=Max('updated_at'), preferencias=Count('preferencias')
+    )
+    return (*acto.values(), *papeletas.values()), None
+
+
+def version_actos():
+    acto = Acto.objects.aggregate(total=Count('id'), ultima=Max('updated_at'), **_plazos_abiertos(timezone.now()))
+
+    return (
+        *acto.values(),
+        *_total_y_ultima(PapeletaSitio.objects.all()),
+        PreferenciaSolicitud.objects.count(),
+    ), None
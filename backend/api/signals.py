@@ -0,0 +1,226 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from api.models import (
+    Acto, AreaInteres, Comunicado, Cuota, CuerpoPertenencia, EstadisticasActo, Hermano, HermanoCuerpo, PapeletaSitio, Puesto,
+    TipoActo, TipoPuesto, Tramo,
+)
+from api.servicios.acto.estadisticas_acto_service import marcar_para_recalculo, programar_recalculo
+from api.servicios.acto.proximos_actos_service import invalidar_proximos_actos
+from api.servicios.catalogo_service import invalidar_catalogos
+from api.servicios.comunicado.busqueda_comunicado_service import indexar_busqueda
+from api.servicios.comunicado.resumen_comunicado_service import calcular_resumen
+from api.servicios.papeleta_sitio.elegibilidad_solicitud_service import actualizar_elegibilidad_hermanos
+
+
+def _recalcular_mascaras(modelo, campo_mascara, relacion, ids, instance=None):
+    """
+    Recalcula la máscara de bits de las filas `ids` a partir de su relación M2M con AreaInteres.
+    Si el modelo registra `updated_at` (o `indice_modificado`) también lo actualiza, porque las
+    áreas forman parte de su representación. Los valores escritos se copian en `instance` para
+    que quien la tenga en memoria vea lo mismo que la BD.
+    """
+    if not ids:
+        return {}
+
+    through = relacion.through
+    columna = relacion.field.m2m_field_name() + '_id'
+
+    nombres_por_id = {pk: [] for pk in ids}
+    for pk, nombre_area in through.objects.filter(**{f'{columna}__in': ids}).values_list(columna, 'areainteres__nombre_area'):
+        nombres_por_id[pk].append(nombre_area)
+
+    ahora = timezone.now()
+    extra = {campo: ahora for campo in ('updated_at', 'indice_modificado') if hasattr(modelo, campo)}
+
+    mascaras = {pk: AreaInteres.mascara_de(nombres) for pk, nombres in nombres_por_id.items()}
+    for pk, mascara in mascaras.items():
+        modelo.objects.filter(pk=pk).update(**{campo_mascara: mascara}, **extra)
+
+    if instance is not None:
+        setattr(instance, campo_mascara, mascaras[instance.pk])
+        for campo, valor in extra.items():
+            setattr(instance, campo, valor)
+
+    return mascaras
+
+
+def _mantener_mascara(modelo, campo_mascara, relacion, related_name, instance, action, reverse, pk_set):
+    if action == 'pre_clear' and reverse:
+        # Tras el clear ya no se sabe qué filas estaban enlazadas con el área
+        instance._ids_antes_de_clear = list(getattr(instance, related_name).values_list('pk', flat=True))
+        return
+
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        _recalcular_mascaras(modelo, campo_mascara, relacion, [instance.pk], instance)
+    elif action == 'post_clear':
+        _recalcular_mascaras(modelo, campo_mascara, relacion, instance.__dict__.pop('_ids_antes_de_clear', []))
+    else:
+        _recalcular_mascaras(modelo, campo_mascara, relacion, list(pk_set or ()))
+
+
+@receiver(m2m_changed, sender=Comunicado.areas_interes.through)
+def mantener_mascara_audiencia(sender, instance, action, reverse, pk_set, **kwargs):
+    """Mantiene `Comunicado.mascara_audiencia` al asignar áreas desde cualquier lado de la relación."""
+    _mantener_mascara(Comunicado, 'mascara_audiencia', Comunicado.areas_interes, 'comunicados', instance, action, reverse, pk_set)
+
+
+@receiver(pre_save, sender=Comunicado)
+def calcular_resumen_comunicado(sender, instance, update_fields=None, **kwargs):
+    """Rellena extracto, número de palabras y minutos de lectura cada vez que se guarda el contenido."""
+    if update_fields is not None and 'contenido' not in update_fields:
+        return
+
+    for campo, valor in calcular_resumen(instance.contenido).items():
+        setattr(instance, campo, valor)
+
+
+@receiver(post_save, sender=Comunicado)
+def indexar_busqueda_comunicado(sender, instance, update_fields=None, raw=False, **kwargs):
+    """
+    Mantiene la fila de texto completo (ver busqueda_comunicado_service) al guardar título o
+    contenido, venga el comunicado del servicio, del admin o de los comandos de carga.
+    """
+    if raw or (update_fields is not None and not {'titulo', 'contenido'} & set(update_fields)):
+        return
+
+    indexar_busqueda(instance)
+
+
+@receiver(m2m_changed, sender=Hermano.areas_interes.through)
+def mantener_mascara_suscripcion(sender, instance, action, reverse, pk_set, **kwargs):
+    """Mantiene `Hermano.mascara_suscripcion` al cambiar las áreas de interés del hermano."""
+    _mantener_mascara(Hermano, 'mascara_suscripcion', Hermano.areas_interes, 'hermanos', instance, action, reverse, pk_set)
+
+
+@receiver(post_save, sender=Puesto)
+@receiver(post_delete, sender=Puesto)
+@receiver(post_save, sender=Tramo)
+@receiver(post_delete, sender=Tramo)
+def tocar_acto(sender, instance, **kwargs):
+    """
+    Los puestos y tramos se devuelven anidados en el acto: cualquier cambio en ellos
+    cambia su versión (`Acto.updated_at`) para que las peticiones condicionales lo detecten.
+    """
+    Acto.objects.filter(pk=instance.acto_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Acto)
+def crear_estadisticas_acto(sender, instance, created, raw=False, **kwargs):
+    """Todo acto nace con su fila de estadísticas a cero; los servicios de papeletas la van actualizando."""
+    if created and not raw:
+        EstadisticasActo.objects.get_or_create(acto=instance)
+
+
+# Campos de los que dependen los contadores de EstadisticasActo
+CAMPOS_ESTADISTICAS_PAPELETA = {'estado_papeleta', 'puesto', 'es_solicitud_insignia', 'acto'}
+CAMPOS_ESTADISTICAS_PUESTO = {'tipo_puesto', 'cortejo_cristo'}
+
+
+@receiver(post_save, sender=PapeletaSitio)
+@receiver(post_delete, sender=PapeletaSitio)
+def marcar_estadisticas_papeleta(sender, instance, update_fields=None, raw=False, **kwargs):
+    """
+    Papeletas cambiadas desde el admin o por código que no pasa por los servicios: el acto
+    se recalcula al confirmar, salvo que un servicio registre la transición (ver estadisticas_acto_service).
+    """
+    if raw or (update_fields is not None and not CAMPOS_ESTADISTICAS_PAPELETA & set(update_fields)):
+        return
+
+    marcar_para_recalculo(instance.acto_id)
+
+
+@receiver(pre_save, sender=Puesto)
+def detectar_cambio_estadisticas_puesto(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Cambiar el tipo o el cortejo de un puesto ya ocupado cambia los contadores de insignias y cirios."""
+    if raw or instance.pk is None or (update_fields is not None and not CAMPOS_ESTADISTICAS_PUESTO & set(update_fields)):
+        return
+
+    anterior = Puesto.objects.filter(pk=instance.pk).values('tipo_puesto_id', 'cortejo_cristo').first()
+    instance._recalcular_estadisticas = anterior is not None and anterior != {
+        'tipo_puesto_id': instance.tipo_puesto_id, 'cortejo_cristo': instance.cortejo_cristo,
+    }
+
+
+@receiver(post_save, sender=Puesto)
+def recalcular_estadisticas_puesto(sender, instance, **kwargs):
+    if instance.__dict__.pop('_recalcular_estadisticas', False) and instance.papeletas_asignadas.exists():
+        programar_recalculo(instance.acto_id)
+
+
+@receiver(post_delete, sender=Puesto)
+def recalcular_estadisticas_puesto_borrado(sender, instance, **kwargs):
+    """Las papeletas del puesto se quedan sin él (SET_NULL) sin pasar por sus señales."""
+    programar_recalculo(instance.acto_id)
+
+
+@receiver(pre_save, sender=TipoPuesto)
+def detectar_cambio_tipo_insignia(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+
+    anterior = TipoPuesto.objects.filter(pk=instance.pk).values_list('es_insignia', flat=True).first()
+    instance._recalcular_estadisticas = anterior is not None and anterior != instance.es_insignia
+
+
+@receiver(post_save, sender=TipoPuesto)
+def recalcular_estadisticas_tipo_puesto(sender, instance, **kwargs):
+    """Un tipo que pasa a ser (o deja de ser) insignia mueve sus papeletas entre los contadores de cirios."""
+    if not instance.__dict__.pop('_recalcular_estadisticas', False):
+        return
+
+    actos = Puesto.objects.filter(tipo_puesto=instance, papeletas_asignadas__isnull=False).values_list('acto_id', flat=True).distinct()
+    for acto_id in actos:
+        programar_recalculo(acto_id)
+
+
+@receiver(post_save, sender=Acto)
+@receiver(post_delete, sender=Acto)
+def invalidar_cache_proximos_actos(sender, **kwargs):
+    """Crear, editar o borrar un acto puede cambiar los widgets de próximos actos del dashboard."""
+    invalidar_proximos_actos()
+
+
+@receiver(post_save, sender=TipoActo)
+@receiver(post_delete, sender=TipoActo)
+@receiver(post_save, sender=TipoPuesto)
+@receiver(post_delete, sender=TipoPuesto)
+@receiver(post_save, sender=AreaInteres)
+@receiver(post_delete, sender=AreaInteres)
+@receiver(post_save, sender=CuerpoPertenencia)
+@receiver(post_delete, sender=CuerpoPertenencia)
+def invalidar_catalogo(sender, **kwargs):
+    """Cualquier escritura en un catálogo cambia la versión de la caché en memoria (ver catalogo_service)."""
+    invalidar_catalogos()
+
+
+@receiver(post_save, sender=Cuota)
+@receiver(post_delete, sender=Cuota)
+@receiver(post_save, sender=HermanoCuerpo)
+@receiver(post_delete, sender=HermanoCuerpo)
+def actualizar_elegibilidad(sender, instance, raw=False, **kwargs):
+    """Las fotos de elegibilidad (ver elegibilidad_solicitud_service) dependen de las cuotas y cuerpos del hermano."""
+    if not raw:
+        actualizar_elegibilidad_hermanos([instance.hermano_id])
+
+
+@receiver(m2m_changed, sender=Hermano.cuerpos.through)
+def actualizar_elegibilidad_cuerpos(sender, instance, action, reverse, pk_set, **kwargs):
+    """Igual que `actualizar_elegibilidad` cuando los cuerpos se asignan con add/remove/set/clear."""
+    if action == 'pre_clear' and reverse:
+        instance._hermanos_antes_de_clear = list(instance.hermanos_miembros.values_list('pk', flat=True))
+        return
+
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        actualizar_elegibilidad_hermanos([instance.pk])
+    elif action == 'post_clear':
+        actualizar_elegibilidad_hermanos(instance.__dict__.pop('_hermanos_antes_de_clear', []))
+    else:
+        actualizar_elegibilidad_hermanos(pk_set or ())
@@ -0,0 +1,13 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def cache_limpia():
+    """
+    Cada test deshace sus escrituras con un rollback, que no emite señales: se vacía la
+    caché (y con ella las claves de versión de los catálogos) para que ningún test vea
+    filas de otro.
+    """
+    cache.clear()
+    yield
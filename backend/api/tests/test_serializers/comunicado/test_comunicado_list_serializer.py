@@ -6,7 +6,7 @@ from django.test import TestCase, override_settings
 from django.utils import timezone
 from django.core.files.uploadedfile import SimpleUploadedFile
 from api.models import Hermano, AreaInteres, Comunicado
-from api.serializadores.comunicado.comunicado_list_serializer import ComunicadoListSerializer
+from api.serializadores.comunicado.comunicado_list_serializer import ComunicadoDetalleSerializer, ComunicadoListSerializer
 from unittest.mock import Mock, PropertyMock, patch
 
 
@@ -55,7 +55,7 @@ class TestComunicadoSerializer(TestCase):
 
         self.assertEqual(data['id'], self.comunicado.id)
         self.assertEqual(data['titulo'], "Gran Recogida de Alimentos")
-        self.assertEqual(data['contenido'], "Contenido detallado del comunicado...")
+        self.assertEqual(data['extracto'], "Contenido detallado del comunicado...")
         self.assertEqual(data['tipo_comunicacion'], 'URGENTE')
 
         self.assertEqual(data['tipo_display'], "Urgente")
@@ -159,8 +159,8 @@ class TestComunicadoSerializer(TestCase):
             en Meta.fields y ninguno adicional inyectado.
         """
         expected_fields = {
-            'id', 'titulo', 'contenido', 'fecha_emision', 'imagen_portada',
-            'tipo_comunicacion', 'tipo_display', 'autor_nombre', 
+            'id', 'titulo', 'extracto', 'numero_palabras', 'minutos_lectura',
+            'fecha_emision', 'imagen_portada', 'imagen_srcset', 'tipo_comunicacion', 'tipo_display', 'autor_nombre', 
             'areas_interes'
         }
 
@@ -209,7 +209,7 @@ class TestComunicadoSerializer(TestCase):
                 msg=f"Seguridad comprometida: El campo '{campo}' se ha filtrado en el output."
             )
 
-        self.assertEqual(len(data), 9)
+        self.assertEqual(len(data), 12)
 
 
 
@@ -993,7 +993,7 @@ class TestComunicadoSerializer(TestCase):
 
         Given: Un comunicado que contiene un texto complejo en el campo 'contenido', 
             incluyendo saltos de línea, caracteres especiales y posibles etiquetas.
-        When: Se procesa la instancia a través del ComunicadoListSerializer.
+        When: Se procesa la instancia a través del ComunicadoDetalleSerializer.
         Then: El campo 'contenido' de la respuesta debe ser idéntico al almacenado 
             en el modelo, asegurando que el serializador no aplique filtros 
             o limpiezas no deseadas en esta capa.
@@ -1005,7 +1005,7 @@ class TestComunicadoSerializer(TestCase):
         )
         self.comunicado.contenido = texto_complejo
         
-        serializer = ComunicadoListSerializer(instance=self.comunicado)
+        serializer = ComunicadoDetalleSerializer(instance=self.comunicado)
         data = serializer.data
 
         self.assertIn('contenido', data)
@@ -1025,7 +1025,7 @@ class TestComunicadoSerializer(TestCase):
 
         Given: Un comunicado cuyo campo 'contenido' almacena una cadena con 
             marcado HTML válido (párrafos, negritas, listas).
-        When: Se procesa la instancia a través del ComunicadoListSerializer.
+        When: Se procesa la instancia a través del ComunicadoDetalleSerializer.
         Then: El campo 'contenido' debe devolverse íntegro, sin escapar los 
             caracteres especiales (<, >, &), permitiendo que el cliente 
             (web/app) renderice el HTML correctamente.
@@ -1037,7 +1037,7 @@ class TestComunicadoSerializer(TestCase):
         )
         self.comunicado.contenido = html_input
         
-        serializer = ComunicadoListSerializer(instance=self.comunicado)
+        serializer = ComunicadoDetalleSerializer(instance=self.comunicado)
         data = serializer.data
 
         self.assertIn('contenido', data)
@@ -1060,7 +1060,7 @@ class TestComunicadoSerializer(TestCase):
 
         Given: Un comunicado con un campo 'contenido' que almacena un volumen 
             considerable de texto (ej. 10.000 caracteres generados).
-        When: Se procesa la instancia a través del ComunicadoListSerializer.
+        When: Se procesa la instancia a través del ComunicadoDetalleSerializer.
         Then: El campo 'contenido' debe devolverse íntegro, sin truncamientos 
             ni pérdida de datos, manteniendo la longitud exacta original 
             en la respuesta serializada.
@@ -1068,7 +1068,7 @@ class TestComunicadoSerializer(TestCase):
         contenido_extenso = "Contenido de prueba. " * 500 
         self.comunicado.contenido = contenido_extenso
         
-        serializer = ComunicadoListSerializer(instance=self.comunicado)
+        serializer = ComunicadoDetalleSerializer(instance=self.comunicado)
         data = serializer.data
 
         self.assertIn('contenido', data)
@@ -1093,7 +1093,7 @@ class TestComunicadoSerializer(TestCase):
         Given: Un comunicado cuyo campo 'contenido' incluye una mezcla de 
             emojis, símbolos de moneda (€, $), caracteres con tildes, 
             eñes (ñ) y símbolos matemáticos (≠, ±).
-        When: Se procesa la instancia a través del ComunicadoListSerializer.
+        When: Se procesa la instancia a través del ComunicadoDetalleSerializer.
         Then: El campo 'contenido' debe devolverse íntegro y con la codificación 
             correcta (UTF-8), garantizando que no se transformen en 
             caracteres extraños (mojibake) en la respuesta JSON.
@@ -1106,7 +1106,7 @@ class TestComunicadoSerializer(TestCase):
         )
         self.comunicado.contenido = caracteres_especiales
         
-        serializer = ComunicadoListSerializer(instance=self.comunicado)
+        serializer = ComunicadoDetalleSerializer(instance=self.comunicado)
         data = serializer.data
 
         self.assertIn('contenido', data)
@@ -1129,7 +1129,7 @@ class TestComunicadoSerializer(TestCase):
 
         Given: Un comunicado cuyo campo 'contenido' incluye una variedad de 
             emojis modernos (caracteres Unicode de 4 bytes) como 🔔, 📅 y 🙏.
-        When: Se procesa la instancia a través del ComunicadoListSerializer.
+        When: Se procesa la instancia a través del ComunicadoDetalleSerializer.
         Then: El campo 'contenido' debe mantener los emojis íntegros en la 
             respuesta JSON, garantizando que el serializador soporte 
             correctamente la codificación utf8mb4.
@@ -1137,7 +1137,7 @@ class TestComunicadoSerializer(TestCase):
         texto_con_emojis = "¡Atención! 🔔 Mañana es el Besamanos. 📅 ¡Os esperamos! 🙏✨"
         self.comunicado.contenido = texto_con_emojis
         
-        serializer = ComunicadoListSerializer(instance=self.comunicado)
+        serializer = ComunicadoDetalleSerializer(instance=self.comunicado)
         data = serializer.data
 
         self.assertIn('contenido', data)
@@ -1886,4 +1886,43 @@ class TestComunicadoSerializer(TestCase):
             nombre_real, 
             areas_en_salida,
             msg=f"El serializador perdió la integridad. No se encontró '{nombre_real}' en {areas_en_salida}."
-        )
\ No newline at end of file
+        )
+
+
+    def test_comunicado_listado_envia_extracto_en_lugar_del_contenido(self):
+        """
+        Test: El listado no envía el contenido HTML completo.
+
+        Given: Un comunicado largo con etiquetas y entidades HTML.
+        When: Se procesa con el ComunicadoListSerializer.
+        Then: Solo se devuelve el extracto en texto plano (recortado sin partir palabras),
+            el número de palabras y los minutos de lectura, calculados al guardar.
+        """
+        self.comunicado.contenido = "<p>Cabildo <b>general</b> &amp; ordinario.</p>" + "<p>palabra larga</p>" * 300
+        self.comunicado.save()
+
+        data = ComunicadoListSerializer(instance=self.comunicado).data
+
+        self.assertNotIn('contenido', data)
+        self.assertTrue(data['extracto'].startswith("Cabildo general & ordinario. palabra larga"))
+        self.assertTrue(data['extracto'].endswith("…"))
+        self.assertLessEqual(len(data['extracto']), 281)
+        self.assertNotIn("<", data['extracto'])
+        self.assertEqual(data['numero_palabras'], 604)
+        self.assertEqual(data['minutos_lectura'], 4)
+
+
+    def test_comunicado_detalle_anade_el_contenido_completo(self):
+        """
+        Test: El detalle es el listado más el contenido.
+
+        Given: Un comunicado guardado.
+        When: Se procesa con el ComunicadoDetalleSerializer.
+        Then: Devuelve los mismos campos que el listado y además 'contenido' íntegro.
+        """
+        listado = ComunicadoListSerializer(instance=self.comunicado).data
+        detalle = ComunicadoDetalleSerializer(instance=self.comunicado).data
+
+        self.assertEqual(set(detalle) - set(listado), {'contenido'})
+        self.assertEqual(detalle['contenido'], self.comunicado.contenido)
+        self.assertEqual(detalle['minutos_lectura'], 1)
@@ -0,0 +1,71 @@
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from api.models import AreaInteres, Comunicado, Hermano
+from api.serializadores.comunicado.comunicado_list_serializer import ComunicadoListSerializer
+from api.serializadores.comunicado.comunicado_list_values import proyectar_comunicados_listado, serializar_comunicados_listado
+from api.servicios.comunicado.feed_comunicado_service import obtener_feed_comunicados
+from api.tests.factories import HermanoFactory
+
+
+class ContratoComunicadoListValuesTest(TestCase):
+    """La ruta rápida debe producir exactamente el mismo JSON que `ComunicadoListSerializer`."""
+
+    def setUp(self):
+        self.hermano = HermanoFactory()
+
+        self.todos = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.TODOS_HERMANOS)
+        self.caridad = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.CARIDAD)
+        self.juventud = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.JUVENTUD)
+        self.hermano.areas_interes.set([self.caridad, self.juventud])
+
+        sin_nombre = HermanoFactory()
+        Hermano.objects.filter(pk=sin_nombre.pk).update(nombre="", primer_apellido="")
+
+        self._crear("Cabildo general", Comunicado.TipoComunicacion.SECRETARIA, self.hermano, [self.juventud, self.todos, self.caridad])
+        self._crear("Recogida de <alimentos> & más", Comunicado.TipoComunicacion.EVENTOS, sin_nombre, [self.caridad])
+        self._crear("Sin áreas visibles", Comunicado.TipoComunicacion.URGENTE, self.hermano, [self.todos])
+
+        con_portada = self._crear("Besamanos", Comunicado.TipoComunicacion.CULTOS, self.hermano, [self.todos])
+        Comunicado.objects.filter(pk=con_portada.pk).update(
+            imagen_portada='comunicados/portadas/cartel.jpg',
+            imagen_derivados={
+                'origen': 'comunicados/portadas/cartel.jpg', 'anchos': [400, 1000],
+                'webp': {'400': 'derivados/cartel_400.webp', '1000': 'derivados/cartel_1000.webp'},
+                'jpeg': {'400': 'derivados/cartel_400.jpg', '1000': 'derivados/cartel_1000.jpg'},
+            },
+        )
+
+        antigua = self._crear("Portada antigua", Comunicado.TipoComunicacion.GENERAL, self.hermano, [self.todos])
+        Comunicado.objects.filter(pk=antigua.pk).update(imagen_portada='comunicados/portadas/nueva.png', imagen_derivados={'origen': 'otra.png'})
+
+    def _crear(self, titulo, tipo, autor, areas):
+        comunicado = Comunicado.objects.create(
+            titulo=titulo, contenido="<p>Texto del <b>comunicado</b>.</p>", tipo_comunicacion=tipo, autor=autor,
+        )
+        comunicado.areas_interes.set(areas)
+        return comunicado
+
+    def _json(self, datos):
+        return JSONRenderer().render(datos)
+
+    def test_mismo_json_que_el_serializador(self):
+        for request in (None, APIRequestFactory().get('/api/comunicados/')):
+            queryset = obtener_feed_comunicados(self.hermano)
+            contexto = {'request': request} if request is not None else {}
+
+            esperado = self._json(ComunicadoListSerializer(queryset, many=True, context=contexto).data)
+            obtenido = self._json(serializar_comunicados_listado(proyectar_comunicados_listado(queryset), request))
+
+            self.assertEqual(obtenido, esperado)
+
+    def test_dos_consultas_sea_cual_sea_el_tamano_de_la_pagina(self):
+        with self.assertNumQueries(2):
+            datos = serializar_comunicados_listado(proyectar_comunicados_listado(obtener_feed_comunicados(self.hermano)))
+
+        self.assertEqual(len(datos), 5)
+
+    def test_pagina_vacia_no_consulta_las_areas(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(serializar_comunicados_listado([]), [])
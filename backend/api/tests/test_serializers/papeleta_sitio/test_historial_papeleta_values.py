@@ -0,0 +1,54 @@
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Acto, PapeletaSitio, Puesto, TipoActo, TipoPuesto, Tramo
+from api.serializadores.papeleta_sitio.historial_papeleta_values import proyectar_historial_papeletas, serializar_historial_papeletas
+from api.serializers import HistorialPapeletaSerializer
+from api.services import get_historial_papeletas_hermano_service
+from api.tests.factories import HermanoFactory
+
+
+class ContratoHistorialPapeletaValuesTest(TestCase):
+    """La ruta rápida debe producir exactamente el mismo JSON que `HistorialPapeletaSerializer`."""
+
+    def setUp(self):
+        self.hermano = HermanoFactory()
+        ahora = timezone.now()
+
+        tipo = TipoActo.objects.create(tipo=TipoActo.OpcionesTipo.CONVIVENCIA, requiere_papeleta=False)
+        self.acto = Acto.objects.create(nombre="Convivencia", lugar="Casa Hermandad", fecha=ahora, tipo_acto=tipo)
+        anterior = Acto.objects.create(nombre="Convivencia anterior", lugar="Casa Hermandad", fecha=ahora - datetime.timedelta(days=400), tipo_acto=tipo)
+
+        insignia = Puesto.objects.create(
+            nombre="Senatus", acto=self.acto, lugar_citacion="Capilla", hora_citacion=datetime.time(17, 30),
+            tipo_puesto=TipoPuesto.objects.create(nombre_tipo="Insignia", es_insignia=True),
+        )
+        cirio = Puesto.objects.create(nombre="Cirio", acto=self.acto, tipo_puesto=TipoPuesto.objects.create(nombre_tipo="Cirio"))
+        tramo = Tramo.objects.create(nombre="Tramo 3", numero_orden=3, acto=self.acto)
+
+        PapeletaSitio.objects.create(
+            hermano=self.hermano, acto=self.acto, anio=ahora.year, puesto=insignia,
+            estado_papeleta=PapeletaSitio.EstadoPapeleta.EMITIDA, fecha_solicitud=ahora, fecha_emision=ahora.date(),
+        )
+        PapeletaSitio.objects.create(
+            hermano=self.hermano, acto=self.acto, anio=ahora.year, puesto=cirio, tramo=tramo,
+            orden_en_tramo=4, lado=PapeletaSitio.LadoTramo.IZQUIERDA, estado_papeleta=PapeletaSitio.EstadoPapeleta.ANULADA,
+        )
+        PapeletaSitio.objects.create(hermano=self.hermano, acto=anterior, anio=ahora.year - 1)
+
+    def test_mismo_json_que_el_serializador(self):
+        queryset = get_historial_papeletas_hermano_service(self.hermano)
+
+        esperado = JSONRenderer().render(HistorialPapeletaSerializer(queryset, many=True).data)
+        obtenido = JSONRenderer().render(serializar_historial_papeletas(proyectar_historial_papeletas(queryset)))
+
+        self.assertEqual(obtenido, esperado)
+
+    def test_una_sola_consulta(self):
+        with self.assertNumQueries(1):
+            datos = serializar_historial_papeletas(proyectar_historial_papeletas(get_historial_papeletas_hermano_service(self.hermano)))
+
+        self.assertEqual(len(datos), 3)
@@ -0,0 +1,126 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from api.models import Acto, PapeletaSitio, PreferenciaSolicitud, Puesto, TipoActo, TipoPuesto, Tramo
+from api.servicios.catalogo_service import obtener_catalogo
+from api.serializers import ActoSerializer
+from api.servicios.acto.contadores_acto_service import preparar_actos_serializacion
+from api.servicios.acto.estadisticas_acto_service import recalcular_estadisticas_acto
+from api.tests.factories import HermanoFactory
+
+
+class ContadoresActoServiceTest(TestCase):
+
+    def setUp(self):
+        self.ahora = timezone.now()
+        self.tipo_acto = TipoActo.objects.create(tipo=TipoActo.OpcionesTipo.CONVIVENCIA, requiere_papeleta=False)
+
+        self.acto = Acto.objects.create(nombre="Salida", lugar="Parroquia", fecha=self.ahora, tipo_acto=self.tipo_acto)
+        Acto.objects.filter(pk=self.acto.pk).update(fecha_ejecucion_reparto=self.ahora)
+
+        tipo_insignia = TipoPuesto.objects.create(nombre_tipo="Vara", es_insignia=True)
+        tipo_cirio = TipoPuesto.objects.create(nombre_tipo="Cirio", es_insignia=False)
+
+        vara_a = Puesto.objects.create(nombre="Vara A", acto=self.acto, tipo_puesto=tipo_insignia, numero_maximo_asignaciones=2)
+        vara_b = Puesto.objects.create(nombre="Vara B", acto=self.acto, tipo_puesto=tipo_insignia, numero_maximo_asignaciones=3)
+        cirio_cristo = Puesto.objects.create(nombre="Cirio Cristo", acto=self.acto, tipo_puesto=tipo_cirio, cortejo_cristo=True)
+        cirio_virgen = Puesto.objects.create(nombre="Cirio Virgen", acto=self.acto, tipo_puesto=tipo_cirio, cortejo_cristo=False)
+
+        Estado = PapeletaSitio.EstadoPapeleta
+        papeletas = [
+            (True, Estado.EMITIDA, vara_a, [vara_a, vara_b]),
+            (True, Estado.NO_ASIGNADA, None, [vara_b]),
+            (True, Estado.ANULADA, None, [vara_a]),
+            (False, Estado.EMITIDA, cirio_cristo, []),
+            (None, Estado.EMITIDA, cirio_virgen, []),
+            (False, Estado.ANULADA, cirio_cristo, []),
+        ]
+
+        for es_insignia, estado, puesto, preferencias in papeletas:
+            papeleta = PapeletaSitio.objects.create(
+                hermano=HermanoFactory(), acto=self.acto, anio=self.ahora.year, es_solicitud_insignia=es_insignia,
+                estado_papeleta=estado, puesto=puesto,
+            )
+            for orden, puesto_solicitado in enumerate(preferencias, start=1):
+                PreferenciaSolicitud.objects.create(papeleta=papeleta, puesto_solicitado=puesto_solicitado, orden_prioridad=orden)
+
+        # Las papeletas se crean sin pasar por los servicios: se materializan las estadísticas a mano.
+        recalcular_estadisticas_acto(self.acto.pk)
+
+        self.esperado = {
+            'total_solicitantes_insignia': 2,
+            'total_solicitudes_insignias': 3,
+            'total_insignias': 5,
+            'total_asignados': 1,
+            'total_no_asignados': 4,
+            'total_solicitantes_cirio': 2,
+            'total_cirios_cristo': 1,
+            'total_cirios_virgen': 1,
+        }
+
+    def _contadores(self, datos):
+        return {campo: datos[campo] for campo in self.esperado}
+
+    def test_contadores_anotados(self):
+        acto = preparar_actos_serializacion(Acto.objects.filter(pk=self.acto.pk)).get()
+
+        self.assertEqual(self._contadores(ActoSerializer(acto).data), self.esperado)
+
+    def test_acto_sin_anotar_lee_los_contadores_en_una_consulta(self):
+        acto = Acto.objects.select_related('tipo_acto').get(pk=self.acto.pk)
+
+        self.assertEqual(self._contadores(ActoSerializer(acto).data), self.esperado)
+
+    def test_sin_reparto_no_hay_asignados(self):
+        Acto.objects.filter(pk=self.acto.pk).update(fecha_ejecucion_reparto=None)
+        acto = preparar_actos_serializacion(Acto.objects.filter(pk=self.acto.pk)).get()
+
+        datos = ActoSerializer(acto).data
+
+        self.assertIsNone(datos['total_asignados'])
+        self.assertIsNone(datos['total_no_asignados'])
+        self.assertEqual(datos['total_insignias'], 5)
+
+    def test_ocupacion_de_puestos_desde_el_mapa(self):
+        acto = preparar_actos_serializacion(Acto.objects.filter(pk=self.acto.pk)).get()
+        esperado = {
+            puesto.nombre: (puesto.cantidad_ocupada, puesto.plazas_disponibles, puesto.porcentaje_ocupacion)
+            for puesto in Puesto.objects.filter(acto=self.acto)
+        }
+
+        obtener_catalogo(TipoActo), obtener_catalogo(TipoPuesto)
+
+        with self.assertNumQueries(1):
+            datos = ActoSerializer(acto).data
+
+        obtenido = {
+            puesto['nombre']: (puesto['cantidad_ocupada'], puesto['plazas_disponibles'], puesto['porcentaje_ocupacion'])
+            for puesto in datos['puestos_disponibles']
+        }
+        self.assertEqual(obtenido, esperado)
+        self.assertEqual(obtenido["Vara A"], (1, 1, 50))
+
+    def test_listado_con_numero_fijo_de_consultas(self):
+        Acto.objects.all().delete()
+        tipo_cirio = TipoPuesto.objects.get(nombre_tipo="Cirio")
+
+        for i in range(30):
+            acto = Acto.objects.create(nombre=f"Convivencia {i}", lugar="Casa Hermandad", fecha=self.ahora, tipo_acto=self.tipo_acto)
+            Tramo.objects.create(nombre="Tramo 1", numero_orden=1, acto=acto)
+            for j in range(3):
+                puesto = Puesto.objects.create(nombre=f"Cirio {j}", acto=acto, tipo_puesto=tipo_cirio, numero_maximo_asignaciones=4)
+                PapeletaSitio.objects.create(
+                    hermano=HermanoFactory(), acto=acto, anio=self.ahora.year, es_solicitud_insignia=False,
+                    puesto=puesto, estado_papeleta=PapeletaSitio.EstadoPapeleta.EMITIDA,
+                )
+            recalcular_estadisticas_acto(acto.pk)
+
+        obtener_catalogo(TipoActo), obtener_catalogo(TipoPuesto)
+
+        # Actos con contadores + puestos + tramos + mapa de ocupación; los tipos salen de la caché de catálogos.
+        with self.assertNumQueries(4):
+            datos = ActoSerializer(preparar_actos_serializacion(Acto.objects.order_by('fecha')), many=True).data
+
+        self.assertEqual(len(datos), 30)
+        self.assertTrue(all(acto['total_solicitantes_cirio'] == 3 for acto in datos))
+        self.assertTrue(all(puesto['plazas_disponibles'] == 3 for acto in datos for puesto in acto['puestos_disponibles']))
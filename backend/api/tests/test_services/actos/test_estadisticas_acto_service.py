@@ -0,0 +1,150 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.forms.models import model_to_dict
+from django.test import TestCase
+from django.utils import timezone
+
+from api.models import Acto, EstadisticasActo, PapeletaSitio, PreferenciaSolicitud, Puesto, TipoActo, TipoPuesto
+from api.service.GenerarQRPapeletaService import validar_acceso_papeleta
+from api.servicios.acto.estadisticas_acto_service import contar_papeletas, recalcular_estadisticas_acto, registrar_transicion
+from api.servicios.solicitud_insignia.solicitud_insignia_service import RepartoService
+from api.tests.factories import HermanoFactory
+
+
+class EstadisticasActoServiceTest(TestCase):
+
+    def setUp(self):
+        self.ahora = timezone.now()
+        tipo_acto = TipoActo.objects.create(tipo=TipoActo.OpcionesTipo.CONVIVENCIA, requiere_papeleta=False)
+        self.acto = Acto.objects.create(nombre="Salida", lugar="Parroquia", fecha=self.ahora, tipo_acto=tipo_acto)
+
+        tipo_insignia = TipoPuesto.objects.create(nombre_tipo="Vara", es_insignia=True)
+        self.vara = Puesto.objects.create(nombre="Vara", acto=self.acto, tipo_puesto=tipo_insignia, numero_maximo_asignaciones=1)
+        self.cirio = Puesto.objects.create(
+            nombre="Cirio Virgen", acto=self.acto, cortejo_cristo=False,
+            tipo_puesto=TipoPuesto.objects.create(nombre_tipo="Cirio", es_insignia=False),
+        )
+
+        self.admin = HermanoFactory(esAdmin=True)
+
+    def _estadisticas(self):
+        return model_to_dict(EstadisticasActo.objects.get(acto=self.acto), exclude=['acto', 'updated_at'])
+
+    def _recalculadas(self):
+        return model_to_dict(recalcular_estadisticas_acto(self.acto.pk), exclude=['acto', 'updated_at'])
+
+    def _solicitar_insignia(self, preferencias):
+        papeleta = PapeletaSitio.objects.create(
+            hermano=HermanoFactory(), acto=self.acto, anio=self.ahora.year, es_solicitud_insignia=True,
+            estado_papeleta=PapeletaSitio.EstadoPapeleta.SOLICITADA,
+        )
+        for orden, puesto in enumerate(preferencias, start=1):
+            PreferenciaSolicitud.objects.create(papeleta=papeleta, puesto_solicitado=puesto, orden_prioridad=orden)
+
+        registrar_transicion(self.acto.pk, None, PapeletaSitio.objects.filter(pk=papeleta.pk))
+        return papeleta
+
+    def test_el_acto_nace_con_estadisticas_a_cero(self):
+        self.assertEqual(set(self._estadisticas().values()), {0})
+
+    def test_las_transiciones_suman_la_diferencia(self):
+        self._solicitar_insignia([self.vara, self.cirio])
+
+        papeleta = PapeletaSitio.objects.create(hermano=HermanoFactory(), acto=self.acto, anio=self.ahora.year, puesto=self.cirio)
+        registrar_transicion(self.acto.pk, None, PapeletaSitio.objects.filter(pk=papeleta.pk))
+
+        afectada = PapeletaSitio.objects.filter(pk=papeleta.pk)
+        antes = contar_papeletas(afectada)
+        afectada.update(estado_papeleta=PapeletaSitio.EstadoPapeleta.EMITIDA)
+        registrar_transicion(self.acto.pk, antes, afectada)
+
+        estadisticas = self._estadisticas()
+        self.assertEqual(estadisticas['solicitudes_insignias'], 2)
+        self.assertEqual(estadisticas['papeletas_solicitadas'], 1)
+        self.assertEqual(estadisticas['papeletas_emitidas'], 1)
+        self.assertEqual(estadisticas['cirios_virgen'], 1)
+        self.assertEqual(estadisticas, self._recalculadas())
+
+    def test_reparto_de_insignias_actualiza_las_estadisticas(self):
+        self._solicitar_insignia([self.vara])
+        self._solicitar_insignia([self.vara])
+
+        RepartoService.ejecutar_asignacion_automatica(self.acto.pk)
+
+        estadisticas = self._estadisticas()
+        self.assertEqual(estadisticas['insignias_asignadas'], 1)
+        self.assertEqual(estadisticas['papeletas_emitidas'], 1)
+        self.assertEqual(estadisticas['papeletas_no_asignadas'], 1)
+        self.assertEqual(estadisticas['papeletas_solicitadas'], 0)
+        self.assertEqual(estadisticas, self._recalculadas())
+
+    def test_validacion_qr_cuenta_la_papeleta_como_leida(self):
+        papeleta = PapeletaSitio.objects.create(
+            hermano=HermanoFactory(), acto=self.acto, anio=self.ahora.year, puesto=self.cirio,
+            estado_papeleta=PapeletaSitio.EstadoPapeleta.EMITIDA, codigo_verificacion="ABC123",
+        )
+        registrar_transicion(self.acto.pk, None, PapeletaSitio.objects.filter(pk=papeleta.pk))
+
+        validar_acceso_papeleta(papeleta.pk, "ABC123", self.admin)
+
+        estadisticas = self._estadisticas()
+        self.assertEqual(estadisticas['papeletas_emitidas'], 0)
+        self.assertEqual(estadisticas['papeletas_leidas'], 1)
+        self.assertEqual(estadisticas, self._recalculadas())
+
+    def test_cambios_fuera_de_los_servicios_se_recalculan_al_confirmar(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            papeleta = PapeletaSitio.objects.create(hermano=HermanoFactory(), acto=self.acto, anio=self.ahora.year, puesto=self.cirio)
+
+        self.assertEqual(self._estadisticas()['cirios_virgen'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            papeleta.estado_papeleta = PapeletaSitio.EstadoPapeleta.ANULADA
+            papeleta.save()
+
+        self.assertEqual(self._estadisticas()['papeletas_anuladas'], 1)
+        self.assertEqual(self._estadisticas()['cirios_virgen'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            papeleta.delete()
+
+        self.assertEqual(set(self._estadisticas().values()), {0})
+
+    def test_las_transiciones_de_los_servicios_no_se_recalculan(self):
+        with patch('api.servicios.acto.estadisticas_acto_service.recalcular_estadisticas_acto') as mock_recalcular:
+            with self.captureOnCommitCallbacks(execute=True):
+                self._solicitar_insignia([self.vara])
+
+        mock_recalcular.assert_not_called()
+        self.assertEqual(self._estadisticas()['solicitantes_insignia'], 1)
+
+    def test_cambiar_el_cortejo_de_un_puesto_ocupado_recalcula(self):
+        papeleta = PapeletaSitio.objects.create(hermano=HermanoFactory(), acto=self.acto, anio=self.ahora.year, puesto=self.cirio)
+        registrar_transicion(self.acto.pk, None, PapeletaSitio.objects.filter(pk=papeleta.pk))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cirio.cortejo_cristo = True
+            self.cirio.save()
+
+        estadisticas = self._estadisticas()
+        self.assertEqual(estadisticas['cirios_cristo'], 1)
+        self.assertEqual(estadisticas['cirios_virgen'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cirio.tipo_puesto.es_insignia = True
+            self.cirio.tipo_puesto.save()
+
+        self.assertEqual(self._estadisticas()['cirios_cristo'], 0)
+
+    def test_comando_corrige_la_desviacion(self):
+        self._solicitar_insignia([self.vara])
+        EstadisticasActo.objects.filter(acto=self.acto).update(solicitantes_insignia=7, papeletas_solicitadas=0)
+
+        salida = StringIO()
+        call_command('recalcular_estadisticas_actos', stdout=salida)
+
+        self.assertIn("1 corregidos", salida.getvalue())
+        self.assertEqual(self._estadisticas()['solicitantes_insignia'], 1)
+        self.assertEqual(self._estadisticas()['papeletas_solicitadas'], 1)
@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import Acto, TipoActo
+from api.servicios.acto.proximos_actos_service import TTL_CACHE_LOCAL, TTL_MAXIMO, ttl_hasta
+from api.tests.factories import HermanoFactory
+
+
+class ProximosActosServiceTest(APITestCase):
+
+    def setUp(self):
+        self.ahora = timezone.now()
+        self.convivencia = TipoActo.objects.create(tipo=TipoActo.OpcionesTipo.CONVIVENCIA, requiere_papeleta=False)
+        self.estacion = TipoActo.objects.create(tipo=TipoActo.OpcionesTipo.ESTACION_PENITENCIA, requiere_papeleta=False)
+        self.client.force_authenticate(user=HermanoFactory())
+
+    def _crear_acto(self, nombre, dias, tipo_acto=None):
+        return Acto.objects.create(
+            nombre=nombre, lugar="Parroquia", fecha=self.ahora + timedelta(days=dias),
+            tipo_acto=tipo_acto or self.convivencia,
+        )
+
+    def test_lecturas_repetidas_no_consultan_la_bd(self):
+        self._crear_acto("Convivencia", 2)
+        self.client.get(reverse('proximos-actos'))
+
+        with self.assertNumQueries(0):
+            respuesta = self.client.get(reverse('proximos-actos'))
+
+        self.assertEqual(respuesta.status_code, status.HTTP_200_OK)
+        self.assertEqual([acto['nombre'] for acto in respuesta.data], ["Convivencia"])
+
+    def test_la_escritura_de_un_acto_invalida_la_cache(self):
+        acto = self._crear_acto("Convivencia", 2)
+        self.client.get(reverse('proximos-actos'))
+
+        self._crear_acto("Quinario", 1)
+        acto.nombre = "Convivencia de jóvenes"
+        acto.save()
+
+        respuesta = self.client.get(reverse('proximos-actos'))
+        self.assertEqual([acto['nombre'] for acto in respuesta.data], ["Quinario", "Convivencia de jóvenes"])
+
+    def test_sin_estacion_futura_se_cachea_el_404(self):
+        self.assertEqual(self.client.get(reverse('proxima-estacion')).status_code, status.HTTP_404_NOT_FOUND)
+
+        with self.assertNumQueries(0):
+            respuesta = self.client.get(reverse('proxima-estacion'))
+        self.assertEqual(respuesta.status_code, status.HTTP_404_NOT_FOUND)
+
+        self._crear_acto("Estación de Penitencia", 30, tipo_acto=self.estacion)
+        respuesta = self.client.get(reverse('proxima-estacion'))
+        self.assertEqual(respuesta.status_code, status.HTTP_200_OK)
+        self.assertEqual(respuesta.data['nombre'], "Estación de Penitencia")
+
+    def test_ttl_hasta_el_inicio_del_proximo_acto(self):
+        self.assertEqual(ttl_hasta(self.ahora + timedelta(seconds=90), self.ahora), 91)
+        self.assertEqual(ttl_hasta(self.ahora, self.ahora), 1)
+
+    def test_con_cache_por_proceso_el_ttl_se_acota(self):
+        self.assertEqual(ttl_hasta(self.ahora + timedelta(days=30), self.ahora), TTL_CACHE_LOCAL)
+        self.assertEqual(ttl_hasta(None, self.ahora), TTL_CACHE_LOCAL)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'cache'}})
+    def test_con_cache_compartida_el_ttl_llega_a_un_dia(self):
+        self.assertEqual(ttl_hasta(self.ahora + timedelta(days=30), self.ahora), TTL_MAXIMO)
+        self.assertEqual(ttl_hasta(None, self.ahora), TTL_MAXIMO)
+
+    @override_settings(PROXIMOS_ACTOS_TTL=60)
+    def test_el_tope_se_puede_fijar_en_los_ajustes(self):
+        self.assertEqual(ttl_hasta(self.ahora + timedelta(days=30), self.ahora), 60)
+        self.assertEqual(ttl_hasta(self.ahora + timedelta(seconds=30), self.ahora), 31)
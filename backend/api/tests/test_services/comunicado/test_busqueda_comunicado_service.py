@@ -0,0 +1,135 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from api.models import AreaInteres, BusquedaComunicado, Comunicado
+from api.servicios.comunicado.busqueda_comunicado_service import (
+    buscar_comunicados, reconstruir_busqueda, resaltar_fragmento, terminos_consulta
+)
+from api.servicios.comunicado.creacion_comunicado_service import ComunicadoService
+from api.tests.factories import HermanoFactory
+
+
+class BusquedaComunicadoServiceTest(TestCase):
+
+    def setUp(self):
+        self.todos = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.TODOS_HERMANOS)
+        self.caridad = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.CARIDAD)
+        self.juventud = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.JUVENTUD)
+
+        self.admin = HermanoFactory(esAdmin=True)
+        self.service = ComunicadoService()
+
+        self.hermano = HermanoFactory()
+        self.hermano.areas_interes.set([self.caridad])
+
+        patcher = patch('api.servicios.comunicado.creacion_comunicado_service.generar_y_guardar_embedding_async')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _crear(self, titulo, contenido, areas=None):
+        with self.captureOnCommitCallbacks():
+            return self.service.create_comunicado(self.admin, {
+                'titulo': titulo, 'contenido': contenido,
+                'tipo_comunicacion': Comunicado.TipoComunicacion.GENERAL,
+                'areas_interes': areas or [self.caridad],
+            })
+
+    def _titulos(self, consulta, usuario=None):
+        return [c.titulo for c in buscar_comunicados(usuario or self.hermano, consulta)]
+
+    def test_el_alta_indexa_el_texto_sin_html(self):
+        comunicado = self._crear("Recogida de alimentos", "<p>Traed <b>aceite</b> &amp; legumbres</p>")
+
+        documento = BusquedaComunicado.objects.get(pk=comunicado.pk)
+        self.assertEqual(documento.texto, "Traed aceite & legumbres")
+        self.assertEqual(self._titulos("aceite"), ["Recogida de alimentos"])
+
+    def test_comunicado_creado_fuera_del_servicio_tambien_se_indexa(self):
+        comunicado = Comunicado.objects.create(
+            titulo="Besamanos", contenido="<p>Besamanos<br>extraordinario</p>",
+            tipo_comunicacion=Comunicado.TipoComunicacion.GENERAL, autor=self.admin,
+        )
+        comunicado.areas_interes.set([self.caridad])
+
+        self.assertEqual(BusquedaComunicado.objects.get(pk=comunicado.pk).texto, "Besamanos extraordinario")
+        self.assertEqual(self._titulos("extraordinario"), ["Besamanos"])
+
+        comunicado.contenido = "Besamanos aplazado"
+        comunicado.save()
+
+        self.assertEqual(self._titulos("aplazado"), ["Besamanos"])
+
+    def test_ordena_por_relevancia_con_mas_peso_en_el_titulo(self):
+        self._crear("Convivencia", "Tras la convivencia habrá una recogida de alimentos.")
+        self._crear("Recogida de alimentos", "Campaña anual de la bolsa de caridad.")
+
+        self.assertEqual(self._titulos("alimentos"), ["Recogida de alimentos", "Convivencia"])
+
+    def test_exige_todos_los_terminos_como_prefijo(self):
+        self._crear("Campaña de Navidad", "Recogida de juguetes.")
+        self._crear("Navidad en la casa hermandad", "Belén viviente.")
+
+        self.assertEqual(self._titulos("navid juguete"), ["Campaña de Navidad"])
+
+    def test_no_distingue_tildes_ni_mayusculas(self):
+        self._crear("Besamanos", "Solemne BESAMANOS a María Santísima.")
+
+        self.assertEqual(self._titulos("maria santisima"), ["Besamanos"])
+        self.assertEqual(self._titulos("SANTÍSIMA"), ["Besamanos"])
+
+    def test_solo_devuelve_comunicados_de_la_audiencia_del_hermano(self):
+        self._crear("Convivencia de caridad", "Encuentro anual.")
+        self._crear("Convivencia joven", "Encuentro anual.", [self.juventud])
+        self._crear("Convivencia general", "Encuentro anual.", [self.todos])
+
+        self.assertCountEqual(self._titulos("encuentro"), ["Convivencia de caridad", "Convivencia general"])
+
+    def test_editar_el_texto_reindexa_y_borrar_lo_quita(self):
+        comunicado = self._crear("Cabildo", "Cabildo ordinario de cuentas.")
+
+        with self.captureOnCommitCallbacks():
+            self.service.update_comunicado(self.admin, comunicado, {'contenido': "Cabildo extraordinario de elecciones."})
+
+        self.assertEqual(self._titulos("elecciones"), ["Cabildo"])
+        self.assertEqual(self._titulos("cuentas"), [])
+
+        with self.captureOnCommitCallbacks():
+            self.service.delete_comunicado(self.admin, comunicado)
+
+        self.assertEqual(self._titulos("cabildo"), [])
+        self.assertFalse(BusquedaComunicado.objects.exists())
+
+    def test_el_resultado_trae_titulo_y_fragmento_resaltados_y_escapados(self):
+        self._crear("Misa <de> Réquiem", "Se celebrará misa de réquiem por los hermanos difuntos.")
+
+        resultado = buscar_comunicados(self.hermano, "requiem")[0]
+
+        self.assertEqual(resultado.titulo_resaltado, "Misa &lt;de&gt; <mark>Réquiem</mark>")
+        self.assertIn("misa de <mark>réquiem</mark> por", resultado.fragmento)
+        self.assertGreater(resultado.puntuacion, 0)
+
+    def test_el_fragmento_se_centra_en_la_primera_coincidencia(self):
+        texto = "palabra " * 60 + "cirio " + "relleno " * 60
+
+        fragmento = resaltar_fragmento(texto, ["cirio"], longitud=80)
+
+        self.assertTrue(fragmento.startswith("… "))
+        self.assertTrue(fragmento.endswith(" …"))
+        self.assertIn("<mark>cirio</mark>", fragmento)
+        self.assertLess(len(fragmento), 120)
+
+    def test_consulta_sin_terminos_utiles_no_busca(self):
+        self._crear("De la hermandad", "Contenido.")
+
+        self.assertEqual(terminos_consulta("de la y el"), [])
+        self.assertEqual(buscar_comunicados(self.hermano, "de la"), [])
+
+    def test_reconstruir_regenera_el_indice(self):
+        self._crear("Quinario", "Solemne quinario.")
+        BusquedaComunicado.objects.all().delete()
+        self.assertEqual(self._titulos("quinario"), [])
+
+        self.assertEqual(reconstruir_busqueda(), 1)
+
+        self.assertEqual(self._titulos("quinario"), ["Quinario"])
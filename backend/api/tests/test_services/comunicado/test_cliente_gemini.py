@@ -0,0 +1,60 @@
+import threading
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from api.servicios.comunicado.cliente_gemini import obtener_cliente_gemini, reiniciar_cliente_gemini
+
+
+class ClienteGeminiTest(SimpleTestCase):
+
+    def setUp(self):
+        reiniciar_cliente_gemini()
+        self.addCleanup(reiniciar_cliente_gemini)
+
+    @patch('api.servicios.comunicado.cliente_gemini.genai.Client')
+    def test_no_se_construye_hasta_el_primer_uso(self, mock_client):
+        mock_client.assert_not_called()
+
+        obtener_cliente_gemini()
+
+        mock_client.assert_called_once()
+
+    @patch('api.servicios.comunicado.cliente_gemini.genai.Client')
+    def test_llamadas_sucesivas_reutilizan_el_mismo_cliente(self, mock_client):
+        primero = obtener_cliente_gemini()
+        segundo = obtener_cliente_gemini()
+
+        self.assertIs(primero, segundo)
+        mock_client.assert_called_once()
+
+    @patch('api.servicios.comunicado.cliente_gemini.genai.Client')
+    def test_hilos_concurrentes_comparten_una_unica_instancia(self, mock_client):
+        resultados = []
+        hilos = [threading.Thread(target=lambda: resultados.append(obtener_cliente_gemini())) for _ in range(10)]
+
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(len({id(cliente) for cliente in resultados}), 1)
+        mock_client.assert_called_once()
+
+    @override_settings(GEMINI_API_KEY='clave-test', GEMINI_TIMEOUT_SEGUNDOS=7.5, GEMINI_MAX_CONEXIONES=4)
+    @patch('api.servicios.comunicado.cliente_gemini.genai.Client')
+    def test_aplica_timeout_y_limite_de_conexiones_configurados(self, mock_client):
+        obtener_cliente_gemini()
+
+        kwargs = mock_client.call_args.kwargs
+        self.assertEqual(kwargs['api_key'], 'clave-test')
+        self.assertEqual(kwargs['http_options'].timeout, 7500)
+        self.assertEqual(kwargs['http_options'].client_args['limits'].max_connections, 4)
+
+    @patch('api.servicios.comunicado.cliente_gemini.genai.Client')
+    def test_reiniciar_fuerza_nueva_construccion(self, mock_client):
+        obtener_cliente_gemini()
+        reiniciar_cliente_gemini()
+        obtener_cliente_gemini()
+
+        self.assertEqual(mock_client.call_count, 2)
@@ -0,0 +1,94 @@
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from api.models import Comunicado
+from api.servicios.comunicado.cliente_gemini import obtener_cliente_gemini, reiniciar_cliente_gemini
+from api.servicios.comunicado.cliente_gemini_falso import ClienteGeminiFalso, DIMENSION_EMBEDDING_FALSO, embedding_por_hash
+from api.servicios.comunicado.comunicado_rag_service import calcular_similitud_coseno
+
+
+class ClienteGeminiFalsoTest(SimpleTestCase):
+
+    def setUp(self):
+        self.cliente = ClienteGeminiFalso()
+
+    def test_embedding_es_determinista_y_normalizado(self):
+        vector = embedding_por_hash("Reparto de papeletas del tramo 7")
+
+        self.assertEqual(vector, embedding_por_hash("Reparto de papeletas del tramo 7"))
+        self.assertEqual(len(vector), DIMENSION_EMBEDDING_FALSO)
+        self.assertAlmostEqual(sum(v * v for v in vector), 1.0)
+
+    def test_textos_con_vocabulario_comun_son_mas_similares(self):
+        pregunta = embedding_por_hash("¿Cuándo es el reparto de papeletas?")
+
+        similar = calcular_similitud_coseno(pregunta, embedding_por_hash("El reparto de papeletas será el lunes"))
+        distinto = calcular_similitud_coseno(pregunta, embedding_por_hash("Quinario en honor a los titulares"))
+
+        self.assertGreater(similar, distinto)
+
+    def test_embed_content_imita_la_respuesta_del_sdk(self):
+        resultado = self.cliente.models.embed_content(model='x', contents="Cuota 2025")
+
+        self.assertEqual(resultado.embeddings[0].values, embedding_por_hash("Cuota 2025"))
+
+    def test_generate_content_cita_el_primer_comunicado_del_prompt(self):
+        prompt = "--- COMUNICADO: Besamanos (Fecha: 01/03/2025) ---\nTexto\n"
+
+        respuesta = self.cliente.models.generate_content(model='x', contents=prompt)
+
+        self.assertIn('"Besamanos"', respuesta.text)
+
+    def test_generate_content_sin_contexto_responde_que_no_hay_informacion(self):
+        respuesta = self.cliente.models.generate_content(model='x', contents="Pregunta sin comunicados")
+
+        self.assertIn("no encuentro información", respuesta.text)
+
+    def test_stream_reconstruye_la_respuesta_completa(self):
+        prompt = "--- COMUNICADO: Besamanos (Fecha: 01/03/2025) ---\nTexto\n"
+
+        trozos = list(self.cliente.models.generate_content_stream(model='x', contents=prompt))
+
+        self.assertGreater(len(trozos), 1)
+        self.assertEqual(''.join(t.text for t in trozos), self.cliente.models.generate_content(model='x', contents=prompt).text)
+
+    def test_latencia_artificial(self):
+        cliente = ClienteGeminiFalso(latencia_ms=30)
+
+        inicio = time.perf_counter()
+        cliente.models.embed_content(model='x', contents="hola")
+
+        self.assertGreaterEqual(time.perf_counter() - inicio, 0.03)
+
+    @override_settings(GEMINI_BACKEND='falso')
+    def test_factoria_devuelve_el_cliente_falso_segun_settings(self):
+        reiniciar_cliente_gemini()
+        self.addCleanup(reiniciar_cliente_gemini)
+
+        self.assertIsInstance(obtener_cliente_gemini(), ClienteGeminiFalso)
+
+
+class BenchmarkRAGCommandTest(TestCase):
+
+    def setUp(self):
+        self.addCleanup(reiniciar_cliente_gemini)
+
+    def test_informa_latencias_prompt_y_recall_sin_dejar_datos(self):
+        salida = StringIO()
+
+        call_command('benchmark_rag', comunicados=30, preguntas=10, stdout=salida)
+
+        texto = salida.getvalue()
+        self.assertIn("recuperación", texto)
+        self.assertIn("p99=", texto)
+        self.assertIn("Prompt (caracteres)", texto)
+        self.assertIn("recall@3:", texto)
+        self.assertFalse(Comunicado.objects.exists())
+
+    def test_recall_minimo_inalcanzable_falla(self):
+        with self.assertRaises(CommandError):
+            call_command('benchmark_rag', comunicados=10, preguntas=5, recall_minimo=1.01, stdout=StringIO())
@@ -148,6 +148,14 @@ class CrearComunicadoServiceTest(TestCase):
             "imagen_portada": self.imagen_dummy
         }
 
+        # La difusión a Telegram se ejecuta en línea en lugar de en un hilo aparte
+        patcher_difusion = patch(
+            'api.servicios.comunicado.difusion_telegram_service.lanzar_en_segundo_plano',
+            side_effect=lambda funcion, *args: funcion(*args)
+        )
+        patcher_difusion.start()
+        self.addCleanup(patcher_difusion.stop)
+
 
 
     @patch('api.servicios.comunicado.creacion_comunicado_service.generar_y_guardar_embedding_async')
@@ -0,0 +1,209 @@
+import shutil
+import tempfile
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import requests
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from api.models import Comunicado, EnvioTelegram
+from api.servicios.comunicado.difusion_telegram_service import (
+    LimitadorTasa, difundir_comunicado, programar_difusion, publicar_en_telegram
+)
+from api.tests.factories import HermanoFactory
+
+
+def respuesta(status_code=200, cuerpo=None):
+    mock = MagicMock(status_code=status_code, ok=status_code < 400, text="")
+    mock.json.return_value = cuerpo or {"ok": status_code < 400}
+    return mock
+
+
+@override_settings(
+    TELEGRAM_BOT_TOKEN="TOKEN_TEST", TELEGRAM_REINTENTOS=3, TELEGRAM_ESPERA_REINTENTO=0,
+    TELEGRAM_MENSAJES_POR_SEGUNDO=1000, TELEGRAM_ENVIOS_CONCURRENTES=4,
+)
+class DifusionTelegramServiceTest(TestCase):
+
+    def setUp(self):
+        self.comunicado = Comunicado.objects.create(
+            titulo="Cabildo", contenido="Cabildo general ordinario.",
+            tipo_comunicacion=Comunicado.TipoComunicacion.GENERAL, autor=HermanoFactory(),
+        )
+
+        patcher = patch('api.servicios.comunicado.difusion_telegram_service.lanzar_en_segundo_plano')
+        self.mock_lanzar = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _programar(self, canales):
+        with self.captureOnCommitCallbacks(execute=True):
+            programar_difusion(self.comunicado, canales)
+
+    def _estados(self):
+        return dict(EnvioTelegram.objects.values_list('canal', 'estado'))
+
+    def test_registra_un_envio_pendiente_por_canal_y_lanza_tras_el_commit(self):
+        self._programar({"-1001", "-1002"})
+
+        self.assertEqual(self._estados(), {"-1001": "PENDIENTE", "-1002": "PENDIENTE"})
+        self.mock_lanzar.assert_called_once_with(difundir_comunicado, self.comunicado.id)
+
+    def test_sin_canales_no_programa_nada(self):
+        self._programar(set())
+
+        self.assertFalse(EnvioTelegram.objects.exists())
+        self.mock_lanzar.assert_not_called()
+
+    @patch('requests.post')
+    def test_envia_a_todos_los_canales_en_paralelo(self, mock_post):
+        canales = {f"-100{i}" for i in range(4)}
+        self._programar(canales)
+
+        hilos, barrera = set(), threading.Barrier(4, timeout=5)
+
+        def post(url, **kwargs):
+            hilos.add(threading.get_ident())
+            barrera.wait()
+            return respuesta()
+
+        mock_post.side_effect = post
+
+        difundir_comunicado(self.comunicado.id)
+
+        self.assertEqual(len(hilos), 4)
+        self.assertEqual(set(self._estados().values()), {"ENVIADO"})
+        self.assertFalse(EnvioTelegram.objects.filter(fecha_envio__isnull=True).exists())
+
+    @patch('requests.post')
+    def test_reintenta_errores_transitorios_y_registra_los_intentos(self, mock_post):
+        self._programar({"-1001"})
+        mock_post.side_effect = [requests.ConnectionError("caída"), respuesta(502), respuesta()]
+
+        difundir_comunicado(self.comunicado.id)
+
+        envio = EnvioTelegram.objects.get()
+        self.assertEqual(envio.estado, EnvioTelegram.EstadoEnvio.ENVIADO)
+        self.assertEqual(envio.intentos, 3)
+        self.assertEqual(envio.ultimo_error, "")
+
+    @patch('requests.post')
+    def test_error_permanente_no_se_reintenta_y_queda_fallido(self, mock_post):
+        self._programar({"-1001"})
+        mock_post.return_value = respuesta(400)
+
+        difundir_comunicado(self.comunicado.id)
+
+        envio = EnvioTelegram.objects.get()
+        self.assertEqual(envio.estado, EnvioTelegram.EstadoEnvio.FALLIDO)
+        self.assertEqual(envio.intentos, 1)
+        self.assertIn("HTTP 400", envio.ultimo_error)
+
+    @patch('requests.post')
+    def test_volver_a_difundir_solo_reintenta_los_fallidos(self, mock_post):
+        self._programar({"-1001", "-1002"})
+        mock_post.side_effect = lambda url, **kwargs: respuesta(403 if kwargs['data']['chat_id'] == "-1002" else 200)
+        difundir_comunicado(self.comunicado.id)
+
+        mock_post.reset_mock()
+        mock_post.side_effect = None
+        mock_post.return_value = respuesta()
+        difundir_comunicado(self.comunicado.id)
+
+        mock_post.assert_called_once()
+        self.assertEqual(mock_post.call_args.kwargs['data']['chat_id'], "-1002")
+        self.assertEqual(self._estados(), {"-1001": "ENVIADO", "-1002": "ENVIADO"})
+
+    @patch('api.servicios.comunicado.difusion_telegram_service.time.sleep')
+    @patch('requests.post')
+    def test_respeta_el_retry_after_de_telegram(self, mock_post, mock_sleep):
+        mock_post.side_effect = [respuesta(429, {"ok": False, "parameters": {"retry_after": 7}}), respuesta()]
+
+        _, intentos, error = publicar_en_telegram("TOKEN_TEST", "sendMessage", {"chat_id": "-1001"})
+
+        self.assertEqual((intentos, error), (2, None))
+        mock_sleep.assert_any_call(7.0)
+
+
+@override_settings(
+    TELEGRAM_BOT_TOKEN="TOKEN_TEST", TELEGRAM_REINTENTOS=1, TELEGRAM_MENSAJES_POR_SEGUNDO=1000,
+)
+class DifusionConPortadaTest(TestCase):
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        ajustes = override_settings(MEDIA_ROOT=self.media)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+
+        self.comunicado = Comunicado.objects.create(
+            titulo="Besamanos", contenido="Besamanos a la Santísima Virgen.",
+            tipo_comunicacion=Comunicado.TipoComunicacion.CULTOS, autor=HermanoFactory(),
+            imagen_portada=SimpleUploadedFile("cartel.jpg", b"bytes_de_la_portada", content_type="image/jpeg"),
+        )
+
+        patcher = patch('requests.post')
+        self.mock_post = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.mock_post.side_effect = lambda url, **kwargs: respuesta(cuerpo={
+            "ok": True, "result": {"photo": [{"file_id": "MINIATURA"}, {"file_id": "FOTO_123"}]}
+        })
+
+    def _crear_envios(self, canales):
+        EnvioTelegram.objects.bulk_create([EnvioTelegram(comunicado=self.comunicado, canal=canal) for canal in canales])
+
+    def _subidas(self):
+        return [llamada for llamada in self.mock_post.call_args_list if 'files' in llamada.kwargs]
+
+    def test_sube_la_portada_una_vez_y_reutiliza_el_file_id(self):
+        self._crear_envios(["-1001", "-1002", "-1003"])
+
+        difundir_comunicado(self.comunicado.id)
+
+        self.assertEqual(len(self._subidas()), 1)
+        reenvios = [llamada.kwargs['data']['photo'] for llamada in self.mock_post.call_args_list if 'files' not in llamada.kwargs]
+        self.assertEqual(reenvios, ["FOTO_123", "FOTO_123"])
+
+        self.comunicado.refresh_from_db()
+        self.assertEqual(self.comunicado.telegram_file_id, "FOTO_123")
+        self.assertEqual(EnvioTelegram.objects.filter(estado=EnvioTelegram.EstadoEnvio.ENVIADO).count(), 3)
+
+    def test_los_reenvios_no_vuelven_a_subir_la_imagen(self):
+        Comunicado.objects.filter(pk=self.comunicado.pk).update(telegram_file_id="FOTO_GUARDADA")
+        self._crear_envios(["-1001"])
+
+        with patch('django.db.models.fields.files.FieldFile.open') as mock_open:
+            difundir_comunicado(self.comunicado.id)
+
+        mock_open.assert_not_called()
+        self.assertEqual(self._subidas(), [])
+        self.assertEqual(self.mock_post.call_args.kwargs['data']['photo'], "FOTO_GUARDADA")
+
+    def test_si_la_subida_falla_se_intenta_con_el_siguiente_canal(self):
+        self._crear_envios(["-1001", "-1002", "-1003"])
+        respuestas = iter([respuesta(403), respuesta(cuerpo={"ok": True, "result": {"photo": [{"file_id": "FOTO_123"}]}})])
+        self.mock_post.side_effect = lambda url, **kwargs: next(respuestas, respuesta())
+
+        difundir_comunicado(self.comunicado.id)
+
+        self.assertEqual(len(self._subidas()), 2)
+        self.assertEqual(self.mock_post.call_count, 3)
+        self.assertEqual(EnvioTelegram.objects.filter(estado=EnvioTelegram.EstadoEnvio.FALLIDO).count(), 1)
+
+
+class LimitadorTasaTest(TestCase):
+
+    def test_espacia_los_envios_entre_hilos(self):
+        limitador = LimitadorTasa(por_segundo=50)
+
+        inicio = time.monotonic()
+        hilos = [threading.Thread(target=limitador.esperar) for _ in range(6)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertGreaterEqual(time.monotonic() - inicio, 5 / 50)
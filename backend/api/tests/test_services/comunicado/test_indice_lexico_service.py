@@ -0,0 +1,380 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from api.models import AreaInteres, Comunicado, CuerpoPertenencia
+from api.servicios.comunicado.comunicado_rag_service import ComunicadoRAGService, fusionar_rankings
+from api.servicios.comunicado.creacion_comunicado_service import ComunicadoService
+from api.servicios.comunicado.indice_lexico_service import (
+    IndiceBM25, normalizar_texto, obtener_indice_comunicados, reiniciar_indice_comunicados, tokenizar
+)
+from api.tests.factories import HermanoFactory
+
+from unittest.mock import MagicMock, patch
+
+
+class TokenizacionTest(TestCase):
+
+    def test_normalizar_texto_elimina_tildes_y_conserva_enie(self):
+        self.assertEqual(normalizar_texto("Estación de Penitencia AÑO"), "estacion de penitencia año")
+
+    def test_tokenizar_elimina_html_y_stopwords(self):
+        self.assertEqual(tokenizar("<p>El <b>Cabildo</b> de la Hermandad</p>"), ["cabild", "hermandad"])
+
+    def test_tokenizar_conserva_numeros(self):
+        self.assertEqual(tokenizar("Tramo 7 - Cuota 2025"), ["tram", "7", "cuot", "2025"])
+
+    def test_tokenizar_unifica_singular_y_plural(self):
+        self.assertEqual(tokenizar("cirio"), tokenizar("cirios"))
+        self.assertEqual(tokenizar("papeleta"), tokenizar("papeletas"))
+        self.assertEqual(tokenizar("cruz"), tokenizar("cruces"))
+
+    def test_tokenizar_texto_vacio(self):
+        self.assertEqual(tokenizar(""), [])
+        self.assertEqual(tokenizar(None), [])
+
+
+class IndiceBM25Test(TestCase):
+
+    def setUp(self):
+        self.indice = IndiceBM25()
+        self.indice.indexar(1, tokenizar("Reparto de papeletas del tramo 7"))
+        self.indice.indexar(2, tokenizar("Cuota anual 2025 de los hermanos"))
+        self.indice.indexar(3, tokenizar("Cultos del quinario y besamanos"))
+
+    def test_buscar_coincidencia_exacta_de_numero(self):
+        resultado = self.indice.buscar(tokenizar("tramo 7"))
+        self.assertEqual(list(resultado), [1])
+
+        resultado = self.indice.buscar(tokenizar("cuota 2025"))
+        self.assertEqual(list(resultado), [2])
+
+    def test_buscar_sin_coincidencias(self):
+        self.assertEqual(self.indice.buscar(tokenizar("capataz")), {})
+
+    def test_buscar_ordena_por_relevancia(self):
+        self.indice.indexar(4, tokenizar("Quinario: horario del quinario y del triduo"))
+        resultado = self.indice.buscar(tokenizar("quinario"))
+        self.assertGreater(resultado[4], resultado[3])
+
+    def test_buscar_sin_particiones_recorre_todo_el_indice(self):
+        resultado = self.indice.buscar(tokenizar("tramo cuota"))
+        self.assertEqual(set(resultado), {1, 2})
+
+    def test_reindexar_reemplaza_terminos_anteriores(self):
+        self.indice.indexar(1, tokenizar("Convivencia de jóvenes"))
+
+        self.assertEqual(self.indice.buscar(tokenizar("tramo")), {})
+        self.assertIn(1, self.indice.buscar(tokenizar("convivencia")))
+        self.assertEqual(len(self.indice), 3)
+
+    def test_eliminar_documento(self):
+        self.indice.eliminar(2)
+
+        self.assertNotIn(2, self.indice)
+        self.assertEqual(self.indice.buscar(tokenizar("cuota")), {})
+
+    def test_eliminar_documento_inexistente_no_falla(self):
+        self.indice.eliminar(99)
+        self.assertEqual(len(self.indice), 3)
+
+
+class IndiceBM25ParticionadoTest(TestCase):
+
+    def setUp(self):
+        self.indice = IndiceBM25()
+        self.indice.indexar(1, tokenizar("Igualá de costaleros"), ["COSTALEROS"])
+        self.indice.indexar(2, tokenizar("Convivencia de costaleros y acólitos"), ["COSTALEROS", "ACOLITOS"])
+        self.indice.indexar(3, tokenizar("Cuota de costaleros para todos"), ["TODOS_HERMANOS"])
+        self.indice.indexar(4, tokenizar("Costaleros sin área"))
+
+    def test_buscar_solo_en_las_particiones_indicadas(self):
+        resultado = self.indice.buscar(tokenizar("costaleros"), {"ACOLITOS", "TODOS_HERMANOS"})
+        self.assertEqual(set(resultado), {2, 3})
+
+    def test_documento_en_varias_particiones_se_puntua_una_vez(self):
+        ambas = self.indice.buscar(tokenizar("costaleros"), {"COSTALEROS", "ACOLITOS"})
+        global_ = self.indice.buscar(tokenizar("costaleros"))
+
+        self.assertAlmostEqual(ambas[2], global_[2])
+
+    def test_particion_inexistente_no_devuelve_nada(self):
+        self.assertEqual(self.indice.buscar(tokenizar("costaleros"), {"PRIOSTIA"}), {})
+
+    def test_documentos_por_particion(self):
+        self.assertEqual(self.indice.documentos({"COSTALEROS"}), {1, 2})
+        self.assertEqual(self.indice.documentos(), {1, 2, 3, 4})
+        self.assertTrue(self.indice.hay_documentos({"COSTALEROS", "INEXISTENTE"}))
+        self.assertFalse(self.indice.hay_documentos({"INEXISTENTE"}))
+
+    def test_reindexar_mueve_el_documento_de_particion(self):
+        self.indice.indexar(1, tokenizar("Igualá de costaleros"), ["JUVENTUD"])
+
+        self.assertEqual(self.indice.documentos({"COSTALEROS"}), {2})
+        self.assertEqual(set(self.indice.buscar(tokenizar("iguala"), {"JUVENTUD"})), {1})
+
+
+class IndiceComunicadosTest(TestCase):
+
+    def setUp(self):
+        reiniciar_indice_comunicados()
+
+        self.admin = HermanoFactory(esAdmin=True)
+        CuerpoPertenencia.objects.create(nombre_cuerpo=CuerpoPertenencia.NombreCuerpo.JUNTA_GOBIERNO)
+
+        self.comunicado = Comunicado.objects.create(
+            titulo="Reparto de papeletas",
+            contenido="El reparto del tramo 7 será el lunes.",
+            tipo_comunicacion=Comunicado.TipoComunicacion.GENERAL,
+            autor=self.admin,
+        )
+
+    def tearDown(self):
+        reiniciar_indice_comunicados()
+
+    def test_indice_se_construye_desde_base_de_datos(self):
+        indice = obtener_indice_comunicados()
+
+        self.assertIn(self.comunicado.id, indice)
+        self.assertIs(obtener_indice_comunicados(), indice)
+
+    def test_indice_se_reconstruye_si_cambia_la_firma(self):
+        obtener_indice_comunicados()
+
+        nuevo = Comunicado.objects.create(
+            titulo="Cuota 2025",
+            contenido="Recordatorio de la cuota.",
+            tipo_comunicacion=Comunicado.TipoComunicacion.SECRETARIA,
+            autor=self.admin,
+        )
+
+        self.assertIn(nuevo.id, obtener_indice_comunicados())
+
+    def test_indice_se_reconstruye_si_otro_proceso_edita_un_comunicado(self):
+        obtener_indice_comunicados()
+
+        self.comunicado.contenido = "Se aplaza la igualá."
+        self.comunicado.save()
+
+        self.assertIn(self.comunicado.id, obtener_indice_comunicados().buscar(tokenizar("igualá")))
+
+    @patch('api.servicios.comunicado.creacion_comunicado_service.generar_y_guardar_embedding_async')
+    def test_alta_local_no_oculta_las_de_otros_procesos(self, mock_embedding):
+        obtener_indice_comunicados()
+
+        ajeno = Comunicado.objects.create(
+            titulo="Cuota 2025",
+            contenido="Recordatorio de la cuota.",
+            tipo_comunicacion=Comunicado.TipoComunicacion.SECRETARIA,
+            autor=self.admin,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ComunicadoService().create_comunicado(self.admin, {
+                'titulo': "Besamanos",
+                'contenido': "Horario del besamanos extraordinario.",
+                'tipo_comunicacion': Comunicado.TipoComunicacion.CULTOS,
+            })
+
+        self.assertIn(ajeno.id, obtener_indice_comunicados())
+
+    @patch('api.servicios.comunicado.creacion_comunicado_service.generar_y_guardar_embedding_async')
+    def test_servicio_actualiza_indice_incrementalmente(self, mock_embedding):
+        indice = obtener_indice_comunicados()
+        servicio = ComunicadoService()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            creado = servicio.create_comunicado(self.admin, {
+                'titulo': "Besamanos",
+                'contenido': "Horario del besamanos extraordinario.",
+                'tipo_comunicacion': Comunicado.TipoComunicacion.CULTOS,
+            })
+
+        self.assertIn(creado.id, indice.buscar(tokenizar("besamanos")))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            servicio.update_comunicado(self.admin, creado, {'contenido': "Se suspende el acto."})
+
+        self.assertEqual(indice.buscar(tokenizar("horario")), {})
+
+        creado_id = creado.id
+        with self.captureOnCommitCallbacks(execute=True):
+            servicio.delete_comunicado(self.admin, creado)
+
+        self.assertNotIn(creado_id, indice)
+        self.assertIs(obtener_indice_comunicados(), indice)
+
+
+    @patch('api.servicios.comunicado.gemini_service.actualizar_relacionados')
+    @patch('api.servicios.comunicado.gemini_service.obtener_cliente_gemini')
+    def test_alta_con_areas_y_embedding_no_reconstruye_el_indice(self, mock_cliente, mock_relacionados):
+        mock_cliente.return_value.models.embed_content.return_value.embeddings = [MagicMock(values=[0.1, 0.2, 0.3])]
+        area = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.JUVENTUD)
+        indice = obtener_indice_comunicados()
+
+        # El hilo del embedding se ejecuta en línea para que su escritura ocurra antes de comprobar la firma
+        with patch('api.servicios.comunicado.gemini_service.threading.Thread', HiloSincrono):
+            with self.captureOnCommitCallbacks(execute=True):
+                creado = ComunicadoService().create_comunicado(self.admin, {
+                    'titulo': "Convivencia",
+                    'contenido': "Convivencia de la juventud en la casa de hermandad.",
+                    'tipo_comunicacion': Comunicado.TipoComunicacion.EVENTOS,
+                    'areas_interes': [area],
+                })
+
+        self.assertIsNotNone(Comunicado.objects.get(pk=creado.pk).embedding)
+        self.assertIs(obtener_indice_comunicados(), indice)
+        self.assertIn(creado.id, indice.buscar(tokenizar("convivencia")))
+
+
+class HiloSincrono:
+    """Sustituye a threading.Thread ejecutando el objetivo en el propio hilo del test."""
+
+    def __init__(self, target, args=()):
+        self.target, self.args = target, args
+
+    def start(self):
+        self.target(*self.args)
+
+
+class RecuperacionHibridaTest(TestCase):
+
+    def setUp(self):
+        reiniciar_indice_comunicados()
+
+        autor = HermanoFactory()
+        base = {'tipo_comunicacion': Comunicado.TipoComunicacion.GENERAL, 'autor': autor, 'fecha_emision': timezone.now()}
+
+        self.com_tramo = Comunicado.objects.create(
+            titulo="Reparto de papeletas", contenido="Tramo 7: recogida el lunes.", embedding=[0.0, 1.0], **base
+        )
+        self.com_cultos = Comunicado.objects.create(
+            titulo="Cultos de Cuaresma", contenido="Quinario al Señor.", embedding=[1.0, 0.0], **base
+        )
+        self.com_sin_vector = Comunicado.objects.create(
+            titulo="Cuota 2025", contenido="Plazo de pago de la cuota.", **base
+        )
+
+    def tearDown(self):
+        reiniciar_indice_comunicados()
+
+    def _servicio_con_vector(self, vector=None, error=None):
+        with patch('api.servicios.comunicado.comunicado_rag_service.obtener_cliente_gemini'):
+            servicio = ComunicadoRAGService()
+
+        if error:
+            servicio.client = MagicMock()
+            servicio.client.models.embed_content.side_effect = error
+        else:
+            resultado = MagicMock()
+            resultado.embeddings = [MagicMock(values=vector)]
+            servicio.client = MagicMock()
+            servicio.client.models.embed_content.return_value = resultado
+
+        return servicio
+
+    def test_fusionar_rankings_prioriza_documentos_en_ambas_listas(self):
+        vectorial = {1: 0.9, 2: 0.8, 3: 0.1}
+        lexico = {2: 5.0, 4: 3.0}
+
+        self.assertEqual(fusionar_rankings(vectorial, lexico)[0], 2)
+
+    def test_coincidencia_exacta_gana_aunque_el_vector_apunte_a_otro(self):
+        servicio = self._servicio_con_vector([1.0, 0.0])
+
+        recuperados = servicio._recuperar_comunicados("¿Cuándo es el reparto del tramo 7?")
+
+        self.assertEqual(recuperados[0], self.com_tramo)
+
+    def test_comunicado_sin_embedding_es_recuperable_por_texto(self):
+        servicio = self._servicio_con_vector([1.0, 0.0])
+
+        recuperados = servicio._recuperar_comunicados("cuota 2025")
+
+        self.assertIn(self.com_sin_vector, recuperados)
+
+    def test_fallo_del_embedding_recurre_solo_al_indice_lexico(self):
+        servicio = self._servicio_con_vector(error=Exception("Quota exceeded"))
+
+        recuperados = servicio._recuperar_comunicados("quinario")
+
+        self.assertEqual(recuperados, [self.com_cultos])
+
+    def test_contexto_vacio_devuelve_mensaje_sin_llamar_al_modelo(self):
+        servicio = self._servicio_con_vector(error=Exception("Quota exceeded"))
+
+        respuesta = servicio.preguntar_a_comunicados("capataces")
+
+        self.assertIn("no hay comunicados", respuesta)
+        servicio.client.models.generate_content.assert_not_called()
+
+
+class RecuperacionPorAudienciaTest(TestCase):
+
+    def setUp(self):
+        reiniciar_indice_comunicados()
+
+        self.area_todos = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.TODOS_HERMANOS)
+        self.area_costaleros = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.COSTALEROS)
+        self.area_juventud = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.JUVENTUD)
+
+        self.hermano = HermanoFactory()
+        self.hermano.areas_interes.set([self.area_costaleros])
+
+        base = {'tipo_comunicacion': Comunicado.TipoComunicacion.GENERAL, 'autor': self.hermano, 'embedding': [1.0, 0.0]}
+
+        self.com_costaleros = Comunicado.objects.create(titulo="Igualá de costaleros", contenido="Ensayo el lunes.", **base)
+        self.com_costaleros.areas_interes.set([self.area_costaleros])
+
+        self.com_juventud = Comunicado.objects.create(titulo="Ensayo de la juventud", contenido="Ensayo el lunes.", **base)
+        self.com_juventud.areas_interes.set([self.area_juventud])
+
+        self.com_general = Comunicado.objects.create(titulo="Horario de ensayo general", contenido="Ensayo el lunes.", **base)
+        self.com_general.areas_interes.set([self.area_todos])
+
+        with patch('api.servicios.comunicado.comunicado_rag_service.obtener_cliente_gemini'):
+            self.servicio = ComunicadoRAGService()
+
+        self.servicio.client = MagicMock()
+        self.servicio.client.models.embed_content.return_value = MagicMock(embeddings=[MagicMock(values=[1.0, 0.0])])
+
+    def tearDown(self):
+        reiniciar_indice_comunicados()
+
+    def test_solo_recupera_comunicados_de_sus_areas_y_generales(self):
+        recuperados = self.servicio._recuperar_comunicados("ensayo", self.hermano)
+
+        self.assertEqual(set(recuperados), {self.com_costaleros, self.com_general})
+
+    def test_sin_usuario_no_se_filtra_por_audiencia(self):
+        recuperados = self.servicio._recuperar_comunicados("ensayo")
+
+        self.assertEqual(set(recuperados), {self.com_costaleros, self.com_juventud, self.com_general})
+
+    def test_vectores_solo_se_puntuan_para_su_audiencia(self):
+        mascara = AreaInteres.mascara_de([AreaInteres.NombreArea.COSTALEROS, AreaInteres.NombreArea.TODOS_HERMANOS])
+
+        puntuaciones = self.servicio._puntuar_por_vector([1.0, 0.0], mascara=mascara)
+
+        self.assertEqual(set(puntuaciones), {self.com_costaleros.id, self.com_general.id})
+
+    def test_hermano_sin_comunicados_visibles_no_llama_al_modelo(self):
+        self.com_general.areas_interes.set([self.area_juventud])
+        reiniciar_indice_comunicados()
+
+        respuesta = self.servicio.preguntar_a_comunicados("ensayo", HermanoFactory())
+
+        self.assertIn("no hay comunicados", respuesta)
+        self.servicio.client.models.embed_content.assert_not_called()
+
+    @patch('api.servicios.comunicado.creacion_comunicado_service.generar_y_guardar_embedding_async')
+    def test_cambio_de_areas_actualiza_la_particion(self, mock_embedding):
+        admin = HermanoFactory(esAdmin=True)
+        obtener_indice_comunicados()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ComunicadoService().update_comunicado(admin, self.com_juventud, {'areas_interes': [self.area_costaleros]})
+
+        recuperados = self.servicio._recuperar_comunicados("ensayo", self.hermano)
+
+        self.assertIn(self.com_juventud, recuperados)
+        mock_embedding.assert_not_called()
@@ -0,0 +1,173 @@
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api.models import Comunicado
+from api.servicios.comunicado.comunicado_rag_service import ComunicadoRAGService, calcular_similitud_coseno
+from api.servicios.comunicado.indice_vectorial_service import (
+    IndiceVectorialCuantizado, cuantizar_int8, indexar_vector_comunicado, obtener_indice_vectorial,
+    reiniciar_indice_vectorial, truncar_y_normalizar
+)
+from api.tests.factories import HermanoFactory
+
+from unittest.mock import patch
+
+
+class CuantizacionTest(TestCase):
+
+    def test_truncar_y_normalizar_recorta_y_deja_norma_unidad(self):
+        vector = truncar_y_normalizar([3.0, 4.0, 12.0], dimension=2)
+
+        self.assertEqual(vector, [0.6, 0.8])
+
+    def test_vector_nulo_no_divide_por_cero(self):
+        self.assertEqual(truncar_y_normalizar([0.0, 0.0]), [0.0, 0.0])
+        self.assertEqual(cuantizar_int8([0.0, 0.0])[1], 0.0)
+
+    def test_int8_reconstruye_el_vector_con_error_acotado(self):
+        vector = truncar_y_normalizar([0.3, -0.7, 0.1, 0.5])
+
+        enteros, escala = cuantizar_int8(vector)
+
+        self.assertEqual(max(abs(v) for v in enteros), 127)
+        for original, entero in zip(vector, enteros):
+            self.assertAlmostEqual(original, entero * escala, delta=escala / 2)
+
+    def test_modo_no_valido_lanza_error(self):
+        with self.assertRaises(ValueError):
+            IndiceVectorialCuantizado('ninguna')
+
+
+class IndiceVectorialCuantizadoTest(TestCase):
+
+    VECTORES = {
+        1: [0.9, 0.1, 0.0, 0.2],
+        2: [0.1, 0.9, 0.3, 0.0],
+        3: [0.0, 0.2, 0.9, 0.4],
+    }
+
+    def _indice(self, modo, dimension=None):
+        indice = IndiceVectorialCuantizado(modo, dimension)
+        for doc_id, vector in self.VECTORES.items():
+            indice.indexar(doc_id, vector)
+        return indice
+
+    def test_puntuacion_aproxima_el_coseno_exacto(self):
+        pregunta = [0.8, 0.3, 0.1, 0.1]
+
+        for modo in ('float16', 'int8'):
+            puntuaciones = self._indice(modo).puntuar(pregunta)
+
+            for doc_id, vector in self.VECTORES.items():
+                self.assertAlmostEqual(puntuaciones[doc_id], calcular_similitud_coseno(pregunta, vector), delta=0.02)
+
+    def test_mejores_respeta_el_orden_y_los_candidatos(self):
+        indice = self._indice('int8')
+
+        self.assertEqual(indice.mejores([0.0, 1.0, 0.1, 0.0], 2), [2, 3])
+        self.assertEqual(indice.mejores([0.0, 1.0, 0.1, 0.0], 2, candidatos={1, 3}), [3, 1])
+
+    def test_memoria_int8_es_cuatro_veces_menor_que_float32(self):
+        dimension = 768
+        indice = IndiceVectorialCuantizado('int8')
+        indice.indexar(1, [0.5] * dimension)
+
+        self.assertLessEqual(indice.memoria_bytes() * 3.9, 4 * dimension)
+
+    def test_truncado_matryoshka_reduce_la_dimension(self):
+        completo = self._indice('float16')
+        truncado = self._indice('float16', dimension=2)
+
+        self.assertEqual(truncado.memoria_bytes() * 2, completo.memoria_bytes())
+
+    def test_eliminar_documento(self):
+        indice = self._indice('int8')
+        indice.eliminar(2)
+        indice.eliminar(99)
+
+        self.assertEqual(len(indice), 2)
+        self.assertNotIn(2, indice.puntuar([0.0, 1.0, 0.0, 0.0]))
+
+
+@override_settings(RAG_CUANTIZACION='int8', RAG_DIMENSION_TRUNCADA=None, RAG_CANDIDATOS_REPUNTUACION=2)
+class RecuperacionCuantizadaTest(TestCase):
+
+    def setUp(self):
+        reiniciar_indice_vectorial()
+        autor = HermanoFactory()
+
+        self.comunicados = {
+            doc_id: Comunicado.objects.create(
+                titulo=f"Comunicado {doc_id}",
+                contenido="Texto",
+                tipo_comunicacion=Comunicado.TipoComunicacion.GENERAL,
+                autor=autor,
+                embedding=vector,
+            )
+            for doc_id, vector in IndiceVectorialCuantizadoTest.VECTORES.items()
+        }
+
+        patcher = patch('api.servicios.comunicado.comunicado_rag_service.obtener_cliente_gemini')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        reiniciar_indice_vectorial()
+
+    def test_solo_se_repuntuan_los_mejores_candidatos_a_precision_completa(self):
+        pregunta = [0.0, 1.0, 0.1, 0.0]
+
+        puntuaciones = ComunicadoRAGService()._puntuar_por_vector(pregunta)
+
+        esperados = {self.comunicados[2].id, self.comunicados[3].id}
+        self.assertEqual(set(puntuaciones), esperados)
+        for com_id in esperados:
+            embedding = Comunicado.objects.get(pk=com_id).embedding
+            self.assertEqual(puntuaciones[com_id], calcular_similitud_coseno(pregunta, embedding))
+
+    def test_indice_se_reconstruye_si_cambia_la_configuracion(self):
+        indice = obtener_indice_vectorial()
+
+        self.assertIs(obtener_indice_vectorial(), indice)
+
+        with override_settings(RAG_CUANTIZACION='float16'):
+            self.assertEqual(obtener_indice_vectorial().modo, 'float16')
+
+    def test_nuevo_embedding_se_indexa_incrementalmente(self):
+        indice = obtener_indice_vectorial()
+        comunicado = self.comunicados[1]
+
+        Comunicado.objects.filter(pk=comunicado.pk).update(embedding=[0.0, 0.0, 0.0, 1.0])
+        indexar_vector_comunicado(comunicado.pk, [0.0, 0.0, 0.0, 1.0])
+
+        self.assertIs(obtener_indice_vectorial(), indice)
+        self.assertEqual(indice.mejores([0.0, 0.0, 0.0, 1.0], 1), [comunicado.pk])
+
+    def test_indice_se_reconstruye_si_otro_proceso_regenera_un_embedding(self):
+        obtener_indice_vectorial()
+        comunicado = self.comunicados[1]
+
+        comunicado.embedding = [0.0, 0.0, 0.0, 1.0]
+        comunicado.embedding_modificado = timezone.now()
+        comunicado.save(update_fields=['embedding', 'embedding_modificado'])
+
+        self.assertEqual(obtener_indice_vectorial().mejores([0.0, 0.0, 0.0, 1.0], 1), [comunicado.pk])
+
+    def test_escrituras_que_no_tocan_el_embedding_no_reconstruyen_el_indice(self):
+        indice = obtener_indice_vectorial()
+        comunicado = self.comunicados[1]
+
+        comunicado.titulo = "Comunicado corregido"
+        comunicado.save()
+        Comunicado.objects.filter(pk=comunicado.pk).update(telegram_file_id='abc', updated_at=timezone.now())
+
+        self.assertIs(obtener_indice_vectorial(), indice)
+
+    def test_una_sola_consulta_comprueba_ambos_indices(self):
+        servicio = ComunicadoRAGService()
+        servicio._obtener_indices()
+
+        with self.assertNumQueries(1):
+            indice_lexico, indice_vectorial = servicio._obtener_indices()
+
+        self.assertIsNotNone(indice_lexico)
+        self.assertIsNotNone(indice_vectorial)
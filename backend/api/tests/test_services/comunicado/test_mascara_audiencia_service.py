@@ -0,0 +1,107 @@
+from django.test import TestCase
+from django.utils import timezone
+from datetime import timedelta
+
+from api.models import AreaInteres, Comunicado, Hermano
+from api.servicios.comunicado.feed_comunicado_service import obtener_feed_comunicados
+from api.servicios.comunicado.ultimo_comunicado_service import (
+    obtener_comunicados_relacionados_usuario, obtener_ultimos_comunicados_areas_usuario
+)
+from api.tests.factories import HermanoFactory
+
+
+class MascaraAudienciaTest(TestCase):
+
+    def setUp(self):
+        self.todos = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.TODOS_HERMANOS)
+        self.caridad = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.CARIDAD)
+        self.juventud = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.JUVENTUD)
+
+        self.autor = HermanoFactory()
+        self.ahora = timezone.now()
+
+    def _crear(self, titulo, areas, dias=0):
+        comunicado = Comunicado.objects.create(
+            titulo=titulo,
+            contenido="Contenido",
+            tipo_comunicacion=Comunicado.TipoComunicacion.GENERAL,
+            autor=self.autor,
+            fecha_emision=self.ahora - timedelta(days=dias),
+        )
+        comunicado.areas_interes.set(areas)
+        return comunicado
+
+    def _mascara_bd(self, comunicado):
+        return Comunicado.objects.values_list('mascara_audiencia', flat=True).get(pk=comunicado.pk)
+
+    def test_mascara_de_asigna_un_bit_por_area(self):
+        self.assertEqual(AreaInteres.mascara_de([]), 0)
+        self.assertEqual(AreaInteres.mascara_de([AreaInteres.NombreArea.TODOS_HERMANOS]), 1)
+        self.assertEqual(AreaInteres.mascara_de([AreaInteres.NombreArea.CARIDAD, AreaInteres.NombreArea.JUVENTUD]), 0b1010)
+
+    def test_asignar_areas_actualiza_la_mascara_en_bd_y_en_la_instancia(self):
+        comunicado = self._crear("Convivencia", [self.caridad, self.juventud])
+
+        self.assertEqual(comunicado.mascara_audiencia, 0b1010)
+        self.assertEqual(self._mascara_bd(comunicado), 0b1010)
+
+        comunicado.areas_interes.remove(self.juventud)
+        self.assertEqual(self._mascara_bd(comunicado), 0b0010)
+
+        comunicado.areas_interes.clear()
+        self.assertEqual(self._mascara_bd(comunicado), 0)
+
+    def test_cambios_desde_el_area_actualizan_los_comunicados(self):
+        primero = self._crear("Uno", [self.todos])
+        segundo = self._crear("Dos", [])
+
+        self.caridad.comunicados.add(primero, segundo)
+        self.assertEqual(self._mascara_bd(primero), 0b0011)
+        self.assertEqual(self._mascara_bd(segundo), 0b0010)
+
+        self.caridad.comunicados.clear()
+        self.assertEqual(self._mascara_bd(primero), 0b0001)
+        self.assertEqual(self._mascara_bd(segundo), 0)
+
+    def test_mascara_de_suscripcion_del_hermano(self):
+        hermano = HermanoFactory()
+
+        hermano.areas_interes.set([self.caridad])
+        self.assertEqual(hermano.mascara_suscripcion, 0b0010)
+
+        self.juventud.hermanos.add(hermano)
+        self.assertEqual(Hermano.objects.get(pk=hermano.pk).mascara_suscripcion, 0b1010)
+
+    def test_feed_filtra_por_bits_sin_join_ni_distinct(self):
+        general = self._crear("General", [self.todos], dias=2)
+        caridad = self._crear("Caridad", [self.caridad, self.todos], dias=1)
+        self._crear("Juventud", [self.juventud])
+
+        hermano = HermanoFactory()
+        hermano.areas_interes.set([self.caridad])
+
+        feed = obtener_feed_comunicados(hermano)
+        sql = str(feed.query).upper()
+
+        self.assertEqual(list(feed), [caridad, general])
+        self.assertNotIn('DISTINCT', sql)
+        self.assertNotIn('JOIN "API_COMUNICADO_AREAS_INTERES"', sql)
+
+    def test_ultimos_comunicados_sin_areas_usa_todos_los_hermanos(self):
+        general = self._crear("General", [self.todos])
+        self._crear("Caridad", [self.caridad])
+
+        hermano = HermanoFactory()
+
+        self.assertEqual(list(obtener_ultimos_comunicados_areas_usuario(hermano)), [general])
+
+    def test_ultimos_y_relacionados_solo_de_las_areas_del_hermano(self):
+        self._crear("General", [self.todos])
+        reciente = self._crear("Caridad reciente", [self.caridad])
+        antiguo = self._crear("Caridad antiguo", [self.caridad, self.juventud], dias=3)
+
+        hermano = HermanoFactory()
+        hermano.areas_interes.set([self.caridad])
+
+        self.assertEqual(list(obtener_ultimos_comunicados_areas_usuario(hermano)), [reciente, antiguo])
+        self.assertEqual(list(obtener_comunicados_relacionados_usuario(hermano, reciente.id)), [antiguo])
@@ -0,0 +1,95 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from api.models import AreaInteres, Comunicado, ComunicadoRelacionado
+from api.servicios.comunicado.relacionados_comunicado_service import actualizar_relacionados, reconstruir_relacionados
+from api.servicios.comunicado.ultimo_comunicado_service import obtener_comunicados_relacionados_usuario
+from api.tests.factories import HermanoFactory
+
+
+class RelacionadosComunicadoTest(TestCase):
+
+    def setUp(self):
+        self.todos = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.TODOS_HERMANOS)
+        self.caridad = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.CARIDAD)
+        self.juventud = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.JUVENTUD)
+
+        self.autor = HermanoFactory()
+
+        self.hermano = HermanoFactory()
+        self.hermano.areas_interes.set([self.caridad])
+
+    def _crear(self, titulo, embedding, areas=None):
+        comunicado = Comunicado.objects.create(
+            titulo=titulo, contenido="Contenido", tipo_comunicacion=Comunicado.TipoComunicacion.GENERAL,
+            autor=self.autor, embedding=embedding,
+        )
+        comunicado.areas_interes.set(areas or [self.caridad])
+        actualizar_relacionados(comunicado.id, embedding)
+        return comunicado
+
+    def _vecinos(self, comunicado):
+        return list(comunicado.vecinos.order_by('-similitud').values_list('relacionado__titulo', flat=True))
+
+    def test_los_vecinos_se_ordenan_por_similitud_en_ambos_sentidos(self):
+        base = self._crear("Base", [1.0, 0.0])
+        lejano = self._crear("Lejano", [0.0, 1.0])
+        cercano = self._crear("Cercano", [0.9, 0.1])
+
+        self.assertEqual(self._vecinos(base), ["Cercano", "Lejano"])
+        self.assertEqual(self._vecinos(lejano), ["Cercano", "Base"])
+        self.assertEqual(self._vecinos(cercano), ["Base", "Lejano"])
+
+    @patch('api.servicios.comunicado.relacionados_comunicado_service.VECINOS_POR_COMUNICADO', 1)
+    def test_un_vector_nuevo_sustituye_al_peor_vecino_de_las_listas_completas(self):
+        base = self._crear("Base", [1.0, 0.0])
+        self._crear("Lejano", [0.0, 1.0])
+        self.assertEqual(self._vecinos(base), ["Lejano"])
+
+        self._crear("Cercano", [0.9, 0.1])
+
+        self.assertEqual(self._vecinos(base), ["Cercano"])
+
+    def test_regenerar_el_embedding_reemplaza_sus_relaciones(self):
+        base = self._crear("Base", [1.0, 0.0])
+        otro = self._crear("Otro", [0.9, 0.1])
+
+        actualizar_relacionados(otro.id, [0.9, 0.1])
+
+        self.assertEqual(ComunicadoRelacionado.objects.count(), 2)
+        self.assertEqual(self._vecinos(base), ["Otro"])
+
+    def test_la_lectura_cruza_los_vecinos_con_la_audiencia_del_hermano(self):
+        base = self._crear("Base", [1.0, 0.0])
+        self._crear("Juventud muy parecido", [0.99, 0.01], [self.juventud])
+        parecido = self._crear("Caridad parecido", [0.8, 0.2])
+        distinto = self._crear("Caridad distinto", [0.1, 0.9])
+
+        with self.assertNumQueries(1):
+            relacionados = list(obtener_comunicados_relacionados_usuario(self.hermano, base.id))
+
+        self.assertEqual(relacionados, [parecido, distinto])
+
+    def test_sin_vecinos_visibles_devuelve_los_ultimos_de_sus_areas(self):
+        sin_vector = Comunicado.objects.create(
+            titulo="Sin vector", contenido="Contenido", tipo_comunicacion=Comunicado.TipoComunicacion.GENERAL,
+            autor=self.autor,
+        )
+        ultimo = self._crear("Último", [1.0, 0.0])
+
+        self.assertEqual(list(obtener_comunicados_relacionados_usuario(self.hermano, sin_vector.id)), [ultimo])
+
+    def test_reconstruir_recalcula_la_tabla_completa(self):
+        base = self._crear("Base", [1.0, 0.0])
+        self._crear("Cercano", [0.9, 0.1])
+        ComunicadoRelacionado.objects.all().delete()
+
+        self.assertEqual(reconstruir_relacionados(), 2)
+        self.assertEqual(self._vecinos(base), ["Cercano"])
+
+    def test_borrar_un_comunicado_lo_quita_de_las_listas(self):
+        base = self._crear("Base", [1.0, 0.0])
+        self._crear("Cercano", [0.9, 0.1]).delete()
+
+        self.assertEqual(self._vecinos(base), [])
@@ -0,0 +1,168 @@
+import shutil
+import tempfile
+from io import BytesIO
+from unittest.mock import patch
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from PIL import Image
+
+from api.models import Comunicado
+from api.serializadores.comunicado.comunicado_list_serializer import ComunicadoListSerializer
+from api.servicios.comunicado.creacion_comunicado_service import ComunicadoService
+from api.servicios.imagen.derivados_imagen_service import (
+    crear_derivados, generar_derivados_imagen, generar_derivados_imagen_async
+)
+from api.tests.factories import HermanoFactory
+
+
+def imagen_png(nombre, ancho, alto, color=(200, 30, 30)):
+    buffer = BytesIO()
+    Image.new('RGB', (ancho, alto), color).save(buffer, format='PNG')
+    return SimpleUploadedFile(nombre, buffer.getvalue(), content_type='image/png')
+
+
+class MediaTemporalTestCase(TestCase):
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        ajustes = override_settings(MEDIA_ROOT=self.media)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+
+        self.admin = HermanoFactory(esAdmin=True)
+
+
+class DerivadosImagenTest(MediaTemporalTestCase):
+
+    def _comunicado(self, imagen):
+        return Comunicado.objects.create(
+            titulo="Salida extraordinaria", contenido="Texto", tipo_comunicacion=Comunicado.TipoComunicacion.GENERAL,
+            autor=self.admin, imagen_portada=imagen,
+        )
+
+    def test_genera_webp_y_jpeg_en_cada_ancho_con_nombre_por_contenido(self):
+        comunicado = self._comunicado(imagen_png('portada.png', 2000, 1000))
+
+        derivados = crear_derivados(comunicado.imagen_portada)
+
+        self.assertEqual(derivados['anchos'], [400, 1000])
+        self.assertEqual(derivados['origen'], comunicado.imagen_portada.name)
+
+        nombre = derivados['webp']['400']
+        self.assertTrue(nombre.startswith('comunicados/portadas/derivados/'))
+        self.assertIn(derivados['huella'], nombre)
+
+        with default_storage.open(nombre) as fichero, Image.open(fichero) as miniatura:
+            self.assertEqual((miniatura.format, miniatura.size), ('WEBP', (400, 200)))
+
+        with default_storage.open(derivados['jpeg']['1000']) as fichero, Image.open(fichero) as media:
+            self.assertEqual((media.format, media.size), ('JPEG', (1000, 500)))
+
+    def test_no_amplia_imagenes_pequenas(self):
+        comunicado = self._comunicado(imagen_png('pequena.png', 300, 200))
+
+        self.assertEqual(crear_derivados(comunicado.imagen_portada)['anchos'], [300])
+
+    def test_la_misma_imagen_reutiliza_los_derivados(self):
+        primero = self._comunicado(imagen_png('a.png', 800, 600))
+        segundo = self._comunicado(imagen_png('b.png', 800, 600))
+
+        derivados_primero = crear_derivados(primero.imagen_portada)
+        derivados_segundo = crear_derivados(segundo.imagen_portada)
+
+        self.assertEqual(derivados_primero['webp'], derivados_segundo['webp'])
+
+    def test_serializador_expone_srcset_solo_para_la_portada_actual(self):
+        comunicado = self._comunicado(imagen_png('portada.png', 1600, 900))
+
+        self.assertIsNone(ComunicadoListSerializer(comunicado).data['imagen_srcset'])
+
+        generar_derivados_imagen(Comunicado, comunicado.pk)
+        comunicado.refresh_from_db()
+
+        srcset = ComunicadoListSerializer(comunicado).data['imagen_srcset']
+        self.assertRegex(srcset['webp'], r'^/media/comunicados/portadas/derivados/\w+_400\.webp 400w, \S+_1000\.webp 1000w$')
+        self.assertTrue(srcset['miniatura'].endswith('_400.jpg'))
+
+        comunicado.imagen_portada = imagen_png('otra.png', 500, 500, color=(0, 0, 0))
+        comunicado.save()
+        self.assertIsNone(ComunicadoListSerializer(comunicado).data['imagen_srcset'])
+
+    def test_imagen_no_valida_no_rompe_el_proceso(self):
+        comunicado = self._comunicado(SimpleUploadedFile('rota.jpg', b'\x00\x01\x02', content_type='image/jpeg'))
+
+        generar_derivados_imagen(Comunicado, comunicado.pk)
+
+        comunicado.refresh_from_db()
+        self.assertEqual(comunicado.imagen_derivados, {})
+
+
+class DerivadosEnServicioComunicadoTest(MediaTemporalTestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        patcher = patch('api.servicios.comunicado.creacion_comunicado_service.generar_y_guardar_embedding_async')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('api.servicios.imagen.derivados_imagen_service.generar_derivados_imagen_async')
+    def test_crear_con_portada_programa_los_derivados_tras_el_commit(self, mock_async):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            comunicado = ComunicadoService().create_comunicado(self.admin, {
+                'titulo': "Con foto", 'contenido': "Texto", 'tipo_comunicacion': Comunicado.TipoComunicacion.GENERAL,
+                'imagen_portada': imagen_png('foto.png', 1200, 800),
+            })
+
+        mock_async.assert_not_called()
+
+        for callback in callbacks:
+            callback()
+
+        mock_async.assert_called_once_with(Comunicado, comunicado.pk)
+
+    def test_borrar_el_comunicado_elimina_los_derivados(self):
+        comunicado = Comunicado.objects.create(
+            titulo="Con foto", contenido="Texto", tipo_comunicacion=Comunicado.TipoComunicacion.GENERAL,
+            autor=self.admin, imagen_portada=imagen_png('foto.png', 1200, 800),
+        )
+        generar_derivados_imagen(Comunicado, comunicado.pk)
+        comunicado.refresh_from_db()
+        nombres = list(comunicado.imagen_derivados['webp'].values()) + list(comunicado.imagen_derivados['jpeg'].values())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ComunicadoService().delete_comunicado(self.admin, comunicado)
+
+        self.assertFalse(any(default_storage.exists(nombre) for nombre in nombres))
+
+
+class HiloSincrono:
+    """Sustituye a threading.Thread ejecutando el objetivo en el propio hilo del test."""
+
+    def __init__(self, target, args=()):
+        self.target, self.args = target, args
+
+    def start(self):
+        self.target(*self.args)
+
+
+@patch('api.servicios.imagen.derivados_imagen_service.threading.Thread', HiloSincrono)
+@patch('api.servicios.imagen.derivados_imagen_service.connection')
+class DerivadosEnSegundoPlanoTest(SimpleTestCase):
+
+    @patch('api.servicios.imagen.derivados_imagen_service.generar_derivados_imagen')
+    def test_el_hilo_cierra_su_conexion_al_terminar(self, mock_generar, mock_connection):
+        generar_derivados_imagen_async(Comunicado, 7)
+
+        mock_generar.assert_called_once_with(Comunicado, 7)
+        mock_connection.close.assert_called_once_with()
+
+    @patch('api.servicios.imagen.derivados_imagen_service.generar_derivados_imagen', side_effect=RuntimeError)
+    def test_el_hilo_cierra_su_conexion_aunque_falle(self, mock_generar, mock_connection):
+        with self.assertRaises(RuntimeError):
+            generar_derivados_imagen_async(Comunicado, 7)
+
+        mock_connection.close.assert_called_once_with()
@@ -0,0 +1,150 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db import OperationalError
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import Acto, Cuota, PapeletaSitio, Puesto, SolicitudEnCola, TipoActo, TipoPuesto
+from api.servicios.papeleta_sitio.cola_solicitudes_service import (
+    MAX_INTENTOS, _ejecutar, liberar_atascadas, procesar_cola, reclamar_lote, tramitar,
+)
+from api.tests.factories import HermanoFactory
+
+
+@override_settings(SOLICITUDES_EN_COLA=True)
+class ColaSolicitudesServiceTest(APITestCase):
+
+    def setUp(self):
+        self.ahora = timezone.now()
+
+        tipo_acto = TipoActo.objects.create(tipo=TipoActo.OpcionesTipo.ESTACION_PENITENCIA, requiere_papeleta=True)
+        self.acto = Acto.objects.create(
+            nombre="Estación de Penitencia", lugar="Parroquia", tipo_acto=tipo_acto,
+            fecha=self.ahora + timedelta(days=30), modalidad=Acto.ModalidadReparto.TRADICIONAL,
+            inicio_solicitud=self.ahora - timedelta(days=3), fin_solicitud=self.ahora - timedelta(days=2),
+            inicio_solicitud_cirios=self.ahora - timedelta(days=1), fin_solicitud_cirios=self.ahora + timedelta(days=5),
+        )
+        self.cirio = Puesto.objects.create(
+            nombre="Cirio Cristo", acto=self.acto, tipo_puesto=TipoPuesto.objects.create(nombre_tipo="Cirio", es_insignia=False),
+        )
+
+        self.hermano = HermanoFactory(estado_hermano='ALTA', numero_registro=1)
+        self.cuota = Cuota.objects.create(
+            hermano=self.hermano, anio=self.ahora.year - 1, descripcion="Cuota", importe="30.00", estado=Cuota.EstadoCuota.PAGADA
+        )
+        self.client.force_authenticate(user=self.hermano)
+
+    def _solicitar(self, **cabeceras):
+        return self.client.post(reverse('solicitar-cirio'), {'acto': self.acto.pk, 'puesto': self.cirio.pk}, format='json', **cabeceras)
+
+    def test_el_endpoint_encola_y_devuelve_un_ticket(self):
+        respuesta = self._solicitar()
+
+        self.assertEqual(respuesta.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(respuesta.data['estado'], SolicitudEnCola.EstadoCola.PENDIENTE)
+        self.assertEqual(respuesta.data['posicion'], 1)
+        self.assertFalse(PapeletaSitio.objects.exists())
+
+        self.assertEqual(self._solicitar().data['ticket'], respuesta.data['ticket'])
+        self.assertEqual(SolicitudEnCola.objects.count(), 1)
+
+    def test_la_cabecera_idempotency_key_identifica_la_solicitud(self):
+        primera = self._solicitar(HTTP_IDEMPOTENCY_KEY="envio-1")
+        segunda = self._solicitar(HTTP_IDEMPOTENCY_KEY="envio-2")
+
+        self.assertNotEqual(primera.data['ticket'], segunda.data['ticket'])
+        self.assertEqual(self._solicitar(HTTP_IDEMPOTENCY_KEY="envio-1").data['ticket'], primera.data['ticket'])
+
+    def test_los_workers_tramitan_con_los_servicios_existentes(self):
+        ticket = self._solicitar().data['ticket']
+
+        self.assertEqual(procesar_cola(), 1)
+
+        respuesta = self.client.get(reverse('estado-solicitud-cola', args=[ticket]))
+        papeleta = PapeletaSitio.objects.get()
+        self.assertEqual(respuesta.data['estado'], SolicitudEnCola.EstadoCola.ACEPTADA)
+        self.assertEqual(respuesta.data['papeleta_id'], papeleta.pk)
+        self.assertIsNone(respuesta.data['posicion'])
+        self.assertEqual(papeleta.puesto, self.cirio)
+
+    def test_el_plazo_se_evalua_al_recibir_la_solicitud(self):
+        self._solicitar()
+        SolicitudEnCola.objects.update(recibida_en=self.ahora - timedelta(minutes=2))
+        Acto.objects.filter(pk=self.acto.pk).update(fin_solicitud_cirios=self.ahora - timedelta(minutes=1))
+
+        procesar_cola()
+
+        self.assertEqual(SolicitudEnCola.objects.get().estado, SolicitudEnCola.EstadoCola.ACEPTADA)
+
+    def test_rechazo_con_motivo_y_reenvio(self):
+        self.cuota.estado = Cuota.EstadoCuota.PENDIENTE
+        self.cuota.save()
+        ticket = self._solicitar().data['ticket']
+
+        procesar_cola()
+
+        solicitud = SolicitudEnCola.objects.get(ticket=ticket)
+        self.assertEqual(solicitud.estado, SolicitudEnCola.EstadoCola.RECHAZADA)
+        self.assertIn("cuota pendiente o devuelta", solicitud.mensaje)
+
+        self.cuota.estado = Cuota.EstadoCuota.PAGADA
+        self.cuota.save()
+
+        self.assertEqual(self._solicitar().data['estado'], SolicitudEnCola.EstadoCola.PENDIENTE)
+        procesar_cola()
+        self.assertEqual(SolicitudEnCola.objects.get(ticket=ticket).estado, SolicitudEnCola.EstadoCola.ACEPTADA)
+
+    def test_errores_transitorios_se_reintentan(self):
+        self._solicitar()
+
+        with patch('api.servicios.papeleta_sitio.cola_solicitudes_service._ejecutar', side_effect=OperationalError("bloqueo")):
+            for _ in range(MAX_INTENTOS):
+                solicitud = tramitar(reclamar_lote(1)[0])
+
+        self.assertEqual(solicitud.estado, SolicitudEnCola.EstadoCola.RECHAZADA)
+        self.assertEqual(solicitud.intentos, MAX_INTENTOS)
+        self.assertFalse(PapeletaSitio.objects.exists())
+
+    def test_reenvio_tras_anular_la_papeleta_vuelve_a_la_cola(self):
+        ticket = self._solicitar().data['ticket']
+        procesar_cola()
+
+        papeleta = PapeletaSitio.objects.get()
+        papeleta.estado_papeleta = PapeletaSitio.EstadoPapeleta.ANULADA
+        papeleta.save()
+
+        respuesta = self._solicitar()
+
+        self.assertEqual(respuesta.data['ticket'], ticket)
+        self.assertEqual(respuesta.data['estado'], SolicitudEnCola.EstadoCola.PENDIENTE)
+        procesar_cola()
+        self.assertEqual(SolicitudEnCola.objects.get().estado, SolicitudEnCola.EstadoCola.ACEPTADA)
+        self.assertEqual(PapeletaSitio.objects.filter(activa=True).count(), 1)
+
+    def test_reintento_tras_caida_enlaza_la_papeleta_ya_creada(self):
+        self._solicitar()
+        solicitud = reclamar_lote(1)[0]
+        papeleta = _ejecutar(solicitud)
+
+        # El worker cae tras confirmar la papeleta y antes de marcar la solicitud
+        SolicitudEnCola.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(liberar_atascadas(), 1)
+
+        procesar_cola()
+
+        solicitud = SolicitudEnCola.objects.get()
+        self.assertEqual(solicitud.estado, SolicitudEnCola.EstadoCola.ACEPTADA)
+        self.assertEqual(solicitud.papeleta, papeleta)
+        self.assertEqual(PapeletaSitio.objects.count(), 1)
+
+    def test_cada_hermano_solo_ve_sus_tickets(self):
+        ticket = self._solicitar().data['ticket']
+        self.client.force_authenticate(user=HermanoFactory())
+
+        respuesta = self.client.get(reverse('estado-solicitud-cola', args=[ticket]))
+
+        self.assertEqual(respuesta.status_code, status.HTTP_404_NOT_FOUND)
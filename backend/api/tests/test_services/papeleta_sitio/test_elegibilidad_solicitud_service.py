@@ -0,0 +1,104 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from api.models import Acto, Cuota, CuerpoPertenencia, ElegibilidadSolicitud, HermanoCuerpo, Puesto, TipoActo, TipoPuesto
+from api.servicios.papeleta_sitio.elegibilidad_solicitud_service import obtener_elegibilidad, preparar_elegibilidad_acto
+from api.servicios.solicitud_cirio_tradicional import SolicitudCirioTradicionalService
+from api.tests.factories import HermanoFactory
+
+
+class ElegibilidadSolicitudServiceTest(TestCase):
+
+    def setUp(self):
+        self.ahora = timezone.now()
+        self.anio_limite = self.ahora.year - 1
+
+        tipo_acto = TipoActo.objects.create(tipo=TipoActo.OpcionesTipo.ESTACION_PENITENCIA, requiere_papeleta=True)
+        self.acto = Acto.objects.create(
+            nombre="Estación de Penitencia", lugar="Parroquia", tipo_acto=tipo_acto,
+            fecha=self.ahora + timedelta(days=30), modalidad=Acto.ModalidadReparto.TRADICIONAL,
+            inicio_solicitud=self.ahora - timedelta(days=3), fin_solicitud=self.ahora - timedelta(days=2),
+            inicio_solicitud_cirios=self.ahora - timedelta(days=1), fin_solicitud_cirios=self.ahora + timedelta(days=5),
+        )
+        self.cirio = Puesto.objects.create(
+            nombre="Cirio Cristo", acto=self.acto, tipo_puesto=TipoPuesto.objects.create(nombre_tipo="Cirio", es_insignia=False),
+        )
+
+        self.nazarenos = CuerpoPertenencia.objects.create(nombre_cuerpo=CuerpoPertenencia.NombreCuerpo.NAZARENOS)
+        self.juventud = CuerpoPertenencia.objects.create(nombre_cuerpo=CuerpoPertenencia.NombreCuerpo.JUVENTUD)
+
+        self.al_corriente = HermanoFactory(estado_hermano='ALTA', numero_registro=1)
+        self._cuota(self.al_corriente, self.anio_limite, Cuota.EstadoCuota.PAGADA)
+        HermanoCuerpo.objects.create(hermano=self.al_corriente, cuerpo=self.nazarenos, anio_ingreso=2010)
+
+        self.con_deuda = HermanoFactory(estado_hermano='ALTA', numero_registro=2)
+        self._cuota(self.con_deuda, self.anio_limite - 1, Cuota.EstadoCuota.DEVUELTA)
+        self._cuota(self.con_deuda, self.anio_limite, Cuota.EstadoCuota.PENDIENTE)
+
+        self.sin_cuotas = HermanoFactory(estado_hermano='ALTA', numero_registro=3)
+
+    def _cuota(self, hermano, anio, estado):
+        return Cuota.objects.create(hermano=hermano, anio=anio, descripcion=f"Cuota {anio}", importe="30.00", estado=estado)
+
+    def _foto(self, hermano):
+        return ElegibilidadSolicitud.objects.get(acto=self.acto, hermano=hermano)
+
+    def test_preparar_construye_la_foto_de_todos_los_hermanos(self):
+        with self.assertNumQueries(6):
+            total = preparar_elegibilidad_acto(self.acto)
+
+        self.assertEqual(total, 3)
+        self.assertEqual(self._foto(self.al_corriente).cuerpos, ['NAZARENOS'])
+        self.assertTrue(self._foto(self.al_corriente).tiene_historial_cuotas)
+        self.assertIsNone(self._foto(self.al_corriente).anio_primera_deuda)
+        self.assertEqual(self._foto(self.con_deuda).anio_primera_deuda, self.anio_limite - 1)
+        self.assertFalse(self._foto(self.sin_cuotas).tiene_historial_cuotas)
+
+    def test_con_foto_la_elegibilidad_es_una_sola_consulta(self):
+        preparar_elegibilidad_acto(self.acto)
+
+        with self.assertNumQueries(1):
+            elegibilidad = obtener_elegibilidad(self.con_deuda, self.acto, self.ahora)
+
+        self.assertEqual(elegibilidad.anio_primera_deuda, self.anio_limite - 1)
+
+    def test_sin_foto_se_calcula_lo_mismo_al_vuelo(self):
+        sin_foto = {h.pk: obtener_elegibilidad(h, self.acto, self.ahora) for h in (self.al_corriente, self.con_deuda, self.sin_cuotas)}
+        self.assertFalse(ElegibilidadSolicitud.objects.exists())
+
+        preparar_elegibilidad_acto(self.acto)
+
+        for hermano_id, elegibilidad in sin_foto.items():
+            foto = ElegibilidadSolicitud.objects.get(acto=self.acto, hermano_id=hermano_id)
+            self.assertEqual(
+                (elegibilidad.anio_primera_deuda, elegibilidad.tiene_historial_cuotas, elegibilidad.cuerpos),
+                (foto.anio_primera_deuda, foto.tiene_historial_cuotas, foto.cuerpos),
+            )
+
+    def test_cambios_de_cuotas_y_cuerpos_refrescan_la_foto(self):
+        preparar_elegibilidad_acto(self.acto)
+
+        Cuota.objects.filter(hermano=self.con_deuda, anio=self.anio_limite - 1).get().delete()
+        self._cuota(self.sin_cuotas, self.anio_limite, Cuota.EstadoCuota.PAGADA)
+        self.al_corriente.cuerpos.add(self.juventud, through_defaults={'anio_ingreso': 2020})
+
+        self.assertEqual(self._foto(self.con_deuda).anio_primera_deuda, self.anio_limite)
+        self.assertTrue(self._foto(self.sin_cuotas).tiene_historial_cuotas)
+        self.assertEqual(self._foto(self.al_corriente).cuerpos, ['JUVENTUD', 'NAZARENOS'])
+
+    def test_la_solicitud_valida_contra_la_foto(self):
+        preparar_elegibilidad_acto(self.acto)
+        ElegibilidadSolicitud.objects.filter(acto=self.acto, hermano=self.al_corriente).update(anio_primera_deuda=2001)
+
+        with self.assertRaisesMessage(ValidationError, "Consta una cuota pendiente o devuelta del año 2001"):
+            SolicitudCirioTradicionalService().procesar_solicitud_cirio_tradicional(self.al_corriente, self.acto, self.cirio)
+
+        call_command('preparar_elegibilidad_actos', stdout=StringIO())
+
+        papeleta = SolicitudCirioTradicionalService().procesar_solicitud_cirio_tradicional(self.al_corriente, self.acto, self.cirio)
+        self.assertEqual(papeleta.puesto, self.cirio)
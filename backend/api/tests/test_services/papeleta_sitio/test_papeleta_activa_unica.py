@@ -0,0 +1,165 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+from django.forms import modelform_factory
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.models import Acto, Cuota, PapeletaSitio, PreferenciaSolicitud, Puesto, TipoActo, TipoPuesto
+from api.servicios.solicitud_cirio_tradicional import SolicitudCirioTradicionalService
+from api.servicios.solicitud_insignia.solicitud_insignia_service import SolicitudInsigniaService
+from api.tests.factories import HermanoFactory
+
+
+class PapeletaActivaUnicaTest(TestCase):
+
+    def setUp(self):
+        self.ahora = timezone.now()
+        tipo_acto = TipoActo.objects.create(tipo=TipoActo.OpcionesTipo.ESTACION_PENITENCIA, requiere_papeleta=True)
+        self.acto = Acto.objects.create(
+            nombre="Estación de Penitencia", lugar="Parroquia", tipo_acto=tipo_acto,
+            fecha=self.ahora + timedelta(days=30), modalidad=Acto.ModalidadReparto.TRADICIONAL,
+            inicio_solicitud=self.ahora - timedelta(days=3), fin_solicitud=self.ahora - timedelta(days=2),
+            inicio_solicitud_cirios=self.ahora - timedelta(days=1), fin_solicitud_cirios=self.ahora + timedelta(days=5),
+        )
+        self.hermano = HermanoFactory(estado_hermano='ALTA', numero_registro=1)
+
+    def _papeleta(self, estado=PapeletaSitio.EstadoPapeleta.SOLICITADA):
+        return PapeletaSitio(hermano=self.hermano, acto=self.acto, anio=self.acto.fecha.year, estado_papeleta=estado)
+
+    def test_el_alta_no_consulta_papeletas_existentes(self):
+        papeleta = self._papeleta()
+
+        # Comprobación de hermano y acto (full_clean), SAVEPOINT, INSERT y RELEASE
+        with CaptureQueriesContext(connection) as consultas:
+            papeleta.save()
+
+        self.assertEqual(len(consultas), 5)
+        consultas_papeletas = [q['sql'] for q in consultas if q['sql'].startswith('SELECT') and 'api_papeletasitio' in q['sql']]
+        self.assertEqual(consultas_papeletas, [])
+
+        self.assertTrue(PapeletaSitio.objects.get(pk=papeleta.pk).activa)
+
+    def test_los_guardados_que_no_activan_no_abren_punto_de_guardado(self):
+        self._papeleta().save()
+        papeleta = PapeletaSitio.objects.get(hermano=self.hermano, acto=self.acto)
+
+        # Comprobación de hermano y acto (full_clean) y UPDATE, como cada guardado del reparto
+        papeleta.estado_papeleta = PapeletaSitio.EstadoPapeleta.EMITIDA
+        with self.assertNumQueries(3):
+            papeleta.save()
+
+        papeleta.estado_papeleta = PapeletaSitio.EstadoPapeleta.NO_ASIGNADA
+        with self.assertNumQueries(3):
+            papeleta.save()
+
+    def test_reactivar_una_papeleta_abre_punto_de_guardado(self):
+        anulada = self._papeleta(PapeletaSitio.EstadoPapeleta.ANULADA)
+        anulada.save()
+        self._papeleta().save()
+
+        anulada = PapeletaSitio.objects.get(pk=anulada.pk)
+        anulada.estado_papeleta = PapeletaSitio.EstadoPapeleta.SOLICITADA
+        # Hermano y acto, SAVEPOINT, UPDATE fallido, ROLLBACK TO y RELEASE
+        with self.assertNumQueries(6):
+            with self.assertRaises(ValidationError) as cm:
+                anulada.save()
+
+        self.assertEqual(cm.exception.message_dict['hermano'], [PapeletaSitio.MENSAJE_PAPELETA_ACTIVA_DUPLICADA])
+        # El error no deja rota la transacción del llamador
+        self.assertEqual(PapeletaSitio.objects.filter(activa=True).count(), 1)
+
+    def test_segunda_papeleta_activa_se_rechaza(self):
+        self._papeleta().save()
+
+        with self.assertRaises(ValidationError) as cm:
+            self._papeleta().save()
+
+        self.assertIn('ya tiene una papeleta activa', str(cm.exception.message_dict['hermano']))
+        # El error no deja rota la transacción del llamador
+        self.assertEqual(PapeletaSitio.objects.count(), 1)
+
+    def test_el_formulario_rechaza_la_papeleta_activa_duplicada(self):
+        self._papeleta().save()
+        # Mismo formulario que genera el admin: todos los campos editables
+        Formulario = modelform_factory(PapeletaSitio, fields='__all__')
+        datos = {
+            'hermano': self.hermano.pk, 'acto': self.acto.pk, 'anio': self.acto.fecha.year,
+            'estado_papeleta': PapeletaSitio.EstadoPapeleta.SOLICITADA,
+        }
+
+        formulario = Formulario(data=datos)
+        self.assertFalse(formulario.is_valid())
+        self.assertIn('ya tiene una papeleta activa', str(formulario.errors['hermano']))
+
+        formulario = Formulario(data={**datos, 'estado_papeleta': PapeletaSitio.EstadoPapeleta.ANULADA})
+        self.assertTrue(formulario.is_valid(), formulario.errors)
+
+    def test_las_anuladas_no_bloquean_ni_colisionan_entre_si(self):
+        self._papeleta(PapeletaSitio.EstadoPapeleta.ANULADA).save()
+        self._papeleta(PapeletaSitio.EstadoPapeleta.ANULADA).save()
+        self._papeleta(PapeletaSitio.EstadoPapeleta.NO_ASIGNADA).save()
+        self._papeleta().save()
+
+        self.assertEqual(PapeletaSitio.objects.filter(activa=True).count(), 1)
+        self.assertEqual(PapeletaSitio.objects.filter(activa__isnull=True).count(), 3)
+
+    def test_la_bd_impide_reactivar_por_update(self):
+        anulada = self._papeleta(PapeletaSitio.EstadoPapeleta.ANULADA)
+        anulada.save()
+        self._papeleta().save()
+
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                PapeletaSitio.objects.filter(pk=anulada.pk).update(estado_papeleta=PapeletaSitio.EstadoPapeleta.SOLICITADA)
+
+    def _cuota_pagada(self):
+        Cuota.objects.create(
+            hermano=self.hermano, anio=self.ahora.year - 1, descripcion="Cuota", importe="30.00", estado=Cuota.EstadoCuota.PAGADA
+        )
+
+    def test_servicio_en_carrera_recibe_el_error_del_modelo(self):
+        self._cuota_pagada()
+        cirio = Puesto.objects.create(
+            nombre="Cirio Cristo", acto=self.acto, tipo_puesto=TipoPuesto.objects.create(nombre_tipo="Cirio", es_insignia=False),
+        )
+        concurrente = self._papeleta()
+
+        def confirmar_la_otra_solicitud(*args):
+            # La otra solicitud se confirma justo después de la comprobación de unicidad del servicio
+            concurrente.save()
+
+        with patch.object(SolicitudCirioTradicionalService, '_gestionar_conflicto_insignia_y_unicidad', side_effect=confirmar_la_otra_solicitud):
+            with self.assertRaises(ValidationError) as cm:
+                SolicitudCirioTradicionalService().procesar_solicitud_cirio_tradicional(self.hermano, self.acto, cirio)
+
+        self.assertEqual(cm.exception.message_dict['hermano'], [PapeletaSitio.MENSAJE_PAPELETA_ACTIVA_DUPLICADA])
+        # La simulación confirma dentro de la transacción del servicio, que se deshace entera;
+        # la consulta funciona porque el error no ha dejado la conexión inutilizable
+        self.assertFalse(PapeletaSitio.objects.exists())
+
+    def test_solicitud_de_insignia_en_carrera_recibe_el_error_del_modelo(self):
+        self._cuota_pagada()
+        insignia = Puesto.objects.create(
+            nombre="Cruz de guía", acto=self.acto, tipo_puesto=TipoPuesto.objects.create(nombre_tipo="Cruz", es_insignia=True),
+        )
+        concurrente = self._papeleta()
+        concurrente.es_solicitud_insignia = True
+
+        def confirmar_la_otra_solicitud(*args):
+            # Doble envío: la otra solicitud se confirma justo después de la comprobación de unicidad
+            concurrente.save()
+
+        with patch.object(SolicitudInsigniaService, '_validar_unicidad', side_effect=confirmar_la_otra_solicitud):
+            with self.assertRaises(ValidationError) as cm:
+                SolicitudInsigniaService().procesar_solicitud_insignia_tradicional(
+                    self.hermano, self.acto, [{'puesto_solicitado': insignia.pk, 'orden_prioridad': 1}],
+                    ahora=self.acto.inicio_solicitud + timedelta(hours=1),
+                )
+
+        self.assertEqual(cm.exception.message_dict['hermano'], [PapeletaSitio.MENSAJE_PAPELETA_ACTIVA_DUPLICADA])
+        self.assertFalse(PapeletaSitio.objects.exists())
+        self.assertFalse(PreferenciaSolicitud.objects.exists())
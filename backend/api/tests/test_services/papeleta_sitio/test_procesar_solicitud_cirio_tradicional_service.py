@@ -1831,18 +1831,20 @@ class ProcesarSolicitudCirioConVinculacionServiceTest(TestCase):
 
 
 
-    @patch("api.servicios.solicitud_cirio_tradicional.PapeletaSitio.objects.create")
-    def test_procesar_solicitud_cirio_tradicional_error_integridad_concurrente(self, mock_create):
+    @patch.object(SolicitudCirioTradicionalService, "_gestionar_conflicto_insignia_y_unicidad", return_value=None)
+    def test_procesar_solicitud_cirio_tradicional_error_integridad_concurrente(self, mock_unicidad):
         """
         Test: Manejo de error de integridad (ej. doble clic simultáneo).
 
-        Given: Un intento de creación que lanza un IntegrityError desde la base de datos.
+        Given: Otra solicitud del hermano se confirma después de la comprobación previa de unicidad.
         When: Se llama al servicio procesar_solicitud_cirio_tradicional.
-        Then: El servicio captura el error y lanza una ValidationError amigable con el mensaje de salvaguarda.
+        Then: El índice único de la BD rechaza la papeleta y el modelo lanza una ValidationError amigable.
         """
         PapeletaSitio.objects.filter(hermano=self.hermano_antiguo, acto=self.acto).delete()
-
-        mock_create.side_effect = IntegrityError("UNIQUE constraint failed")
+        PapeletaSitio.objects.create(
+            hermano=self.hermano_antiguo, acto=self.acto, anio=self.acto.fecha.year,
+            estado_papeleta=PapeletaSitio.EstadoPapeleta.SOLICITADA
+        )
 
         with patch("django.utils.timezone.now", return_value=self.ahora):
             with self.assertRaises(ValidationError) as cm:
@@ -1852,8 +1854,8 @@ class ProcesarSolicitudCirioConVinculacionServiceTest(TestCase):
                     puesto=self.mi_puesto_cirio_cristo
                 )
 
-        mensaje_esperado = "Ya existe una papeleta activa para este acto. Si has pulsado dos veces, espera unos segundos y recarga."
-        self.assertIn(mensaje_esperado, str(cm.exception))
+        self.assertIn(PapeletaSitio.MENSAJE_PAPELETA_ACTIVA_DUPLICADA, str(cm.exception))
+        self.assertEqual(PapeletaSitio.objects.filter(hermano=self.hermano_antiguo, acto=self.acto).count(), 1)
 
 
 
@@ -2047,19 +2049,22 @@ class ProcesarSolicitudCirioConVinculacionServiceTest(TestCase):
 
 
 
-    @patch("api.servicios.solicitud_cirio_tradicional.PapeletaSitio.objects.create")
-    def test_procesar_solicitud_cirio_tradicional_error_unicidad_simultanea(self, mock_create):
+    @patch.object(SolicitudCirioTradicionalService, "_gestionar_conflicto_insignia_y_unicidad", return_value=None)
+    def test_procesar_solicitud_cirio_tradicional_error_unicidad_simultanea(self, mock_unicidad):
         """
         Test: Manejo de IntegrityError por doble creación simultánea (Race Condition).
 
         Given: Un escenario donde la validación lógica pasa, pero la base de datos 
             lanza un IntegrityError al intentar insertar (por UniqueConstraint).
         When: Se llama al servicio procesar_solicitud_cirio_tradicional.
-        Then: Se captura el IntegrityError y se lanza una ValidationError amigable.
+        Then: El modelo convierte el IntegrityError en una ValidationError amigable
+            y la transacción sigue siendo usable.
         """
         PapeletaSitio.objects.filter(hermano=self.hermano_antiguo, acto=self.acto).delete()
-
-        mock_create.side_effect = IntegrityError("UNIQUE constraint failed: api_papeletasitio.hermano_id...")
+        PapeletaSitio.objects.create(
+            hermano=self.hermano_antiguo, acto=self.acto, anio=self.acto.fecha.year,
+            estado_papeleta=PapeletaSitio.EstadoPapeleta.EMITIDA
+        )
 
         with patch("django.utils.timezone.now", return_value=self.ahora):
             with self.assertRaises(ValidationError) as cm:
@@ -2069,8 +2074,8 @@ class ProcesarSolicitudCirioConVinculacionServiceTest(TestCase):
                     puesto=self.mi_puesto_cirio_cristo
                 )
 
-        mensaje_esperado = "Ya existe una papeleta activa para este acto. Si has pulsado dos veces, espera unos segundos y recarga."
-        self.assertIn(mensaje_esperado, str(cm.exception))
+        self.assertEqual(cm.exception.message_dict['hermano'], [PapeletaSitio.MENSAJE_PAPELETA_ACTIVA_DUPLICADA])
+        self.assertTrue(PapeletaSitio.objects.filter(hermano=self.hermano_antiguo, acto=self.acto).exists())
 
 
 
@@ -3029,9 +3034,21 @@ class ProcesarSolicitudCirioConVinculacionServiceTest(TestCase):
         self.hermano_antiguo.numero_registro = 100
         self.hermano_antiguo.save()
 
+        papeleta_concurrente = PapeletaSitio(
+            hermano=self.hermano_antiguo, acto=self.acto, anio=self.acto.fecha.year,
+            estado_papeleta=PapeletaSitio.EstadoPapeleta.SOLICITADA
+        )
+
+        def confirmar_la_otra_solicitud(*args, **kwargs):
+            # La otra solicitud se confirma justo después de la comprobación de unicidad
+            papeleta_concurrente.save()
+            return None
+
         with patch("django.utils.timezone.now", return_value=self.ahora):
-            with patch.object(PapeletaSitio, 'save', side_effect=IntegrityError("Duplicate entry")):
-                
+            with patch.object(
+                SolicitudCirioTradicionalService, "_gestionar_conflicto_insignia_y_unicidad",
+                side_effect=confirmar_la_otra_solicitud
+            ):
                 with self.assertRaises(ValidationError) as cm:
                     self.service.procesar_solicitud_cirio_tradicional(
                         hermano=self.hermano_antiguo,
@@ -3039,11 +3056,9 @@ class ProcesarSolicitudCirioConVinculacionServiceTest(TestCase):
                         puesto=self.mi_puesto_cirio_cristo
                     )
 
-        mensaje_esperado = (
-            "Ya existe una papeleta activa para este acto. "
-            "Si has pulsado dos veces, espera unos segundos y recarga."
-        )
-        self.assertIn(mensaje_esperado, str(cm.exception))
+        self.assertIn(PapeletaSitio.MENSAJE_PAPELETA_ACTIVA_DUPLICADA, str(cm.exception))
+        # La transacción del servicio se deshace entera (también la papeleta simulada)
+        self.assertFalse(PapeletaSitio.objects.filter(acto=self.acto).exists())
 
 
 
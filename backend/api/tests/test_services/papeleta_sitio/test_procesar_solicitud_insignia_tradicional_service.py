@@ -3058,53 +3058,6 @@ class ProcesarSolicitudInsigniaTradicionalServiceTest(TestCase):
 
 
 
-    def test_tradicional_solicitud_insignia_integrity_error_doble_click_falla(self):
-        """
-        Test: Condición de carrera / doble click
-
-        Given:
-            - Durante la creación de la papeleta se produce un IntegrityError
-            (simulando doble envío o condición de carrera).
-        When:
-            - Se procesa la solicitud de insignia tradicional.
-        Then:
-            - ValidationError con mensaje:
-            “Ya existe una solicitud activa tramitada para este hermano.
-            Por favor, no haga doble clic en el botón de enviar.”
-            - No se persiste ninguna papeleta ni preferencias.
-        """
-        now = timezone.now()
-
-        preferencias = [
-            {"puesto_solicitado": self.puesto_ok_1.id, "orden_prioridad": 1},
-        ]
-
-        with patch("django.utils.timezone.now", return_value=now):
-            with patch.object(
-                SolicitudInsigniaService,
-                "_crear_papeleta_base",
-                side_effect=IntegrityError("simulated race condition")
-            ):
-                with self.assertRaises(ValidationError) as ctx:
-                    self.service.procesar_solicitud_insignia_tradicional(
-                        hermano=self.hermano_ok,
-                        acto=self.acto_tradicional,
-                        preferencias_data=preferencias,
-                    )
-
-        self.assertEqual(
-            ctx.exception.messages,
-            [
-                "Ya existe una solicitud activa tramitada para este hermano. "
-                "Por favor, no haga doble clic en el botón de enviar."
-            ]
-        )
-
-        self.assertFalse(PapeletaSitio.objects.exists())
-        self.assertFalse(PreferenciaSolicitud.objects.exists())
-
-
-
     def test_tradicional_solicitud_insignia_falla_antes_de_crear_no_persiste_nada(self):
         """
         Test: Falla antes de crear papeleta (plazo fuera)
@@ -0,0 +1,83 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import serializers, status
+from rest_framework.test import APITestCase
+
+from api.models import Acto, TipoActo, TipoPuesto
+from api.serializadores.catalogo.catalogo_slug_field import CatalogoSlugRelatedField
+from api.serializers import ActoSerializer
+from api.servicios import catalogo_service
+from api.servicios.catalogo_service import CLAVE_VERSION, obtener_catalogo
+from api.tests.factories import HermanoFactory
+
+
+class CatalogoServiceTest(APITestCase):
+
+    def setUp(self):
+        self.convivencia = TipoActo.objects.create(tipo=TipoActo.OpcionesTipo.CONVIVENCIA, requiere_papeleta=False)
+        self.quinario = TipoActo.objects.create(tipo=TipoActo.OpcionesTipo.QUINARIO, requiere_papeleta=False)
+        self.campo = CatalogoSlugRelatedField(slug_field='tipo', queryset=TipoActo.objects.all())
+
+    def test_resuelve_el_slug_sin_consultar_la_bd(self):
+        obtener_catalogo(TipoActo)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.campo.to_internal_value('QUINARIO'), self.quinario)
+
+    def test_slug_inexistente_mantiene_el_error_de_drf(self):
+        with self.assertRaises(serializers.ValidationError) as contexto:
+            self.campo.to_internal_value('TRIDUO')
+
+        self.assertIn("TRIDUO", str(contexto.exception.detail))
+
+    def test_la_escritura_invalida_la_copia_en_memoria(self):
+        obtener_catalogo(TipoActo)
+
+        triduo = TipoActo.objects.create(tipo=TipoActo.OpcionesTipo.TRIDUO, requiere_papeleta=True)
+
+        self.assertEqual(self.campo.to_internal_value('TRIDUO'), triduo)
+        self.assertTrue(obtener_catalogo(TipoActo).por_pk[triduo.pk].requiere_papeleta)
+
+    def test_la_version_se_lee_de_la_cache_una_vez_por_intervalo(self):
+        obtener_catalogo(TipoActo)
+
+        with patch.object(catalogo_service.cache, 'get', wraps=cache.get) as lecturas:
+            for _ in range(5):
+                obtener_catalogo(TipoActo)
+
+        lecturas.assert_not_called()
+
+    @override_settings(CATALOGOS_INTERVALO_VERSION=0)
+    def test_el_cambio_de_version_de_otro_proceso_se_ve_tras_el_intervalo(self):
+        catalogo = obtener_catalogo(TipoActo)
+
+        cache.set(CLAVE_VERSION, 'otro-proceso', None)
+
+        self.assertIsNot(obtener_catalogo(TipoActo), catalogo)
+
+    def test_serializar_acto_no_carga_su_tipo(self):
+        Acto.objects.create(nombre="Convivencia", lugar="Casa Hermandad", fecha="2026-05-01T10:00:00Z", tipo_acto=self.convivencia)
+        acto = Acto.objects.get()
+        obtener_catalogo(TipoActo)
+
+        datos = ActoSerializer(acto).data
+
+        self.assertEqual(datos['tipo_acto'], 'CONVIVENCIA')
+        self.assertFalse(datos['requiere_papeleta'])
+        self.assertFalse(Acto.tipo_acto.is_cached(acto))
+
+    def test_listados_de_tipos_servidos_desde_memoria(self):
+        TipoPuesto.objects.create(nombre_tipo="Cirio")
+        self.client.force_authenticate(user=HermanoFactory())
+        obtener_catalogo(TipoActo), obtener_catalogo(TipoPuesto)
+
+        with self.assertNumQueries(0):
+            tipos_acto = self.client.get(reverse('lista-tipos-acto'))
+            tipos_puesto = self.client.get(reverse('lista-tipos-puesto'))
+
+        self.assertEqual(tipos_acto.status_code, status.HTTP_200_OK)
+        self.assertEqual([tipo['tipo'] for tipo in tipos_acto.data], ['CONVIVENCIA', 'QUINARIO'])
+        self.assertEqual([tipo['nombre_tipo'] for tipo in tipos_puesto.data], ['Cirio'])
@@ -0,0 +1,49 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import AreaInteres, Comunicado
+from api.tests.factories import HermanoFactory
+
+
+class BusquedaComunicadosViewTest(APITestCase):
+
+    def setUp(self):
+        self.user = HermanoFactory()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('buscar-comunicados')
+
+        self.area_caridad = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.CARIDAD)
+        self.area_juventud = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.JUVENTUD)
+        self.user.areas_interes.set([self.area_caridad])
+
+        self.visible = self._crear("Operación kilo", "Recogida de alimentos en la casa hermandad.", self.area_caridad)
+        self._crear("Convivencia joven", "Recogida de alimentos en el instituto.", self.area_juventud)
+
+    def _crear(self, titulo, contenido, area):
+        comunicado = Comunicado.objects.create(
+            titulo=titulo, contenido=contenido, tipo_comunicacion=Comunicado.TipoComunicacion.GENERAL,
+            autor=HermanoFactory(),
+        )
+        comunicado.areas_interes.set([area])
+        return comunicado
+
+    def test_devuelve_los_resultados_visibles_con_fragmento(self):
+        response = self.client.get(self.url, {'q': 'alimentos'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([r['id'] for r in response.data], [self.visible.id])
+        self.assertIn("<mark>alimentos</mark>", response.data[0]['fragmento'])
+        self.assertNotIn('contenido', response.data[0])
+
+    def test_consulta_vacia_devuelve_400(self):
+        for consulta in ['', '   ', 'de la']:
+            response = self.client.get(self.url, {'q': consulta})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requiere_autenticacion(self):
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get(self.url, {'q': 'alimentos'})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
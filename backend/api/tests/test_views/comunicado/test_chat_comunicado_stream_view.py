@@ -0,0 +1,132 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from api.models import AreaInteres, Comunicado
+from api.servicios.comunicado.indice_lexico_service import reiniciar_indice_comunicados
+from api.tests.factories import HermanoFactory
+
+
+def parsear_eventos(response):
+    """Convierte el cuerpo SSE en una lista de tuplas (evento, datos)."""
+    cuerpo = b''.join(response.streaming_content).decode('utf-8')
+    eventos = []
+
+    for bloque in cuerpo.strip().split('\n\n'):
+        lineas = dict(linea.split(': ', 1) for linea in bloque.split('\n'))
+        eventos.append((lineas['event'], json.loads(lineas['data'])))
+
+    return eventos
+
+
+class ChatComunicadosStreamViewTest(APITestCase):
+
+    def setUp(self):
+        reiniciar_indice_comunicados()
+
+        self.user = HermanoFactory()
+        self.url = '/api/comunicados/chat/stream/'
+
+        self.comunicado = Comunicado.objects.create(
+            titulo="Reparto de papeletas",
+            contenido="El reparto del tramo 7 será el lunes.",
+            tipo_comunicacion=Comunicado.TipoComunicacion.GENERAL,
+            autor=self.user,
+            embedding=[1.0, 0.0]
+        )
+        self.comunicado.areas_interes.set([
+            AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.TODOS_HERMANOS)
+        ])
+
+        patcher = patch('api.servicios.comunicado.comunicado_rag_service.obtener_cliente_gemini')
+        self.mock_client = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+
+        self.mock_client.models.embed_content.return_value = MagicMock(embeddings=[MagicMock(values=[1.0, 0.0])])
+        self.mock_client.models.generate_content_stream.return_value = iter([
+            MagicMock(text="El reparto "), MagicMock(text="es el lunes.")
+        ])
+
+    def tearDown(self):
+        reiniciar_indice_comunicados()
+
+    def test_sin_autenticacion_retorna_401(self):
+        response = self.client.post(self.url, {'pregunta': '¿Cuándo es el reparto?'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_pregunta_vacia_retorna_400(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(self.url, {'pregunta': '   '}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.mock_client.models.generate_content_stream.assert_not_called()
+
+    def test_stream_envia_contexto_primero_y_luego_fragmentos(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(self.url, {'pregunta': '¿Cuándo es el reparto?'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response['Content-Type'].startswith('text/event-stream'))
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+
+        eventos = parsear_eventos(response)
+
+        self.assertEqual(eventos[0][0], 'contexto')
+        self.assertEqual(eventos[0][1]['comunicados'][0]['id'], self.comunicado.id)
+        self.assertEqual(eventos[0][1]['comunicados'][0]['titulo'], "Reparto de papeletas")
+
+        self.assertEqual(
+            [datos['texto'] for evento, datos in eventos if evento == 'fragmento'],
+            ["El reparto ", "es el lunes."]
+        )
+        self.assertEqual(eventos[-1], ('fin', {}))
+
+    def test_acepta_cabecera_accept_event_stream(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(
+            self.url, {'pregunta': 'reparto'}, format='json', HTTP_ACCEPT='text/event-stream'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_no_envia_comunicados_de_areas_que_el_hermano_no_sigue(self):
+        self.comunicado.areas_interes.set([
+            AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.PRIOSTIA)
+        ])
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(self.url, {'pregunta': '¿Cuándo es el reparto?'}, format='json')
+        eventos = parsear_eventos(response)
+
+        self.assertEqual(eventos[0], ('contexto', {'comunicados': []}))
+        self.mock_client.models.generate_content_stream.assert_not_called()
+
+    def test_sin_comunicados_envia_mensaje_sin_llamar_al_modelo(self):
+        Comunicado.objects.all().delete()
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(self.url, {'pregunta': '¿Cuándo es el reparto?'}, format='json')
+        eventos = parsear_eventos(response)
+
+        self.assertEqual(eventos[0], ('contexto', {'comunicados': []}))
+        self.assertIn("no hay comunicados", eventos[1][1]['texto'])
+        self.assertEqual(eventos[-1], ('fin', {}))
+        self.mock_client.models.generate_content_stream.assert_not_called()
+
+    def test_error_del_modelo_se_envia_como_evento_error(self):
+        self.mock_client.models.generate_content_stream.side_effect = Exception("Quota exceeded")
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(self.url, {'pregunta': '¿Cuándo es el reparto?'}, format='json')
+        eventos = parsear_eventos(response)
+
+        self.assertEqual(eventos[0][0], 'contexto')
+        self.assertEqual(eventos[-1][0], 'error')
+        self.assertIn("Quota exceeded", eventos[-1][1]['detail'])
@@ -0,0 +1,204 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from django.test import AsyncRequestFactory, TestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.models import AreaInteres, Comunicado
+from api.servicios.comunicado.cliente_gemini_falso import ClienteGeminiFalso
+from api.servicios.comunicado.indice_lexico_service import reiniciar_indice_comunicados
+from api.tests.factories import HermanoFactory
+from api.vistas.comunicado.comunicado_async_view import ChatComunicadosAsyncView, ChatComunicadosStreamAsyncView
+from api.vistas.telegram_async_view import TelegramWebhookAsyncView
+
+
+def cabecera_jwt(usuario):
+    return {"Authorization": f"Bearer {RefreshToken.for_user(usuario).access_token}"}
+
+
+class ChatComunicadosAsyncViewTest(TestCase):
+
+    def setUp(self):
+        reiniciar_indice_comunicados()
+
+        self.factory = AsyncRequestFactory()
+        self.vista = ChatComunicadosAsyncView.as_view()
+        self.user = HermanoFactory()
+
+        comunicado = Comunicado.objects.create(
+            titulo="Reparto de papeletas",
+            contenido="El reparto del tramo 7 será el lunes.",
+            tipo_comunicacion=Comunicado.TipoComunicacion.GENERAL,
+            autor=self.user,
+            embedding=None
+        )
+        comunicado.areas_interes.set([
+            AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.TODOS_HERMANOS)
+        ])
+
+        patcher = patch(
+            'api.servicios.comunicado.comunicado_rag_service.obtener_cliente_gemini',
+            return_value=ClienteGeminiFalso()
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        reiniciar_indice_comunicados()
+
+    def _post(self, cuerpo, usuario=None):
+        cabeceras = cabecera_jwt(usuario) if usuario else {}
+        return self.factory.post('/api/comunicados/chat/', data=cuerpo, content_type='application/json', headers=cabeceras)
+
+    async def test_sin_autenticacion_retorna_401(self):
+        response = await self.vista(self._post({'pregunta': '¿Cuándo es el reparto?'}))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn('WWW-Authenticate', response)
+
+    async def test_pregunta_vacia_retorna_400(self):
+        response = await self.vista(self._post({'pregunta': '  '}, self.user))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_metodo_no_permitido_retorna_405(self):
+        request = self.factory.get('/api/comunicados/chat/', headers=cabecera_jwt(self.user))
+
+        response = await self.vista(request)
+
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    async def test_responde_con_el_comunicado_recuperado(self):
+        response = await self.vista(self._post({'pregunta': '¿Cuándo es el reparto de papeletas?'}, self.user))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("Reparto de papeletas", json.loads(response.content)['respuesta'])
+
+    async def test_error_del_servicio_retorna_500(self):
+        with patch(
+            'api.vistas.comunicado.comunicado_async_view.ComunicadoRAGService.apreguntar_a_comunicados',
+            new=AsyncMock(side_effect=RuntimeError("caída"))
+        ):
+            response = await self.vista(self._post({'pregunta': '¿Cuándo es el reparto?'}, self.user))
+
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(json.loads(response.content)['error'], "caída")
+
+
+def parsear_evento(trozo):
+    """Convierte un bloque SSE (bytes) en la tupla (evento, datos)."""
+    lineas = dict(linea.split(': ', 1) for linea in trozo.decode('utf-8').strip().split('\n'))
+    return lineas['event'], json.loads(lineas['data'])
+
+
+class ChatComunicadosStreamAsyncViewTest(TestCase):
+
+    def setUp(self):
+        reiniciar_indice_comunicados()
+
+        self.factory = AsyncRequestFactory()
+        self.vista = ChatComunicadosStreamAsyncView.as_view()
+        self.user = HermanoFactory()
+
+        self.comunicado = Comunicado.objects.create(
+            titulo="Reparto de papeletas",
+            contenido="El reparto del tramo 7 será el lunes.",
+            tipo_comunicacion=Comunicado.TipoComunicacion.GENERAL,
+            autor=self.user,
+            embedding=None
+        )
+        self.comunicado.areas_interes.set([
+            AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.TODOS_HERMANOS)
+        ])
+
+        self.cliente = ClienteGeminiFalso()
+        patcher = patch('api.servicios.comunicado.comunicado_rag_service.obtener_cliente_gemini', return_value=self.cliente)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        reiniciar_indice_comunicados()
+
+    def _post(self, cuerpo, usuario=None):
+        cabeceras = cabecera_jwt(usuario) if usuario else {}
+        return self.factory.post('/api/comunicados/chat/stream/', data=cuerpo, content_type='application/json', headers=cabeceras)
+
+    async def test_sin_autenticacion_retorna_401(self):
+        response = await self.vista(self._post({'pregunta': '¿Cuándo es el reparto?'}))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_pregunta_vacia_retorna_400(self):
+        response = await self.vista(self._post({'pregunta': '  '}, self.user))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_emite_contexto_fragmentos_y_fin(self):
+        response = await self.vista(self._post({'pregunta': '¿Cuándo es el reparto de papeletas?'}, self.user))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        self.assertEqual(response['Content-Type'], 'text/event-stream; charset=utf-8')
+
+        eventos = [parsear_evento(trozo) async for trozo in response.streaming_content]
+
+        self.assertEqual(eventos[0], ('contexto', {'comunicados': [{
+            'id': self.comunicado.id, 'titulo': "Reparto de papeletas",
+            'fecha_emision': self.comunicado.fecha_emision.isoformat(),
+        }]}))
+        self.assertEqual(eventos[-1], ('fin', {}))
+        texto = ''.join(datos['texto'] for evento, datos in eventos if evento == 'fragmento')
+        self.assertIn("Reparto de papeletas", texto)
+
+    async def test_el_contexto_se_envia_antes_de_que_termine_la_generacion(self):
+        continuar = asyncio.Event()
+
+        async def generar_lento(model, contents, config=None):
+            async def trozos():
+                yield SimpleNamespace(text="El reparto ")
+                await continuar.wait()
+                yield SimpleNamespace(text="es el lunes.")
+
+            return trozos()
+
+        with patch.object(self.cliente.aio.models, 'generate_content_stream', generar_lento):
+            response = await self.vista(self._post({'pregunta': '¿Cuándo es el reparto?'}, self.user))
+            contenido = aiter(response.streaming_content)
+
+            # Con la generación aún en curso ya han llegado el contexto y el primer fragmento
+            self.assertEqual(parsear_evento(await anext(contenido))[0], 'contexto')
+            self.assertEqual(parsear_evento(await anext(contenido)), ('fragmento', {'texto': "El reparto "}))
+            self.assertFalse(continuar.is_set())
+
+            continuar.set()
+            resto = [parsear_evento(trozo) async for trozo in contenido]
+
+        self.assertEqual(resto, [('fragmento', {'texto': "es el lunes."}), ('fin', {})])
+
+    async def test_fallo_de_la_generacion_emite_evento_error(self):
+        with patch.object(self.cliente.aio.models, 'generate_content_stream', AsyncMock(side_effect=RuntimeError("caída"))):
+            response = await self.vista(self._post({'pregunta': '¿Cuándo es el reparto?'}, self.user))
+            eventos = [parsear_evento(trozo) async for trozo in response.streaming_content]
+
+        self.assertEqual(eventos[0][0], 'contexto')
+        self.assertEqual(eventos[-1], ('error', {'detail': "Error al generar la respuesta con la IA: caída"}))
+
+
+class TelegramWebhookAsyncViewTest(TestCase):
+
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        self.vista = TelegramWebhookAsyncView.as_view()
+
+    async def test_webhook_publico_responde_ok(self):
+        request = self.factory.post('/api/telegram/webhook/', data={"message": {"text": "hola"}}, content_type='application/json')
+
+        with patch('api.vistas.telegram_async_view.TelegramWebhookService.aprocesar_actualizacion', new=AsyncMock()) as mock_procesar:
+            response = await self.vista(request)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), {"status": "ok"})
+        mock_procesar.assert_awaited_once_with({"message": {"text": "hola"}})
@@ -16,6 +16,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 
 from api.models import CuerpoPertenencia, Hermano, AreaInteres, Comunicado, HermanoCuerpo
 from api.servicios.comunicado.gemini_service import generar_y_guardar_embedding_async
+from api.servicios.comunicado.creacion_comunicado_service import ComunicadoService
 
 
 class TestComunicadoListCreateView(TestCase):
@@ -47,6 +48,18 @@ class TestComunicadoListCreateView(TestCase):
 
         self.url = reverse('lista-crear-comunicados')
 
+        # La difusión a Telegram se ejecuta en línea en lugar de en un hilo aparte
+        patcher_difusion = patch(
+            'api.servicios.comunicado.difusion_telegram_service.lanzar_en_segundo_plano',
+            side_effect=lambda funcion, *args: funcion(*args)
+        )
+        patcher_difusion.start()
+        self.addCleanup(patcher_difusion.stop)
+
+        sin_espera = override_settings(TELEGRAM_ESPERA_REINTENTO=0)
+        sin_espera.enable()
+        self.addCleanup(sin_espera.disable)
+
         self.valid_payload = {
             "titulo": "Nuevo comunicado de prueba",
             "contenido": "<p>Contenido importante</p>",
@@ -83,8 +96,8 @@ class TestComunicadoListCreateView(TestCase):
         response = self.client.get(self.url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 0)
-        self.assertEqual(response.data, [])
+        self.assertEqual(len(response.data['results']), 0)
+        self.assertEqual(response.data['results'], [])
 
 
 
@@ -107,9 +120,9 @@ class TestComunicadoListCreateView(TestCase):
         response = self.client.get(self.url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
 
-        datos_comunicado = response.data[0]
+        datos_comunicado = response.data['results'][0]
         self.assertEqual(datos_comunicado['titulo'], "Comunicado de Hermandad")
         self.assertEqual(datos_comunicado['tipo_comunicacion'], "INFORMATIVO")
 
@@ -145,10 +158,10 @@ class TestComunicadoListCreateView(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
 
-        self.assertEqual(response.data[0]['titulo'], "Segundo Comunicado")
-        self.assertEqual(response.data[1]['titulo'], "Primer Comunicado")
+        self.assertEqual(response.data['results'][0]['titulo'], "Segundo Comunicado")
+        self.assertEqual(response.data['results'][1]['titulo'], "Primer Comunicado")
 
 
 
@@ -182,10 +195,10 @@ class TestComunicadoListCreateView(TestCase):
         response = self.client.get(self.url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
 
-        self.assertEqual(response.data[0]['titulo'], "Comunicado Reciente")
-        self.assertEqual(response.data[1]['titulo'], "Comunicado Antiguo")
+        self.assertEqual(response.data['results'][0]['titulo'], "Comunicado Reciente")
+        self.assertEqual(response.data['results'][1]['titulo'], "Comunicado Antiguo")
 
 
 
@@ -209,9 +222,9 @@ class TestComunicadoListCreateView(TestCase):
         response = self.client.get(self.url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertTrue(len(response.data) > 0)
+        self.assertTrue(len(response.data['results']) > 0)
 
-        datos = response.data[0]
+        datos = response.data['results'][0]
 
         self.assertIn('titulo', datos)
         self.assertEqual(datos['titulo'], "Aviso de Priostía")
@@ -250,7 +263,7 @@ class TestComunicadoListCreateView(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         
-        datos = response.data[0]
+        datos = response.data['results'][0]
 
         self.assertIsInstance(datos['areas_interes'], list)
 
@@ -280,7 +293,7 @@ class TestComunicadoListCreateView(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         
-        datos_comunicado = response.data[0]
+        datos_comunicado = response.data['results'][0]
 
         nombre_esperado = f"{self.usuario.nombre} {self.usuario.primer_apellido}"
         
@@ -321,7 +334,7 @@ class TestComunicadoListCreateView(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         
-        datos = response.data[0]
+        datos = response.data['results'][0]
 
         self.assertIsNotNone(datos['imagen_portada'])
         self.assertIn('test_portada', datos['imagen_portada'])
@@ -348,7 +361,7 @@ class TestComunicadoListCreateView(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         
-        datos = response.data[0]
+        datos = response.data['results'][0]
 
         self.assertIn('imagen_portada', datos)
         self.assertNil = self.assertIsNone(datos['imagen_portada'])
@@ -376,8 +389,8 @@ class TestComunicadoListCreateView(TestCase):
         response = self.client.get(self.url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['titulo'], "Comunicado para Admins")
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['titulo'], "Comunicado para Admins")
 
 
 
@@ -402,8 +415,8 @@ class TestComunicadoListCreateView(TestCase):
         response = self.client.get(self.url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertTrue(len(response.data) >= 1)
-        self.assertEqual(response.data[0]['titulo'], "Comunicado para Hermanos")
+        self.assertTrue(len(response.data['results']) >= 1)
+        self.assertEqual(response.data['results'][0]['titulo'], "Comunicado para Hermanos")
 
 
 
@@ -435,8 +448,8 @@ class TestComunicadoListCreateView(TestCase):
         response = self.client.get(self.url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['titulo'], "Acuerdo de Junta")
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['titulo'], "Acuerdo de Junta")
 
 
 
@@ -460,7 +473,7 @@ class TestComunicadoListCreateView(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         
-        datos_comunicado = response.data[0]
+        datos_comunicado = response.data['results'][0]
 
         self.assertEqual(datos_comunicado['titulo'], "Comunicado sin procesamiento IA")
 
@@ -490,7 +503,7 @@ class TestComunicadoListCreateView(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         
-        datos_areas = response.data[0]['areas_interes']
+        datos_areas = response.data['results'][0]['areas_interes']
 
         self.assertIsInstance(datos_areas, list)
         self.assertEqual(len(datos_areas), 2)
@@ -1014,7 +1027,9 @@ class TestComunicadoListCreateView(TestCase):
             "areas_interes": [self.area_juventud.id]
         }
 
-        response = self.client.post(self.url, data=payload, format='json')
+        # El embedding se genera al confirmar la transacción
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data=payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
@@ -1027,7 +1042,7 @@ class TestComunicadoListCreateView(TestCase):
 
 
     @override_settings(TELEGRAM_BOT_TOKEN='token_falso_para_tests_123')
-    @patch('api.servicios.comunicado.creacion_comunicado_service.requests.post')
+    @patch('api.servicios.comunicado.difusion_telegram_service.requests.post')
     @patch('api.servicios.comunicado.creacion_comunicado_service.generar_y_guardar_embedding_async')
     def test_post_comunicado_ejecuta_notificacion_telegram(self, mock_generar_embedding, mock_requests_post):
         """
@@ -1051,7 +1066,8 @@ class TestComunicadoListCreateView(TestCase):
             "areas_interes": [self.area_juventud.id]
         }
 
-        response = self.client.post(self.url, data=payload, format='json')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data=payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
@@ -1070,7 +1086,7 @@ class TestComunicadoListCreateView(TestCase):
 
 
     @override_settings(TELEGRAM_BOT_TOKEN='bot_token_test_abc')
-    @patch('api.servicios.comunicado.creacion_comunicado_service.requests.post')
+    @patch('api.servicios.comunicado.difusion_telegram_service.requests.post')
     @patch('api.servicios.comunicado.creacion_comunicado_service.generar_y_guardar_embedding_async')
     def test_post_comunicado_notifica_a_multiples_canales_telegram(self, mock_embedding, mock_requests):
         """
@@ -1097,7 +1113,8 @@ class TestComunicadoListCreateView(TestCase):
             "areas_interes": [self.area_juventud.id, self.area_caridad.id]
         }
 
-        response = self.client.post(self.url, data=payload, format='json')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data=payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
@@ -1110,7 +1127,7 @@ class TestComunicadoListCreateView(TestCase):
 
 
     @override_settings(TELEGRAM_BOT_TOKEN='bot_token_test_abc')
-    @patch('api.servicios.comunicado.creacion_comunicado_service.requests.post')
+    @patch('api.servicios.comunicado.difusion_telegram_service.requests.post')
     @patch('api.servicios.comunicado.creacion_comunicado_service.generar_y_guardar_embedding_async')
     def test_post_comunicado_con_areas_sin_telegram_no_notifica(self, mock_embedding, mock_requests):
         """
@@ -1133,7 +1150,8 @@ class TestComunicadoListCreateView(TestCase):
             "areas_interes": [self.area_juventud.id]
         }
 
-        response = self.client.post(self.url, data=payload, format='json')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data=payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
@@ -1144,7 +1162,7 @@ class TestComunicadoListCreateView(TestCase):
 
 
     @override_settings(TELEGRAM_BOT_TOKEN=None) # Simulamos que no existe el token
-    @patch('api.servicios.comunicado.creacion_comunicado_service.requests.post')
+    @patch('api.servicios.comunicado.difusion_telegram_service.requests.post')
     @patch('api.servicios.comunicado.creacion_comunicado_service.generar_y_guardar_embedding_async')
     def test_post_comunicado_sin_token_telegram_crea_registro_sin_notificar(self, mock_embedding, mock_requests):
         """
@@ -1167,7 +1185,8 @@ class TestComunicadoListCreateView(TestCase):
             "areas_interes": [self.area_juventud.id]
         }
 
-        response = self.client.post(self.url, data=payload, format='json')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data=payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
@@ -1236,7 +1255,9 @@ class TestComunicadoListCreateView(TestCase):
             "areas_interes": [self.area_juventud.id]
         }
 
-        response = self.client.post(self.url, data=payload, format='json')
+        # El embedding se genera al confirmar la transacción
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data=payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertTrue(Comunicado.objects.filter(titulo=payload["titulo"]).exists())
@@ -1700,7 +1721,9 @@ class TestComunicadoListCreateView(TestCase):
             "areas_interes": [id_area, id_area]
         }
 
-        response = self.client.post(self.url, data=payload, format='json')
+        # El embedding se genera al confirmar la transacción
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data=payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
@@ -1731,7 +1754,9 @@ class TestComunicadoListCreateView(TestCase):
             "areas_interes": [self.area_juventud.id]
         }
 
-        response = self.client.post(self.url, data=payload, format='json')
+        # El embedding se genera al confirmar la transacción
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data=payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
@@ -1805,7 +1830,8 @@ class TestComunicadoListCreateView(TestCase):
             "imagen_portada": imagen_simulada
         }
 
-        response = self.client.post(self.url, data=payload, format='multipart')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data=payload, format='multipart')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
@@ -1845,7 +1871,8 @@ class TestComunicadoListCreateView(TestCase):
             "areas_interes": [self.area_juventud.id]
         }
 
-        response = self.client.post(self.url, data=payload, format='json')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data=payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
@@ -1889,7 +1916,8 @@ class TestComunicadoListCreateView(TestCase):
             "areas_interes": [self.area_juventud.id]
         }
 
-        response = self.client.post(self.url, data=payload, format='json')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data=payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
@@ -1928,7 +1956,8 @@ class TestComunicadoListCreateView(TestCase):
             "areas_interes": [self.area_juventud.id]
         }
 
-        response = self.client.post(self.url, data=payload, format='json')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data=payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
@@ -1976,7 +2005,8 @@ class TestComunicadoListCreateView(TestCase):
             "imagen_portada": imagen_simulada
         }
 
-        response = self.client.post(self.url, data=payload, format='multipart')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data=payload, format='multipart')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
@@ -2027,7 +2057,8 @@ class TestComunicadoListCreateView(TestCase):
             "areas_interes": [self.area_juventud.id, area_2.id, area_3.id]
         }
 
-        response = self.client.post(self.url, data=payload, format='json')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data=payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
@@ -2073,7 +2104,8 @@ class TestComunicadoListCreateView(TestCase):
             "areas_interes": [self.area_juventud.id]
         }
 
-        response = self.client.post(self.url, data=payload, format='json')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data=payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
@@ -2112,7 +2144,8 @@ class TestComunicadoListCreateView(TestCase):
             "areas_interes": [self.area_juventud.id]
         }
 
-        response = self.client.post(self.url, data=payload, format='json')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data=payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
@@ -2153,7 +2186,8 @@ class TestComunicadoListCreateView(TestCase):
             "areas_interes": [self.area_juventud.id]
         }
 
-        response = self.client.post(self.url, data=payload, format='json')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data=payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
@@ -2191,7 +2225,9 @@ class TestComunicadoListCreateView(TestCase):
             "areas_interes": [self.area_juventud.id]
         }
 
-        response = self.client.post(self.url, data=payload, format='json')
+        # El embedding se genera al confirmar la transacción
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data=payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
@@ -2261,7 +2297,9 @@ class TestComunicadoListCreateView(TestCase):
             "areas_interes": [self.area_juventud.id]
         }
 
-        response = self.client.post(self.url, data=payload, format='json')
+        # El embedding se genera al confirmar la transacción
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data=payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
@@ -2274,7 +2312,7 @@ class TestComunicadoListCreateView(TestCase):
 
 
 
-    @patch('api.servicios.comunicado.gemini_service.genai.Client')
+    @patch('api.servicios.comunicado.gemini_service.obtener_cliente_gemini')
     @patch('api.servicios.comunicado.gemini_service.threading.Thread')
     def test_generar_y_guardar_embedding_ejecucion_exitosa(self, mock_thread, mock_genai_client):
         """
@@ -2315,7 +2353,7 @@ class TestComunicadoListCreateView(TestCase):
 
 
 
-    @patch('api.servicios.comunicado.gemini_service.genai.Client')
+    @patch('api.servicios.comunicado.gemini_service.obtener_cliente_gemini')
     @patch('api.servicios.comunicado.gemini_service.threading.Thread')
     def test_generar_y_guardar_embedding_persiste_en_json_correctamente(self, mock_thread, mock_genai_client):
         """
@@ -2355,7 +2393,7 @@ class TestComunicadoListCreateView(TestCase):
 
 
 
-    @patch('api.servicios.comunicado.gemini_service.genai.Client')
+    @patch('api.servicios.comunicado.gemini_service.obtener_cliente_gemini')
     @patch('api.servicios.comunicado.gemini_service.threading.Thread')
     def test_generar_y_guardar_embedding_error_api_gemini(self, mock_thread, mock_genai_client):
         """
@@ -2393,7 +2431,7 @@ class TestComunicadoListCreateView(TestCase):
 
 
 
-    @patch('api.servicios.comunicado.gemini_service.genai.Client')
+    @patch('api.servicios.comunicado.gemini_service.obtener_cliente_gemini')
     @patch('api.servicios.comunicado.gemini_service.threading.Thread')
     def test_generar_y_guardar_embedding_timeout_api(self, mock_thread, mock_genai_client):
         """
@@ -2430,7 +2468,7 @@ class TestComunicadoListCreateView(TestCase):
 
 
 
-    @patch('api.servicios.comunicado.gemini_service.genai.Client')
+    @patch('api.servicios.comunicado.gemini_service.obtener_cliente_gemini')
     @patch('api.servicios.comunicado.gemini_service.threading.Thread')
     def test_generar_y_guardar_embedding_error_inesperado_en_tarea_async(self, mock_thread, mock_genai_client):
         """
@@ -2465,7 +2503,7 @@ class TestComunicadoListCreateView(TestCase):
 
 
 
-    @patch('api.servicios.comunicado.gemini_service.genai.Client')
+    @patch('api.servicios.comunicado.gemini_service.obtener_cliente_gemini')
     @patch('api.servicios.comunicado.gemini_service.threading.Thread')
     def test_generar_y_guardar_embedding_devuelve_lista_vacia(self, mock_thread, mock_genai_client):
         """
@@ -2706,8 +2744,6 @@ class TestComunicadoListCreateView(TestCase):
         self.usuario.esAdmin = True
         self.usuario.save()
 
-        mock_generar_embedding.side_effect = Exception("Fallo catastrófico final")
-
         payload = {
             "titulo": "Comunicado Fantasma",
             "contenido": "Este comunicado debería desaparecer por el rollback.",
@@ -2715,7 +2751,9 @@ class TestComunicadoListCreateView(TestCase):
             "areas_interes": [self.area_juventud.id]
         }
 
-        response = self.client.post(self.url, data=payload, format='json')
+        # El último paso dentro de la transacción (los índices se refrescan al confirmar)
+        with patch.object(ComunicadoService, '_indexar', side_effect=Exception("Fallo catastrófico final")):
+            response = self.client.post(self.url, data=payload, format='json')
 
         self.assertTrue(
             status.is_client_error(response.status_code) or status.is_server_error(response.status_code),
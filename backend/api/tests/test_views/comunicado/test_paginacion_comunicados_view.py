@@ -0,0 +1,128 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import AreaInteres, Comunicado
+from api.tests.factories import HermanoFactory
+
+
+class PaginacionCursorComunicadosTest(APITestCase):
+
+    def setUp(self):
+        self.user = HermanoFactory()
+        self.client.force_authenticate(user=self.user)
+
+        self.area_general = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.TODOS_HERMANOS)
+        self.area_caridad = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.CARIDAD)
+        self.area_juventud = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.JUVENTUD)
+        self.user.areas_interes.set([self.area_caridad])
+
+        self.ahora = timezone.now()
+
+        # Dos pares con la misma fecha para comprobar el desempate por id
+        fechas = [self.ahora, self.ahora, self.ahora - timedelta(days=1), self.ahora - timedelta(days=1), self.ahora - timedelta(days=2)]
+        self.comunicados = [
+            self._crear(f"Comunicado {i}", fecha, [self.area_general] if i % 2 else [self.area_caridad, self.area_general])
+            for i, fecha in enumerate(fechas)
+        ]
+        self.oculto = self._crear("Solo juventud", self.ahora, [self.area_juventud])
+
+        self.orden_esperado = [
+            com.id for com in sorted(self.comunicados, key=lambda c: (c.fecha_emision, c.id), reverse=True)
+        ]
+
+    def _crear(self, titulo, fecha, areas):
+        comunicado = Comunicado.objects.create(
+            titulo=titulo,
+            contenido="Contenido",
+            tipo_comunicacion=Comunicado.TipoComunicacion.GENERAL,
+            autor=self.user,
+            fecha_emision=fecha,
+        )
+        comunicado.areas_interes.set(areas)
+        return comunicado
+
+    def _recorrer(self, url):
+        ids, paginas = [], 0
+
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            ids += [item['id'] for item in response.data['results']]
+            url = response.data['next']
+            paginas += 1
+
+        return ids, paginas
+
+    def test_recorrido_por_cursor_devuelve_todo_en_orden_y_sin_repetidos(self):
+        for nombre_url in ('lista-crear-comunicados', 'mis-noticias'):
+            ids, paginas = self._recorrer(reverse(nombre_url) + '?page_size=2')
+
+            self.assertEqual(ids, self.orden_esperado)
+            self.assertEqual(paginas, 3)
+
+    def test_comunicados_de_otras_areas_no_aparecen(self):
+        ids, _ = self._recorrer(reverse('mis-noticias'))
+
+        self.assertNotIn(self.oculto.id, ids)
+
+    def test_ultima_pagina_no_tiene_siguiente(self):
+        response = self.client.get(reverse('mis-noticias') + '?page_size=5')
+
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertIsNone(response.data['next'])
+
+    def test_comunicado_nuevo_no_desplaza_las_paginas_siguientes(self):
+        response = self.client.get(reverse('mis-noticias') + '?page_size=2')
+        primera = [item['id'] for item in response.data['results']]
+
+        self._crear("Urgente de última hora", self.ahora + timedelta(minutes=5), [self.area_general])
+
+        resto, _ = self._recorrer(response.data['next'])
+
+        self.assertEqual(primera + resto, self.orden_esperado)
+
+    def test_cursor_manipulado_retorna_404(self):
+        response = self.client.get(reverse('mis-noticias') + '?page_size=2')
+        cursor = response.data['next'].split('cursor=')[1]
+
+        response = self.client.get(reverse('mis-noticias'), {'cursor': cursor[:-1] + ('A' if cursor[-1] != 'A' else 'B')})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get(reverse('mis-noticias'), {'cursor': 'no-es-un-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_size_se_limita_al_maximo(self):
+        response = self.client.get(reverse('mis-noticias') + '?page_size=100000')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), len(self.comunicados))
+
+    def test_numero_de_consultas_no_depende_de_la_profundidad(self):
+        url = reverse('mis-noticias') + '?page_size=2'
+        segunda = self.client.get(url).data['next']
+        tercera = self.client.get(segunda).data['next']
+
+        # Versión del feed (ETag) + página + prefetch de áreas
+        with self.assertNumQueries(3):
+            self.client.get(url)
+
+        with self.assertNumQueries(3):
+            self.client.get(tercera)
+
+    def test_el_listado_envia_el_extracto_y_el_detalle_el_contenido(self):
+        largo = self._crear("Memoria anual", self.ahora + timedelta(minutes=1), [self.area_general])
+        largo.contenido = "<p>Memoria de actividades de la hermandad.</p>" * 2000
+        largo.save()
+
+        listado = self.client.get(reverse('mis-noticias') + '?page_size=1')
+        detalle = self.client.get(reverse('detalle-comunicado', args=[largo.id]))
+
+        self.assertEqual(listado.data['results'][0]['minutos_lectura'], 60)
+        self.assertNotIn('contenido', listado.data['results'][0])
+        self.assertEqual(detalle.data['contenido'], largo.contenido)
+        self.assertLess(len(listado.content) * 10, len(detalle.content))
@@ -0,0 +1,152 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import Acto, AreaInteres, Comunicado, Cuota, PapeletaSitio, Puesto, TipoActo, TipoPuesto
+from api.tests.factories import HermanoFactory
+
+
+class PeticionCondicionalTest(APITestCase):
+
+    def setUp(self):
+        self.ahora = timezone.now()
+
+        self.hermano = HermanoFactory()
+        self.client.force_authenticate(user=self.hermano)
+
+        self.area_todos = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.TODOS_HERMANOS)
+        self.area_juventud = AreaInteres.objects.create(nombre_area=AreaInteres.NombreArea.JUVENTUD)
+
+        self.comunicado = self._crear_comunicado("Cabildo", [self.area_todos])
+
+        tipo_acto = TipoActo.objects.create(tipo=TipoActo.OpcionesTipo.CONVIVENCIA, requiere_papeleta=False)
+        self.acto = Acto.objects.create(
+            nombre="Convivencia", lugar="Casa Hermandad", fecha=self.ahora + timedelta(days=30), tipo_acto=tipo_acto,
+        )
+
+    def _crear_comunicado(self, titulo, areas):
+        comunicado = Comunicado.objects.create(
+            titulo=titulo, contenido="Contenido", tipo_comunicacion=Comunicado.TipoComunicacion.GENERAL, autor=self.hermano,
+        )
+        comunicado.areas_interes.set(areas)
+        return comunicado
+
+    def _revalidar(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_detalle_comunicado_responde_304_sin_cambios_y_200_tras_editar(self):
+        url = reverse('detalle-comunicado', args=[self.comunicado.pk])
+
+        primera = self.client.get(url)
+        self.assertEqual(primera.status_code, status.HTTP_200_OK)
+        self.assertIn('Last-Modified', primera)
+        self.assertIn('private', primera['Cache-Control'])
+        self.assertIn('no-cache', primera['Cache-Control'])
+
+        no_modificado = self._revalidar(url, primera)
+        self.assertEqual(no_modificado.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(no_modificado.content, b'')
+        self.assertEqual(no_modificado['ETag'], primera['ETag'])
+
+        por_fecha = self.client.get(url, HTTP_IF_MODIFIED_SINCE=primera['Last-Modified'])
+        self.assertEqual(por_fecha.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.comunicado.titulo = "Cabildo extraordinario"
+        self.comunicado.save()
+
+        modificado = self._revalidar(url, primera)
+        self.assertEqual(modificado.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(modificado['ETag'], primera['ETag'])
+
+    def test_la_version_no_renderiza_el_cuerpo(self):
+        url = reverse('detalle-comunicado', args=[self.comunicado.pk])
+        primera = self.client.get(url)
+
+        with self.assertNumQueries(1), patch('api.vistas.comunicado.comunicado_especifico_view.ComunicadoDetalleSerializer') as serializer:
+            self._revalidar(url, primera)
+
+        serializer.assert_not_called()
+
+    def test_detalle_inexistente_no_lleva_validadores(self):
+        response = self.client.get(reverse('detalle-comunicado', args=[9999]))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('ETag', response)
+
+    def test_feed_cambia_con_comunicados_visibles_y_areas_del_hermano(self):
+        url = reverse('mis-noticias')
+        primera = self.client.get(url)
+
+        self._crear_comunicado("Solo juventud", [self.area_juventud])
+        self.assertEqual(self._revalidar(url, primera).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.hermano.areas_interes.set([self.area_juventud])
+        self.assertEqual(self._revalidar(url, primera).status_code, status.HTTP_200_OK)
+
+    def test_feed_detecta_borrados(self):
+        url = reverse('lista-crear-comunicados')
+        otro = self._crear_comunicado("Otro", [self.area_todos])
+        primera = self.client.get(url)
+
+        otro.delete()
+
+        self.assertEqual(self._revalidar(url, primera).status_code, status.HTTP_200_OK)
+
+    def test_cada_hermano_y_cada_pagina_tienen_su_etag(self):
+        url = reverse('mis-noticias')
+        primera = self.client.get(url)
+
+        otra_pagina = self.client.get(url + '?page_size=1')
+        self.assertNotEqual(otra_pagina['ETag'], primera['ETag'])
+
+        self.client.force_authenticate(user=HermanoFactory())
+        self.assertEqual(self._revalidar(url, primera).status_code, status.HTTP_200_OK)
+
+    def test_cuotas_cambian_al_pagar(self):
+        cuota = Cuota.objects.create(hermano=self.hermano, anio=self.ahora.year, descripcion="Cuota", importe=30)
+        url = reverse('mis_cuotas_list')
+        primera = self.client.get(url)
+
+        self.assertEqual(self._revalidar(url, primera).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        cuota.estado = Cuota.EstadoCuota.PAGADA
+        cuota.save()
+
+        self.assertEqual(self._revalidar(url, primera).status_code, status.HTTP_200_OK)
+
+    def test_historial_de_papeletas_cambia_al_editar_el_acto(self):
+        PapeletaSitio.objects.create(hermano=self.hermano, acto=self.acto, anio=self.ahora.year)
+        url = reverse('mis-papeletas')
+        primera = self.client.get(url)
+
+        self.assertEqual(self._revalidar(url, primera).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Acto.objects.filter(pk=self.acto.pk).update(lugar="Parroquia", updated_at=timezone.now())
+
+        self.assertEqual(self._revalidar(url, primera).status_code, status.HTTP_200_OK)
+
+    def test_acto_cambia_al_crear_un_puesto(self):
+        url = reverse('detalle-acto', args=[self.acto.pk])
+        primera = self.client.get(url)
+
+        self.assertEqual(self._revalidar(url, primera).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Puesto.objects.create(nombre="Vara", acto=self.acto, tipo_puesto=TipoPuesto.objects.create(nombre_tipo="Vara"))
+
+        self.assertEqual(self._revalidar(url, primera).status_code, status.HTTP_200_OK)
+
+    def test_listado_de_actos_cambia_al_abrirse_un_plazo(self):
+        Acto.objects.filter(pk=self.acto.pk).update(
+            inicio_solicitud=self.ahora + timedelta(hours=1), fin_solicitud=self.ahora + timedelta(days=2)
+        )
+        url = reverse('acto-list')
+        primera = self.client.get(url)
+
+        self.assertEqual(self._revalidar(url, primera).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with patch('api.servicios.version_recursos_service.timezone.now', return_value=self.ahora + timedelta(hours=2)):
+            self.assertEqual(self._revalidar(url, primera).status_code, status.HTTP_200_OK)
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 
 from api.view.register_view import AprobarAltaHermanoView, HermanoCreateView
@@ -6,6 +7,10 @@ from api.view.GenerarQRPapeletaView import DescargarPapeletaPDFView, ValidarAcce
 from api.view.gestion_solicitudes_views import CrearSolicitudUnificadaView, SolicitarCirioView
 from api.vistas.comunicado.comunicado_general_view import ComunicadoListCreateView
 from api.vistas.comunicado.comunicado_especifico_view import ComunicadoDetailView
+from api.vistas.comunicado.chat_comunicado_stream_view import ChatComunicadosStreamView
+from api.vistas.comunicado.busqueda_comunicado_view import BusquedaComunicadosView
+from api.vistas.comunicado.comunicado_async_view import ChatComunicadosAsyncView, ChatComunicadosStreamAsyncView
+from api.vistas.telegram_async_view import TelegramWebhookAsyncView
 from api.vistas.acto.acto_general_view import ActoCreateView, ActoListAPIView
 from api.vistas.acto.proximos_actos_view import ProximosActosView
 from api.vistas.comunicado.ultimo_comunicado_view import ComunicadosRelacionadosView, UltimosComunicadosAreaInteresView
@@ -13,11 +18,18 @@ from api.vistas.cuota.cuota_view import MisCuotasListView
 from api.vistas.acto.proxima_estacion_penitencia_view import ProximaEstacionPenitenciaView
 from api.vistas.solicitud_insignia.solicitud_insignia_view import ActoActivoInsigniasView, DescargarListadoInsigniasView, DescargarListadoTodasInsigniasView, DescargarListadoVacantesView, EjecutarRepartoView, SolicitarInsigniaView
 from api.vistas.papeleta_sitio.papeleta_sitio_view import TablaInsigniasActoView
+from api.vistas.papeleta_sitio.cola_solicitudes_view import EstadoSolicitudEnColaView
 from api.vistas.solicitud_cirio.solicitud_cirio_view import DescargarListadoCiriosView, EjecutarRepartoCiriosView
 from . import views
 
 from .views import ActoListCreateView, ActoUpdateView, AreaInteresListView, ChatComunicadosView, HermanoAdminDetailView, HermanoListView, MisComunicadosListView, MisPapeletasListView, TelegramWebhookView, TipoActoListView, UsuarioLogueadoView, ActoDetalleView, CrearPuestoView, TipoPuestoListView, PuestoDetalleView
 
+# Bajo ASGI, las rutas que esperan a servicios externos (Gemini, Telegram) usan vistas asíncronas
+if settings.SERVIDOR_ASGI:
+    ChatComunicadosView = ChatComunicadosAsyncView
+    ChatComunicadosStreamView = ChatComunicadosStreamAsyncView
+    TelegramWebhookView = TelegramWebhookAsyncView
+
 urlpatterns = [
     path("me/", UsuarioLogueadoView.as_view(), name="usuario-logueado"),
     path("hermanos/registro/", HermanoCreateView.as_view(), name="registro-hermano"),
@@ -51,10 +63,12 @@ urlpatterns = [
     path("papeletas/solicitar-insignia/", SolicitarInsigniaView.as_view(), name="solicitar-insignia"),
     path("papeletas/solicitar-cirio/", SolicitarCirioView.as_view(), name="solicitar-cirio"),
     path("papeletas/solicitar-unificada/", CrearSolicitudUnificadaView.as_view(), name="solicitar-unificada"),
+    path("papeletas/cola/<uuid:ticket>/", EstadoSolicitudEnColaView.as_view(), name="estado-solicitud-cola"),
 
     path("comunicados/", ComunicadoListCreateView.as_view(), name="lista-crear-comunicados"),
     path("comunicados/<int:pk>/", ComunicadoDetailView.as_view(), name="detalle-comunicado"),
     path("comunicados/mis-noticias/", MisComunicadosListView.as_view(), name="mis-noticias"),
+    path("comunicados/buscar/", BusquedaComunicadosView.as_view(), name="buscar-comunicados"),
     path('comunicados/<int:exclude_id>/relacionados/', ComunicadosRelacionadosView.as_view(), name='comunicados-relacionados'),
     path("areas-interes/", AreaInteresListView.as_view(), name="lista-areas-interes"),
     path('comunicados/ultimos-area-interes/', UltimosComunicadosAreaInteresView.as_view(), name='ultimos-comunicado-areas'),
@@ -62,6 +76,7 @@ urlpatterns = [
     path("telegram/webhook/", TelegramWebhookView.as_view(), name="telegram-webhook"),
 
     path("comunicados/chat/", ChatComunicadosView.as_view(), name="chat-comunicados"),
+    path("comunicados/chat/stream/", ChatComunicadosStreamView.as_view(), name="chat-comunicados-stream"),
 
     #Cuotas
     path('mis-cuotas/', MisCuotasListView.as_view(), name='mis_cuotas_list'),
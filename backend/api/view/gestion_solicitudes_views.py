@@ -4,7 +4,10 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django.core.exceptions import ValidationError as DjangoValidationError
 
+from api.models import SolicitudEnCola
+from api.servicios.papeleta_sitio.cola_solicitudes_service import modo_admision_activo
 from api.servicios.solicitud_cirio_tradicional import SolicitudCirioTradicionalService
+from api.vistas.papeleta_sitio.cola_solicitudes_view import respuesta_encolada
 
 from ..servicios.papeleta_sitio_service import PapeletaSitioService
 from ..serializers import (
@@ -26,6 +29,9 @@ class SolicitarCirioView(APIView):
         serializer = SolicitudCirioSerializer(data=request.data)
         
         if serializer.is_valid():
+            if modo_admision_activo():
+                return respuesta_encolada(request, SolicitudEnCola.TipoSolicitud.CIRIO, serializer.validated_data)
+
             try:
                 service = SolicitudCirioTradicionalService()
                 
@@ -76,6 +82,9 @@ class CrearSolicitudUnificadaView(APIView):
         serializer = SolicitudUnificadaSerializer(data=request.data)
         
         if serializer.is_valid():
+            if modo_admision_activo():
+                return respuesta_encolada(request, SolicitudEnCola.TipoSolicitud.UNIFICADA, serializer.validated_data)
+
             try:
                 service = PapeletaSitioService()
                 
@@ -2,15 +2,21 @@ from django.shortcuts import render
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import User
 from rest_framework import generics, status
-from django.db.models import Q
 
 from api.servicios.comunicado.creacion_comunicado_service import ComunicadoService
 from api.servicios.papeleta_telegram import TelegramWebhookService
 from api.servicios.hermano.edicion_datos_hermano_service import update_mi_perfil_service
 from api.servicios.comunicado.comunicado_rag_service import ComunicadoRAGService
+from api.servicios.comunicado.feed_comunicado_service import obtener_feed_comunicados
 from api.serializadores.comunicado.comunicado_form_serializer import ComunicadoFormSerializer
 from api.serializadores.comunicado.comunicado_list_serializer import ComunicadoListSerializer
+from api.serializadores.comunicado.comunicado_list_values import proyectar_comunicados_listado, serializar_comunicados_listado
+from api.serializadores.papeleta_sitio.historial_papeleta_values import proyectar_historial_papeletas, serializar_historial_papeletas
 from api.servicios.acto.acto_service import actualizar_acto_service, crear_acto_service
+from api.servicios.acto.contadores_acto_service import preparar_actos_serializacion
+from api.servicios.catalogo_service import obtener_catalogo
+from api.servicios.version_recursos_service import version_acto, version_feed_comunicados, version_papeletas_hermano
+from api.condicional import peticion_condicional
 
 from .serializers import ActoCreateSerializer, AreaInteresSerializer, DetalleVinculacionSerializer, HermanoAdminUpdateSerializer, HermanoListadoSerializer, HistorialPapeletaSerializer, PuestoUpdateSerializer, SolicitudUnificadaSerializer, TipoActoSerializer, UserSerializer, UserUpdateSerializer, ActoSerializer, PuestoSerializer, TipoPuestoSerializer, VincularPapeletaSerializer
 from rest_framework.permissions import IsAuthenticated, AllowAny
@@ -19,7 +25,7 @@ from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from .models import Acto, AreaInteres, Comunicado, Puesto
 from django.utils import timezone
-from .pagination import StandardResultsSetPagination
+from .pagination import PaginacionCursorComunicados, StandardResultsSetPagination
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.exceptions import ValidationError as DRFValidationError 
 from django.core.exceptions import ValidationError as DjangoValidationError
@@ -71,7 +77,7 @@ class ActoListCreateView(APIView):
 
     def get(self, request):
         anio_actual = timezone.now().year
-        actos = Acto.objects.filter(fecha__year = anio_actual).order_by('fecha')
+        actos = preparar_actos_serializacion(Acto.objects.filter(fecha__year = anio_actual).order_by('fecha'))
         serializer = ActoSerializer(actos, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -91,11 +97,12 @@ class ActoListCreateView(APIView):
 class ActoDetalleView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @peticion_condicional(lambda request, pk: version_acto(pk))
     def get(self, request, pk):
         """
         Recuperar un acto específico por su ID.
         """
-        acto = get_object_or_404(Acto, pk=pk)
+        acto = get_object_or_404(preparar_actos_serializacion(Acto.objects.all()), pk=pk)
         serializer = ActoSerializer(acto, context={'request': request})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -306,18 +313,18 @@ class MisPapeletasListView(APIView):
     permission_classes = [IsAuthenticated]
     pagination_class = StandardResultsSetPagination
 
+    @peticion_condicional(lambda request: version_papeletas_hermano(request.user))
     def get(self, request):
         try:
-            queryset = get_historial_papeletas_hermano_service(usuario=request.user)
+            # Mismo esquema que `HistorialPapeletaSerializer`, construido desde values() en una sola consulta
+            queryset = proyectar_historial_papeletas(get_historial_papeletas_hermano_service(usuario=request.user))
             paginator = self.pagination_class()
             page = paginator.paginate_queryset(queryset, request, view=self)
 
             if page is not None:
-                serializer = HistorialPapeletaSerializer(page, many=True)
-                return paginator.get_paginated_response(serializer.data)
+                return paginator.get_paginated_response(serializar_historial_papeletas(page))
 
-            serializer = HistorialPapeletaSerializer(queryset, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return Response(serializar_historial_papeletas(queryset), status=status.HTTP_200_OK)
 
         except Exception as e:
             print(f"Error en MisPapeletasListView: {str(e)}")
@@ -389,20 +396,23 @@ class MisComunicadosListView(generics.ListAPIView):
     """
     Devuelve los comunicados filtrados por las áreas de interés del usuario logueado,
     INCLUYENDO siempre los comunicados dirigidos a 'Todos los Hermanos'.
+    Paginado por cursor sobre (fecha_emision, id).
     """
     serializer_class = ComunicadoListSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = PaginacionCursorComunicados
 
-    def get_queryset(self):
-        usuario = self.request.user
-        mis_areas = usuario.areas_interes.all()
+    @peticion_condicional(lambda request: version_feed_comunicados(request.user))
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
-        queryset = Comunicado.objects.filter(
-            Q(areas_interes__in=mis_areas) | 
-            Q(areas_interes__nombre_area=AreaInteres.NombreArea.TODOS_HERMANOS)
-        ).distinct().order_by('-fecha_emision')
+    def get_queryset(self):
+        return obtener_feed_comunicados(self.request.user)
 
-        return queryset
+    def list(self, request, *args, **kwargs):
+        # Mismo esquema que `serializer_class`, construido desde values() (ver comunicado_list_values)
+        pagina = self.paginate_queryset(proyectar_comunicados_listado(self.get_queryset()))
+        return self.get_paginated_response(serializar_comunicados_listado(pagina, request))
 
 # -----------------------------------------------------------------------------
 # VISTA: LISTA DE ÁREAS DE INTERÉS (Para el Select del Frontend)
@@ -411,10 +421,12 @@ class AreaInteresListView(generics.ListAPIView):
     """
     Devuelve la lista de áreas disponibles para poblar los selectores en React.
     """
-    queryset = AreaInteres.objects.all()
     serializer_class = AreaInteresSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        return list(obtener_catalogo(AreaInteres).instancias)
+
 
 
 # -----------------------------------------------------------------------------
@@ -451,7 +463,7 @@ class ChatComunicadosView(APIView):
 
         try:
             servicio_rag = ComunicadoRAGService()
-            respuesta_ia = servicio_rag.preguntar_a_comunicados(pregunta)
+            respuesta_ia = servicio_rag.preguntar_a_comunicados(pregunta, request.user)
             
             return Response({"respuesta": respuesta_ia}, status=status.HTTP_200_OK)
             
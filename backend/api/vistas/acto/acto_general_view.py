@@ -5,8 +5,11 @@ from rest_framework.exceptions import PermissionDenied
 
 from django.core.exceptions import ValidationError as DjangoValidationError
 
+from api.condicional import peticion_condicional
 from api.serializers import ActoCreateSerializer, ActoSerializer
 from api.servicios.acto.acto_service import ActoService, crear_acto_service
+from api.servicios.acto.contadores_acto_service import preparar_actos_serializacion
+from api.servicios.version_recursos_service import version_actos
 from api.pagination import PaginacionDiezElementos
 
 
@@ -37,9 +40,14 @@ class ActoListAPIView(generics.ListAPIView):
     """
     Vista para listar todos los Actos.
     Utiliza PaginacionDiezElementos para devolver 10 resultados por página.
+    Admite peticiones condicionales (`If-None-Match`).
     """
     serializer_class = ActoSerializer
     pagination_class = PaginacionDiezElementos
 
+    @peticion_condicional(lambda request: version_actos())
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
     def get_queryset(self):
-        return ActoService.get_todos_los_actos()
\ No newline at end of file
+        return preparar_actos_serializacion(ActoService.get_todos_los_actos())
\ No newline at end of file
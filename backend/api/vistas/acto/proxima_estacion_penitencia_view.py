@@ -1,11 +1,9 @@
-from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 
-from api.models import Acto, TipoActo
-from api.serializadores.acto.proximos_actos_serializer import ActoCultoCardSerializer
+from api.servicios.acto.proximos_actos_service import obtener_proxima_estacion_penitencia
 
 class ProximaEstacionPenitenciaView(APIView):
     """
@@ -15,16 +13,10 @@ class ProximaEstacionPenitenciaView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        ahora = timezone.now()
-
-        proxima_estacion = Acto.objects.filter(
-            tipo_acto__tipo=TipoActo.OpcionesTipo.ESTACION_PENITENCIA,
-            fecha__gte=ahora
-        ).select_related('tipo_acto').order_by('fecha').first()
+        proxima_estacion = obtener_proxima_estacion_penitencia()
 
         if proxima_estacion:
-            serializer = ActoCultoCardSerializer(proxima_estacion)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return Response(proxima_estacion, status=status.HTTP_200_OK)
         else:
             return Response(
                 {"detail": "No hay ninguna Estación de Penitencia futura programada."}, 
@@ -1,11 +1,9 @@
-from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 
-from api.models import Acto
-from api.serializadores.acto.proximos_actos_serializer import ActoCultoCardSerializer
+from api.servicios.acto.proximos_actos_service import obtener_proximos_actos
 
 class ProximosActosView(APIView):
     """
@@ -15,13 +13,4 @@ class ProximosActosView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        ahora = timezone.now()
-
-        proximos_actos = Acto.objects.filter(
-            fecha__gte=ahora
-        ).only(
-            'id', 'nombre', 'fecha', 'lugar'
-        ).order_by('fecha')[:3]
-
-        serializer = ActoCultoCardSerializer(proximos_actos, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(obtener_proximos_actos(), status=status.HTTP_200_OK)
\ No newline at end of file
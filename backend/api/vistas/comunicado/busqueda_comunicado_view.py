@@ -0,0 +1,37 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+
+from api.serializadores.comunicado.comunicado_busqueda_serializer import ComunicadoBusquedaSerializer
+from api.servicios.comunicado.busqueda_comunicado_service import buscar_comunicados, terminos_consulta
+
+
+class BusquedaComunicadosView(APIView):
+    """
+    GET /api/comunicados/buscar/?q=texto[&limite=20]
+
+    Búsqueda de texto completo en los comunicados dirigidos al hermano, por relevancia.
+    """
+    permission_classes = [IsAuthenticated]
+
+    LIMITE_MAXIMO = 50
+
+    def get(self, request):
+        consulta = request.query_params.get('q', '').strip()
+
+        if not terminos_consulta(consulta):
+            return Response(
+                {'detail': 'Indique al menos una palabra que buscar.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limite = min(max(int(request.query_params.get('limite', 20)), 1), self.LIMITE_MAXIMO)
+        except ValueError:
+            limite = 20
+
+        comunicados = buscar_comunicados(request.user, consulta, limite)
+
+        serializer = ComunicadoBusquedaSerializer(comunicados, many=True, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_200_OK)
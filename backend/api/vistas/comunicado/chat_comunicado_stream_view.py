@@ -0,0 +1,52 @@
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from api.renderers import ServerSentEventRenderer, formatear_evento_sse
+from api.servicios.comunicado.comunicado_rag_service import ComunicadoRAGService
+
+
+class ChatComunicadosStreamView(APIView):
+    """
+    Variante en streaming del chat sobre comunicados (Server-Sent Events).
+
+    En lugar de esperar a que el modelo genere la respuesta completa, reenvía cada
+    fragmento en cuanto llega, de modo que la latencia percibida es la del primer token.
+
+    Eventos emitidos, en este orden:
+        contexto: comunicados recuperados para responder (id, título y fecha).
+        fragmento: trozo de texto de la respuesta (uno o varios).
+        fin | error: cierre del stream.
+    """
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [JSONRenderer, ServerSentEventRenderer]
+
+    def post(self, request):
+        pregunta = request.data.get('pregunta')
+
+        if not pregunta or not str(pregunta).strip():
+            return Response({"detail": "Debes enviar una pregunta válida en el campo 'pregunta'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(
+            self._generar_eventos(str(pregunta), request.user),
+            content_type='text/event-stream; charset=utf-8'
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+
+        return response
+
+    def _generar_eventos(self, pregunta, usuario):
+        try:
+            servicio_rag = ComunicadoRAGService()
+            for evento, datos in servicio_rag.preguntar_a_comunicados_stream(pregunta, usuario):
+                yield formatear_evento_sse(evento, datos)
+
+        except Exception as e:
+            yield formatear_evento_sse('error', {
+                "detail": "Ocurrió un error interno procesando la consulta con la IA.",
+                "error": str(e)
+            })
@@ -0,0 +1,68 @@
+from django.http import StreamingHttpResponse
+from rest_framework import status
+
+from api.renderers import formatear_evento_sse
+from api.servicios.comunicado.comunicado_rag_service import ComunicadoRAGService
+from api.vistas.vista_asincrona import VistaAPIAsincrona
+
+
+class ChatComunicadosAsyncView(VistaAPIAsincrona):
+    """
+    Versión ASGI de `ChatComunicadosView`. Mientras Gemini genera la respuesta la
+    petición queda suspendida en el bucle de eventos y el worker sigue atendiendo
+    otras, en lugar de quedar bloqueado durante toda la llamada.
+    """
+
+    async def post(self, request):
+        pregunta = request.data.get('pregunta')
+
+        if not pregunta or not str(pregunta).strip():
+            return self.respuesta({"detail": "Debes enviar una pregunta válida en el campo 'pregunta'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            servicio_rag = ComunicadoRAGService()
+            respuesta_ia = await servicio_rag.apreguntar_a_comunicados(pregunta, request.user)
+
+            return self.respuesta({"respuesta": respuesta_ia}, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            return self.respuesta(
+                {"detail": "Ocurrió un error interno procesando la consulta con la IA.", "error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class ChatComunicadosStreamAsyncView(VistaAPIAsincrona):
+    """
+    Versión ASGI de `ChatComunicadosStreamView`. Bajo ASGI Django consume un generador
+    síncrono entero (`sync_to_async(list)`) antes de enviar nada, lo que anularía el
+    streaming; aquí los eventos salen de un generador asíncrono y cada uno se envía en
+    cuanto está listo. Emite los mismos eventos (contexto, fragmento, fin | error).
+    """
+
+    async def post(self, request):
+        pregunta = request.data.get('pregunta')
+
+        if not pregunta or not str(pregunta).strip():
+            return self.respuesta({"detail": "Debes enviar una pregunta válida en el campo 'pregunta'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(
+            self._generar_eventos(str(pregunta), request.user),
+            content_type='text/event-stream; charset=utf-8'
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+
+        return response
+
+    async def _generar_eventos(self, pregunta, usuario):
+        try:
+            servicio_rag = ComunicadoRAGService()
+            async for evento, datos in servicio_rag.apreguntar_a_comunicados_stream(pregunta, usuario):
+                yield formatear_evento_sse(evento, datos)
+
+        except Exception as e:
+            yield formatear_evento_sse('error', {
+                "detail": "Ocurrió un error interno procesando la consulta con la IA.",
+                "error": str(e)
+            })
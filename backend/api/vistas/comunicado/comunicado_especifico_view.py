@@ -6,10 +6,12 @@ from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 
 
+from api.condicional import peticion_condicional
 from api.serializadores.comunicado.comunicado_form_serializer import ComunicadoFormSerializer
 from api.servicios.comunicado.creacion_comunicado_service import ComunicadoService
+from api.servicios.version_recursos_service import version_comunicado
 from api.models import Comunicado
-from api.serializadores.comunicado.comunicado_list_serializer import ComunicadoListSerializer
+from api.serializadores.comunicado.comunicado_list_serializer import ComunicadoDetalleSerializer
 
 
 class ComunicadoDetailView(APIView):
@@ -29,8 +31,9 @@ class ComunicadoDetailView(APIView):
     Methods:
         get(request, pk):
             Recupera los detalles de un comunicado específico por su clave primaria.
-            Respuesta: Objeto serializado con `ComunicadoListSerializer`.
-            Códigos HTTP: 200 OK, 404 Not Found.
+            Respuesta: Objeto serializado con `ComunicadoDetalleSerializer` (incluye el `contenido` completo).
+            Admite peticiones condicionales (`If-None-Match` / `If-Modified-Since`).
+            Códigos HTTP: 200 OK, 304 Not Modified, 404 Not Found.
 
         put(request, pk):
             Procesa la actualización total del comunicado (requiere todos los campos obligatorios).
@@ -49,9 +52,10 @@ class ComunicadoDetailView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
+    @peticion_condicional(lambda request, pk: version_comunicado(pk))
     def get(self, request, pk):
         comunicado = get_object_or_404(Comunicado, pk=pk)
-        serializer = ComunicadoListSerializer(comunicado, context={'request': request})
+        serializer = ComunicadoDetalleSerializer(comunicado, context={'request': request})
         return Response(serializer.data)
 
 
@@ -69,7 +73,7 @@ class ComunicadoDetailView(APIView):
                 comunicado_instance=comunicado,
                 data_validada=serializer.validated_data
             )
-            return Response(ComunicadoListSerializer(actualizado).data)
+            return Response(ComunicadoDetalleSerializer(actualizado).data)
         except Exception as e:
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -87,7 +91,7 @@ class ComunicadoDetailView(APIView):
                 comunicado_instance=comunicado,
                 data_validada=serializer.validated_data
             )
-            return Response(ComunicadoListSerializer(actualizado).data)
+            return Response(ComunicadoDetalleSerializer(actualizado).data)
         except Exception as e:
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
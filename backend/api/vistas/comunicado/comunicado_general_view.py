@@ -1,13 +1,16 @@
 from rest_framework import status
-from django.db.models import Q
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from api.models import AreaInteres, Comunicado
+from api.condicional import peticion_condicional
 from api.serializadores.comunicado.comunicado_form_serializer import ComunicadoFormSerializer
+from api.pagination import PaginacionCursorComunicados
 from api.servicios.comunicado.creacion_comunicado_service import ComunicadoService
-from api.serializadores.comunicado.comunicado_list_serializer import ComunicadoListSerializer
+from api.servicios.comunicado.feed_comunicado_service import obtener_feed_comunicados
+from api.servicios.version_recursos_service import version_feed_comunicados
+from api.serializadores.comunicado.comunicado_list_serializer import ComunicadoDetalleSerializer
+from api.serializadores.comunicado.comunicado_list_values import proyectar_comunicados_listado, serializar_comunicados_listado
 
 
 class ComunicadoListCreateView(APIView):
@@ -22,37 +25,34 @@ class ComunicadoListCreateView(APIView):
 
     Methods:
         get(request):
-            Recupera el listado completo de comunicados.
-            Orden: Descendente por fecha de emisión (más recientes primero).
-            Respuesta: Array de objetos serializados con `ComunicadoListSerializer`.
-            Códigos HTTP: 200 OK.
+            Recupera los comunicados dirigidos al usuario, paginados por cursor.
+            Orden: Descendente por fecha de emisión (más recientes primero) e id.
+            Respuesta: `{"next": url | null, "results": [...]}` con el esquema de `ComunicadoListSerializer`,
+            construido desde una proyección `values()` (ver comunicado_list_values).
+            Admite peticiones condicionales (`If-None-Match`).
+            Códigos HTTP: 200 OK, 304 Not Modified.
 
         post(request):
             Procesa la creación de un nuevo comunicado.
             Flujo de trabajo:
                 1. Validación de entrada mediante `ComunicadoFormSerializer`.
                 2. Delegación de la lógica de creación a `ComunicadoService.create_comunicado()`.
-                3. Formateo de la respuesta utilizando `ComunicadoListSerializer`.
+                3. Formateo de la respuesta utilizando `ComunicadoDetalleSerializer`.
             Códigos HTTP: 
                 - 201 Created (Éxito).
                 - 400 Bad Request (Error de validación o excepción en la capa de servicio).
     """
     permission_classes = [IsAuthenticated]
+    pagination_class = PaginacionCursorComunicados
 
+    @peticion_condicional(lambda request: version_feed_comunicados(request.user))
     def get(self, request):
-        usuario = request.user
+        comunicados = proyectar_comunicados_listado(obtener_feed_comunicados(request.user))
 
-        filtro_areas = Q(areas_interes__in=usuario.areas_interes.all()) | \
-                    Q(areas_interes__nombre_area=AreaInteres.NombreArea.TODOS_HERMANOS)
+        paginator = self.pagination_class()
+        pagina = paginator.paginate_queryset(comunicados, request, view=self)
 
-        comunicados = Comunicado.objects.select_related('autor') \
-                                        .prefetch_related('areas_interes') \
-                                        .filter(filtro_areas) \
-                                        .distinct() \
-                                        .order_by('-fecha_emision')
-
-        serializer = ComunicadoListSerializer(comunicados, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return paginator.get_paginated_response(serializar_comunicados_listado(pagina, request))
 
 
     def post(self, request):
@@ -67,7 +67,7 @@ class ComunicadoListCreateView(APIView):
                 data_validada=serializer.validated_data
             )
 
-            response_serializer = ComunicadoListSerializer(nuevo_comunicado)
+            response_serializer = ComunicadoDetalleSerializer(nuevo_comunicado)
             return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
         except Exception as e:
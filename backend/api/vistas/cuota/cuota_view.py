@@ -3,20 +3,27 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Count, Sum, Q
 
+from api.condicional import peticion_condicional
 from api.serializers import CuotaSerializer
 from api.pagination import PaginacionDiezElementos
 from api.models import Cuota
+from api.servicios.version_recursos_service import version_cuotas_hermano
 
 class MisCuotasListView(generics.ListAPIView):
     """
     Lista las cuotas exclusivas del hermano autenticado.
     Paginadas de 10 en 10 y ordenadas de más recientes a más antiguas.
     Incluye un resumen de los totales del hermano.
+    Admite peticiones condicionales (`If-None-Match`).
     """
     serializer_class = CuotaSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = PaginacionDiezElementos
 
+    @peticion_condicional(lambda request: version_cuotas_hermano(request.user))
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
     def get_queryset(self):
         return Cuota.objects.filter(
             hermano=self.request.user
@@ -0,0 +1,26 @@
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.models import SolicitudEnCola
+from api.serializadores.papeleta_sitio.cola_solicitud_serializer import TicketSolicitudSerializer
+from api.servicios.papeleta_sitio.cola_solicitudes_service import encolar_solicitud
+
+
+def respuesta_encolada(request, tipo, validated_data):
+    """Respuesta de los endpoints de solicitud en modo admisión: 202 con el ticket que consultar."""
+    solicitud = encolar_solicitud(request.user, tipo, validated_data, request.headers.get('Idempotency-Key'))
+    return Response(TicketSolicitudSerializer(solicitud).data, status=status.HTTP_202_ACCEPTED)
+
+
+class EstadoSolicitudEnColaView(APIView):
+    """
+    Estado de una solicitud encolada. Cada hermano solo puede consultar sus tickets.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, ticket):
+        solicitud = get_object_or_404(SolicitudEnCola, ticket=ticket, hermano=request.user)
+        return Response(TicketSolicitudSerializer(solicitud).data, status=status.HTTP_200_OK)
@@ -10,7 +10,9 @@ from django.shortcuts import get_object_or_404
 
 from api.serializadores.solicitud_insignia.solicitud_insignia_serializer import ActoInsigniaResumenSerializer, SolicitudInsigniaSerializer
 from api.servicios.solicitud_insignia.solicitud_insignia_service import ActoService, RepartoService, SolicitudInsigniaService
-from api.models import Acto, PapeletaSitio, Puesto
+from api.servicios.papeleta_sitio.cola_solicitudes_service import modo_admision_activo
+from api.vistas.papeleta_sitio.cola_solicitudes_view import respuesta_encolada
+from api.models import Acto, PapeletaSitio, Puesto, SolicitudEnCola
 
 
 class ActoActivoInsigniasView(APIView):
@@ -43,6 +45,9 @@ class SolicitarInsigniaView(APIView):
         serializer = SolicitudInsigniaSerializer(data=request.data, context={'request': request})
         
         if serializer.is_valid():
+            if modo_admision_activo():
+                return respuesta_encolada(request, SolicitudEnCola.TipoSolicitud.INSIGNIA, serializer.validated_data)
+
             try:
                 service = SolicitudInsigniaService()
 
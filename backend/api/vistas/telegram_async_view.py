@@ -0,0 +1,19 @@
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+
+from api.servicios.papeleta_telegram import TelegramWebhookService
+from api.vistas.vista_asincrona import VistaAPIAsincrona
+
+
+class TelegramWebhookAsyncView(VistaAPIAsincrona):
+    """
+    Versión ASGI de `TelegramWebhookView`: responde a Telegram sin bloquear el worker
+    mientras se envía el mensaje de bienvenida.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny] # IMPORTANTE: Debe ser público para Telegram
+
+    async def post(self, request, *args, **kwargs):
+        await TelegramWebhookService.aprocesar_actualizacion(request.data)
+
+        return self.respuesta({"status": "ok"}, status=status.HTTP_200_OK)
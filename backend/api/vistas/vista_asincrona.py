@@ -0,0 +1,77 @@
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+
+class VistaAPIAsincrona(View):
+    """
+    Base para las vistas asíncronas del despliegue ASGI.
+
+    DRF no ejecuta vistas `async`, así que esta clase reproduce la parte del ciclo de
+    APIView que necesitan (parseo del cuerpo, autenticación JWT y permisos) en un hilo
+    mediante `sync_to_async`, y entrega a los métodos `async def get/post` un `Request`
+    de DRF ya autenticado. Las respuestas son `JsonResponse` con el mismo formato
+    (`{"detail": ...}` en los errores) que las vistas síncronas equivalentes.
+    """
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES
+    permission_classes = [IsAuthenticated]
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Igual que APIView: la autenticación es por token, no por sesión
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        handler = getattr(self, request.method.lower(), None)
+
+        if request.method.lower() not in self.http_method_names or handler is None:
+            return self.respuesta(
+                {"detail": f'Método "{request.method}" no permitido.'},
+                status=status.HTTP_405_METHOD_NOT_ALLOWED
+            )
+
+        drf_request, error = await sync_to_async(self._inicializar)(request)
+        if error is not None:
+            return error
+
+        return await handler(drf_request, *args, **kwargs)
+
+    def _inicializar(self, request):
+        drf_request = Request(
+            request,
+            parsers=[parser() for parser in self.parser_classes],
+            authenticators=[autenticador() for autenticador in self.authentication_classes],
+        )
+
+        try:
+            # Se fuerzan aquí la autenticación y la lectura del cuerpo, que acceden a BD/socket
+            drf_request.user
+            drf_request.data
+
+            for permiso in [permiso() for permiso in self.permission_classes]:
+                if not permiso.has_permission(drf_request, self):
+                    if drf_request.successful_authenticator is None and self.authentication_classes:
+                        raise exceptions.NotAuthenticated()
+                    raise exceptions.PermissionDenied(getattr(permiso, 'message', None))
+
+        except exceptions.APIException as exc:
+            respuesta = self.respuesta({"detail": exc.detail}, status=exc.status_code)
+
+            if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)) and self.authentication_classes:
+                cabecera = self.authentication_classes[0]().authenticate_header(drf_request)
+                if cabecera:
+                    respuesta['WWW-Authenticate'] = cabecera
+
+            return None, respuesta
+
+        return drf_request, None
+
+    @staticmethod
+    def respuesta(data, status=status.HTTP_200_OK):
+        return JsonResponse(data, status=status, safe=False, json_dumps_params={'ensure_ascii': False})
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+# Las rutas del chat y del webhook de Telegram usan las vistas asíncronas
+os.environ.setdefault('SERVIDOR_ASGI', 'True')
 
 application = get_asgi_application()
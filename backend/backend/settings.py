@@ -183,7 +183,36 @@ if 'pytest' in sys.modules or 'test' in sys.argv:
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
 TELEGRAM_BOT_USERNAME = os.getenv('TELEGRAM_BOT_USERNAME')
 
+# Difusión de comunicados a los canales (ver api/servicios/comunicado/difusion_telegram_service.py).
+# Telegram admite unos 30 mensajes/s por bot; se deja margen.
+TELEGRAM_MENSAJES_POR_SEGUNDO = float(os.getenv("TELEGRAM_MENSAJES_POR_SEGUNDO", "25"))
+TELEGRAM_ENVIOS_CONCURRENTES = int(os.getenv("TELEGRAM_ENVIOS_CONCURRENTES", "8"))
+TELEGRAM_REINTENTOS = int(os.getenv("TELEGRAM_REINTENTOS", "3"))
+TELEGRAM_ESPERA_REINTENTO = float(os.getenv("TELEGRAM_ESPERA_REINTENTO", "1"))
+
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 if not GEMINI_API_KEY:
-    print("⚠️ ADVERTENCIA: No se ha encontrado GEMINI_API_KEY en las variables de entorno.")
\ No newline at end of file
+    print("⚠️ ADVERTENCIA: No se ha encontrado GEMINI_API_KEY en las variables de entorno.")
+# Cliente Gemini compartido por proceso (ver api/servicios/comunicado/cliente_gemini.py)
+GEMINI_TIMEOUT_SEGUNDOS = float(os.getenv("GEMINI_TIMEOUT_SEGUNDOS", "30"))
+GEMINI_MAX_CONEXIONES = int(os.getenv("GEMINI_MAX_CONEXIONES", "10"))
+
+# 'google' usa la API real; 'falso' usa el sustituto local determinista (benchmarks y CI sin red)
+GEMINI_BACKEND = os.getenv("GEMINI_BACKEND", "google")
+GEMINI_FALSO_LATENCIA_MS = float(os.getenv("GEMINI_FALSO_LATENCIA_MS", "0"))
+
+# Activado por backend/asgi.py: sirve las vistas asíncronas (uvicorn) en lugar de las síncronas (gunicorn)
+SERVIDOR_ASGI = os.getenv("SERVIDOR_ASGI", "False") == "True"
+
+# Índice vectorial del chat: 'ninguna' puntúa con los embeddings completos de la BD;
+# 'float16' o 'int8' usan vectores compactos en memoria y repuntúan los mejores candidatos
+RAG_CUANTIZACION = os.getenv("RAG_CUANTIZACION", "ninguna")
+# Recorte Matryoshka de los vectores compactos (p. ej. 768); vacío para usar la dimensión completa
+RAG_DIMENSION_TRUNCADA = int(os.getenv("RAG_DIMENSION_TRUNCADA", "0")) or None
+RAG_CANDIDATOS_REPUNTUACION = int(os.getenv("RAG_CANDIDATOS_REPUNTUACION", "50"))
+
+# Modo admisión de las solicitudes de papeleta (ver api/servicios/papeleta_sitio/cola_solicitudes_service.py):
+# los endpoints encolan y devuelven un ticket; `procesar_cola_solicitudes` las tramita con este número de workers
+SOLICITUDES_EN_COLA = os.getenv("SOLICITUDES_EN_COLA", "False") == "True"
+SOLICITUDES_COLA_WORKERS = int(os.getenv("SOLICITUDES_COLA_WORKERS", "4"))
@@ -6,7 +6,21 @@ const NewsCard = ({ item }) => {
     return (
         <div className="card-noticias">
             <div className="card-header-noticias">
-                <img src={item.image} alt={item.title} className="card-image-noticias" />
+                {item.srcset ? (
+                    <picture>
+                        <source type="image/webp" srcSet={item.srcset.webp} sizes="(max-width: 600px) 100vw, 400px" />
+                        <img
+                            src={item.srcset.miniatura}
+                            srcSet={item.srcset.jpeg}
+                            sizes="(max-width: 600px) 100vw, 400px"
+                            alt={item.title}
+                            loading="lazy"
+                            className="card-image-noticias"
+                        />
+                    </picture>
+                ) : (
+                    <img src={item.image} alt={item.title} className="card-image-noticias" />
+                )}
             </div>
             
             <div className="card-content-noticias">
@@ -26,8 +26,15 @@ function AdminListadoComunicados() {
     useEffect(() => {
         const fetchComunicados = async () => {
             try {
-                const response = await api.get('api/comunicados/');
-                setComunicados(response.data);
+                // El listado está paginado por cursor: se recorren todas las páginas
+                let url = 'api/comunicados/?page_size=100';
+                let todos = [];
+                while (url) {
+                    const response = await api.get(url);
+                    todos = [...todos, ...response.data.results];
+                    url = response.data.next;
+                }
+                setComunicados(todos);
             } catch (err) {
                 console.error(err);
                 setError("Error al cargar los comunicados.");
@@ -48,12 +48,9 @@ function HermanoConsultaNoticia() {
     };
 
     const adaptarNoticiaACard = (item) => {
-        const wordCount = item.contenido ? item.contenido.split(/\s+/).length : 0;
-        const readTimeMinutes = Math.max(1, Math.ceil(wordCount / 200));
+        const readTimeMinutes = item.minutos_lectura || 1;
 
-        const descripcionCorta = item.contenido 
-            ? item.contenido.substring(0, 120) + '...'
-            : 'Sin descripción disponible.';
+        const descripcionCorta = item.extracto || 'Sin descripción disponible.';
 
         return {
             id: item.id,
@@ -97,6 +97,8 @@ const getBadgeColor = (tipo) => {
 
 function HermanoMuroNoticias() {
     const [noticias, setNoticias] = useState([]);
+    const [siguientePagina, setSiguientePagina] = useState(null);
+    const [cargandoMas, setCargandoMas] = useState(false);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
 
@@ -105,7 +107,8 @@ function HermanoMuroNoticias() {
             try {
                 // Llamamos al endpoint filtrado
                 const response = await api.get('api/comunicados/mis-noticias/');
-                setNoticias(response.data);
+                setNoticias(response.data.results);
+                setSiguientePagina(response.data.next);
             } catch (err) {
                 console.error(err);
                 setError("No se pudieron cargar las noticias.");
@@ -117,6 +120,22 @@ function HermanoMuroNoticias() {
         fetchNoticias();
     }, []);
 
+    // La API pagina por cursor: 'next' es la URL de la página siguiente (null si no hay más)
+    const cargarMas = async () => {
+        if (!siguientePagina) return;
+        setCargandoMas(true);
+        try {
+            const response = await api.get(siguientePagina);
+            setNoticias(prev => [...prev, ...response.data.results]);
+            setSiguientePagina(response.data.next);
+        } catch (err) {
+            console.error(err);
+            setError("No se pudieron cargar más noticias.");
+        } finally {
+            setCargandoMas(false);
+        }
+    };
+
     // Formateador de fecha amigable
     const formatDate = (isoString) => {
         return new Date(isoString).toLocaleDateString('es-ES', {
@@ -168,7 +187,7 @@ function HermanoMuroNoticias() {
 
                                 {/* Título y Contenido */}
                                 <h2 style={styles.cardTitle}>{noticia.titulo}</h2>
-                                <p style={styles.content}>{noticia.contenido}</p>
+                                <p style={styles.content}>{noticia.extracto}</p>
 
                                 {/* Footer de la tarjeta: Autor y Áreas */}
                                 <div style={styles.footer}>
@@ -194,6 +213,14 @@ function HermanoMuroNoticias() {
                     })
                 )}
             </div>
+
+            {siguientePagina && (
+                <div style={{ textAlign: 'center', marginTop: '30px' }}>
+                    <button onClick={cargarMas} disabled={cargandoMas}>
+                        {cargandoMas ? 'Cargando...' : 'Ver más noticias'}
+                    </button>
+                </div>
+            )}
         </div>
     );
 }
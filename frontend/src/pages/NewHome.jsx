@@ -110,12 +110,9 @@ function HermanoNewHome() {
             }
         }
 
-        const wordCount = item.contenido ? item.contenido.split(/\s+/).length : 0;
-        const readTimeMinutes = Math.max(1, Math.ceil(wordCount / 200));
+        const readTimeMinutes = item.minutos_lectura || 1;
 
-        const descripcionCorta = item.contenido 
-            ? item.contenido.substring(0, 120) + '...'
-            : 'Sin descripción disponible.';
+        const descripcionCorta = item.extracto || 'Sin descripción disponible.';
 
         return {
             id: item.id,
@@ -24,21 +24,28 @@ const getTimeAgo = (dateString) => {
     return "Hace unos instantes";
 };
 
-const getReadTime = (content) => {
-    if (!content) return '1 min lectura';
-    const wordsPerMinute = 200;
-    const words = content.trim().split(/\s+/).length;
-    const time = Math.ceil(words / wordsPerMinute);
-    return `${time} min lectura`;
-};
+const getReadTime = (minutos) => `${minutos || 1} min lectura`;
 
 // --- FIN FUNCIONES AUXILIARES ---
 
+const formatearNoticia = (item) => ({
+    id: item.id,
+    image: item.imagen_portada || 'https://images.unsplash.com/photo-1444703686981-a3abbc4d4fe3?auto=format&fit=crop&q=80&w=500', 
+    srcset: item.imagen_srcset,
+    time: getTimeAgo(item.fecha_emision),
+    readTime: getReadTime(item.minutos_lectura),
+    title: item.titulo,
+    description: item.extracto || '', 
+    author: item.autor_nombre
+});
+
 function NoticiasHermano() {
     const [isOpen, setIsOpen] = useState(false); 
 
     const [user, setUser] = useState(null);
     const [noticias, setNoticias] = useState([]); 
+    const [siguientePagina, setSiguientePagina] = useState(null);
+    const [cargandoMas, setCargandoMas] = useState(false);
     const [loading, setLoading] = useState(true);
     
     const navigate = useNavigate();
@@ -61,17 +68,8 @@ function NoticiasHermano() {
                 if (isMounted) {
                     console.log("Datos recibidos de API:", resNoticias.data);
 
-                    const noticiasFormateadas = resNoticias.data.map(item => ({
-                        id: item.id,
-                        image: item.imagen_portada || 'https://images.unsplash.com/photo-1444703686981-a3abbc4d4fe3?auto=format&fit=crop&q=80&w=500', 
-                        time: getTimeAgo(item.fecha_emision),
-                        readTime: getReadTime(item.contenido),
-                        title: item.titulo,
-                        description: item.contenido ? item.contenido.replace(/<[^>]+>/g, '').substring(0, 150) + '...' : '', 
-                        author: item.autor_nombre
-                    }));
-
-                    setNoticias(noticiasFormateadas);
+                    setNoticias(resNoticias.data.results.map(formatearNoticia));
+                    setSiguientePagina(resNoticias.data.next);
                 }
 
             } catch (err) {
@@ -87,6 +85,21 @@ function NoticiasHermano() {
         return () => { isMounted = false; };
     }, [navigate, user]);
 
+    // La API pagina por cursor: 'next' es la URL de la página siguiente (null si no hay más)
+    const cargarMas = async () => {
+        if (!siguientePagina) return;
+        setCargandoMas(true);
+        try {
+            const res = await api.get(siguientePagina);
+            setNoticias(prev => [...prev, ...res.data.results.map(formatearNoticia)]);
+            setSiguientePagina(res.data.next);
+        } catch (err) {
+            console.error("Error cargando más noticias:", err);
+        } finally {
+            setCargandoMas(false);
+        }
+    };
+
     const toggleSidebar = () => setIsOpen(!isOpen);
     const handleLogout = () => {
         localStorage.removeItem("user_data");
@@ -203,6 +216,13 @@ function NoticiasHermano() {
                                 ))}
                             </div>
                         )}
+                        {siguientePagina && (
+                            <div style={{ textAlign: 'center', marginTop: '20px' }}>
+                                <button onClick={cargarMas} disabled={cargandoMas}>
+                                    {cargandoMas ? 'Cargando...' : 'Ver más noticias'}
+                                </button>
+                            </div>
+                        )}
                     </div>
 
                     {/* COLUMNA DERECHA: ASIDE DE ÁREAS (25%) */}